@@ -0,0 +1,111 @@
+"""
+Delivering --messages A2A messages that all carry an injected a2a.delay:
+
+  inline/pool     delay_mode="inline", sends spread over a --threads worker pool
+  inline/threads  delay_mode="inline", one thread per message
+  scheduled       delay_mode="scheduled", all sends from one thread,
+                  delivery through A2ASendContext.deliver() on the timer wheel
+
+Reports wall time until every message is delivered, peak thread count, and
+how late deliveries ran relative to the time the message was handed to the
+sender plus the delay (time spent queued for a pool worker counts as late).
+
+    python benchmarks/bench_delay_scheduling.py --messages 5000 --delay-ms 100
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from opentelemetry.sdk.trace import TracerProvider
+
+from llmmas_otel.injection import FaultSpec, SpecFaultEngine, disable_fault_injection, enable_fault_injection
+from llmmas_otel.span_factory import SpanFactory
+
+
+class Inbox:
+    def __init__(self, expected: int, delay_s: float) -> None:
+        self.expected = expected
+        self.delay_s = delay_s
+        self.lateness_ms: list[float] = []
+        self.peak_threads = threading.active_count()
+        self._lock = threading.Lock()
+        self.done = threading.Event()
+
+    def receive(self, sent_at: float) -> None:
+        late = (time.perf_counter() - sent_at - self.delay_s) * 1e3
+        with self._lock:
+            self.lateness_ms.append(late)
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+            if len(self.lateness_ms) == self.expected:
+                self.done.set()
+
+
+def send(factory: SpanFactory, inbox: Inbox, i: int, sent_at: float) -> None:
+    with factory.a2a_send(
+        source_agent_id="A", target_agent_id="B", edge_id="A->B", message_id=f"m{i}", message_body="hello"
+    ) as ctx:
+        ctx.deliver(inbox.receive, sent_at)
+
+
+def run(mode: str, factory: SpanFactory, messages: int, delay_s: float, threads: int) -> tuple[float, Inbox]:
+    inbox = Inbox(messages, delay_s)
+    t0 = time.perf_counter()
+    if mode == "inline/pool":
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for i in range(messages):
+                pool.submit(send, factory, inbox, i, time.perf_counter())
+    elif mode == "inline/threads":
+        workers = [threading.Thread(target=send, args=(factory, inbox, i, time.perf_counter())) for i in range(messages)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+    else:
+        for i in range(messages):
+            send(factory, inbox, i, time.perf_counter())
+    inbox.done.wait()
+    return time.perf_counter() - t0, inbox
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--delay-ms", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=32, help="worker pool size for inline/pool")
+    args = parser.parse_args()
+
+    factory = SpanFactory(tracer_provider=TracerProvider())
+    engine = SpecFaultEngine(
+        specs=[
+            FaultSpec.from_dict(
+                {
+                    "id": "DELAY",
+                    "hook": "a2a_send",
+                    "selector": {"edge_id": "A->B"},
+                    "action": {"type": "a2a.delay", "params": {"delay_ms": args.delay_ms}},
+                }
+            )
+        ],
+        seed="0",
+    )
+    delay_s = args.delay_ms / 1000.0
+
+    print(f"{args.messages} messages, {args.delay_ms} ms injected delay each")
+    print(f"{'mode':>15} {'wall s':>8} {'threads':>8} {'late p50 ms':>12} {'late max ms':>12}")
+    for mode in ("inline/pool", "inline/threads", "scheduled"):
+        enable_fault_injection(engine, delay_mode="scheduled" if mode == "scheduled" else "inline")
+        wall, inbox = run(mode, factory, args.messages, delay_s, args.threads)
+        late = inbox.lateness_ms
+        print(
+            f"{mode:>15} {wall:>8.2f} {inbox.peak_threads:>8} "
+            f"{statistics.median(late):>12.1f} {max(late):>12.1f}"
+        )
+    disable_fault_injection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+SpecFaultEngine.decide() throughput from several threads: counters sharded
+over --shards locks vs one global lock (counter_shards=1).
+
+Each thread decides for its own sessions against a matching spec without a
+max_times limit, so every call takes the counter lock. Under the GIL the
+difference comes from lock contention and convoying rather than parallel
+execution; on a free-threaded build the sharded engine also scales.
+
+    python benchmarks/bench_engine_concurrency.py --threads 1 4 8 16 --calls 20000
+"""
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+
+from llmmas_otel.injection import FaultSpec, HookContext, HookType, SpecFaultEngine
+
+SPEC = FaultSpec.from_dict(
+    {
+        "id": "DELAY",
+        "hook": "a2a_send",
+        "selector": {"edge_id": "A->B"},
+        "action": {"type": "a2a.delay", "params": {"delay_ms": 0}},
+    }
+)
+
+
+def run(engine: SpecFaultEngine, threads: int, calls: int) -> float:
+    start = threading.Barrier(threads + 1)
+
+    def worker(t: int) -> None:
+        contexts = [
+            HookContext(hook_type=HookType.A2A_SEND, session_id=f"T{t}-S{i}", edge_id="A->B") for i in range(8)
+        ]
+        start.wait()
+        decide = engine.decide
+        for i in range(calls):
+            decide(contexts[i & 7])
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for w in workers:
+        w.join()
+    return threads * calls / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--calls", type=int, default=20_000, help="decide() calls per thread")
+    parser.add_argument("--shards", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'threads':>8} {'global lock/s':>14} {'sharded/s':>12} {'ratio':>7}")
+    for threads in args.threads:
+        rates = {}
+        for name, shards in (("global", 1), ("sharded", args.shards)):
+            rates[name] = max(
+                run(SpecFaultEngine(specs=[SPEC], counter_shards=shards), threads, args.calls)
+                for _ in range(args.rounds)
+            )
+        print(
+            f"{threads:>8} {rates['global']:>14,.0f} {rates['sharded']:>12,.0f} "
+            f"{rates['sharded'] / rates['global']:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Ids minted per second: uuid4 as SpanFactory and the HyperAgent adapter used
+before, RandomIdGenerator, CounterIdGenerator (the default) and
+SeededIdGenerator, single-threaded and from --threads threads. Also the old
+HyperAgent message id (SHA-256 of the body plus a uuid4) for a --body-chars
+message body.
+
+    python benchmarks/bench_ids.py --ids 200000 --threads 8
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import threading
+import time
+import uuid
+from typing import Callable
+
+from llmmas_otel.ids import CounterIdGenerator, RandomIdGenerator, SeededIdGenerator
+
+
+def old_message_id(body: str) -> str:
+    base = f"Planner->Editor:{body}"
+    return f"msg-{hashlib.sha256(base.encode('utf-8')).hexdigest()[:16]}-{uuid.uuid4().hex[:6]}"
+
+
+def ids_per_second(mint: Callable[[], str], n: int, threads: int) -> float:
+    per_thread = n // threads
+    start = threading.Barrier(threads + 1)
+
+    def worker() -> None:
+        start.wait()
+        for _ in range(per_thread):
+            mint()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for t in workers:
+        t.join()
+    return per_thread * threads / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ids", type=int, default=200_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--body-chars", type=int, default=2000)
+    args = parser.parse_args()
+
+    body = "x" * args.body_chars
+    counter, seeded, rnd = CounterIdGenerator(), SeededIdGenerator("bench"), RandomIdGenerator()
+    cases: dict[str, Callable[[], str]] = {
+        "uuid4 (before)": lambda: f"workflow-{uuid.uuid4().hex[:12]}",
+        "random": lambda: rnd.new_id("workflow"),
+        "counter": lambda: counter.new_id("workflow"),
+        "seeded": lambda: seeded.new_id("workflow"),
+        "message id (before)": lambda: old_message_id(body),
+        "message id (counter)": lambda: counter.new_id("msg"),
+    }
+    print(f"{'generator':>22} {'ids/s 1 thread':>15} {f'ids/s {args.threads} threads':>17}")
+    for name, mint in cases.items():
+        single = ids_per_second(mint, args.ids, 1)
+        multi = ids_per_second(mint, args.ids, args.threads)
+        print(f"{name:>22} {single:>15,.0f} {multi:>17,.0f}")
+
+
+if __name__ == "__main__":
+    main()
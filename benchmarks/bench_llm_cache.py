@@ -0,0 +1,78 @@
+"""
+Cost of an llm_call() served by the LLM response cache, against a simulated
+provider call and against the same span with no cache enabled.
+
+Each iteration makes one call per distinct prompt; the first pass fills the
+cache (misses), later passes are hits.
+
+    python benchmarks/bench_llm_cache.py --prompts 200 --latency-ms 50
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+
+from llmmas_otel.llm_cache import disable_llm_cache, enable_llm_cache
+from llmmas_otel.span_factory import SpanFactory
+
+
+class _CollectingProcessor(SpanProcessor):
+    def __init__(self) -> None:
+        self.spans: list = []
+
+    def on_end(self, span) -> None:
+        self.spans.append(span)
+
+
+def call(factory: SpanFactory, prompt: str, latency_s: float) -> str:
+    with factory.llm_call(provider_name="ollama", model="llama2", input_text=prompt, cache=True) as ctx:
+        if ctx.cached_output is not None:
+            return ctx.cached_output
+        time.sleep(latency_s)
+        out = "response to " + prompt[-32:]
+        ctx.store_output(out)
+        return out
+
+
+def time_pass(factory: SpanFactory, prompts: list[str], latency_s: float) -> float:
+    t0 = time.perf_counter()
+    for prompt in prompts:
+        call(factory, prompt, latency_s)
+    return (time.perf_counter() - t0) / len(prompts) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--prompts", type=int, default=200)
+    parser.add_argument("--chars", type=int, default=4_000)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--passes", type=int, default=5)
+    args = parser.parse_args()
+
+    provider = TracerProvider()
+    provider.add_span_processor(_CollectingProcessor())
+    factory = SpanFactory(tracer_provider=provider)
+    prompts = [f"{i:06d} " + "lorem ipsum " * (args.chars // 12) for i in range(args.prompts)]
+    latency_s = args.latency_ms / 1000.0
+
+    uncached_us = time_pass(factory, prompts, latency_s)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = enable_llm_cache(tmp)
+        try:
+            miss_us = time_pass(factory, prompts, latency_s)
+            hit_us = min(time_pass(factory, prompts, latency_s) for _ in range(args.passes))
+        finally:
+            disable_llm_cache()
+
+    print(f"{'':>14} {'us/call':>10}")
+    print(f"{'no cache':>14} {uncached_us:>10.1f}")
+    print(f"{'cache miss':>14} {miss_us:>10.1f}")
+    print(f"{'cache hit':>14} {hit_us:>10.1f}")
+    print(f"hits={cache.hits} misses={cache.misses} entries={len(cache)} bytes={cache.size_bytes}")
+
+
+if __name__ == "__main__":
+    main()
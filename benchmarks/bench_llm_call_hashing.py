@@ -0,0 +1,85 @@
+"""
+Instrumentation overhead of SpanFactory.llm_call() with a large input_text.
+
+Compares a sampled span hashing inline, a sampled span with hashing deferred to
+the exporter, and an unsampled (non-recording) span.
+
+    python benchmarks/bench_llm_call_hashing.py --sizes 1000 100000 500000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF, ALWAYS_ON
+
+from llmmas_otel.export import (
+    DeferredHashSpanExporter,
+    DeferredHashSpanProcessor,
+    disable_deferred_hashing,
+    enable_deferred_hashing,
+)
+from llmmas_otel.span_factory import SpanFactory
+
+
+class _NullExporter(SpanExporter):
+    def export(self, spans):
+        return SpanExportResult.SUCCESS
+
+
+class _CollectingProcessor(SpanProcessor):
+    """Stands in for BatchSpanProcessor: keeps ended spans so export happens off the timed path."""
+
+    def __init__(self) -> None:
+        self.spans: list = []
+
+    def on_end(self, span) -> None:
+        self.spans.append(span)
+
+
+def time_llm_call(factory: SpanFactory, text: str, iterations: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        with factory.llm_call(provider_name="openai", model="gpt-4o", input_text=text):
+            pass
+    return (time.perf_counter() - t0) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 500_000])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'chars':>8} {'sampled us':>11} {'deferred us':>12} {'export us':>10} {'unsampled us':>13}")
+    for size in args.sizes:
+        text = "lorem ipsum " * (size // 12)
+
+        sampled = TracerProvider(sampler=ALWAYS_ON)
+        sampled.add_span_processor(_CollectingProcessor())
+        inline_us = time_llm_call(SpanFactory(tracer_provider=sampled), text, args.iterations)
+
+        collector = _CollectingProcessor()
+        deferred = TracerProvider(sampler=ALWAYS_ON)
+        deferred.add_span_processor(collector)
+        deferred.add_span_processor(DeferredHashSpanProcessor())
+        # Every span stays pending until the export below.
+        enable_deferred_hashing(max_pending_bytes=size * args.iterations)
+        try:
+            deferred_us = time_llm_call(SpanFactory(tracer_provider=deferred), text, args.iterations)
+            t0 = time.perf_counter()
+            DeferredHashSpanExporter(_NullExporter()).export(collector.spans)
+            export_us = (time.perf_counter() - t0) / args.iterations * 1e6
+        finally:
+            disable_deferred_hashing()
+
+        unsampled = TracerProvider(sampler=ALWAYS_OFF)
+        unsampled_us = time_llm_call(SpanFactory(tracer_provider=unsampled), text, args.iterations)
+
+        print(f"{size:>8} {inline_us:>11.2f} {deferred_us:>12.2f} {export_us:>10.2f} {unsampled_us:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Disk savings of dedup_bodies=True on existing JSONL message store files.
+
+Each file is replayed through DedupBodyWriter (as enable_message_store would
+set it up) and the record + blob file sizes are compared with the original.
+
+    python benchmarks/bench_message_dedup.py "out/demo for all samples"
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from llmmas_otel.store import DedupBodyWriter, JSONLWriter, read_messages
+from llmmas_otel.store.blobs import blob_path_for
+
+
+def dedup_file(src: Path, dst: Path, cache_size: int) -> tuple[int, int]:
+    writer = DedupBodyWriter(JSONLWriter(str(dst)), JSONLWriter(blob_path_for(str(dst))), cache_size=cache_size)
+    records = []
+    with open(src, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                records.append(record)
+                writer.write(record)
+    writer.close()
+
+    assert list(read_messages(str(dst))) == records, f"round trip mismatch for {src}"
+    blob_path = blob_path_for(str(dst))
+    blob_size = os.path.getsize(blob_path) if os.path.exists(blob_path) else 0
+    return os.path.getsize(dst), blob_size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory")
+    parser.add_argument("--cache-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    files = sorted(Path(args.directory).glob("messages_*.jsonl"))
+    total_before = total_after = 0
+    with tempfile.TemporaryDirectory() as td:
+        print(f"{'file':<36} {'before':>10} {'after':>10} {'saved':>7}")
+        for src in files:
+            records_size, blob_size = dedup_file(src, Path(td) / src.name, args.cache_size)
+            before = src.stat().st_size
+            after = records_size + blob_size
+            total_before += before
+            total_after += after
+            print(f"{src.name:<36} {before:>10,} {after:>10,} {1 - after / before:>6.1%}")
+
+    if total_before:
+        print(f"{'total':<36} {total_before:>10,} {total_after:>10,} {1 - total_after / total_before:>6.1%}")
+
+
+if __name__ == "__main__":
+    main()
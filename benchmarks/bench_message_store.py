@@ -0,0 +1,60 @@
+"""
+Records/second of the message store: per-record open (default) vs buffered writer.
+
+    python benchmarks/bench_message_store.py --records 20000 --body-chars 2000
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from llmmas_otel import message_store
+
+
+def _run(path: Path, *, records: int, body: str, buffered: bool) -> tuple[float, float]:
+    message_store.enable_message_store(str(path), buffered=buffered)
+    t0 = time.perf_counter()
+    with message_store.session_context("bench-session"):
+        with message_store.workflow_context(workflow_id="wf-1", name="coding", order=1):
+            for i in range(records):
+                message_store.write_message(
+                    direction="send",
+                    message_id=f"msg-{i}",
+                    sha256="0" * 64,
+                    body=body,
+                    source_agent_id="Planner",
+                    target_agent_id="Coder",
+                    edge_id="Planner->Coder",
+                    channel="autogen",
+                )
+    hot_path_s = time.perf_counter() - t0
+    message_store.disable_message_store()
+    total_s = time.perf_counter() - t0
+    return hot_path_s, total_s
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--body-chars", type=int, default=2000)
+    args = parser.parse_args()
+
+    body = "x" * args.body_chars
+    with tempfile.TemporaryDirectory() as td:
+        for label, buffered in (("per-record open", False), ("buffered", True)):
+            hot_s, total_s = _run(
+                Path(td) / f"{label.replace(' ', '_')}.jsonl",
+                records=args.records,
+                body=body,
+                buffered=buffered,
+            )
+            print(
+                f"{label:>16}: {args.records / hot_s:>10.0f} records/s on the caller thread, "
+                f"{args.records / total_s:>10.0f} records/s including final flush"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+SpecFaultEngine.decide() cost when one fault targets many edges: N specs with
+an exact edge_id each vs a single spec with {in: [...]} vs a single spec with
+{glob: "*->Editor"}, with and without the spec index.
+
+    python benchmarks/bench_selector_predicates.py --edges 10 100 1000 --calls 50000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from llmmas_otel.injection import FaultSpec, HookContext, HookType, SpecFaultEngine
+
+ACTION = {"type": "a2a.delay", "params": {"delay_ms": 0}}
+
+
+def specs_for(kind: str, edges: list[str]) -> list[FaultSpec]:
+    if kind == "exact":
+        selectors = [{"edge_id": e} for e in edges]
+    elif kind == "in":
+        selectors = [{"edge_id": {"in": edges}}]
+    else:
+        selectors = [{"edge_id": {"glob": "*->Editor"}}]
+    return [
+        FaultSpec.from_dict({"id": f"F{i}", "hook": "a2a_send", "selector": sel, "action": ACTION})
+        for i, sel in enumerate(selectors)
+    ]
+
+
+def run(engine: SpecFaultEngine, contexts: list[HookContext], calls: int) -> float:
+    decide = engine.decide
+    n = len(contexts)
+    t0 = time.perf_counter()
+    for i in range(calls):
+        decide(contexts[i % n])
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--edges", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--calls", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"{'edges':>6} {'selector':>8} {'indexed us/call':>16} {'linear us/call':>15}")
+    for n in args.edges:
+        edges = [f"Agent{i}->Editor" for i in range(n)]
+        # Half the traffic hits a faulted edge, half goes elsewhere.
+        contexts = [
+            HookContext(hook_type=HookType.A2A_SEND, session_id="S", edge_id=e)
+            for i in range(64)
+            for e in (edges[i * 7919 % n], f"Agent{i}->Planner")
+        ]
+        for kind in ("exact", "in", "glob"):
+            specs = specs_for(kind, edges)
+            timings = []
+            for indexed in (True, False):
+                engine = SpecFaultEngine(specs=specs, indexed=indexed)
+                timings.append(run(engine, contexts, args.calls) / args.calls * 1e6)
+            print(f"{n:>6} {kind:>8} {timings[0]:>16.2f} {timings[1]:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
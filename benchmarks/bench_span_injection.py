@@ -0,0 +1,95 @@
+"""
+SpanFactory throughput (spans/s) per method with fault injection disabled,
+enabled with no matching spec, and enabled with a matching spec.
+
+    python benchmarks/bench_span_injection.py --iterations 20000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+from opentelemetry.sdk.trace import TracerProvider
+
+from llmmas_otel.injection import (
+    FaultSpec,
+    SpecFaultEngine,
+    disable_fault_injection,
+    enable_fault_injection,
+)
+from llmmas_otel.span_factory import SpanFactory
+
+# PASS-equivalent actions so a matching spec takes the full decision path without
+# sleeping or raising: a zero delay for a2a, a mutation that keeps the body for receive.
+MATCHING_SPECS = [
+    {"id": "SEND", "hook": "a2a_send", "selector": {"edge_id": "A->B"},
+     "action": {"type": "a2a.delay", "params": {"delay_ms": 0}}},
+    {"id": "RECV", "hook": "a2a_receive", "selector": {"edge_id": "A->B"},
+     "action": {"type": "a2a.truncate", "params": {"max_chars": 1000}}},
+    {"id": "TOOL", "hook": "tool_call", "selector": {"tool_name": "pytest"},
+     "action": {"type": "tool.delay", "params": {"delay_ms": 0}}},
+    {"id": "LLM", "hook": "llm_call", "selector": {"agent_id": "Planner"},
+     "action": {"type": "llm.delay", "params": {"delay_ms": 0}}},
+]
+
+
+def _no_match(raw: dict) -> dict:
+    return {**raw, "id": raw["id"] + "_OTHER", "selector": {"edge_id": "X->Y", "tool_name": "other", "agent_id": "Other"}}
+
+
+def span_methods(factory: SpanFactory) -> dict[str, Callable[[], object]]:
+    return {
+        "a2a_send": lambda: factory.a2a_send(
+            source_agent_id="A", target_agent_id="B", edge_id="A->B", message_id="m1", message_body="hello"
+        ),
+        "a2a_receive": lambda: factory.a2a_receive(
+            source_agent_id="A", target_agent_id="B", edge_id="A->B", message_id="m1", message_body="hello"
+        ),
+        "environment_action": lambda: factory.environment_action(name="pytest", input_text="pytest -q"),
+        "tool_call": lambda: factory.tool_call(tool_name="pytest", tool_args="pytest -q"),
+        "llm_call": lambda: factory.llm_call(
+            provider_name="openai", model="gpt-4o", input_text="plan", agent_id="Planner"
+        ),
+    }
+
+
+def spans_per_second(open_span: Callable[[], object], iterations: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        with open_span():  # type: ignore[attr-defined]
+            pass
+    return iterations / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    factory = SpanFactory(tracer_provider=TracerProvider())
+    modes: dict[str, Callable[[], None]] = {
+        "disabled": disable_fault_injection,
+        "no-match": lambda: enable_fault_injection(
+            SpecFaultEngine(specs=[FaultSpec.from_dict(_no_match(r)) for r in MATCHING_SPECS])
+        ),
+        # max_times is unset, so every call keeps matching.
+        "matching": lambda: enable_fault_injection(
+            SpecFaultEngine(specs=[FaultSpec.from_dict(r) for r in MATCHING_SPECS])
+        ),
+    }
+
+    print(f"{'method':>20} " + " ".join(f"{m + ' /s':>14}" for m in modes))
+    try:
+        for name, open_span in span_methods(factory).items():
+            row = []
+            for enable in modes.values():
+                enable()
+                row.append(spans_per_second(open_span, args.iterations))
+            print(f"{name:>20} " + " ".join(f"{r:>14,.0f}" for r in row))
+    finally:
+        disable_fault_injection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Overhead of SpanFactory metrics on llm_call, and of pre-bound instruments
+against building the attribute dict on every measurement.
+
+Spans are unsampled, the setting metrics are meant for: traces sampled away,
+aggregates still exact.
+
+    python benchmarks/bench_span_metrics.py --iterations 200000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF
+
+from llmmas_otel import semconv
+from llmmas_otel.metrics import disable_metrics, enable_metrics
+from llmmas_otel.span_factory import SpanFactory
+
+MODELS = ("llama2", "mistral", "qwen2.5")
+
+
+def time_llm_calls(factory: SpanFactory, iterations: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(iterations):
+        with factory.llm_call(provider_name="ollama", model=MODELS[i % 3], input_text="plan"):
+            pass
+    return (time.perf_counter() - t0) / iterations * 1e6
+
+
+def time_records(record, iterations: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(iterations):
+        record(0.1, MODELS[i % 3])
+    return (time.perf_counter() - t0) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200_000)
+    args = parser.parse_args()
+
+    factory = SpanFactory(tracer_provider=TracerProvider(sampler=ALWAYS_OFF))
+    off_us = time_llm_calls(factory, args.iterations)
+    metrics = enable_metrics(MeterProvider(metric_readers=[InMemoryMetricReader()]))
+    try:
+        on_us = time_llm_calls(factory, args.iterations)
+    finally:
+        disable_metrics()
+
+    histogram = MeterProvider(metric_readers=[InMemoryMetricReader()]).get_meter("bench").create_histogram("d")
+
+    def per_call_dict(value: float, model: str) -> None:
+        histogram.record(
+            value,
+            attributes={
+                semconv.ATTR_GEN_AI_PROVIDER_NAME: "ollama",
+                semconv.ATTR_GEN_AI_REQUEST_MODEL: model,
+                semconv.ATTR_GEN_AI_OPERATION_NAME: semconv.GEN_AI_OPERATION_INFERENCE,
+            },
+        )
+
+    dict_us = time_records(per_call_dict, args.iterations)
+    bound_us = time_records(
+        lambda value, model: metrics.llm_call(value, "ollama", model, semconv.GEN_AI_OPERATION_INFERENCE),
+        args.iterations,
+    )
+
+    print(f"{'llm_call, metrics off':>28} {off_us:>8.2f} us")
+    print(f"{'llm_call, metrics on':>28} {on_us:>8.2f} us")
+    print(f"{'record, dict per call':>28} {dict_us:>8.2f} us")
+    print(f"{'record, pre-bound':>28} {bound_us:>8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Inherited attribute resolution (segment and agent of every span): a parent
+walk per span and key, as eval_goal_a.py did, vs SpanTreeIndex.
+
+    python benchmarks/bench_span_tree.py --spans 200000 --depth 50
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from llmmas_otel import semconv
+from llmmas_otel.analysis import SpanTreeIndex
+
+KEYS = (semconv.ATTR_SEGMENT_NAME, semconv.ATTR_AGENT_ID)
+
+
+def synthetic_spans(n: int, depth: int, seed: int = 0) -> list[dict]:
+    """Chains of `depth` spans below a session root; segment and agent set near the top."""
+    rng = random.Random(seed)
+    spans = [{"span_id": "0", "parent_span_id": None, "attributes": {semconv.ATTR_SESSION_ID: "S"}}]
+    for i in range(1, n):
+        level = i % depth
+        parent = "0" if level == 0 else str(i - 1)
+        attrs = {}
+        if level == 1:
+            attrs[semconv.ATTR_SEGMENT_NAME] = rng.choice(["planning", "coding"])
+        elif level == 2:
+            attrs[semconv.ATTR_AGENT_ID] = rng.choice(["Planner", "Coder"])
+        spans.append({"span_id": str(i), "parent_span_id": parent, "attributes": attrs})
+    rng.shuffle(spans)
+    return spans
+
+
+def parent_walk(spans: list[dict]) -> list:
+    by_id = {s["span_id"]: s for s in spans}
+    out = []
+    for span in spans:
+        for key in KEYS:
+            cur, seen, value = span, set(), None
+            while cur is not None:
+                attrs = cur.get("attributes") or {}
+                if key in attrs:
+                    value = attrs[key]
+                    break
+                pid = cur.get("parent_span_id")
+                if not pid or pid in seen:
+                    break
+                seen.add(pid)
+                cur = by_id.get(pid)
+            out.append(value)
+    return out
+
+
+def tree_index(spans: list[dict]) -> list:
+    tree = SpanTreeIndex.from_spans(spans, keys=KEYS)
+    return [tree.get(span["span_id"], key) for span in spans for key in KEYS]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--spans", type=int, default=200_000)
+    parser.add_argument("--depth", type=int, default=50)
+    args = parser.parse_args()
+
+    spans = synthetic_spans(args.spans, args.depth)
+    results = {}
+    for name, fn in (("parent walk", parent_walk), ("SpanTreeIndex", tree_index)):
+        t0 = time.perf_counter()
+        results[name] = fn(spans)
+        elapsed = time.perf_counter() - t0
+        print(f"{name:>14}: {elapsed:7.2f} s  ({args.spans / elapsed:,.0f} spans/s)")
+    assert results["parent walk"] == results["SpanTreeIndex"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+SpecFaultEngine.decide() latency vs spec count, linear scan vs indexed dispatch,
+and ReplayFaultEngine answering the same calls from a recorded decision log.
+
+    python benchmarks/bench_spec_engine.py --counts 10 100 300 1000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from llmmas_otel.injection import (
+    FaultEngine,
+    FaultSpec,
+    HookContext,
+    HookType,
+    RecordingFaultEngine,
+    ReplayFaultEngine,
+    SpecFaultEngine,
+)
+
+
+def make_specs(n: int) -> list[FaultSpec]:
+    """A generated campaign: one spec per concrete edge / tool / agent, spread over hooks."""
+    specs: list[FaultSpec] = []
+    for i in range(n):
+        kind = i % 4
+        if kind == 0:
+            raw = {"hook": "a2a_send", "selector": {"edge_id": f"Agent{i}->Agent{i + 1}"}, "action": {"type": "a2a.drop"}}
+        elif kind == 1:
+            raw = {"hook": "a2a_receive", "selector": {"edge_id": f"Agent{i}->Agent{i + 1}", "phase_name": "coding"}, "action": {"type": "a2a.drop"}}
+        elif kind == 2:
+            raw = {"hook": "tool_call", "selector": {"tool_name": f"tool{i}"}, "action": {"type": "tool.timeout"}}
+        else:
+            raw = {"hook": "llm_call", "selector": {"agent_id": f"Agent{i}", "phase_name": "planning"}, "action": {"type": "llm.timeout"}}
+        specs.append(FaultSpec.from_dict({"id": f"F{i}", **raw}))
+    return specs
+
+
+CONTEXTS = [
+    HookContext(hook_type=HookType.A2A_SEND, session_id="S1", phase_name="coding", edge_id="Planner->Coder",
+                source_agent_id="Planner", target_agent_id="Coder", agent_id="Planner"),
+    HookContext(hook_type=HookType.TOOL_CALL, session_id="S1", phase_name="coding", tool_name="pytest"),
+    HookContext(hook_type=HookType.LLM_CALL, session_id="S1", phase_name="planning", agent_id="Planner"),
+]
+
+
+def time_decide(engine: FaultEngine, iterations: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        for ctx in CONTEXTS:
+            engine.decide(ctx, payload="hello")
+    return (time.perf_counter() - t0) / (iterations * len(CONTEXTS)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 100, 300, 1000])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'specs':>6} {'linear us':>10} {'indexed us':>11} {'speedup':>8} {'replay us':>10}")
+    for n in args.counts:
+        specs = make_specs(n)
+        linear = time_decide(SpecFaultEngine(specs=specs, indexed=False), args.iterations)
+        indexed = time_decide(SpecFaultEngine(specs=specs), args.iterations)
+        with tempfile.TemporaryDirectory() as tmp:
+            log = os.path.join(tmp, "decisions.jsonl")
+            with RecordingFaultEngine(SpecFaultEngine(specs=specs), log) as recorder:
+                time_decide(recorder, args.iterations)
+            replay = time_decide(ReplayFaultEngine.from_file(log), args.iterations)
+        print(f"{n:>6} {linear:>10.2f} {indexed:>11.2f} {linear / indexed:>7.1f}x {replay:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
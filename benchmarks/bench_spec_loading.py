@@ -0,0 +1,74 @@
+"""
+Worker start-up cost of load_fault_specs() for a generated campaign file:
+yaml.safe_load (pure-Python loader) + FaultSpec.from_dict as before, the
+libyaml CSafeLoader + from_dict, and a hit in the compiled-spec cache.
+
+    python benchmarks/bench_spec_loading.py --specs 5000 --rounds 5
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from llmmas_otel.injection import load_fault_specs, parse_fault_specs
+
+
+def write_campaign(path: Path, n: int) -> None:
+    faults = []
+    for i in range(n):
+        kind = i % 4
+        if kind == 0:
+            raw = {"hook": "a2a_send", "selector": {"edge_id": f"Agent{i}->Agent{i + 1}"}, "action": {"type": "a2a.drop"}}
+        elif kind == 1:
+            raw = {"hook": "a2a_receive", "selector": {"edge_id": {"glob": f"Agent{i}->*"}, "phase_name": "coding"}, "action": {"type": "a2a.truncate", "params": {"max_chars": 80}}}
+        elif kind == 2:
+            raw = {"hook": "tool_call", "selector": {"tool_name": {"in": [f"tool{i}", f"tool{i + 1}"]}}, "action": {"type": "tool.timeout"}, "limits": {"max_times": 2}}
+        else:
+            raw = {"hook": "llm_call", "selector": {"agent_id": f"Agent{i}", "step_index": {"min": 1, "max": 5}}, "action": {"type": "llm.delay", "params": {"delay_ms": 50}}, "limits": {"probability": 0.5}}
+        faults.append({"id": f"F{i}", **raw})
+    path.write_text(yaml.safe_dump({"faults": faults}, sort_keys=False), encoding="utf-8")
+
+
+def best_of(rounds: int, fn) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--specs", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "campaign.yaml"
+        cache_dir = Path(tmp) / "cache"
+        write_campaign(path, args.specs)
+        print(f"{args.specs} specs, {path.stat().st_size / 1024:.0f} KiB of YAML")
+
+        def pure_python() -> None:
+            parse_fault_specs(yaml.safe_load(path.read_text(encoding="utf-8")))
+
+        load_fault_specs(str(path), cache_dir=cache_dir)  # populate the cache
+        cases = [
+            ("safe_load + from_dict", pure_python),
+            ("CSafeLoader + from_dict", lambda: load_fault_specs(str(path), cache_dir=None)),
+            ("cache hit", lambda: load_fault_specs(str(path), cache_dir=cache_dir)),
+        ]
+        baseline = None
+        for name, fn in cases:
+            seconds = best_of(args.rounds, fn)
+            baseline = baseline or seconds
+            print(f"{name:>24} {seconds * 1e3:>9.1f} ms {baseline / seconds:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Per-session trace analysis on a synthetic run: streaming (SessionAnalyzer,
+summaries computed as spans end) vs batch (all spans kept in memory, converted
+with spans_to_json and analysed at the end, as eval_goal_a.py --analysis batch).
+
+Each mode runs in its own process so peak RSS is measured independently. The
+batch mode keeps every span, so it defaults to a smaller run. Streaming memory
+grows only with the retained per-session summaries, not with the spans.
+
+    python benchmarks/bench_streaming_analysis.py --spans 1000000 --batch-spans 100000
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from llmmas_otel import semconv
+from llmmas_otel.analysis import SessionAnalyzer
+from llmmas_otel.span_factory import SpanFactory
+
+SPANS_PER_SESSION = 10
+
+
+def run_session(factory: SpanFactory, i: int) -> None:
+    with factory.session(session_id=f"bench::{i}"):
+        with factory.segment(name="planning"):
+            with factory.agent_step(agent_id="Planner", step_index=0):
+                with factory.llm_call(provider_name="p", model="m", input_text="plan") as ctx:
+                    ctx.span.set_attribute(semconv.ATTR_LLM_OUTPUT_SHA256, "a" * 64)
+                with factory.a2a_send(
+                    source_agent_id="Planner",
+                    target_agent_id="Coder",
+                    edge_id="Planner->Coder",
+                    message_id=f"m{i}",
+                    message_body="the plan",
+                ):
+                    pass
+        with factory.segment(name="coding"):
+            with factory.agent_step(agent_id="Coder", step_index=1):
+                with factory.llm_call(provider_name="p", model="m", input_text="code") as ctx:
+                    ctx.span.set_attribute(semconv.ATTR_LLM_OUTPUT_SHA256, "b" * 64)
+                with factory.tool_call(tool_name="pytest", tool_args="pytest -q"):
+                    pass
+                with factory.llm_call(provider_name="p", model="m", input_text="fix") as ctx:
+                    ctx.span.set_attribute(semconv.ATTR_FAULT_INJECTED, True)
+                    ctx.span.add_event("fault.applied", {"delay_ms": 10})
+
+
+def _load_eval():
+    path = Path(__file__).resolve().parents[1] / "examples" / "eval_goal_a.py"
+    spec = importlib.util.spec_from_file_location("eval_goal_a", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def worker(mode: str, spans: int) -> dict:
+    provider = TracerProvider()
+    if mode == "streaming":
+        analyzer = SessionAnalyzer()
+        provider.add_span_processor(analyzer)
+    else:
+        eval_goal_a = _load_eval()
+        exporter = InMemorySpanExporter()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+    factory = SpanFactory(tracer_provider=provider)
+
+    sessions = spans // SPANS_PER_SESSION
+    t0 = time.perf_counter()
+    for i in range(sessions):
+        run_session(factory, i)
+    if mode == "streaming":
+        per_session = analyzer.sessions()
+    else:
+        per_session = eval_goal_a.analyze_batch(eval_goal_a.spans_to_json(exporter.get_finished_spans()))
+    elapsed = time.perf_counter() - t0
+
+    assert len(per_session) == sessions
+    return {
+        "spans": sessions * SPANS_PER_SESSION,
+        "seconds": elapsed,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--spans", type=int, default=1_000_000)
+    parser.add_argument("--batch-spans", type=int, default=100_000, help="0 to skip the batch mode")
+    parser.add_argument("--worker", choices=("streaming", "batch"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args.worker, args.spans)))
+        return
+
+    runs = [("streaming", args.batch_spans), ("batch", args.batch_spans), ("streaming", args.spans)]
+    print(f"{'mode':>10} {'spans':>10} {'seconds':>9} {'spans/s':>9} {'peak RSS MB':>12}")
+    for mode, spans in runs:
+        if spans <= 0:
+            continue
+        out = subprocess.run(
+            [sys.executable, __file__, "--worker", mode, "--spans", str(spans)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        r = json.loads(out.strip().splitlines()[-1])
+        print(f"{mode:>10} {r['spans']:>10,} {r['seconds']:>9.1f} {r['spans'] / r['seconds']:>9,.0f} {r['peak_rss_mb']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Loading a large trace file: json.load of the whole document vs
+load_span_table (incremental parse into a columnar SpanTable).
+
+The input is a copy of an eval_goal_a trace file from out/ repeated with fresh
+trace ids until it holds --spans spans. Each loader runs in its own process so
+peak RSS is measured independently.
+
+    python benchmarks/bench_trace_loader.py --spans 500000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from llmmas_otel.analysis import load_span_table
+
+DEFAULT_SOURCE = Path(__file__).resolve().parents[1] / "out" / "demo for all samples" / "traces_baseline_r01.json"
+
+
+def build_input(source: Path, spans: int, dst: str) -> int:
+    template = json.loads(source.read_text(encoding="utf-8"))["spans"]
+    written = 0
+    with open(dst, "w", encoding="utf-8") as f:
+        f.write('{"spans": [')
+        copy = 0
+        while written < spans:
+            copy += 1
+            for span in template:
+                if written == spans:
+                    break
+                span = {**span, "trace_id": f"{copy:08x}{span['trace_id'][8:]}"}
+                f.write(("," if written else "") + "\n" + json.dumps(span))
+                written += 1
+        f.write("\n]}")
+    return written
+
+
+def worker(mode: str, path: str) -> dict:
+    t0 = time.perf_counter()
+    if mode == "json.load":
+        with open(path, "r", encoding="utf-8") as f:
+            n = len(json.load(f)["spans"])
+    else:
+        n = len(load_span_table(path))
+    return {
+        "spans": n,
+        "seconds": time.perf_counter() - t0,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--spans", type=int, default=500_000)
+    parser.add_argument("--source", type=Path, default=DEFAULT_SOURCE)
+    parser.add_argument("--worker", choices=("json.load", "load_span_table"), help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args.worker, args.path)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "traces.json")
+        n = build_input(args.source, args.spans, path)
+        print(f"{n:,} spans, {os.path.getsize(path) / 1e6:,.0f} MB")
+        print(f"{'loader':>16} {'seconds':>9} {'spans/s':>10} {'peak RSS MB':>12}")
+        for mode in ("json.load", "load_span_table"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--worker", mode, "--path", path],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            r = json.loads(out.strip().splitlines()[-1])
+            print(f"{mode:>16} {r['seconds']:>9.1f} {r['spans'] / r['seconds']:>10,.0f} {r['peak_rss_mb']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Session metrics and quartile statistics over the eval_goal_a trace files in
+out/: the previous dict-based path (json.load, group spans by trace, per-trace
+compute_metrics, one pure-Python median_iqr per session and metric) vs the
+columnar path (load_span_table, session_metrics, grouped_median_iqr).
+
+Both paths must produce identical numbers; the benchmark checks this.
+
+    python benchmarks/bench_vectorized_metrics.py --rounds 5 --copies 20
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from llmmas_otel.analysis import load_span_table
+from llmmas_otel.analysis.vectorized import grouped_median_iqr, session_metrics
+
+OUT = Path(__file__).resolve().parents[1] / "out"
+METRICS = ("session_ms", "injected_delay_ms", "llm_call_count", "llm_total_ms")
+
+
+# ---- dict-based path (as eval_goal_a.py computed it before) ----
+
+
+def dict_compute_metrics(trace_spans: list[dict]) -> Optional[tuple[str, dict]]:
+    sess = next((s for s in trace_spans if s["name"] == "llmmas.session"), None)
+    if sess is None:
+        return None
+    sid = (sess.get("attributes") or {}).get("llmmas.session.id")
+    if not isinstance(sid, str):
+        return None
+    injected = 0.0
+    for s in trace_spans:
+        for e in s.get("events") or []:
+            if e.get("name") == "fault.applied":
+                dm = (e.get("attributes") or {}).get("delay_ms")
+                if isinstance(dm, (int, float)):
+                    injected += float(dm)
+    llm = [s for s in trace_spans if (s.get("attributes") or {}).get("gen_ai.operation.name") == "inference"]
+    return sid, {
+        "session_ms": float((sess["end_time_unix_nano"] - sess["start_time_unix_nano"]) / 1e6),
+        "injected_delay_ms": float(injected),
+        "llm_call_count": int(len(llm)),
+        "llm_total_ms": float(sum((s["end_time_unix_nano"] - s["start_time_unix_nano"]) / 1e6 for s in llm)),
+    }
+
+
+def dict_percentile(sorted_vals: list[float], p: float) -> float:
+    if not sorted_vals:
+        return float("nan")
+    if len(sorted_vals) == 1:
+        return float(sorted_vals[0])
+    k = (len(sorted_vals) - 1) * p
+    f = int(k)
+    c = min(f + 1, len(sorted_vals) - 1)
+    if f == c:
+        return float(sorted_vals[f])
+    return float(sorted_vals[f] * (c - k) + sorted_vals[c] * (k - f))
+
+
+def dict_median_iqr(vals: list[float]) -> dict:
+    s = sorted(float(x) for x in vals)
+    q1, med, q3 = (dict_percentile(s, p) for p in (0.25, 0.5, 0.75))
+    return {"median": med, "q1": q1, "q3": q3, "iqr": q3 - q1, "n": len(s)}
+
+
+def dict_load(paths: list[str]) -> list[dict[str, list[dict]]]:
+    runs = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            spans = json.load(f)["spans"]
+        by_trace: dict[str, list[dict]] = {}
+        for sp in spans:
+            by_trace.setdefault(sp["trace_id"], []).append(sp)
+        runs.append(by_trace)
+    return runs
+
+
+def dict_metrics(runs: list[dict[str, list[dict]]]) -> list[dict[str, dict]]:
+    return [dict(m for m in map(dict_compute_metrics, by_trace.values()) if m is not None) for by_trace in runs]
+
+
+def dict_stats(per_run: list[dict[str, dict]]) -> dict[str, Any]:
+    stats = {}
+    for key in METRICS:
+        values: dict[str, list[float]] = {}
+        for metrics in per_run:
+            for sid, m in metrics.items():
+                values.setdefault(sid, []).append(m[key])
+        stats[key] = {sid: dict_median_iqr(v) for sid, v in values.items()}
+    return stats
+
+
+# ---- columnar path ----
+
+
+def columnar_load(paths: list[str]) -> list:
+    return [load_span_table(path) for path in paths]
+
+
+def columnar_metrics(tables: list) -> list[dict[str, dict]]:
+    return [session_metrics(table) for table in tables]
+
+
+def columnar_stats(per_run: list[dict[str, dict]]) -> dict[str, Any]:
+    groups = [sid for metrics in per_run for sid in metrics]
+    return {
+        key: grouped_median_iqr(groups, [m[key] for metrics in per_run for m in metrics.values()])
+        for key in METRICS
+    }
+
+
+def best_of(rounds: int, fn, arg) -> tuple[float, Any]:
+    best, out = float("inf"), None
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        out = fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--glob", default=str(OUT / "**" / "traces_*.json"))
+    parser.add_argument("--copies", type=int, default=1, help="treat every file as this many repeats")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(args.glob, recursive=True)) * args.copies
+    if not paths:
+        raise SystemExit(f"no trace files match {args.glob}")
+    print(f"{len(paths)} trace files")
+    print(f"{'path':>10} {'load ms':>10} {'metrics ms':>11} {'stats ms':>10}")
+    results = {}
+    for name, load, metrics, stats in (
+        ("dict", dict_load, dict_metrics, dict_stats),
+        ("columnar", columnar_load, columnar_metrics, columnar_stats),
+    ):
+        load_s, loaded = best_of(args.rounds, load, paths)
+        metrics_s, per_run = best_of(args.rounds, metrics, loaded)
+        stats_s, results[name] = best_of(args.rounds, stats, per_run)
+        print(f"{name:>10} {load_s * 1e3:>10.1f} {metrics_s * 1e3:>11.2f} {stats_s * 1e3:>10.2f}")
+    assert results["dict"] == results["columnar"]
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,14 @@
 import json
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from chatdev.chat_chain import ChatChain
 from camel.typing import ModelType
 
 from llmmas_otel.bootstrap import init_otlp_tracing
-from llmmas_otel.message_store import enable_message_store
+from llmmas_otel.message_store import enable_message_store, flush_message_store
+from llmmas_otel.store import merge_shards
 from llmmas_otel.span_factory import default_span_factory
 
 
@@ -48,22 +50,48 @@ def run_one_task(task, config_name, org_name, model_type):
         chain.post_processing()
 
 
+MESSAGES_PATH = "out/messages.jsonl"
+
+
+def init_worker():
+    # Each worker process gets its own tracer provider and message store shard.
+    init_otlp_tracing(service_name="chatdev-programdev", endpoint="http://localhost:4317", insecure=True)
+    enable_message_store(MESSAGES_PATH, concurrency="process")
+
+
+def run_task_in_worker(task, config_name, org_name):
+    run_one_task(task, config_name, org_name, ModelType.GPT_3_5_TURBO)
+    flush_message_store()
+    return task["project_name"]
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--dataset", type=str, default="programdev_dataset.json")
     parser.add_argument("--limit", type=int, default=3)
     parser.add_argument("--config", type=str, default="Default")
     parser.add_argument("--org", type=str, default="ProgramDevOrg")
+    parser.add_argument("--workers", type=int, default=1, help="run tasks in this many worker processes")
     args = parser.parse_args()
 
+    tasks = json.loads(Path(args.dataset).read_text(encoding="utf-8"))
+    tasks = tasks[: args.limit]
+
+    if args.workers > 1:
+        # Workers write out/messages.shard-<pid>.jsonl; merge them into out/messages.jsonl at the end.
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker) as pool:
+            futures = [pool.submit(run_task_in_worker, t, args.config, args.org) for t in tasks]
+            for future in futures:
+                print(f"done: {future.result()}")
+        merged = merge_shards(MESSAGES_PATH)
+        print(f"merged {merged} message records into {MESSAGES_PATH}")
+        return
+
     # OTel exporter -> Jaeger OTLP (you must run Jaeger container)
     init_otlp_tracing(service_name="chatdev-programdev", endpoint="http://localhost:4317", insecure=True)
 
     # Store full messages to JSONL for later fault injection comparisons
-    enable_message_store("out/messages.jsonl")
-
-    tasks = json.loads(Path(args.dataset).read_text(encoding="utf-8"))
-    tasks = tasks[: args.limit]
+    enable_message_store(MESSAGES_PATH)
 
     for t in tasks:
         run_one_task(t, args.config, args.org, ModelType.GPT_3_5_TURBO)
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import argparse
 import json
+import multiprocessing
 import os
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Optional, Dict, List, Tuple
@@ -17,6 +20,9 @@ from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import SimpleSpanProcessor
 from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
 
+from llmmas_otel.analysis import JSONTracesFileExporter, SessionAnalyzer, load_span_table, span_to_dict
+from llmmas_otel.analysis.vectorized import grouped_median_iqr, median_iqr, session_summaries
+
 
 # -----------------------------
 # Minimal A2A envelope
@@ -103,6 +109,7 @@ def llm_call_with_retry(messages: list[dict[str, str]], *, model: str, max_attem
                 model=model,
                 input_text=input_text,
                 record_input=True,
+                cache=True,
             ) as ctx:
                 dec = default_span_factory.current_llm_call_decision()
                 kind = getattr(getattr(dec, "kind", None), "value", None)
@@ -120,7 +127,11 @@ def llm_call_with_retry(messages: list[dict[str, str]], *, model: str, max_attem
                 if kind == "return":
                     return str(getattr(dec, "return_value", ""))
 
+                if ctx.cached_output is not None:
+                    return ctx.cached_output
+
                 out = ollama_chat_completion(messages, model=model)
+                ctx.store_output(out)
 
                 # record output lightly (hash+preview)
                 try:
@@ -232,195 +243,25 @@ def run_one(task: dict[str, Any], *, model: str, task_index: int) -> str:
 # -----------------------------
 # Trace conversion + indexing
 # -----------------------------
-def _hex_trace_id(tid: int) -> str:
-    return f"{tid:032x}"
-
-
-def _hex_span_id(sid: int) -> str:
-    return f"{sid:016x}"
-
-
 def spans_to_json(spans) -> dict:
-    out = []
-    for s in spans:
-        ctx = s.get_span_context()
-        parent = s.parent.span_id if s.parent is not None else None
-        out.append(
-            {
-                "name": s.name,
-                "trace_id": _hex_trace_id(ctx.trace_id),
-                "span_id": _hex_span_id(ctx.span_id),
-                "parent_span_id": _hex_span_id(parent) if parent is not None else None,
-                "kind": str(s.kind.name),
-                "start_time_unix_nano": int(s.start_time),
-                "end_time_unix_nano": int(s.end_time),
-                "attributes": dict(s.attributes) if s.attributes else {},
-                "events": [
-                    {
-                        "name": e.name,
-                        "timestamp_unix_nano": int(e.timestamp),
-                        "attributes": dict(e.attributes) if e.attributes else {},
-                    }
-                    for e in (s.events or [])
-                ],
-                "status": {
-                    "status_code": str(getattr(s.status, "status_code", "")),
-                    "description": str(getattr(s.status, "description", "")),
-                },
-            }
-        )
-    return {"spans": out}
-
-
-def build_index(spans: list[dict]) -> dict[str, dict]:
-    return {s["span_id"]: s for s in spans}
-
-
-def ancestor_attr(spans_by_id: dict[str, dict], span: dict, key: str) -> Optional[Any]:
-    cur = span
-    seen = set()
-    while cur is not None:
-        attrs = cur.get("attributes") or {}
-        if key in attrs:
-            return attrs[key]
-        pid = cur.get("parent_span_id")
-        if not pid or pid in seen:
-            return None
-        seen.add(pid)
-        cur = spans_by_id.get(pid)
-    return None
-
-
-def session_id_for_trace(spans: list[dict]) -> Optional[str]:
-    for s in spans:
-        if s["name"] == "llmmas.session":
-            sid = (s.get("attributes") or {}).get("llmmas.session.id")
-            return sid if isinstance(sid, str) else None
-    return None
-
-
-def session_span_for_trace(spans: list[dict]) -> Optional[dict]:
-    for s in spans:
-        if s["name"] == "llmmas.session":
-            return s
-    return None
-
-
-def compute_metrics(trace_spans: list[dict]) -> dict:
-    sess = session_span_for_trace(trace_spans)
-    if sess is None:
-        return {}
-    session_ms = (sess["end_time_unix_nano"] - sess["start_time_unix_nano"]) / 1e6
-
-    injected_delay_ms = 0.0
-    for s in trace_spans:
-        for e in s.get("events") or []:
-            if e.get("name") == "fault.applied":
-                dm = (e.get("attributes") or {}).get("delay_ms")
-                if isinstance(dm, (int, float)):
-                    injected_delay_ms += float(dm)
-
-    llm_spans = [s for s in trace_spans if (s.get("attributes") or {}).get("gen_ai.operation.name") == "inference"]
-    llm_count = len(llm_spans)
-    llm_total_ms = sum((s["end_time_unix_nano"] - s["start_time_unix_nano"]) / 1e6 for s in llm_spans)
-
-    return {
-        "session_ms": float(session_ms),
-        "injected_delay_ms": float(injected_delay_ms),
-        "llm_call_count": int(llm_count),
-        "llm_total_ms": float(llm_total_ms),
-    }
-
-
-def extract_injection_points(trace_spans: list[dict]) -> list[dict]:
-    idx = build_index(trace_spans)
-    points = []
-    for s in trace_spans:
-        attrs = s.get("attributes") or {}
-        if attrs.get("llmmas.fault.injected") is not True:
-            continue
-
-        delay_ms = None
-        for e in s.get("events") or []:
-            if e.get("name") == "fault.applied":
-                dm = (e.get("attributes") or {}).get("delay_ms")
-                if isinstance(dm, (int, float)):
-                    delay_ms = float(dm)
-
-        points.append(
-            {
-                "span_name": s.get("name"),
-                "span_kind": s.get("kind"),
-                "fault_type": attrs.get("llmmas.fault.type"),
-                "fault_spec_id": attrs.get("llmmas.fault.spec_id"),
-                "fault_decision": attrs.get("llmmas.fault.decision"),
-                "delay_ms": delay_ms,
-                "phase_name": ancestor_attr(idx, s, "llmmas.segment.name"),
-                "agent_id": ancestor_attr(idx, s, "llmmas.agent.id"),
-            }
-        )
-    return points
-
-
-def extract_fingerprints(trace_spans: list[dict]) -> dict:
-    idx = build_index(trace_spans)
-
-    msg_send: dict[str, str] = {}
-    for s in trace_spans:
-        attrs = s.get("attributes") or {}
-        mid = attrs.get("llmmas.message.id")
-        sha = attrs.get("llmmas.message.sha256")
-        if isinstance(mid, str) and isinstance(sha, str) and s.get("kind") == "PRODUCER":
-            msg_send[mid] = sha
-
-    llm_out: dict[str, list[str]] = {}
-    for s in sorted(trace_spans, key=lambda x: x.get("start_time_unix_nano", 0)):
-        attrs = s.get("attributes") or {}
-        if attrs.get("gen_ai.operation.name") != "inference":
-            continue
-        out_sha = attrs.get("llmmas.llm.output.sha256")
-        if not isinstance(out_sha, str):
-            continue
-        phase = ancestor_attr(idx, s, "llmmas.segment.name") or "unknown_phase"
-        agent = ancestor_attr(idx, s, "llmmas.agent.id") or "unknown_agent"
-        k = f"{phase}:{agent}"
-        llm_out.setdefault(k, []).append(out_sha)
-
-    return {"a2a_send_sha": msg_send, "llm_output_sha_by_phase_agent": llm_out}
+    return {"spans": [span_to_dict(s) for s in spans]}
 
 
 def fingerprints_equal(a: dict, b: dict) -> bool:
     return a == b
 
 
-# -----------------------------
-# Robust stats (median + quartiles)
-# -----------------------------
-def percentile(sorted_vals: list[float], p: float) -> float:
-    """
-    Linear interpolation percentile.
-    p in [0,1].
-    """
-    if not sorted_vals:
-        return float("nan")
-    if len(sorted_vals) == 1:
-        return float(sorted_vals[0])
-    k = (len(sorted_vals) - 1) * p
-    f = int(k)
-    c = min(f + 1, len(sorted_vals) - 1)
-    if f == c:
-        return float(sorted_vals[f])
-    d0 = sorted_vals[f] * (c - k)
-    d1 = sorted_vals[c] * (k - f)
-    return float(d0 + d1)
-
-
-def median_iqr(vals: list[float]) -> dict:
-    s = sorted([float(x) for x in vals])
-    q1 = percentile(s, 0.25)
-    med = percentile(s, 0.50)
-    q3 = percentile(s, 0.75)
-    return {"median": med, "q1": q1, "q3": q3, "iqr": q3 - q1, "n": len(s)}
+def fingerprint_diff(a: dict, b: dict) -> list[str]:
+    """Fingerprint entries that differ, as "<group>[<key>]" (e.g. "a2a_send_sha[msg-0001]")."""
+    changed = []
+    for group in sorted(set(a) | set(b)):
+        ga, gb = a.get(group) or {}, b.get(group) or {}
+        if not isinstance(ga, dict) or not isinstance(gb, dict):
+            if ga != gb:
+                changed.append(group)
+            continue
+        changed.extend(f"{group}[{k}]" for k in sorted(set(ga) | set(gb), key=str) if ga.get(k) != gb.get(k))
+    return changed
 
 
 # -----------------------------
@@ -431,29 +272,69 @@ def write_yaml(path: Path, text: str) -> None:
     path.write_text(text.strip() + "\n", encoding="utf-8")
 
 
+@dataclass
+class StreamingCapture:
+    """Streaming analysis: spans are summarised and written to disk as they end."""
+
+    analyzer: SessionAnalyzer
+    traces: JSONTracesFileExporter
+
+
+def analyze_batch(traces_path: Path) -> dict[str, dict]:
+    # per-trace grouping -> per-session summary, from the trace file written for this run
+    return session_summaries(load_span_table(str(traces_path)))
+
+
 def run_once(
     *,
     label: str,
     run_id: str,
     tasks: list[dict[str, Any]],
     model: str,
-    exporter: InMemorySpanExporter,
+    exporter: InMemorySpanExporter | StreamingCapture,
     out_dir: Path,
     faults_yaml_text: Optional[str],
     seed: str,
+    decisions_mode: Optional[str] = None,
+    decisions_dir: Optional[Path] = None,
+    llm_cache_dir: Optional[Path] = None,
 ) -> dict:
-    exporter.clear()
+    traces_path = out_dir / f"traces_{label}_{run_id}.json"
+    if isinstance(exporter, StreamingCapture):
+        exporter.analyzer.reset()
+        exporter.traces.open(str(traces_path))
+    else:
+        exporter.clear()
 
     from llmmas_otel import enable_fault_injection, disable_fault_injection, enable_message_store
+    from llmmas_otel.ids import SeededIdGenerator, set_id_generator
+    from llmmas_otel.injection import RecordingFaultEngine, ReplayFaultEngine, SpecFaultEngine, load_fault_specs
+    from llmmas_otel.llm_cache import disable_llm_cache, enable_llm_cache, get_llm_cache
 
     disable_fault_injection()
+    if llm_cache_dir is None:
+        disable_llm_cache()
+    elif get_llm_cache() is None:
+        enable_llm_cache(llm_cache_dir)
+    cache = get_llm_cache()
+    cache_counts = (cache.hits, cache.misses) if cache is not None else None
+    # Same workflow/request/artifact ids in every repeat of a scenario, so runs can be diffed span by span.
+    set_id_generator(SeededIdGenerator(f"{seed}:{label}"))
 
     faults_path = None
+    recorder: Optional[RecordingFaultEngine] = None
+    decisions_path = decisions_dir / f"decisions_{label}_{run_id}.jsonl" if decisions_dir else None
     if faults_yaml_text is not None:
         faults_path = out_dir / f"faults_{label}.yaml"
         if not faults_path.exists():
             write_yaml(faults_path, faults_yaml_text)
-        enable_fault_injection(str(faults_path), seed=seed)
+        if decisions_mode == "replay":
+            enable_fault_injection(ReplayFaultEngine.from_file(decisions_path))
+        elif decisions_mode == "record":
+            recorder = RecordingFaultEngine(SpecFaultEngine(specs=load_fault_specs(str(faults_path)), seed=seed), decisions_path)
+            enable_fault_injection(recorder)
+        else:
+            enable_fault_injection(str(faults_path), seed=seed)
 
     enable_message_store(str(out_dir / f"messages_{label}_{run_id}.jsonl"))
 
@@ -461,29 +342,17 @@ def run_once(
         INBOX.clear()
         _ = run_one(t, model=model, task_index=i)
 
-    trace.get_tracer_provider().force_flush()
-    spans = exporter.get_finished_spans()
-    spans_json = spans_to_json(spans)
+    if recorder is not None:
+        recorder.close()
 
-    traces_path = out_dir / f"traces_{label}_{run_id}.json"
-    traces_path.write_text(json.dumps(spans_json, indent=2), encoding="utf-8")
-
-    # per-trace grouping -> per-session summary
-    by_trace: dict[str, list[dict]] = {}
-    for sp in spans_json["spans"]:
-        by_trace.setdefault(sp["trace_id"], []).append(sp)
-
-    per_session: dict[str, dict] = {}
-    for tid, t_spans in by_trace.items():
-        sid = session_id_for_trace(t_spans)
-        if sid is None:
-            continue
-        per_session[sid] = {
-            "trace_id": tid,
-            "metrics": compute_metrics(t_spans),
-            "injection_points": extract_injection_points(t_spans),
-            "fingerprints": extract_fingerprints(t_spans),
-        }
+    trace.get_tracer_provider().force_flush()
+    if isinstance(exporter, StreamingCapture):
+        exporter.traces.close()
+        per_session = exporter.analyzer.sessions()
+    else:
+        spans_json = spans_to_json(exporter.get_finished_spans())
+        traces_path.write_text(json.dumps(spans_json, indent=2), encoding="utf-8")
+        per_session = analyze_batch(traces_path)
 
     return {
         "label": label,
@@ -491,10 +360,135 @@ def run_once(
         "traces_file": str(traces_path),
         "messages_file": str(out_dir / f"messages_{label}_{run_id}.jsonl"),
         "faults_file": str(faults_path) if faults_path else None,
+        "decisions_file": str(decisions_path) if decisions_path and faults_path else None,
+        "llm_cache": (
+            {"hits": cache.hits - cache_counts[0], "misses": cache.misses - cache_counts[1]}
+            if cache is not None and cache_counts is not None
+            else None
+        ),
         "per_session": per_session,
     }
 
 
+# -----------------------------
+# Parallel runner
+# -----------------------------
+_WORKER_EXPORTER: Optional[InMemorySpanExporter | StreamingCapture] = None
+
+
+def install_tracer_provider(analysis: str = "streaming") -> InMemorySpanExporter | StreamingCapture:
+    provider = TracerProvider(resource=Resource.create({"service.name": "llmmas-demo-eval"}))
+    exporter: InMemorySpanExporter | StreamingCapture
+    if analysis == "streaming":
+        exporter = StreamingCapture(analyzer=SessionAnalyzer(), traces=JSONTracesFileExporter())
+        provider.add_span_processor(exporter.analyzer)
+        provider.add_span_processor(SimpleSpanProcessor(exporter.traces))
+    else:
+        exporter = InMemorySpanExporter()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    return exporter
+
+
+def _init_worker(analysis: str) -> None:
+    # One tracer provider per worker process; per-run state is reset in _run_once_in_worker.
+    global _WORKER_EXPORTER
+    _WORKER_EXPORTER = install_tracer_provider(analysis)
+
+
+def _reset_worker_state(exporter: InMemorySpanExporter | StreamingCapture) -> None:
+    """Undo whatever a previous run left behind in a reused worker process."""
+    from llmmas_otel import disable_fault_injection, disable_message_store
+    from llmmas_otel.ids import CounterIdGenerator, set_id_generator
+
+    disable_fault_injection()
+    disable_message_store()
+    set_id_generator(CounterIdGenerator())
+    if isinstance(exporter, StreamingCapture):
+        exporter.traces.close()
+        exporter.analyzer.reset()
+    else:
+        exporter.clear()
+
+
+def _run_once_in_worker(kwargs: dict) -> dict:
+    assert _WORKER_EXPORTER is not None
+    # Workers run one task each on Python 3.11+ (max_tasks_per_child=1), but are
+    # reused on 3.10, so every run starts from a clean slate either way.
+    _reset_worker_state(_WORKER_EXPORTER)
+    return run_once(exporter=_WORKER_EXPORTER, **kwargs)
+
+
+def execute_runs(
+    *,
+    scenarios: dict[str, Optional[str]],
+    repeats: int,
+    tasks: list[dict[str, Any]],
+    model: str,
+    out_dir: Path,
+    seed: str,
+    workers: int,
+    analysis: str = "streaming",
+    decisions_mode: Optional[str] = None,
+    decisions_dir: Optional[Path] = None,
+    llm_cache_dir: Optional[Path] = None,
+) -> dict[str, list[dict]]:
+    """
+    Run every (repeat, scenario) pair and return runs[label] ordered by repeat.
+
+    With workers > 1 the pairs run concurrently in a process pool. Results are
+    placed by (label, repeat), not by completion order, and each run uses the
+    same seed and a fresh fault engine, so the report does not depend on
+    scheduling.
+    """
+    plan = [
+        dict(
+            label=label,
+            run_id=f"r{r:02d}",
+            tasks=tasks,
+            model=model,
+            out_dir=out_dir,
+            faults_yaml_text=yml,
+            seed=seed,
+            decisions_mode=decisions_mode,
+            decisions_dir=decisions_dir,
+            llm_cache_dir=llm_cache_dir,
+        )
+        for r in range(1, repeats + 1)
+        for label, yml in scenarios.items()
+    ]
+    runs: dict[str, list[dict]] = {k: [] for k in scenarios}
+
+    if workers <= 1:
+        exporter = install_tracer_provider(analysis)
+        for i, kwargs in enumerate(plan, start=1):
+            runs[kwargs["label"]].append(run_once(exporter=exporter, **kwargs))
+            if i % len(scenarios) == 0:
+                print(f"Completed repeat {i // len(scenarios)}/{repeats}")
+        return runs
+
+    # Fault files are shared by all repeats of a scenario; write them before any worker starts.
+    for label, yml in scenarios.items():
+        if yml is not None:
+            faults_path = out_dir / f"faults_{label}.yaml"
+            if not faults_path.exists():
+                write_yaml(faults_path, yml)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(analysis,),
+        # max_tasks_per_child is new in Python 3.11; older pools reuse workers.
+        **({"max_tasks_per_child": 1} if sys.version_info >= (3, 11) else {}),
+    ) as pool:
+        futures = [pool.submit(_run_once_in_worker, kwargs) for kwargs in plan]
+        for kwargs, future in zip(plan, futures):
+            runs[kwargs["label"]].append(future.result())
+            print(f"Completed {kwargs['label']} {kwargs['run_id']}")
+    return runs
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--dataset", type=str, default="examples/programdev_dataset.json")
@@ -504,17 +498,41 @@ def main() -> None:
     parser.add_argument("--seed", type=str, default="icst")
     parser.add_argument("--out", type=str, default="out")
     parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1, help="run (scenario, repeat) pairs in this many processes")
+    parser.add_argument(
+        "--analysis",
+        choices=("streaming", "batch"),
+        default="streaming",
+        help="summarise spans as they end (streaming) or from the whole trace file after each run (batch)",
+    )
+    decisions = parser.add_mutually_exclusive_group()
+    decisions.add_argument(
+        "--record-decisions",
+        metavar="DIR",
+        help="write every injected fault decision to DIR/decisions_<scenario>_<run>.jsonl",
+    )
+    decisions.add_argument(
+        "--replay-decisions",
+        metavar="DIR",
+        help="replay the decisions recorded in DIR instead of evaluating the fault specs",
+    )
+    parser.add_argument(
+        "--llm-cache",
+        metavar="DIR",
+        help="serve LLM calls already answered from DIR and record new responses there (offline replays)",
+    )
     args = parser.parse_args()
 
+    decisions_mode: Optional[str] = None
+    decisions_dir: Optional[Path] = None
+    if args.record_decisions:
+        decisions_mode, decisions_dir = "record", Path(args.record_decisions)
+    elif args.replay_decisions:
+        decisions_mode, decisions_dir = "replay", Path(args.replay_decisions)
+
     out_dir = Path(args.out)
     out_dir.mkdir(exist_ok=True)
 
-    # tracer provider with in-memory exporter
-    exporter = InMemorySpanExporter()
-    provider = TracerProvider(resource=Resource.create({"service.name": "llmmas-demo-eval"}))
-    provider.add_span_processor(SimpleSpanProcessor(exporter))
-    trace.set_tracer_provider(provider)
-
     tasks = load_tasks(args.dataset, args.limit)
 
     # Scenario YAMLs (separate, controllable)
@@ -556,23 +574,19 @@ faults:
     }
 
     # Run repeated trials
-    runs: dict[str, list[dict]] = {k: [] for k in scenarios}
-    for r in range(1, args.repeats + 1):
-        run_id = f"r{r:02d}"
-        for label, yml in scenarios.items():
-            runs[label].append(
-                run_once(
-                    label=label,
-                    run_id=run_id,
-                    tasks=tasks,
-                    model=args.model,
-                    exporter=exporter,
-                    out_dir=out_dir,
-                    faults_yaml_text=yml,
-                    seed=args.seed,
-                )
-            )
-        print(f"Completed repeat {r}/{args.repeats}")
+    runs = execute_runs(
+        scenarios=scenarios,
+        repeats=args.repeats,
+        tasks=tasks,
+        model=args.model,
+        out_dir=out_dir,
+        seed=args.seed,
+        workers=args.workers,
+        analysis=args.analysis,
+        decisions_mode=decisions_mode,
+        decisions_dir=decisions_dir,
+        llm_cache_dir=Path(args.llm_cache) if args.llm_cache else None,
+    )
 
     # Aggregate by session_id
     all_session_ids = set()
@@ -580,6 +594,21 @@ faults:
         for run in runs[label]:
             all_session_ids |= set(run["per_session"].keys())
 
+    # Quartiles of each metric per (scenario, session_id), one grouped pass per metric
+    def stats_by_session(label: str, key: str) -> dict[str, dict]:
+        groups, values = [], []
+        for run in runs[label]:
+            for sid, entry in run["per_session"].items():
+                v = entry["metrics"].get(key)
+                if isinstance(v, (int, float)):
+                    groups.append(sid)
+                    values.append(float(v))
+        return grouped_median_iqr(groups, values)
+
+    metric_keys = ("session_ms", "injected_delay_ms", "llm_total_ms", "llm_call_count")
+    stats = {label: {key: stats_by_session(label, key) for key in metric_keys} for label in runs}
+    no_values = median_iqr([])
+
     # Baseline fingerprints for content equality check
     baseline_fps: dict[str, list[dict]] = {}
     for run in runs["baseline"]:
@@ -594,6 +623,19 @@ faults:
             "delay_ms": args.delay_ms,
             "seed": args.seed,
             "repeats": args.repeats,
+            "workers": args.workers,
+            "analysis": args.analysis,
+            "decisions": {"mode": decisions_mode, "dir": str(decisions_dir)} if decisions_mode else None,
+            # Latencies are only comparable across scenarios when every run was served from the cache (misses == 0).
+            "llm_cache": (
+                {
+                    "dir": args.llm_cache,
+                    "hits": sum(run["llm_cache"]["hits"] for lst in runs.values() for run in lst),
+                    "misses": sum(run["llm_cache"]["misses"] for lst in runs.values() for run in lst),
+                }
+                if args.llm_cache
+                else None
+            ),
             "generated_at_unix": time.time(),
         },
         "scenarios": {
@@ -603,13 +645,17 @@ faults:
         },
         "artifacts": {
             "runs": {
-                label: [{"run_id": x["run_id"], "traces": x["traces_file"], "messages": x["messages_file"]} for x in lst]
+                label: [
+                    {"run_id": x["run_id"], "traces": x["traces_file"], "messages": x["messages_file"], "llm_cache": x["llm_cache"]}
+                    for x in lst
+                ]
                 for label, lst in runs.items()
             }
         },
         "results": {},
         "notes": {
-            "matching_rule": "Runs are matched by llmmas.session.id (stable). trace_id differs per run.",
+            "matching_rule": "Runs are matched by llmmas.session.id (stable). trace_id differs per run; "
+            "workflow, request and artifact ids are seeded per scenario and repeat across runs.",
             "goal_a_expectation": "Delay faults should increase session_ms without changing content hashes (temp=0).",
         },
     }
@@ -629,18 +675,9 @@ faults:
         if not baseline_metrics:
             continue
 
-        # helper to pull a list of values
-        def vals(metrics_list: list[dict], key: str) -> list[float]:
-            out = []
-            for m in metrics_list:
-                v = m.get(key)
-                if isinstance(v, (int, float)):
-                    out.append(float(v))
-            return out
-
-        base_session_stats = median_iqr(vals(baseline_metrics, "session_ms"))
-        base_llm_total_stats = median_iqr(vals(baseline_metrics, "llm_total_ms"))
-        base_llm_count_stats = median_iqr(vals(baseline_metrics, "llm_call_count"))
+        base_session_stats = stats["baseline"]["session_ms"].get(sid, no_values)
+        base_llm_total_stats = stats["baseline"]["llm_total_ms"].get(sid, no_values)
+        base_llm_count_stats = stats["baseline"]["llm_call_count"].get(sid, no_values)
 
         report["results"][sid]["baseline"] = {
             "session_ms": base_session_stats,
@@ -653,6 +690,7 @@ faults:
             met_list = []
             injection_points_all = []
             content_changed_flags = []
+            content_changed_keys: set[str] = set()
 
             for run in runs[label]:
                 entry = run["per_session"].get(sid)
@@ -665,14 +703,16 @@ faults:
                 if baseline_fp_list:
                     changed = not fingerprints_equal(baseline_fp_list[0], entry["fingerprints"])
                     content_changed_flags.append(changed)
+                    if changed:
+                        content_changed_keys.update(fingerprint_diff(baseline_fp_list[0], entry["fingerprints"]))
 
             if not met_list:
                 continue
 
-            session_stats = median_iqr(vals(met_list, "session_ms"))
-            inj_delay_stats = median_iqr(vals(met_list, "injected_delay_ms"))
-            llm_total_stats = median_iqr(vals(met_list, "llm_total_ms"))
-            llm_count_stats = median_iqr(vals(met_list, "llm_call_count"))
+            session_stats = stats[label]["session_ms"].get(sid, no_values)
+            inj_delay_stats = stats[label]["injected_delay_ms"].get(sid, no_values)
+            llm_total_stats = stats[label]["llm_total_ms"].get(sid, no_values)
+            llm_count_stats = stats[label]["llm_call_count"].get(sid, no_values)
 
             # per-repeat overhead (faulty - baseline) for session_ms
             overhead_vals = []
@@ -708,6 +748,7 @@ faults:
                 "overhead_ms": overhead_stats,
                 "amplification": amp_stats,
                 "content_change_rate": change_rate,
+                "content_changed_keys": sorted(content_changed_keys),
                 "injection_point_example": rep_ip,
             }
 
@@ -10,7 +10,8 @@ from typing import Any
 
 import urllib.request
 
-from llmmas_otel.bootstrap import init_otlp_tracing
+from llmmas_otel.bootstrap import init_otlp_metrics, init_otlp_tracing
+from llmmas_otel.llm_cache import enable_llm_cache
 from llmmas_otel.message_store import enable_message_store
 from llmmas_otel.span_factory import default_span_factory
 from llmmas_otel.injection.exceptions import (
@@ -151,6 +152,7 @@ def llm_call_with_retry(messages: list[dict[str, str]], *, model: str, max_attem
                 model=model,
                 input_text=input_text,
                 record_input=True,
+                cache=True,
             ) as ctx:
                 # enforce injected decisions (RAISE/RETURN handled by decorator normally, but here we do it explicitly)
                 dec = default_span_factory.current_llm_call_decision()
@@ -170,7 +172,11 @@ def llm_call_with_retry(messages: list[dict[str, str]], *, model: str, max_attem
                     if kind == "return":
                         return str(getattr(dec, "return_value", ""))
 
+                if ctx.cached_output is not None:
+                    return ctx.cached_output
+
                 out = ollama_chat_completion(messages, model=model)
+                ctx.store_output(out)
                 # record output lightly
                 try:
                     from llmmas_otel import semconv
@@ -284,10 +290,16 @@ def main() -> None:
     parser.add_argument("--limit", type=int, default=3)
     parser.add_argument("--model", type=str, default=os.getenv("OLLAMA_MODEL", "llama2"))
     parser.add_argument("--otlp", type=str, default="http://localhost:4317")
+    parser.add_argument("--llm-cache", metavar="DIR", help="serve repeated LLM calls from (and record new ones to) DIR")
+    parser.add_argument("--metrics", action="store_true", help="also export LLM/tool latency and message/fault counts over OTLP")
     args = parser.parse_args()
 
+    if args.llm_cache:
+        enable_llm_cache(args.llm_cache)
+
     # tracing + message store
     init_otlp_tracing(service_name="llmmas-demo-programdev", endpoint=args.otlp, insecure=True)
+    meter_provider = init_otlp_metrics(service_name="llmmas-demo-programdev", endpoint=args.otlp) if args.metrics else None
     Path("out").mkdir(exist_ok=True)
     enable_message_store("out/messages_demo.jsonl")
 
@@ -300,6 +312,9 @@ def main() -> None:
         print("RESULT (Coder):")
         print(result[:800])
 
+    if meter_provider is not None:
+        meter_provider.shutdown()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
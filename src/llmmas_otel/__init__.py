@@ -19,7 +19,9 @@ from .decorators import (
     workflow,
 )
 
-from .message_store import disable_message_store, enable_message_store
+from .message_store import disable_message_store, enable_message_store, flush_message_store
+
+from .export import DeferredHashSpanExporter, DeferredHashSpanProcessor, disable_deferred_hashing, enable_deferred_hashing
 
 from .injection.api import disable as disable_fault_injection
 from .injection.api import enable as enable_fault_injection
@@ -46,6 +48,11 @@ __all__ = [
     "artifact",
     "enable_message_store",
     "disable_message_store",
+    "flush_message_store",
+    "DeferredHashSpanExporter",
+    "DeferredHashSpanProcessor",
+    "enable_deferred_hashing",
+    "disable_deferred_hashing",
     "enable_fault_injection",
     "disable_fault_injection",
     "fault_injection_enabled",
@@ -0,0 +1,15 @@
+from .loader import load_span_table
+from .span_json import JSONTracesFileExporter, span_to_dict
+from .span_tree import SpanTreeIndex
+from .streaming import SessionAnalyzer
+from .table import Column, SpanTable
+
+__all__ = [
+    "SessionAnalyzer",
+    "SpanTreeIndex",
+    "JSONTracesFileExporter",
+    "span_to_dict",
+    "SpanTable",
+    "Column",
+    "load_span_table",
+]
@@ -0,0 +1,411 @@
+"""
+Stream trace files into a SpanTable.
+
+Three layouts are recognised from their top-level key:
+
+- ``{"data": [...]}``: a Jaeger UI / query API export (times in microseconds,
+  tags and logs as key/value lists, span kind in the ``span.kind`` tag);
+- ``{"resourceSpans": [...]}``: OTLP JSON, one request per file or one per
+  line as written by the collector's file exporter;
+- ``{"spans": [...]}``: the trace files written by examples/eval_goal_a.py
+  (see llmmas_otel.analysis.span_json).
+
+The document skeleton is walked incrementally and only one span object at a
+time is decoded into Python values, so memory is bounded by the table, not by
+the size of the file.
+
+    table = load_span_table("jaeger_export/trace.json", "out/traces_baseline_r01.json")
+
+or, for a quick summary of a set of files:
+
+    python -m llmmas_otel.analysis.loader jaeger_export/*.json
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import os
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from typing import IO, Any, Optional, Union
+
+from opentelemetry.trace import SpanKind
+from opentelemetry.trace.status import StatusCode
+
+from .table import DEFAULT_COLUMNS, DEFAULT_EVENT_COLUMNS, SpanTable
+
+PathOrFile = Union[str, "os.PathLike[str]", IO[str]]
+
+_WS = " \t\n\r"
+
+# ---- incremental JSON walking ----
+
+
+class _JSONStream:
+    """Walks a JSON text without decoding all of it; values are decoded one at a time."""
+
+    def __init__(self, f: IO[str], chunk_size: int = 1 << 20) -> None:
+        self._f = f
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        # Read at least as much as is pending, so a value larger than a chunk takes
+        # a logarithmic number of retries.
+        chunk = self._f.read(max(self._chunk_size, len(self._buf) - self._pos))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of input), without consuming it."""
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and buf[pos] in _WS:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch: str) -> None:
+        found = self.peek()
+        if found != ch:
+            raise ValueError(f"expected {ch!r} at offset {self._pos}, found {found!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number that ends the buffer may continue in the next chunk.
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def object_keys(self) -> Iterator[str]:
+        """Yield each key of an object; the caller consumes the value before resuming."""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def array_items(self) -> Iterator[None]:
+        """Yield once per array element; the caller consumes the element before resuming."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield None
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("]")
+            return
+
+    def skip_null(self) -> bool:
+        if self.peek() == "n":
+            self.value()
+            return True
+        return False
+
+
+# ---- format-specific normalisation ----
+
+_JAEGER_KINDS = {
+    "internal": SpanKind.INTERNAL.value,
+    "server": SpanKind.SERVER.value,
+    "client": SpanKind.CLIENT.value,
+    "producer": SpanKind.PRODUCER.value,
+    "consumer": SpanKind.CONSUMER.value,
+}
+# OTLP numbers kinds from 1 (0 is UNSPECIFIED).
+_OTLP_KINDS = {
+    0: SpanKind.INTERNAL.value,
+    1: SpanKind.INTERNAL.value,
+    2: SpanKind.SERVER.value,
+    3: SpanKind.CLIENT.value,
+    4: SpanKind.PRODUCER.value,
+    5: SpanKind.CONSUMER.value,
+    "SPAN_KIND_UNSPECIFIED": SpanKind.INTERNAL.value,
+    "SPAN_KIND_INTERNAL": SpanKind.INTERNAL.value,
+    "SPAN_KIND_SERVER": SpanKind.SERVER.value,
+    "SPAN_KIND_CLIENT": SpanKind.CLIENT.value,
+    "SPAN_KIND_PRODUCER": SpanKind.PRODUCER.value,
+    "SPAN_KIND_CONSUMER": SpanKind.CONSUMER.value,
+}
+_OTLP_STATUS = {
+    0: StatusCode.UNSET.value,
+    1: StatusCode.OK.value,
+    2: StatusCode.ERROR.value,
+    "STATUS_CODE_UNSET": StatusCode.UNSET.value,
+    "STATUS_CODE_OK": StatusCode.OK.value,
+    "STATUS_CODE_ERROR": StatusCode.ERROR.value,
+}
+_KIND_NAMES = {kind.name: kind.value for kind in SpanKind}
+_STATUS_NAMES = {
+    "UNSET": StatusCode.UNSET.value,
+    "OK": StatusCode.OK.value,
+    "ERROR": StatusCode.ERROR.value,
+}
+
+
+def _hex_id(value: Optional[str]) -> int:
+    if not value:
+        return 0
+    return int(value, 16)
+
+
+def _trace_hex(value: str) -> str:
+    return value.lower().rjust(32, "0")
+
+
+def _otlp_id(value: Optional[str], nbytes: int) -> str:
+    """OTLP JSON ids are hex; protobuf's generic JSON mapping writes them as base64."""
+    if not value or len(value) == 2 * nbytes:
+        return value or ""
+    return base64.b64decode(value).hex()
+
+
+def _jaeger_fields(fields: Optional[list[dict[str, Any]]]) -> dict[str, Any]:
+    return {f["key"]: f.get("value") for f in fields or ()}
+
+
+def _append_jaeger_span(table: SpanTable, span: dict[str, Any]) -> int:
+    attrs = _jaeger_fields(span.get("tags"))
+    kind = _JAEGER_KINDS.get(str(attrs.pop("span.kind", "internal")).lower(), SpanKind.INTERNAL.value)
+    status = _STATUS_NAMES.get(str(attrs.pop("otel.status_code", "UNSET")).upper(), StatusCode.UNSET.value)
+    if attrs.get("error") is True:
+        status = StatusCode.ERROR.value
+
+    parent = 0
+    for ref in span.get("references") or ():
+        if ref.get("refType") == "CHILD_OF" or not parent:
+            parent = _hex_id(ref.get("spanID"))
+
+    events = []
+    for log in span.get("logs") or ():
+        fields = _jaeger_fields(log.get("fields"))
+        events.append((str(fields.pop("event", "log")), int(log.get("timestamp", 0)) * 1000, fields))
+
+    start = int(span.get("startTime", 0)) * 1000
+    return table.append(
+        trace_id=_trace_hex(span["traceID"]),
+        span_id=_hex_id(span.get("spanID")),
+        parent_span_id=parent,
+        name=span.get("operationName", ""),
+        kind=kind,
+        status=status,
+        start_ns=start,
+        end_ns=start + int(span.get("duration", 0)) * 1000,
+        attributes=attrs,
+        events=events,
+    )
+
+
+def _load_jaeger_data(stream: _JSONStream, table: SpanTable) -> None:
+    # "data": [{"traceID": ..., "spans": [...], "processes": {...}}, ...]
+    for _ in stream.array_items():
+        first = len(table)
+        process_of: dict[int, str] = {}
+        processes: dict[str, Any] = {}
+        for key in stream.object_keys():
+            if key == "spans":
+                for _ in stream.array_items():
+                    span = stream.value()
+                    row = _append_jaeger_span(table, span)
+                    if span.get("processID"):
+                        process_of[row] = span["processID"]
+            elif key == "processes":
+                processes = stream.value() or {}
+            else:
+                stream.value()
+        # "processes" usually follows "spans"; fill in the service names afterwards.
+        for pid, process in processes.items():
+            name = (process or {}).get("serviceName")
+            if name:
+                table.set_service((row for row in range(first, len(table)) if process_of.get(row) == pid), name)
+
+
+def _otlp_value(value: dict[str, Any]) -> Any:
+    if "stringValue" in value:
+        return value["stringValue"]
+    if "boolValue" in value:
+        return value["boolValue"]
+    if "intValue" in value:
+        return int(value["intValue"])
+    if "doubleValue" in value:
+        return float(value["doubleValue"])
+    if "arrayValue" in value:
+        return [_otlp_value(v) for v in (value["arrayValue"].get("values") or ())]
+    if "kvlistValue" in value:
+        return json.dumps(_otlp_attributes(value["kvlistValue"].get("values")), sort_keys=True)
+    if "bytesValue" in value:
+        return value["bytesValue"]
+    return None
+
+
+def _otlp_attributes(kvs: Optional[list[dict[str, Any]]]) -> dict[str, Any]:
+    return {kv["key"]: _otlp_value(kv.get("value") or {}) for kv in kvs or ()}
+
+
+def _append_otlp_span(table: SpanTable, span: dict[str, Any], service: Optional[str]) -> int:
+    status = span.get("status") or {}
+    return table.append(
+        trace_id=_trace_hex(_otlp_id(span["traceId"], 16)),
+        span_id=_hex_id(_otlp_id(span.get("spanId"), 8)),
+        parent_span_id=_hex_id(_otlp_id(span.get("parentSpanId"), 8)),
+        name=span.get("name", ""),
+        kind=_OTLP_KINDS.get(span.get("kind", 0), SpanKind.INTERNAL.value),
+        status=_OTLP_STATUS.get(status.get("code", 0), StatusCode.UNSET.value),
+        start_ns=int(span.get("startTimeUnixNano", 0)),
+        end_ns=int(span.get("endTimeUnixNano", 0)),
+        attributes=_otlp_attributes(span.get("attributes")),
+        events=[
+            (e.get("name", ""), int(e.get("timeUnixNano", 0)), _otlp_attributes(e.get("attributes")))
+            for e in span.get("events") or ()
+        ],
+        service=service,
+    )
+
+
+def _load_otlp_resource_spans(stream: _JSONStream, table: SpanTable) -> None:
+    # "resourceSpans": [{"resource": {...}, "scopeSpans": [{"scope": {...}, "spans": [...]}]}]
+    for _ in stream.array_items():
+        service: Optional[str] = None
+        first = len(table)
+        for key in stream.object_keys():
+            if key == "resource":
+                resource = stream.value() or {}
+                service = _otlp_attributes(resource.get("attributes")).get("service.name")
+            elif key in ("scopeSpans", "instrumentationLibrarySpans"):
+                for _ in stream.array_items():
+                    for scope_key in stream.object_keys():
+                        if scope_key != "spans":
+                            stream.value()
+                            continue
+                        for _ in stream.array_items():
+                            _append_otlp_span(table, stream.value(), service)
+            else:
+                stream.value()
+        # The resource may come after its spans.
+        if service is not None:
+            table.set_service(range(first, len(table)), service)
+
+
+def _append_eval_span(table: SpanTable, span: dict[str, Any]) -> int:
+    status = str((span.get("status") or {}).get("status_code", ""))
+    return table.append(
+        trace_id=_trace_hex(span["trace_id"]),
+        span_id=_hex_id(span.get("span_id")),
+        parent_span_id=_hex_id(span.get("parent_span_id")),
+        name=span.get("name", ""),
+        kind=_KIND_NAMES.get(span.get("kind"), SpanKind.INTERNAL.value),
+        # "StatusCode.ERROR" -> ERROR
+        status=_STATUS_NAMES.get(status.rsplit(".", 1)[-1], StatusCode.UNSET.value),
+        start_ns=int(span.get("start_time_unix_nano", 0)),
+        end_ns=int(span.get("end_time_unix_nano", 0)),
+        attributes=span.get("attributes") or {},
+        events=[
+            (e.get("name", ""), int(e.get("timestamp_unix_nano", 0)), e.get("attributes") or {})
+            for e in span.get("events") or ()
+        ],
+    )
+
+
+def _load_eval_spans(stream: _JSONStream, table: SpanTable) -> None:
+    for _ in stream.array_items():
+        _append_eval_span(table, stream.value())
+
+
+_TOP_LEVEL = {
+    "data": _load_jaeger_data,
+    "resourceSpans": _load_otlp_resource_spans,
+    "spans": _load_eval_spans,
+}
+
+
+def _load_document(stream: _JSONStream, table: SpanTable) -> None:
+    recognised = False
+    for key in stream.object_keys():
+        load = _TOP_LEVEL.get(key)
+        if load is None:
+            stream.value()
+            continue
+        recognised = True
+        # Jaeger answers errors with "data": null.
+        if not stream.skip_null():
+            load(stream, table)
+    if not recognised:
+        raise ValueError("unrecognised trace file: expected a data, resourceSpans or spans key")
+
+
+def load_span_table(
+    *sources: PathOrFile,
+    columns: Optional[Iterable[str]] = DEFAULT_COLUMNS,
+    event_columns: Optional[Iterable[str]] = DEFAULT_EVENT_COLUMNS,
+    table: Optional[SpanTable] = None,
+) -> SpanTable:
+    """
+    Load Jaeger, OTLP JSON or eval_goal_a trace files into one SpanTable.
+
+    Pass `table` to append to an existing table; `columns`/`event_columns` are
+    then ignored. Files may hold several JSON documents one after the other
+    (OTLP JSON Lines).
+    """
+    if table is None:
+        table = SpanTable(columns=columns, event_columns=event_columns)
+    for source in sources:
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "r", encoding="utf-8") as f:
+                _load_stream(_JSONStream(f), table)
+        else:
+            _load_stream(_JSONStream(source), table)
+    return table
+
+
+def _load_stream(stream: _JSONStream, table: SpanTable) -> None:
+    while stream.peek():
+        _load_document(stream, table)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load trace files into a span table and summarise them.")
+    parser.add_argument("paths", nargs="+", help="Jaeger export, OTLP JSON or eval_goal_a traces_*.json files")
+    parser.add_argument("--top", type=int, default=10, help="number of span names to list")
+    args = parser.parse_args()
+
+    table = load_span_table(*args.paths)
+    print(f"{len(table)} spans, {len(table.trace_ids)} traces, {len(table.event_row)} events")
+    for code, count in Counter(table.name_code).most_common(args.top):
+        print(f"{count:>10}  {table.names[code]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+The ``{"spans": [...]}`` JSON trace file format written by the examples.
+
+span_to_dict() converts one finished span. JSONTracesFileExporter writes the
+file incrementally as spans are exported, producing byte-for-byte the same
+output as ``json.dumps({"spans": [span_to_dict(s) for s in spans]}, indent=2)``
+without keeping the spans in memory.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Optional, Sequence, TextIO
+
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+
+def span_to_dict(span: ReadableSpan) -> dict[str, Any]:
+    ctx = span.get_span_context()
+    parent = span.parent.span_id if span.parent is not None else None
+    return {
+        "name": span.name,
+        "trace_id": f"{ctx.trace_id:032x}",
+        "span_id": f"{ctx.span_id:016x}",
+        "parent_span_id": f"{parent:016x}" if parent is not None else None,
+        "kind": str(span.kind.name),
+        "start_time_unix_nano": int(span.start_time),
+        "end_time_unix_nano": int(span.end_time),
+        "attributes": dict(span.attributes) if span.attributes else {},
+        "events": [
+            {
+                "name": e.name,
+                "timestamp_unix_nano": int(e.timestamp),
+                "attributes": dict(e.attributes) if e.attributes else {},
+            }
+            for e in (span.events or [])
+        ],
+        "status": {
+            "status_code": str(getattr(span.status, "status_code", "")),
+            "description": str(getattr(span.status, "description", "")),
+        },
+    }
+
+
+class JSONTracesFileExporter(SpanExporter):
+    """
+    Streams finished spans into a ``{"spans": [...]}`` JSON file.
+
+    The file is valid JSON only after close(). open() finishes the current file
+    (if any) and starts a new one, so one exporter registered on a tracer
+    provider can write one file per run.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self._lock = threading.Lock()
+        self._f: Optional[TextIO] = None
+        self._count = 0
+        if path is not None:
+            self.open(path)
+
+    def open(self, path: str) -> None:
+        with self._lock:
+            self._close_locked()
+            self._f = open(path, "w", encoding="utf-8")
+            self._f.write('{\n  "spans": [')
+            self._count = 0
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        with self._lock:
+            if self._f is None:
+                return SpanExportResult.SUCCESS
+            for span in spans:
+                text = json.dumps(span_to_dict(span), indent=2).replace("\n", "\n    ")
+                self._f.write(("," if self._count else "") + "\n    " + text)
+                self._count += 1
+        return SpanExportResult.SUCCESS
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
+
+    def _close_locked(self) -> None:
+        if self._f is None:
+            return
+        self._f.write("\n  ]\n}" if self._count else "]\n}")
+        self._f.close()
+        self._f = None
+
+    def shutdown(self) -> None:
+        self.close()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        with self._lock:
+            if self._f is not None:
+                self._f.flush()
+        return True
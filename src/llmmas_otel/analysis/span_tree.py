@@ -0,0 +1,103 @@
+"""
+Inherited span attributes for finished traces.
+
+Phase, agent and session of a span are set on an ancestor (the workflow
+segment, the agent step, the session span), not on the span itself.
+SpanTreeIndex resolves them for every span in one top-down pass: a span's
+values are its parent's values overridden by its own attributes, and each
+span is visited once, so the cost is linear in the number of spans whatever
+the depth of the tree.
+"""
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable, Mapping, Sequence
+from typing import Any, Optional
+
+from .. import semconv
+
+DEFAULT_KEYS = (semconv.ATTR_SEGMENT_NAME, semconv.ATTR_AGENT_ID, semconv.ATTR_SESSION_ID)
+
+_EMPTY: dict[str, Any] = {}
+_VISITING: dict[str, Any] = {}
+_MISSING = object()
+
+
+class SpanTreeIndex:
+    """
+    Nearest ancestor-or-self value of selected attributes, for every span.
+
+    Spans are given as parallel sequences of span ids, parent span ids (None
+    for roots) and attribute mappings; from_spans() accepts the span dicts of a
+    ``{"spans": [...]}`` trace file. A parent that is not among the spans ends
+    the chain, as does a cycle. Spans with identical inherited values share one
+    dict, so memory stays close to one reference per span.
+    """
+
+    def __init__(
+        self,
+        span_ids: Sequence[Hashable],
+        parent_ids: Sequence[Optional[Hashable]],
+        attributes: Sequence[Optional[Mapping[str, Any]]],
+        keys: Iterable[str] = DEFAULT_KEYS,
+    ) -> None:
+        if not len(span_ids) == len(parent_ids) == len(attributes):
+            raise ValueError("span_ids, parent_ids and attributes must have the same length")
+        self.keys = tuple(keys)
+        self._pos: dict[Hashable, int] = {sid: i for i, sid in enumerate(span_ids)}
+        parent_pos = [None if pid is None else self._pos.get(pid) for pid in parent_ids]
+        self._resolved = self._resolve(parent_pos, attributes)
+
+    @classmethod
+    def from_spans(cls, spans: Sequence[Mapping[str, Any]], keys: Iterable[str] = DEFAULT_KEYS) -> "SpanTreeIndex":
+        return cls(
+            [s["span_id"] for s in spans],
+            [s.get("parent_span_id") for s in spans],
+            [s.get("attributes") for s in spans],
+            keys,
+        )
+
+    def _resolve(
+        self,
+        parent_pos: list[Optional[int]],
+        attributes: Sequence[Optional[Mapping[str, Any]]],
+    ) -> list[dict[str, Any]]:
+        keys = self.keys
+        resolved: list[Optional[dict[str, Any]]] = [None] * len(parent_pos)
+        chain: list[int] = []
+        for start in range(len(parent_pos)):
+            if resolved[start] is not None:
+                continue
+            # Walk up to the first resolved ancestor (or the root), then resolve downwards.
+            pos: Optional[int] = start
+            while pos is not None and resolved[pos] is None:
+                resolved[pos] = _VISITING
+                chain.append(pos)
+                pos = parent_pos[pos]
+            base = _EMPTY if pos is None or resolved[pos] is _VISITING else resolved[pos]
+            while chain:
+                pos = chain.pop()
+                attrs = attributes[pos]
+                if attrs:
+                    for key in keys:
+                        if key in attrs and base.get(key, _MISSING) != attrs[key]:
+                            base = {**base, key: attrs[key]}
+                resolved[pos] = base
+        return resolved  # type: ignore[return-value]
+
+    def __len__(self) -> int:
+        return len(self._resolved)
+
+    def __contains__(self, span_id: Hashable) -> bool:
+        return span_id in self._pos
+
+    def resolved(self, span_id: Hashable) -> Mapping[str, Any]:
+        """All inherited values of a span (do not mutate; the dict is shared)."""
+        pos = self._pos.get(span_id)
+        return _EMPTY if pos is None else self._resolved[pos]
+
+    def get(self, span_id: Hashable, key: str, default: Any = None) -> Any:
+        return self.resolved(span_id).get(key, default)
+
+    def at(self, pos: int, key: str, default: Any = None) -> Any:
+        """Like get(), by position in the sequences the index was built from."""
+        return self._resolved[pos].get(key, default)
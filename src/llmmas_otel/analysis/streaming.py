@@ -0,0 +1,202 @@
+"""
+Per-session trace analysis computed while the spans are being produced.
+
+SessionAnalyzer is a span processor that yields the same per-session summary
+the batch analysis in examples/eval_goal_a.py derives from a whole trace file
+(metrics, injection points, content fingerprints), without keeping spans
+around. Phase and agent of a span are resolved when it starts, from its live
+parent span, and the state of a trace is released as soon as its root span
+ends; memory is bounded by the sessions in flight, not by the length of the run.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Optional
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.trace import SpanKind, get_current_span
+
+from .. import semconv
+
+# Attributes a span inherits from its nearest ancestor that has them.
+INHERITED_KEYS = (semconv.ATTR_SEGMENT_NAME, semconv.ATTR_AGENT_ID)
+
+_EMPTY: dict[str, Any] = {}
+
+
+class _TraceState:
+    __slots__ = (
+        "inherited",
+        "session_id",
+        "session_ms",
+        "injected_delay_ms",
+        "llm_count",
+        "llm_total_ms",
+        "injection_points",
+        "msg_send",
+        "llm_out",
+    )
+
+    def __init__(self) -> None:
+        # span_id -> inherited attributes from strict ancestors (shared, never mutated).
+        self.inherited: dict[int, dict[str, Any]] = {}
+        self.session_id: Optional[str] = None
+        self.session_ms: Optional[float] = None
+        self.injected_delay_ms = 0.0
+        self.llm_count = 0
+        self.llm_total_ms = 0.0
+        self.injection_points: list[dict[str, Any]] = []
+        self.msg_send: dict[str, str] = {}
+        self.llm_out: list[tuple[int, str, str]] = []
+
+
+def _is_local_root(span: ReadableSpan) -> bool:
+    return span.parent is None or span.parent.is_remote
+
+
+def _fault_delay_ms(span: ReadableSpan) -> tuple[float, Optional[float]]:
+    """(sum of fault.applied delays, last fault.applied delay) of one span."""
+    total = 0.0
+    last: Optional[float] = None
+    for e in span.events or ():
+        if e.name == "fault.applied":
+            dm = (e.attributes or _EMPTY).get("delay_ms")
+            if isinstance(dm, (int, float)):
+                total += float(dm)
+                last = float(dm)
+    return total, last
+
+
+class SessionAnalyzer(SpanProcessor):
+    """
+    Streams per-session metrics, injection points and fingerprints.
+
+    sessions() maps llmmas.session.id to
+    ``{"trace_id", "metrics", "injection_points", "fingerprints"}`` for every
+    trace whose root span has ended and that contains an llmmas.session span.
+    Spans that start or end after their trace's root has ended are ignored.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._traces: dict[int, _TraceState] = {}
+        self._sessions: dict[str, dict[str, Any]] = {}
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        sc = span.get_span_context()
+        parent = span.parent
+        with self._lock:
+            state = self._traces.get(sc.trace_id)
+            if parent is None or parent.is_remote:
+                if state is None:
+                    state = self._traces[sc.trace_id] = _TraceState()
+                state.inherited[sc.span_id] = _EMPTY
+                return
+            if state is None:
+                # The trace's root has already ended (e.g. a delayed delivery
+                # started from the timer wheel); its summary is final.
+                return
+
+            inherited = state.inherited.get(parent.span_id, _EMPTY)
+            # The parent's own attributes are read from the live span: segment and
+            # agent attributes are set on it after it started.
+            live = get_current_span(parent_context)
+            if live.get_span_context().span_id == parent.span_id:
+                attrs = getattr(live, "attributes", None) or _EMPTY
+                for key in INHERITED_KEYS:
+                    if key in attrs and inherited.get(key) != attrs[key]:
+                        inherited = {**inherited, key: attrs[key]}
+            state.inherited[sc.span_id] = inherited
+
+    def on_end(self, span: ReadableSpan) -> None:
+        sc = span.context
+        attrs = span.attributes or _EMPTY
+        with self._lock:
+            state = self._traces.get(sc.trace_id)
+            if state is None:
+                return
+
+            if span.name == semconv.SPAN_SESSION and state.session_ms is None:
+                sid = attrs.get(semconv.ATTR_SESSION_ID)
+                state.session_id = sid if isinstance(sid, str) else None
+                state.session_ms = (span.end_time - span.start_time) / 1e6
+
+            delay_total, delay_last = _fault_delay_ms(span)
+            state.injected_delay_ms += delay_total
+
+            inherited = state.inherited.get(sc.span_id, _EMPTY)
+
+            if attrs.get(semconv.ATTR_GEN_AI_OPERATION_NAME) == semconv.GEN_AI_OPERATION_INFERENCE:
+                state.llm_count += 1
+                state.llm_total_ms += (span.end_time - span.start_time) / 1e6
+                out_sha = attrs.get(semconv.ATTR_LLM_OUTPUT_SHA256)
+                if isinstance(out_sha, str):
+                    phase = attrs.get(semconv.ATTR_SEGMENT_NAME, inherited.get(semconv.ATTR_SEGMENT_NAME))
+                    agent = attrs.get(semconv.ATTR_AGENT_ID, inherited.get(semconv.ATTR_AGENT_ID))
+                    key = f"{phase or 'unknown_phase'}:{agent or 'unknown_agent'}"
+                    state.llm_out.append((span.start_time, key, out_sha))
+
+            if attrs.get(semconv.ATTR_FAULT_INJECTED) is True:
+                state.injection_points.append(
+                    {
+                        "span_name": span.name,
+                        "span_kind": span.kind.name,
+                        "fault_type": attrs.get(semconv.ATTR_FAULT_TYPE),
+                        "fault_spec_id": attrs.get(semconv.ATTR_FAULT_SPEC_ID),
+                        "fault_decision": attrs.get(semconv.ATTR_FAULT_DECISION),
+                        "delay_ms": delay_last,
+                        "phase_name": attrs.get(semconv.ATTR_SEGMENT_NAME, inherited.get(semconv.ATTR_SEGMENT_NAME)),
+                        "agent_id": attrs.get(semconv.ATTR_AGENT_ID, inherited.get(semconv.ATTR_AGENT_ID)),
+                    }
+                )
+
+            if span.kind == SpanKind.PRODUCER:
+                mid = attrs.get(semconv.ATTR_MESSAGE_ID)
+                sha = attrs.get(semconv.ATTR_MESSAGE_SHA256)
+                if isinstance(mid, str) and isinstance(sha, str):
+                    state.msg_send[mid] = sha
+
+            if _is_local_root(span):
+                del self._traces[sc.trace_id]
+                self._finish(sc.trace_id, state)
+
+    def _finish(self, trace_id: int, state: _TraceState) -> None:
+        if state.session_id is None or state.session_ms is None:
+            return
+        llm_out: dict[str, list[str]] = {}
+        # Stable sort: equal start times keep end order, as in the batch analysis.
+        for _, key, sha in sorted(state.llm_out, key=lambda x: x[0]):
+            llm_out.setdefault(key, []).append(sha)
+        self._sessions[state.session_id] = {
+            "trace_id": f"{trace_id:032x}",
+            "metrics": {
+                "session_ms": float(state.session_ms),
+                "injected_delay_ms": float(state.injected_delay_ms),
+                "llm_call_count": int(state.llm_count),
+                "llm_total_ms": float(state.llm_total_ms),
+            },
+            "injection_points": state.injection_points,
+            "fingerprints": {"a2a_send_sha": state.msg_send, "llm_output_sha_by_phase_agent": llm_out},
+        }
+
+    def sessions(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return dict(self._sessions)
+
+    def in_flight(self) -> int:
+        """Number of traces whose root span has not ended yet."""
+        with self._lock:
+            return len(self._traces)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._traces.clear()
+            self._sessions.clear()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._traces.clear()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
@@ -0,0 +1,249 @@
+"""
+Columnar storage for finished spans.
+
+A SpanTable keeps one row per span in typed ``array`` columns (ids, times,
+kind, status) and interns repeated strings (trace ids, span names, attribute
+values), so millions of spans cost a few dozen bytes each instead of a dict
+per span. Events go to a second set of columns that point back to their span's
+row. Tables are filled by llmmas_otel.analysis.loader.
+"""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Hashable, Iterable, Mapping
+from typing import Any, Optional
+
+from .. import semconv
+from .span_tree import DEFAULT_KEYS, SpanTreeIndex
+
+# Attribute columns kept by default: everything the analysis code groups or filters by.
+DEFAULT_COLUMNS = (
+    semconv.ATTR_SESSION_ID,
+    semconv.ATTR_SEGMENT_NAME,
+    semconv.ATTR_AGENT_ID,
+    semconv.ATTR_SOURCE_AGENT_ID,
+    semconv.ATTR_TARGET_AGENT_ID,
+    semconv.ATTR_EDGE_ID,
+    semconv.ATTR_MESSAGE_ID,
+    semconv.ATTR_MESSAGE_SHA256,
+    semconv.ATTR_LLM_OUTPUT_SHA256,
+    semconv.ATTR_GEN_AI_OPERATION_NAME,
+    semconv.ATTR_GEN_AI_TOOL_NAME,
+    semconv.ATTR_FAULT_INJECTED,
+    semconv.ATTR_FAULT_TYPE,
+    semconv.ATTR_FAULT_SPEC_ID,
+    semconv.ATTR_FAULT_DECISION,
+)
+
+DEFAULT_EVENT_COLUMNS = ("delay_ms",)
+
+MISSING = -1
+
+
+def _hashable(value: Any) -> Hashable:
+    return tuple(value) if isinstance(value, list) else value
+
+
+class Column:
+    """Dictionary-encoded values: codes[row] indexes categories, MISSING if unset."""
+
+    __slots__ = ("codes", "categories", "_lookup")
+
+    def __init__(self, rows: int = 0) -> None:
+        self.codes = array("i", [MISSING]) * rows
+        self.categories: list[Any] = []
+        # Keyed by (type, value) so True, 1 and 1.0 stay distinct categories.
+        self._lookup: dict[tuple[type, Hashable], int] = {}
+
+    def code_for(self, value: Any) -> int:
+        value = _hashable(value)
+        key = (type(value), value)
+        code = self._lookup.get(key)
+        if code is None:
+            code = self._lookup[key] = len(self.categories)
+            self.categories.append(value)
+        return code
+
+    def code_of(self, value: Any) -> int:
+        """Code of an existing category, MISSING if the value never occurs."""
+        value = _hashable(value)
+        return self._lookup.get((type(value), value), MISSING)
+
+    def get(self, row: int, default: Any = None) -> Any:
+        code = self.codes[row]
+        return default if code == MISSING else self.categories[code]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+class _Interner:
+    __slots__ = ("values", "_lookup")
+
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self._lookup: dict[str, int] = {}
+
+    def code_of(self, value: str) -> int:
+        return self._lookup.get(value, MISSING)
+
+    def __call__(self, value: str) -> int:
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class SpanTable:
+    """
+    One row per span.
+
+    Span kind and status are stored as the integer values of
+    opentelemetry.trace.SpanKind and StatusCode. Only attribute keys listed in
+    `columns` are kept (all keys if None); event attributes likewise with
+    `event_columns`.
+    """
+
+    def __init__(
+        self,
+        columns: Optional[Iterable[str]] = DEFAULT_COLUMNS,
+        event_columns: Optional[Iterable[str]] = DEFAULT_EVENT_COLUMNS,
+    ) -> None:
+        self._keep = frozenset(columns) if columns is not None else None
+        self._keep_events = frozenset(event_columns) if event_columns is not None else None
+
+        self._trace_ids = _Interner()
+        self.trace_index = array("I")
+        self.span_id = array("Q")
+        self.parent_span_id = array("Q")  # 0 for roots
+        self._names = _Interner()
+        self.name_code = array("I")
+        self.kind = array("b")
+        self.status = array("b")
+        self.start_ns = array("q")
+        self.end_ns = array("q")
+        self.service = Column()
+        self.attributes: dict[str, Column] = {}
+
+        self.event_row = array("I")
+        self._event_names = _Interner()
+        self.event_name_code = array("I")
+        self.event_time_ns = array("q")
+        self.event_attributes: dict[str, Column] = {}
+
+    # ---- filling ----
+
+    def append(
+        self,
+        *,
+        trace_id: str,
+        span_id: int,
+        parent_span_id: int,
+        name: str,
+        kind: int,
+        status: int,
+        start_ns: int,
+        end_ns: int,
+        attributes: Mapping[str, Any],
+        events: Iterable[tuple[str, int, Mapping[str, Any]]] = (),
+        service: Optional[str] = None,
+    ) -> int:
+        row = len(self.span_id)
+        self.trace_index.append(self._trace_ids(trace_id))
+        self.span_id.append(span_id)
+        self.parent_span_id.append(parent_span_id)
+        self.name_code.append(self._names(name))
+        self.kind.append(kind)
+        self.status.append(status)
+        self.start_ns.append(start_ns)
+        self.end_ns.append(end_ns)
+        self.service.codes.append(MISSING if service is None else self.service.code_for(service))
+        self._append_attributes(self.attributes, self._keep, row, attributes)
+
+        for event_name, ts, event_attrs in events:
+            event = len(self.event_row)
+            self.event_row.append(row)
+            self.event_name_code.append(self._event_names(event_name))
+            self.event_time_ns.append(ts)
+            self._append_attributes(self.event_attributes, self._keep_events, event, event_attrs)
+        return row
+
+    @staticmethod
+    def _append_attributes(
+        columns: dict[str, Column],
+        keep: Optional[frozenset[str]],
+        row: int,
+        attributes: Mapping[str, Any],
+    ) -> None:
+        for column in columns.values():
+            column.codes.append(MISSING)
+        for key, value in attributes.items():
+            if value is None or (keep is not None and key not in keep):
+                continue
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = Column(row + 1)
+            column.codes[row] = column.code_for(value)
+
+    def set_service(self, rows: Iterable[int], service: str) -> None:
+        code = self.service.code_for(service)
+        for row in rows:
+            self.service.codes[row] = code
+
+    # ---- reading ----
+
+    def __len__(self) -> int:
+        return len(self.span_id)
+
+    @property
+    def trace_ids(self) -> list[str]:
+        """Hex trace ids; trace_index[row] indexes this list."""
+        return self._trace_ids.values
+
+    @property
+    def names(self) -> list[str]:
+        return self._names.values
+
+    @property
+    def event_names(self) -> list[str]:
+        return self._event_names.values
+
+    def name_code_of(self, name: str) -> int:
+        """Code of a span name in name_code, MISSING if no span has it."""
+        return self._names.code_of(name)
+
+    def event_name_code_of(self, name: str) -> int:
+        return self._event_names.code_of(name)
+
+    def name(self, row: int) -> str:
+        return self._names.values[self.name_code[row]]
+
+    def trace_id(self, row: int) -> str:
+        return self._trace_ids.values[self.trace_index[row]]
+
+    def attribute(self, row: int, key: str, default: Any = None) -> Any:
+        column = self.attributes.get(key)
+        return default if column is None else column.get(row, default)
+
+    def row_attributes(self, row: int) -> dict[str, Any]:
+        return {key: column.categories[c] for key, column in self.attributes.items() if (c := column.codes[row]) != MISSING}
+
+    def parent_rows(self) -> array:
+        """Row of each span's parent within the same trace, -1 for roots and missing parents."""
+        by_key = {(t, s): row for row, (t, s) in enumerate(zip(self.trace_index, self.span_id))}
+        return array(
+            "i",
+            (by_key.get((t, p), -1) if p else -1 for t, p in zip(self.trace_index, self.parent_span_id)),
+        )
+
+    def span_tree(self, keys: Iterable[str] = DEFAULT_KEYS) -> SpanTreeIndex:
+        """SpanTreeIndex keyed by row number."""
+        keys = tuple(keys)
+        parents = self.parent_rows()
+        columns = [(key, self.attributes[key]) for key in keys if key in self.attributes]
+        attrs = [
+            {key: column.categories[c] for key, column in columns if (c := column.codes[row]) != MISSING}
+            for row in range(len(self))
+        ]
+        return SpanTreeIndex(range(len(self)), [p if p >= 0 else None for p in parents], attrs, keys)
@@ -0,0 +1,299 @@
+"""
+NumPy aggregation over a SpanTable.
+
+SpanArrays exposes the table's columns as NumPy arrays (start/end ns, kind,
+status, trace index, parent row, span name codes and attribute codes).
+session_metrics() computes session latency, LLM call count and time and
+injected delay for every session with a few group-by-trace reductions, and
+session_summaries() adds injection points and fingerprints in the same shape
+SessionAnalyzer.sessions() returns. median_iqr() and grouped_median_iqr()
+compute the linear-interpolation quartiles used in the eval reports.
+
+NumPy is an optional dependency: pip install 'llmmas-otel[analysis]'.
+"""
+from __future__ import annotations
+
+from collections.abc import Hashable, Sequence
+from typing import Any, Optional
+
+from opentelemetry.trace import SpanKind
+
+from .. import semconv
+from .table import MISSING, SpanTable
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as exc:  # pragma: no cover - depends on the environment
+        raise ImportError(
+            "llmmas_otel.analysis.vectorized requires NumPy; install it with pip install 'llmmas-otel[analysis]'"
+        ) from exc
+    return numpy
+
+
+class SpanArrays:
+    """NumPy copies of a SpanTable's columns, plus the table for name and category lookups."""
+
+    def __init__(self, table: SpanTable) -> None:
+        np = _numpy()
+        self.table = table
+        self.trace_index = np.array(table.trace_index, dtype=np.int64)
+        self.name_code = np.array(table.name_code, dtype=np.int64)
+        self.kind = np.array(table.kind, dtype=np.int8)
+        self.status = np.array(table.status, dtype=np.int8)
+        self.start_ns = np.array(table.start_ns, dtype=np.int64)
+        self.end_ns = np.array(table.end_ns, dtype=np.int64)
+        self.event_row = np.array(table.event_row, dtype=np.int64)
+        self.event_name_code = np.array(table.event_name_code, dtype=np.int64)
+        self._parent_index: Optional[Any] = None
+        self._codes: dict[str, Any] = {}
+        self._event_codes: dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.trace_index)
+
+    @property
+    def n_traces(self) -> int:
+        return len(self.table.trace_ids)
+
+    @property
+    def duration_ms(self):
+        return (self.end_ns - self.start_ns) / 1e6
+
+    @property
+    def parent_index(self):
+        """Row of each span's parent in the same trace, -1 for roots."""
+        if self._parent_index is None:
+            np = _numpy()
+            self._parent_index = np.array(self.table.parent_rows(), dtype=np.int64)
+        return self._parent_index
+
+    def codes(self, key: str):
+        """Category codes of an attribute column (MISSING where unset, all MISSING if the key never occurs)."""
+        codes = self._codes.get(key)
+        if codes is None:
+            np = _numpy()
+            column = self.table.attributes.get(key)
+            codes = (
+                np.array(column.codes, dtype=np.int64) if column is not None else np.full(len(self), MISSING, dtype=np.int64)
+            )
+            self._codes[key] = codes
+        return codes
+
+    def event_codes(self, key: str):
+        codes = self._event_codes.get(key)
+        if codes is None:
+            np = _numpy()
+            column = self.table.event_attributes.get(key)
+            codes = (
+                np.array(column.codes, dtype=np.int64)
+                if column is not None
+                else np.full(len(self.event_row), MISSING, dtype=np.int64)
+            )
+            self._event_codes[key] = codes
+        return codes
+
+    def mask(self, key: str, value: Any):
+        """Rows whose attribute `key` equals `value`."""
+        column = self.table.attributes.get(key)
+        code = column.code_of(value) if column is not None else MISSING
+        if code == MISSING:
+            return _numpy().zeros(len(self), dtype=bool)
+        return self.codes(key) == code
+
+    def name_mask(self, name: str):
+        code = self.table.name_code_of(name)
+        if code == MISSING:
+            return _numpy().zeros(len(self), dtype=bool)
+        return self.name_code == code
+
+    def numeric_event_values(self, key: str):
+        """Float value of an event attribute per event row, NaN where unset or not a number."""
+        np = _numpy()
+        column = self.table.event_attributes.get(key)
+        if column is None:
+            return np.full(len(self.event_row), np.nan)
+        lookup = np.array(
+            [float(v) if isinstance(v, (int, float)) else np.nan for v in column.categories] + [np.nan],
+            dtype=np.float64,
+        )
+        # MISSING (-1) picks the trailing NaN.
+        return lookup[self.event_codes(key)]
+
+
+def _as_arrays(data: SpanTable | SpanArrays) -> SpanArrays:
+    return data if isinstance(data, SpanArrays) else SpanArrays(data)
+
+
+def _session_rows(arrays: SpanArrays) -> list[tuple[int, int, str]]:
+    """(trace index, row of its first llmmas.session span, session id) per session trace."""
+    np = _numpy()
+    rows = np.flatnonzero(arrays.name_mask(semconv.SPAN_SESSION))
+    traces, first = np.unique(arrays.trace_index[rows], return_index=True)
+    out = []
+    session_ids = arrays.table.attributes.get(semconv.ATTR_SESSION_ID)
+    for trace, row in sorted(zip(traces.tolist(), rows[first].tolist()), key=lambda x: x[1]):
+        sid = session_ids.get(row) if session_ids is not None else None
+        if isinstance(sid, str):
+            out.append((trace, row, sid))
+    return out
+
+
+def session_metrics(data: SpanTable | SpanArrays) -> dict[str, dict[str, Any]]:
+    """
+    session id -> {"trace_id", "session_ms", "injected_delay_ms", "llm_call_count", "llm_total_ms"}.
+
+    The session of a trace is its first llmmas.session span; traces without
+    one (or without a string session id) are left out.
+    """
+    np = _numpy()
+    arrays = _as_arrays(data)
+    n = arrays.n_traces
+    duration_ms = arrays.duration_ms
+
+    llm = arrays.mask(semconv.ATTR_GEN_AI_OPERATION_NAME, semconv.GEN_AI_OPERATION_INFERENCE)
+    llm_count = np.bincount(arrays.trace_index[llm], minlength=n)
+    llm_total_ms = np.bincount(arrays.trace_index[llm], weights=duration_ms[llm], minlength=n)
+
+    fault_code = arrays.table.event_name_code_of("fault.applied")
+    delays = arrays.numeric_event_values("delay_ms")
+    applied = (arrays.event_name_code == fault_code) & ~np.isnan(delays)
+    injected_ms = np.bincount(
+        arrays.trace_index[arrays.event_row[applied]], weights=delays[applied], minlength=n
+    )
+
+    trace_ids = arrays.table.trace_ids
+    return {
+        sid: {
+            "trace_id": trace_ids[trace],
+            "session_ms": float(duration_ms[row]),
+            "injected_delay_ms": float(injected_ms[trace]),
+            "llm_call_count": int(llm_count[trace]),
+            "llm_total_ms": float(llm_total_ms[trace]),
+        }
+        for trace, row, sid in _session_rows(arrays)
+    }
+
+
+def session_summaries(data: SpanTable | SpanArrays) -> dict[str, dict[str, Any]]:
+    """
+    session id -> {"trace_id", "metrics", "injection_points", "fingerprints"},
+    the same summary SessionAnalyzer computes while spans are produced.
+    """
+    np = _numpy()
+    arrays = _as_arrays(data)
+    table = arrays.table
+    metrics = session_metrics(arrays)
+    sessions_of_trace = {table.trace_index[row]: sid for _, row, sid in _session_rows(arrays)}
+    tree = table.span_tree()
+
+    fault_code = table.event_name_code_of("fault.applied")
+    delays = arrays.numeric_event_values("delay_ms")
+    last_delay: dict[int, float] = {}
+    for event in np.flatnonzero((arrays.event_name_code == fault_code) & ~np.isnan(delays)).tolist():
+        last_delay[int(arrays.event_row[event])] = float(delays[event])
+
+    points: dict[str, list[dict[str, Any]]] = {sid: [] for sid in metrics}
+    for row in np.flatnonzero(arrays.mask(semconv.ATTR_FAULT_INJECTED, True)).tolist():
+        sid = sessions_of_trace.get(table.trace_index[row])
+        if sid is None:
+            continue
+        points[sid].append(
+            {
+                "span_name": table.name(row),
+                "span_kind": SpanKind(table.kind[row]).name,
+                "fault_type": table.attribute(row, semconv.ATTR_FAULT_TYPE),
+                "fault_spec_id": table.attribute(row, semconv.ATTR_FAULT_SPEC_ID),
+                "fault_decision": table.attribute(row, semconv.ATTR_FAULT_DECISION),
+                "delay_ms": last_delay.get(row),
+                "phase_name": tree.get(row, semconv.ATTR_SEGMENT_NAME),
+                "agent_id": tree.get(row, semconv.ATTR_AGENT_ID),
+            }
+        )
+
+    msg_send: dict[str, dict[str, str]] = {sid: {} for sid in metrics}
+    producer = (arrays.kind == SpanKind.PRODUCER.value) & (arrays.codes(semconv.ATTR_MESSAGE_ID) != MISSING)
+    for row in np.flatnonzero(producer & (arrays.codes(semconv.ATTR_MESSAGE_SHA256) != MISSING)).tolist():
+        sid = sessions_of_trace.get(table.trace_index[row])
+        mid = table.attribute(row, semconv.ATTR_MESSAGE_ID)
+        sha = table.attribute(row, semconv.ATTR_MESSAGE_SHA256)
+        if sid is not None and isinstance(mid, str) and isinstance(sha, str):
+            msg_send[sid][mid] = sha
+
+    llm_out: dict[str, dict[str, list[str]]] = {sid: {} for sid in metrics}
+    llm = arrays.mask(semconv.ATTR_GEN_AI_OPERATION_NAME, semconv.GEN_AI_OPERATION_INFERENCE)
+    rows = np.flatnonzero(llm & (arrays.codes(semconv.ATTR_LLM_OUTPUT_SHA256) != MISSING))
+    for row in rows[np.argsort(arrays.start_ns[rows], kind="stable")].tolist():
+        sid = sessions_of_trace.get(table.trace_index[row])
+        sha = table.attribute(row, semconv.ATTR_LLM_OUTPUT_SHA256)
+        if sid is None or not isinstance(sha, str):
+            continue
+        phase = tree.get(row, semconv.ATTR_SEGMENT_NAME) or "unknown_phase"
+        agent = tree.get(row, semconv.ATTR_AGENT_ID) or "unknown_agent"
+        llm_out[sid].setdefault(f"{phase}:{agent}", []).append(sha)
+
+    return {
+        sid: {
+            "trace_id": m["trace_id"],
+            "metrics": {k: m[k] for k in ("session_ms", "injected_delay_ms", "llm_call_count", "llm_total_ms")},
+            "injection_points": points[sid],
+            "fingerprints": {"a2a_send_sha": msg_send[sid], "llm_output_sha_by_phase_agent": llm_out[sid]},
+        }
+        for sid, m in metrics.items()
+    }
+
+
+# ---- robust statistics ----
+
+QUARTILES = (0.25, 0.5, 0.75)
+
+
+def _interpolate(sorted_vals, lo, n, p: float):
+    """
+    Linear-interpolation percentile p of the groups sorted_vals[lo:lo+n]
+    (the same arithmetic as the scalar percentile it replaces).
+    """
+    np = _numpy()
+    k = (n - 1) * p
+    f = np.floor(k).astype(np.int64)
+    c = np.minimum(f + 1, n - 1)
+    vf = sorted_vals[lo + f]
+    vc = sorted_vals[lo + c]
+    return np.where(f == c, vf, vf * (c - k) + vc * (k - f))
+
+
+def _stats(q1: float, med: float, q3: float, n: int) -> dict[str, Any]:
+    return {"median": float(med), "q1": float(q1), "q3": float(q3), "iqr": float(q3) - float(q1), "n": int(n)}
+
+
+def median_iqr(values: Sequence[float]) -> dict[str, Any]:
+    """{"median", "q1", "q3", "iqr", "n"} of `values`; NaN statistics when empty."""
+    np = _numpy()
+    vals = np.sort(np.asarray(values, dtype=np.float64))
+    if len(vals) == 0:
+        nan = float("nan")
+        return _stats(nan, nan, nan, 0)
+    lo, n = np.zeros(1, dtype=np.int64), np.array([len(vals)])
+    q1, med, q3 = (_interpolate(vals, lo, n, p)[0] for p in QUARTILES)
+    return _stats(q1, med, q3, len(vals))
+
+
+def grouped_median_iqr(groups: Sequence[Hashable], values: Sequence[float]) -> dict[Hashable, dict[str, Any]]:
+    """median_iqr() of the values of each group, with one sort for all groups."""
+    np = _numpy()
+    if len(groups) != len(values):
+        raise ValueError("groups and values must have the same length")
+    if not len(groups):
+        return {}
+    keys = list(dict.fromkeys(groups))
+    code_of = {key: i for i, key in enumerate(keys)}
+    codes = np.fromiter((code_of[g] for g in groups), dtype=np.int64, count=len(groups))
+    vals = np.asarray(values, dtype=np.float64)
+
+    order = np.lexsort((vals, codes))
+    sorted_vals = vals[order]
+    n = np.bincount(codes, minlength=len(keys))
+    lo = np.concatenate(([0], np.cumsum(n)[:-1]))
+    q1, med, q3 = (_interpolate(sorted_vals, lo, n, p) for p in QUARTILES)
+    return {key: _stats(q1[i], med[i], q3[i], n[i]) for i, key in enumerate(keys)}
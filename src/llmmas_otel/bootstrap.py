@@ -1,16 +1,26 @@
 from __future__ import annotations
 
-from opentelemetry import trace
+from typing import Optional
+
+from opentelemetry import metrics, trace
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
 from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
 from opentelemetry.sdk.trace.export import ConsoleSpanExporter, SimpleSpanProcessor, BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import Sampler
 
+from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 
+from .export import DeferredHashSpanExporter, DeferredHashSpanProcessor, enable_deferred_hashing
+from .metrics import enable_metrics
+from .sampling import SessionSampler, SessionTailProcessor
+
 
-def _set_provider(*, service_name: str) -> TracerProvider:
+def _set_provider(*, service_name: str, sampler: Optional[Sampler] = None) -> TracerProvider:
     resource = Resource.create({"service.name": service_name})
-    provider = TracerProvider(resource=resource)
+    provider = TracerProvider(resource=resource, sampler=sampler)
     trace.set_tracer_provider(provider)
     return provider
 
@@ -25,9 +35,59 @@ def init_otlp_tracing(
     service_name: str = "llmmas-otel-demo",
     endpoint: str = "http://localhost:4317",
     insecure: bool = True,
+    deferred_hashing: bool = False,
+    session_sample_ratio: Optional[float] = None,
+    tail_sampling: bool = False,
+    tail_latency_threshold_s: Optional[float] = None,
 ) -> None:
+    """
+    Export spans over OTLP/gRPC with a BatchSpanProcessor.
 
-    provider = _set_provider(service_name=service_name)
+    With deferred_hashing=True, *.sha256 content attributes are computed on the
+    exporter thread instead of the instrumented code's thread; spans dropped
+    before export release their pending text (DeferredHashSpanProcessor).
+
+    session_sample_ratio installs a SessionSampler that keeps that fraction of
+    sessions. With tail_sampling=True, the other sessions (all of them if no
+    ratio is given) are still recorded and exported whole if they errored, had
+    a visible injected fault, or took at least tail_latency_threshold_s.
+    """
+    sampler: Optional[Sampler] = None
+    if session_sample_ratio is not None or tail_sampling:
+        ratio = 0.0 if session_sample_ratio is None else session_sample_ratio
+        sampler = SessionSampler(ratio, record_unsampled=tail_sampling)
+    provider = _set_provider(service_name=service_name, sampler=sampler)
 
     exporter = OTLPSpanExporter(endpoint=endpoint, insecure=insecure)
-    provider.add_span_processor(BatchSpanProcessor(exporter))
+    if deferred_hashing:
+        exporter = DeferredHashSpanExporter(exporter)
+        enable_deferred_hashing()
+
+    processor: SpanProcessor = BatchSpanProcessor(exporter)
+    if tail_sampling:
+        processor = SessionTailProcessor(processor, latency_threshold_s=tail_latency_threshold_s)
+    provider.add_span_processor(processor)
+    if deferred_hashing:
+        provider.add_span_processor(DeferredHashSpanProcessor())
+
+
+def init_otlp_metrics(
+    *,
+    service_name: str = "llmmas-otel-demo",
+    endpoint: str = "http://localhost:4317",
+    insecure: bool = True,
+    export_interval_s: float = 10.0,
+) -> MeterProvider:
+    """
+    Export SpanFactory metrics (see llmmas_otel.metrics) over OTLP/gRPC every
+    export_interval_s seconds. Installs the MeterProvider globally and returns
+    it; call its shutdown() at exit to flush the last interval.
+    """
+    reader = PeriodicExportingMetricReader(
+        OTLPMetricExporter(endpoint=endpoint, insecure=insecure),
+        export_interval_millis=export_interval_s * 1000.0,
+    )
+    provider = MeterProvider(resource=Resource.create({"service.name": service_name}), metric_readers=[reader])
+    metrics.set_meter_provider(provider)
+    enable_metrics(provider)
+    return provider
@@ -1,10 +1,40 @@
 from __future__ import annotations
 
+import asyncio
+import inspect
+import time
 from collections.abc import Callable
+from contextlib import AbstractContextManager
 from functools import wraps
 from typing import Any, Mapping, MutableMapping, Optional
 
-from .span_factory import default_span_factory
+from .injection.types import DecisionKind
+from .span_factory import _set_content_attrs, default_span_factory
+
+# Sentinel returned by the fault helpers when the wrapped function should run.
+_PROCEED = object()
+
+
+def _wrap_in_span(
+    fn: Callable[..., Any],
+    open_span: Callable[..., AbstractContextManager[Any]],
+) -> Callable[..., Any]:
+    """Run fn inside open_span(*args, **kwargs); coroutine functions are awaited inside the span."""
+    if inspect.iscoroutinefunction(fn):
+
+        @wraps(fn)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with open_span(*args, **kwargs):
+                return await fn(*args, **kwargs)
+
+        return async_wrapper
+
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with open_span(*args, **kwargs):
+            return fn(*args, **kwargs)
+
+    return wrapper
 
 
 def observe_session(
@@ -18,9 +48,8 @@ def observe_session(
     metadata: Optional[Mapping[str, Any]] = None,
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
     def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
-        @wraps(fn)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            with default_span_factory.session(
+        def open_span(*args: Any, **kwargs: Any) -> AbstractContextManager[Any]:
+            return default_span_factory.session(
                 session_id=session_id,
                 name=name,
                 task_id=task_id,
@@ -28,10 +57,9 @@ def observe_session(
                 system=system,
                 adapter=adapter,
                 metadata=metadata,
-            ):
-                return fn(*args, **kwargs)
+            )
 
-        return wrapper
+        return _wrap_in_span(fn, open_span)
 
     return deco
 
@@ -117,9 +145,8 @@ def observe_workflow(
         order = index
 
     def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
-        @wraps(fn)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            with default_span_factory.workflow(
+        def open_span(*args: Any, **kwargs: Any) -> AbstractContextManager[Any]:
+            return default_span_factory.workflow(
                 name=name,
                 order=order,
                 kind=kind,
@@ -127,10 +154,9 @@ def observe_workflow(
                 workflow_id=workflow_id,
                 parent_id=parent_id,
                 metadata=metadata,
-            ):
-                return fn(*args, **kwargs)
+            )
 
-        return wrapper
+        return _wrap_in_span(fn, open_span)
 
     return deco
 
@@ -168,9 +194,8 @@ def observe_segment(
         order = index
 
     def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
-        @wraps(fn)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            with default_span_factory.segment(
+        def open_span(*args: Any, **kwargs: Any) -> AbstractContextManager[Any]:
+            return default_span_factory.segment(
                 name=name,
                 order=order,
                 origin=origin,
@@ -178,10 +203,9 @@ def observe_segment(
                 parent_id=parent_id,
                 kind=kind,
                 metadata=metadata,
-            ):
-                return fn(*args, **kwargs)
+            )
 
-        return wrapper
+        return _wrap_in_span(fn, open_span)
 
     return deco
 
@@ -197,9 +221,8 @@ def observe_agent_step(
     metadata: Optional[Mapping[str, Any]] = None,
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
     def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
-        @wraps(fn)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            with default_span_factory.agent_step(
+        def open_span(*args: Any, **kwargs: Any) -> AbstractContextManager[Any]:
+            return default_span_factory.agent_step(
                 agent_id=agent_id,
                 step_index=step_index,
                 agent_role=agent_role,
@@ -207,10 +230,9 @@ def observe_agent_step(
                 parent_agent_id=parent_agent_id,
                 step_kind=step_kind,
                 metadata=metadata,
-            ):
-                return fn(*args, **kwargs)
+            )
 
-        return wrapper
+        return _wrap_in_span(fn, open_span)
 
     return deco
 
@@ -228,10 +250,9 @@ def observe_delegation(
     metadata: Optional[Mapping[str, Any]] = None,
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
     def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
-        @wraps(fn)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
+        def open_span(*args: Any, **kwargs: Any) -> AbstractContextManager[Any]:
             goal = goal_fn(*args, **kwargs) if goal_fn else None
-            with default_span_factory.delegation(
+            return default_span_factory.delegation(
                 from_agent_id=from_agent_id,
                 to_agent_id=to_agent_id,
                 delegation_id=delegation_id,
@@ -241,14 +262,17 @@ def observe_delegation(
                 goal=goal,
                 preview_chars=preview_chars,
                 metadata=metadata,
-            ):
-                return fn(*args, **kwargs)
+            )
 
-        return wrapper
+        return _wrap_in_span(fn, open_span)
 
     return deco
 
 
+def _is_drop(decision: Optional[object]) -> bool:
+    return decision is not None and getattr(decision, "kind", None) == DecisionKind.DROP
+
+
 def observe_a2a_send(
     *,
     source_agent_id: str,
@@ -266,41 +290,73 @@ def observe_a2a_send(
     message_kind: Optional[str] = None,
     parent_message_id: Optional[str] = None,
     metadata: Optional[Mapping[str, Any]] = None,
+    defer_on_delay: bool = False,
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Wrap a send function in an a2a_send span; a dropped message skips the call
+    and returns None.
+
+    With delay_mode="scheduled", a delayed call still sleeps and then returns
+    fn's result, unless defer_on_delay=True: then the wrapper returns None at
+    once and fn runs after the delay through A2ASendContext.deliver(), on the
+    event loop or the timer wheel thread. A deferred call's return value is
+    lost, and its exceptions are only printed (timer wheel) or reported to
+    the loop's exception handler.
+    """
+
+    def span_kwargs(args: tuple[Any, ...], kwargs: dict[str, Any]) -> dict[str, Any]:
+        body = message_body_fn(*args, **kwargs) if message_body_fn else None
+        carrier = carrier_fn(*args, **kwargs) if carrier_fn else None
+
+        apply_mutation = None
+        if message_body_setter_fn is not None:
+            apply_mutation = lambda new_body: message_body_setter_fn(new_body, *args, **kwargs)
+
+        return dict(
+            source_agent_id=source_agent_id,
+            target_agent_id=target_agent_id,
+            edge_id=edge_id,
+            message_id=message_id,
+            channel=channel,
+            message_body=body,
+            carrier=carrier,
+            propagate_context=propagate_context,
+            preview_chars=preview_chars,
+            add_event=add_event,
+            apply_mutation=apply_mutation,
+            route_via=route_via,
+            message_kind=message_kind,
+            parent_message_id=parent_message_id,
+            metadata=metadata,
+        )
+
     def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(fn):
+
+            @wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                async with default_span_factory.async_a2a_send(**span_kwargs(args, kwargs)) as ctx:
+                    if _is_drop(ctx.decision):
+                        return None
+                    if ctx.pending_delay_s:
+                        if defer_on_delay:
+                            ctx.deliver(fn, *args, **kwargs)
+                            return None
+                        await asyncio.sleep(ctx.pending_delay_s)
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
         @wraps(fn)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            body = message_body_fn(*args, **kwargs) if message_body_fn else None
-            carrier = carrier_fn(*args, **kwargs) if carrier_fn else None
-
-            apply_mutation = None
-            if message_body_setter_fn is not None:
-                apply_mutation = lambda new_body: message_body_setter_fn(new_body, *args, **kwargs)
-
-            with default_span_factory.a2a_send(
-                source_agent_id=source_agent_id,
-                target_agent_id=target_agent_id,
-                edge_id=edge_id,
-                message_id=message_id,
-                channel=channel,
-                message_body=body,
-                carrier=carrier,
-                propagate_context=propagate_context,
-                preview_chars=preview_chars,
-                add_event=add_event,
-                apply_mutation=apply_mutation,
-                route_via=route_via,
-                message_kind=message_kind,
-                parent_message_id=parent_message_id,
-                metadata=metadata,
-            ) as ctx:
-                try:
-                    from .injection import DecisionKind
-
-                    if ctx.decision is not None and ctx.decision.kind == DecisionKind.DROP:
+            with default_span_factory.a2a_send(**span_kwargs(args, kwargs)) as ctx:
+                if _is_drop(ctx.decision):
+                    return None
+                if ctx.pending_delay_s:
+                    if defer_on_delay:
+                        ctx.deliver(fn, *args, **kwargs)
                         return None
-                except Exception:
-                    pass
+                    time.sleep(ctx.pending_delay_s)
                 return fn(*args, **kwargs)
 
         return wrapper
@@ -325,36 +381,44 @@ def observe_a2a_receive(
     parent_message_id: Optional[str] = None,
     metadata: Optional[Mapping[str, Any]] = None,
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def span_kwargs(args: tuple[Any, ...], kwargs: dict[str, Any]) -> dict[str, Any]:
+        body = message_body_fn(*args, **kwargs) if message_body_fn else None
+        carrier = carrier_fn(*args, **kwargs) if carrier_fn else None
+
+        return dict(
+            source_agent_id=source_agent_id,
+            target_agent_id=target_agent_id,
+            edge_id=edge_id,
+            message_id=message_id,
+            channel=channel,
+            message_body=body,
+            carrier=carrier,
+            link_from_carrier=link_from_carrier,
+            preview_chars=preview_chars,
+            add_event=add_event,
+            route_via=route_via,
+            message_kind=message_kind,
+            parent_message_id=parent_message_id,
+            metadata=metadata,
+        )
+
     def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
-        @wraps(fn)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            body = message_body_fn(*args, **kwargs) if message_body_fn else None
-            carrier = carrier_fn(*args, **kwargs) if carrier_fn else None
-
-            with default_span_factory.a2a_receive(
-                source_agent_id=source_agent_id,
-                target_agent_id=target_agent_id,
-                edge_id=edge_id,
-                message_id=message_id,
-                channel=channel,
-                message_body=body,
-                carrier=carrier,
-                link_from_carrier=link_from_carrier,
-                preview_chars=preview_chars,
-                add_event=add_event,
-                route_via=route_via,
-                message_kind=message_kind,
-                parent_message_id=parent_message_id,
-                metadata=metadata,
-            ):
-                try:
-                    from .injection import DecisionKind
+        if inspect.iscoroutinefunction(fn):
 
-                    dec = default_span_factory.current_a2a_receive_decision()
-                    if dec is not None and getattr(dec, "kind", None) == DecisionKind.DROP:
+            @wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                async with default_span_factory.async_a2a_receive(**span_kwargs(args, kwargs)):
+                    if _is_drop(default_span_factory.current_a2a_receive_decision()):
                         return None
-                except Exception:
-                    pass
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with default_span_factory.a2a_receive(**span_kwargs(args, kwargs)):
+                if _is_drop(default_span_factory.current_a2a_receive_decision()):
+                    return None
                 return fn(*args, **kwargs)
 
         return wrapper
@@ -375,49 +439,62 @@ def observe_environment_action(
     changed_files_fn: Optional[Callable[[Any], Optional[list[str]]]] = None,
     metadata: Optional[Mapping[str, Any]] = None,
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def span_kwargs(args: tuple[Any, ...], kwargs: dict[str, Any]) -> dict[str, Any]:
+        input_text = input_text_fn(*args, **kwargs) if input_text_fn else None
+
+        return dict(
+            name=name,
+            kind=kind,
+            action_id=action_id,
+            input_text=input_text,
+            preview_chars=preview_chars,
+            record_input=record_input,
+            metadata=metadata,
+        )
+
+    def record_result(ctx: Any, result: Any) -> None:
+        if record_output and output_text_fn is not None and ctx.span.is_recording():
+            try:
+                output_text = output_text_fn(result)
+            except Exception:
+                output_text = None
+            if output_text is not None:
+                from . import semconv
+
+                _set_content_attrs(
+                    ctx.span,
+                    output_text,
+                    preview_chars,
+                    (semconv.ATTR_ENV_ACTION_OUTPUT_PREVIEW, semconv.ATTR_ENV_ACTION_OUTPUT_SHA256),
+                )
+
+        if changed_files_fn is not None:
+            try:
+                changed_files = changed_files_fn(result)
+            except Exception:
+                changed_files = None
+            if changed_files:
+                from . import semconv
+
+                ctx.span.set_attribute(semconv.ATTR_ENV_ACTION_CHANGED_FILES, changed_files)
+
     def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
-        @wraps(fn)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            input_text = input_text_fn(*args, **kwargs) if input_text_fn else None
+        if inspect.iscoroutinefunction(fn):
 
-            with default_span_factory.environment_action(
-                name=name,
-                kind=kind,
-                action_id=action_id,
-                input_text=input_text,
-                preview_chars=preview_chars,
-                record_input=record_input,
-                metadata=metadata,
-            ) as ctx:
-                result = _run_with_tool_fault_decision(fn, ctx, *args, **kwargs)
+            @wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                async with default_span_factory.async_environment_action(**span_kwargs(args, kwargs)) as ctx:
+                    result = await _run_with_tool_fault_decision_async(fn, ctx, *args, **kwargs)
+                    record_result(ctx, result)
+                    return result
 
-                if record_output and output_text_fn is not None:
-                    try:
-                        output_text = output_text_fn(result)
-                    except Exception:
-                        output_text = None
-                    if output_text is not None:
-                        from . import semconv
-
-                        ctx.span.set_attribute(
-                            semconv.ATTR_ENV_ACTION_OUTPUT_PREVIEW,
-                            output_text[:preview_chars],
-                        )
-                        ctx.span.set_attribute(
-                            semconv.ATTR_ENV_ACTION_OUTPUT_SHA256,
-                            __import__("hashlib").sha256(output_text.encode("utf-8")).hexdigest(),
-                        )
-
-                if changed_files_fn is not None:
-                    try:
-                        changed_files = changed_files_fn(result)
-                    except Exception:
-                        changed_files = None
-                    if changed_files:
-                        from . import semconv
-
-                        ctx.span.set_attribute(semconv.ATTR_ENV_ACTION_CHANGED_FILES, changed_files)
+            return async_wrapper
 
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with default_span_factory.environment_action(**span_kwargs(args, kwargs)) as ctx:
+                result = _run_with_tool_fault_decision(fn, ctx, *args, **kwargs)
+                record_result(ctx, result)
                 return result
 
         return wrapper
@@ -436,35 +513,52 @@ def observe_tool_call(
     record_args: bool = False,
     record_result: bool = False,
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
-    def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
-        @wraps(fn)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            tool_args = tool_args_fn(*args, **kwargs) if tool_args_fn else None
+    def span_kwargs(args: tuple[Any, ...], kwargs: dict[str, Any]) -> dict[str, Any]:
+        tool_args = tool_args_fn(*args, **kwargs) if tool_args_fn else None
+
+        return dict(
+            tool_name=tool_name,
+            tool_type=tool_type,
+            tool_call_id=tool_call_id,
+            tool_args=tool_args,
+            preview_chars=preview_chars,
+            record_args=record_args,
+        )
+
+    def record_tool_result(ctx: Any, result: Any) -> None:
+        if record_result and tool_result_fn is not None and ctx.span.is_recording():
+            try:
+                tool_result = tool_result_fn(result)
+            except Exception:
+                tool_result = None
+            if tool_result is not None:
+                from . import semconv
+
+                _set_content_attrs(
+                    ctx.span,
+                    tool_result,
+                    preview_chars,
+                    (semconv.ATTR_TOOL_RESULT_PREVIEW, semconv.ATTR_TOOL_RESULT_SHA256),
+                    (semconv.ATTR_ENV_ACTION_OUTPUT_PREVIEW, semconv.ATTR_ENV_ACTION_OUTPUT_SHA256),
+                )
 
-            with default_span_factory.tool_call(
-                tool_name=tool_name,
-                tool_type=tool_type,
-                tool_call_id=tool_call_id,
-                tool_args=tool_args,
-                preview_chars=preview_chars,
-                record_args=record_args,
-            ) as ctx:
-                result = _run_with_tool_fault_decision(fn, ctx, *args, **kwargs)
+    def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(fn):
 
-                if record_result and tool_result_fn is not None:
-                    try:
-                        tool_result = tool_result_fn(result)
-                    except Exception:
-                        tool_result = None
-                    if tool_result is not None:
-                        from . import semconv
+            @wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                async with default_span_factory.async_tool_call(**span_kwargs(args, kwargs)) as ctx:
+                    result = await _run_with_tool_fault_decision_async(fn, ctx, *args, **kwargs)
+                    record_tool_result(ctx, result)
+                    return result
 
-                        sha = __import__("hashlib").sha256(tool_result.encode("utf-8")).hexdigest()
-                        ctx.span.set_attribute(semconv.ATTR_TOOL_RESULT_PREVIEW, tool_result[:preview_chars])
-                        ctx.span.set_attribute(semconv.ATTR_TOOL_RESULT_SHA256, sha)
-                        ctx.span.set_attribute(semconv.ATTR_ENV_ACTION_OUTPUT_PREVIEW, tool_result[:preview_chars])
-                        ctx.span.set_attribute(semconv.ATTR_ENV_ACTION_OUTPUT_SHA256, sha)
+            return async_wrapper
 
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with default_span_factory.tool_call(**span_kwargs(args, kwargs)) as ctx:
+                result = _run_with_tool_fault_decision(fn, ctx, *args, **kwargs)
+                record_tool_result(ctx, result)
                 return result
 
         return wrapper
@@ -481,21 +575,34 @@ def observe_artifact(
     content_fn: Optional[Callable[[Any], Optional[str]]] = None,
     metadata: Optional[Mapping[str, Any]] = None,
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def record_artifact(result: Any, args: tuple[Any, ...], kwargs: dict[str, Any]) -> None:
+        path = path_fn(*args, **kwargs) if path_fn else None
+        content = content_fn(result) if content_fn else None
+        with default_span_factory.artifact(
+            kind=kind,
+            artifact_id=artifact_id,
+            name=name,
+            path=path,
+            content=content,
+            metadata=metadata,
+        ):
+            pass
+
     def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(fn):
+
+            @wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                result = await fn(*args, **kwargs)
+                record_artifact(result, args, kwargs)
+                return result
+
+            return async_wrapper
+
         @wraps(fn)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             result = fn(*args, **kwargs)
-            path = path_fn(*args, **kwargs) if path_fn else None
-            content = content_fn(result) if content_fn else None
-            with default_span_factory.artifact(
-                kind=kind,
-                artifact_id=artifact_id,
-                name=name,
-                path=path,
-                content=content,
-                metadata=metadata,
-            ):
-                pass
+            record_artifact(result, args, kwargs)
             return result
 
         return wrapper
@@ -583,63 +690,84 @@ def observe_llm_call(
     record_output: bool = False,
     agent_id: Optional[str] = None,
     metadata: Optional[Mapping[str, Any]] = None,
+    cache: bool = False,
 ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Wrap each call of the decorated function in an llm_call span.
+
+    With cache=True and an LLM response cache enabled, str results are
+    recorded and a later call with the same provider, model and input text
+    returns the cached str without calling the function. Only opt in for
+    functions that return the provider's text response.
+    """
+
+    def span_kwargs(args: tuple[Any, ...], kwargs: dict[str, Any]) -> dict[str, Any]:
+        input_text = input_text_fn(*args, **kwargs) if input_text_fn else None
+
+        return dict(
+            provider_name=provider_name,
+            model=model,
+            operation_name=operation_name,
+            request_id=request_id,
+            input_text=input_text,
+            preview_chars=preview_chars,
+            record_input=record_input,
+            agent_id=agent_id,
+            metadata=metadata,
+            cache=cache,
+        )
+
+    def record_result(ctx: Any, result: Any) -> None:
+        if record_output and output_text_fn is not None and ctx.span.is_recording():
+            try:
+                out_text = output_text_fn(result)
+            except Exception:
+                out_text = None
+            if out_text is not None:
+                from . import semconv
+
+                _set_content_attrs(
+                    ctx.span,
+                    out_text,
+                    preview_chars,
+                    (semconv.ATTR_LLM_OUTPUT_PREVIEW, semconv.ATTR_LLM_OUTPUT_SHA256),
+                )
+
     def deco(fn: Callable[..., Any]) -> Callable[..., Any]:
+        if inspect.iscoroutinefunction(fn):
+
+            @wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                async with default_span_factory.async_llm_call(**span_kwargs(args, kwargs)) as ctx:
+                    result = _fault_result(
+                        ctx,
+                        default_span_factory.current_llm_call_decision(),
+                        "Injected LLM error",
+                    )
+                    if result is _PROCEED and ctx.cached_output is not None:
+                        result = ctx.cached_output
+                    elif result is _PROCEED:
+                        result = await fn(*args, **kwargs)
+                        _store_llm_output(ctx, result)
+                    record_result(ctx, result)
+                    return result
+
+            return async_wrapper
+
         @wraps(fn)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            input_text = input_text_fn(*args, **kwargs) if input_text_fn else None
-
-            with default_span_factory.llm_call(
-                provider_name=provider_name,
-                model=model,
-                operation_name=operation_name,
-                request_id=request_id,
-                input_text=input_text,
-                preview_chars=preview_chars,
-                record_input=record_input,
-                agent_id=agent_id,
-                metadata=metadata,
-            ) as ctx:
-                dec = default_span_factory.current_llm_call_decision()
-
-                try:
-                    from .injection import DecisionKind
-                except Exception:
-                    DecisionKind = None  # type: ignore
-
-                if dec is not None and DecisionKind is not None:
-                    if dec.kind == DecisionKind.RAISE:
-                        exc = getattr(dec, "raise_exception", None) or RuntimeError("Injected LLM error")
-                        try:
-                            from opentelemetry.trace.status import Status, StatusCode
-
-                            ctx.span.record_exception(exc)
-                            ctx.span.set_status(Status(StatusCode.ERROR, str(exc)))
-                        except Exception:
-                            pass
-                        raise exc
-
-                    if dec.kind == DecisionKind.RETURN:
-                        result = getattr(dec, "return_value", None)
-                    else:
-                        result = fn(*args, **kwargs)
-                else:
+            with default_span_factory.llm_call(**span_kwargs(args, kwargs)) as ctx:
+                result = _fault_result(
+                    ctx,
+                    default_span_factory.current_llm_call_decision(),
+                    "Injected LLM error",
+                )
+                if result is _PROCEED and ctx.cached_output is not None:
+                    result = ctx.cached_output
+                elif result is _PROCEED:
                     result = fn(*args, **kwargs)
-
-                if record_output and output_text_fn is not None:
-                    try:
-                        out_text = output_text_fn(result)
-                    except Exception:
-                        out_text = None
-                    if out_text is not None:
-                        from . import semconv
-
-                        ctx.span.set_attribute(semconv.ATTR_LLM_OUTPUT_PREVIEW, out_text[:preview_chars])
-                        ctx.span.set_attribute(
-                            semconv.ATTR_LLM_OUTPUT_SHA256,
-                            __import__("hashlib").sha256(out_text.encode("utf-8")).hexdigest(),
-                        )
-
+                    _store_llm_output(ctx, result)
+                record_result(ctx, result)
                 return result
 
         return wrapper
@@ -647,17 +775,22 @@ def observe_llm_call(
     return deco
 
 
-def _run_with_tool_fault_decision(fn: Callable[..., Any], ctx: Any, *args: Any, **kwargs: Any) -> Any:
-    dec = default_span_factory.current_tool_call_decision()
+def _store_llm_output(ctx: Any, result: Any) -> None:
+    # Only text responses go to the LLM response cache; a hit returns the cached str.
+    if isinstance(result, str):
+        ctx.store_output(result)
 
-    try:
-        from .injection import DecisionKind
-    except Exception:
-        DecisionKind = None  # type: ignore
 
-    if dec is not None and DecisionKind is not None:
+def _fault_result(ctx: Any, dec: Optional[object], default_error: str) -> Any:
+    """
+    Apply a RAISE/RETURN decision for a tool or LLM call.
+
+    Raises the injected exception (recorded on the span), returns the injected
+    value, or returns _PROCEED when the wrapped function should run.
+    """
+    if dec is not None:
         if dec.kind == DecisionKind.RAISE:
-            exc = getattr(dec, "raise_exception", None) or RuntimeError("Injected tool error")
+            exc = getattr(dec, "raise_exception", None) or RuntimeError(default_error)
             try:
                 from opentelemetry.trace.status import Status, StatusCode
 
@@ -670,4 +803,18 @@ def _run_with_tool_fault_decision(fn: Callable[..., Any], ctx: Any, *args: Any,
         if dec.kind == DecisionKind.RETURN:
             return getattr(dec, "return_value", None)
 
-    return fn(*args, **kwargs)
\ No newline at end of file
+    return _PROCEED
+
+
+def _run_with_tool_fault_decision(fn: Callable[..., Any], ctx: Any, *args: Any, **kwargs: Any) -> Any:
+    result = _fault_result(ctx, default_span_factory.current_tool_call_decision(), "Injected tool error")
+    if result is _PROCEED:
+        return fn(*args, **kwargs)
+    return result
+
+
+async def _run_with_tool_fault_decision_async(fn: Callable[..., Any], ctx: Any, *args: Any, **kwargs: Any) -> Any:
+    result = _fault_result(ctx, default_span_factory.current_tool_call_decision(), "Injected tool error")
+    if result is _PROCEED:
+        return await fn(*args, **kwargs)
+    return result
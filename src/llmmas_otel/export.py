@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import weakref
+from collections import deque
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, Optional
+
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.trace import Span, SpanContext
+
+
+def clone_span(
+    span: ReadableSpan,
+    *,
+    attributes: Optional[Mapping[str, Any]] = None,
+    context: Optional[SpanContext] = None,
+) -> ReadableSpan:
+    """Copy a finished span, optionally adding attributes or replacing its span context."""
+    merged = dict(span.attributes or {})
+    if attributes:
+        merged.update(attributes)
+    clone = ReadableSpan(
+        name=span.name,
+        context=context or span.context,
+        parent=span.parent,
+        resource=span.resource,
+        attributes=merged,
+        events=span.events,
+        links=span.links,
+        kind=span.kind,
+        status=span.status,
+        start_time=span.start_time,
+        end_time=span.end_time,
+        instrumentation_scope=span.instrumentation_scope,
+    )
+    _share_deferred(span, clone)
+    return clone
+
+
+# ---- Deferred content hashing ----
+#
+# With deferred hashing enabled, SpanFactory records (attribute key, text) for
+# *.sha256 attributes instead of hashing on the agent thread. A
+# DeferredHashSpanExporter computes the hashes when the span is exported, which
+# under BatchSpanProcessor happens on the exporter's worker thread.
+#
+# Pending texts are bounded by size. With a DeferredHashSpanProcessor on the
+# provider, an entry is also released once the ended span and its clones have
+# been garbage-collected without being exported, e.g. when a full
+# BatchSpanProcessor queue drops the span or it only went to an exporter that
+# was not wrapped.
+
+_DEFERRED_ENABLED: bool = False
+DEFAULT_MAX_PENDING_BYTES = 256 * 1024 * 1024
+_max_pending_bytes = DEFAULT_MAX_PENDING_BYTES
+
+
+class _Pending:
+    __slots__ = ("entries", "nbytes", "refs")
+
+    def __init__(self) -> None:
+        self.entries: list[tuple[str, str]] = []
+        # Characters of pending text, counted as bytes.
+        self.nbytes = 0
+        # Weak references to the ended spans this entry is tracked for; untracked while empty.
+        self.refs: list[weakref.ref[Any]] = []
+
+
+_pending: dict[tuple[int, int], _Pending] = {}
+_pending_bytes = 0
+_pending_lock = threading.Lock()
+# (span key, dead reference) pairs, appended by weakref callbacks. The callbacks
+# can run during garbage collection while _pending_lock is held, so they only
+# queue the release; it is applied the next time the lock is taken.
+_released: deque[tuple[tuple[int, int], weakref.ref[Any]]] = deque()
+
+
+def enable_deferred_hashing(max_pending_bytes: int = DEFAULT_MAX_PENDING_BYTES) -> None:
+    """
+    Defer sha256 attributes to export time.
+
+    Only enable this when every exporter is wrapped in DeferredHashSpanExporter;
+    otherwise those attributes are missing from exported spans. At most
+    `max_pending_bytes` of text waits to be hashed; past that, the oldest
+    pending spans are exported without their hashes.
+    """
+    global _DEFERRED_ENABLED, _max_pending_bytes
+    if max_pending_bytes <= 0:
+        raise ValueError("max_pending_bytes must be positive")
+    _max_pending_bytes = max_pending_bytes
+    _DEFERRED_ENABLED = True
+
+
+def disable_deferred_hashing() -> None:
+    global _DEFERRED_ENABLED, _pending_bytes
+    _DEFERRED_ENABLED = False
+    with _pending_lock:
+        _pending.clear()
+        _pending_bytes = 0
+        _released.clear()
+
+
+def is_deferred_hashing_enabled() -> bool:
+    return _DEFERRED_ENABLED
+
+
+def pending_bytes() -> int:
+    """Characters of text currently waiting to be hashed at export."""
+    with _pending_lock:
+        _drain_released_locked()
+    return _pending_bytes
+
+
+def _pop_locked(span_key: tuple[int, int]) -> Optional[_Pending]:
+    global _pending_bytes
+    entry = _pending.pop(span_key, None)
+    if entry is not None:
+        _pending_bytes -= entry.nbytes
+    return entry
+
+
+def _drain_released_locked() -> None:
+    while _released:
+        span_key, ref = _released.popleft()
+        entry = _pending.get(span_key)
+        if entry is None:
+            continue
+        entry.refs = [r for r in entry.refs if r is not ref]
+        if not entry.refs:
+            _pop_locked(span_key)
+
+
+def _watch_locked(entry: _Pending, owner: object, span_key: tuple[int, int]) -> None:
+    entry.refs.append(weakref.ref(owner, lambda ref: _released.append((span_key, ref))))
+
+
+def defer_sha256(span: Span, key: str, text: str) -> None:
+    """Register `key = sha256(text)` to be set on `span` when it is exported."""
+    global _pending_bytes
+    size = len(text)
+    if size > _max_pending_bytes:
+        # Would evict everything else and itself; hash now while the span is live.
+        span.set_attribute(key, hashlib.sha256(text.encode("utf-8")).hexdigest())
+        return
+    sc = span.get_span_context()
+    span_key = (sc.trace_id, sc.span_id)
+    with _pending_lock:
+        _drain_released_locked()
+        entry = _pending.get(span_key)
+        if entry is None:
+            entry = _pending[span_key] = _Pending()
+        entry.entries.append((key, text))
+        entry.nbytes += size
+        _pending_bytes += size
+        while _pending_bytes > _max_pending_bytes:
+            # Oldest first; those spans are exported without the deferred hashes.
+            _pop_locked(next(iter(_pending)))
+
+
+def _track(span: ReadableSpan) -> None:
+    """Release `span`'s pending hashes when it is garbage-collected without being exported."""
+    sc = span.context
+    if not _pending or sc is None:
+        return
+    span_key = (sc.trace_id, sc.span_id)
+    with _pending_lock:
+        _drain_released_locked()
+        entry = _pending.get(span_key)
+        if entry is not None:
+            _watch_locked(entry, span, span_key)
+
+
+def _share_deferred(span: ReadableSpan, clone: ReadableSpan) -> None:
+    """Keep `span`'s pending hashes alive for as long as `clone` is, if they are tracked."""
+    sc = span.context
+    if not _pending or sc is None:
+        return
+    span_key = (sc.trace_id, sc.span_id)
+    with _pending_lock:
+        entry = _pending.get(span_key)
+        if entry is not None and entry.refs:
+            _watch_locked(entry, clone, span_key)
+
+
+def resolve_deferred(span: ReadableSpan) -> ReadableSpan:
+    """Return `span` with its deferred hash attributes computed, if it has any."""
+    if not _pending:
+        return span
+    sc = span.context
+    if sc is None:
+        return span
+    with _pending_lock:
+        entry = _pop_locked((sc.trace_id, sc.span_id))
+    if entry is None or not entry.entries:
+        return span
+    hashes: dict[str, str] = {}
+    by_text: dict[int, str] = {}
+    for key, text in entry.entries:
+        # Several keys can share one text (e.g. tool result and env action output).
+        sha = by_text.get(id(text))
+        if sha is None:
+            sha = by_text[id(text)] = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        hashes[key] = sha
+    return clone_span(span, attributes=hashes)
+
+
+def discard_deferred(spans: Iterable[ReadableSpan]) -> None:
+    """Forget the deferred hash attributes of spans that will never be exported."""
+    if not _pending:
+        return
+    with _pending_lock:
+        for span in spans:
+            sc = span.context
+            if sc is not None:
+                _pop_locked((sc.trace_id, sc.span_id))
+        _drain_released_locked()
+
+
+class DeferredHashSpanProcessor(SpanProcessor):
+    """
+    Releases the deferred hashes of ended spans that are never exported.
+
+    Add it to the TracerProvider next to the processors whose exporters are
+    wrapped in DeferredHashSpanExporter. It only keeps a weak reference to
+    each ended span; once nothing holds the span any more (it was exported,
+    dropped from a full queue, or no wrapped exporter received it), its
+    pending text is freed.
+    """
+
+    def on_end(self, span: ReadableSpan) -> None:
+        _track(span)
+
+
+class DeferredHashSpanExporter(SpanExporter):
+    """Wraps an exporter and fills in deferred sha256 attributes before exporting."""
+
+    def __init__(self, exporter: SpanExporter) -> None:
+        self._exporter = exporter
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        return self._exporter.export([resolve_deferred(s) for s in spans])
+
+    def shutdown(self) -> None:
+        self._exporter.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._exporter.force_flush(timeout_millis)
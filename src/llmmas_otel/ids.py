@@ -0,0 +1,117 @@
+"""
+Identifiers for workflows, delegations, actions, artifacts, LLM requests and
+messages.
+
+SpanFactory and the framework adapters mint ids through new_id() and
+new_token() instead of calling uuid4() themselves. The process-wide generator
+is a CounterIdGenerator, which needs no OS randomness per id. For
+reproducible evaluation runs, install a SeededIdGenerator:
+
+    from llmmas_otel.ids import SeededIdGenerator, set_id_generator
+
+    set_id_generator(SeededIdGenerator("exp-01"))
+
+Ids only need to be unique within a trace store; they are not secrets.
+"""
+from __future__ import annotations
+
+import itertools
+import os
+import random
+import threading
+import uuid
+import weakref
+
+
+class IdGenerator:
+    """Interface: token() returns a fresh hex token; new_id() prefixes it."""
+
+    def token(self, length: int = 12) -> str:
+        raise NotImplementedError
+
+    def new_id(self, prefix: str, length: int = 12) -> str:
+        return f"{prefix}-{self.token(length)}"
+
+
+class RandomIdGenerator(IdGenerator):
+    """uuid4-based tokens, as the library used before; one OS RNG read per id."""
+
+    def token(self, length: int = 12) -> str:
+        return uuid.uuid4().hex[:length]
+
+
+_COUNTERS: "weakref.WeakSet[CounterIdGenerator]" = weakref.WeakSet()
+
+
+class CounterIdGenerator(IdGenerator):
+    """
+    A random 32-bit run prefix drawn once per process, followed by a counter.
+
+    Tokens are unique within a process and, with high probability, across
+    the processes of a worker pool. A forked child draws a new prefix so it
+    does not repeat its parent's ids. `length` is ignored: tokens are 8 hex
+    digits of prefix plus at least 4 of counter.
+    """
+
+    def __init__(self) -> None:
+        self._reset()
+        _COUNTERS.add(self)
+
+    def _reset(self) -> None:
+        self._run = f"{random.SystemRandom().getrandbits(32):08x}"
+        # next() on itertools.count is atomic under the GIL, so no lock is needed.
+        self._next = itertools.count().__next__
+
+    def token(self, length: int = 12) -> str:
+        return f"{self._run}{self._next():04x}"
+
+
+def _reset_counters_after_fork() -> None:
+    for generator in list(_COUNTERS):
+        generator._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_counters_after_fork)
+
+
+class SeededIdGenerator(IdGenerator):
+    """
+    Pseudo-random tokens from `seed`: the same seed and the same sequence of
+    calls give the same ids, so two runs of an evaluation can be diffed span
+    by span. Ids are only reproducible if spans are created in the same order.
+    """
+
+    def __init__(self, seed: int | str) -> None:
+        self.seed = seed
+        self._rng = random.Random(str(seed))
+        self._lock = threading.Lock()
+
+    def token(self, length: int = 12) -> str:
+        with self._lock:
+            bits = self._rng.getrandbits(length * 4)
+        return f"{bits:0{length}x}"
+
+
+_GENERATOR: IdGenerator = CounterIdGenerator()
+
+
+def set_id_generator(generator: IdGenerator) -> None:
+    """Use `generator` for every id minted from now on."""
+    global _GENERATOR
+    if not isinstance(generator, IdGenerator):
+        raise TypeError("set_id_generator(...) expects an IdGenerator instance")
+    _GENERATOR = generator
+
+
+def get_id_generator() -> IdGenerator:
+    return _GENERATOR
+
+
+def new_id(prefix: str, length: int = 12) -> str:
+    """`<prefix>-<token>` from the current generator, e.g. "workflow-3f9a01c2001a"."""
+    return _GENERATOR.new_id(prefix, length)
+
+
+def new_token(length: int = 12) -> str:
+    return _GENERATOR.token(length)
@@ -8,12 +8,20 @@ from .engine import (
     get_engine,
     set_fault_trace_visibility,
     is_fault_trace_visible,
+    DELAY_MODES,
+    set_delay_mode,
+    get_delay_mode,
 )
 from .spec import FaultSpec, FaultSelector, FaultAction, FaultLimits
-from .loader import load_fault_specs
+from .loader import load_fault_specs, parse_fault_specs
 from .matcher import selector_matches
+from .predicates import Exact, Glob, OneOf, Predicate, Range, Regex, compile_condition
 from .spec_engine import SpecFaultEngine
+from .index import SpecIndex
+from .scheduler import Timer, TimerWheel, get_timer_wheel
 from .config import enable_fault_injection_from_file
+from .replay import RecordingFaultEngine, ReplayFaultEngine, load_decision_log
+from .watch import SpecDirectory, SpecWatcher, enable_fault_injection_from_dir, stop_fault_spec_watcher
 from .api import enable, disable, enabled, set_trace_visibility, trace_visible
 from .exceptions import LLMFaultError, LLMRateLimitError, LLMNetworkError, LLMTimeoutError
 
@@ -30,14 +38,36 @@ __all__ = [
     "get_engine",
     "set_fault_trace_visibility",
     "is_fault_trace_visible",
+    "DELAY_MODES",
+    "set_delay_mode",
+    "get_delay_mode",
     "FaultSpec",
     "FaultSelector",
     "FaultAction",
     "FaultLimits",
     "load_fault_specs",
+    "parse_fault_specs",
     "selector_matches",
+    "Predicate",
+    "Exact",
+    "OneOf",
+    "Glob",
+    "Regex",
+    "Range",
+    "compile_condition",
     "SpecFaultEngine",
+    "SpecIndex",
+    "Timer",
+    "TimerWheel",
+    "get_timer_wheel",
     "enable_fault_injection_from_file",
+    "RecordingFaultEngine",
+    "ReplayFaultEngine",
+    "load_decision_log",
+    "SpecDirectory",
+    "SpecWatcher",
+    "enable_fault_injection_from_dir",
+    "stop_fault_spec_watcher",
     "enable",
     "disable",
     "enabled",
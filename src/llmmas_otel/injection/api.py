@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from .config import enable_fault_injection_from_file
 from .engine import (
+    enable_fault_injection as _enable,
     disable_fault_injection as _disable,
     is_enabled as _is_enabled,
     is_fault_trace_visible as _is_fault_trace_visible,
@@ -9,11 +9,12 @@ from .engine import (
 )
 
 
-def enable(path: str, *, seed: str = "0", trace_visible: bool = True) -> None:
+def enable(path: str, *, seed: str = "0", trace_visible: bool = True, delay_mode: str = "inline") -> None:
     """
-    Enable config-driven fault injection from a YAML/JSON file.
+    Enable config-driven fault injection from a YAML/JSON file, or from a
+    directory of them that is watched for changes.
     """
-    enable_fault_injection_from_file(path, seed=seed, trace_visible=trace_visible)
+    _enable(path, seed=seed, trace_visible=trace_visible, delay_mode=delay_mode)
 
 
 def disable() -> None:
@@ -10,10 +10,11 @@ def enable_fault_injection_from_file(
     *,
     seed: str = "0",
     trace_visible: bool = True,
+    delay_mode: str = "inline",
 ) -> None:
     """
     Load YAML/JSON fault specs from file and enable injection globally.
     """
     specs = load_fault_specs(path)
     engine = SpecFaultEngine(specs=specs, seed=seed)
-    _enable_engine(engine, trace_visible=trace_visible)
\ No newline at end of file
+    _enable_engine(engine, trace_visible=trace_visible, delay_mode=delay_mode)
\ No newline at end of file
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from os import PathLike
 from typing import Optional
 
+from ..session_state import on_session_end
 from .types import HookContext, InjectionDecision
 
 
@@ -15,6 +17,9 @@ class FaultEngine:
     def decide(self, ctx: HookContext, payload: Optional[str] = None) -> InjectionDecision:
         raise NotImplementedError
 
+    def release_session(self, session_id: str) -> None:
+        """Drop any per-session state; called when the session ends."""
+
 
 @dataclass
 class NoOpFaultEngine(FaultEngine):
@@ -26,9 +31,34 @@ class NoOpFaultEngine(FaultEngine):
         return InjectionDecision.pass_through()
 
 
-_ACTIVE_ENGINE: FaultEngine = NoOpFaultEngine()
-_ENABLED: bool = False
-_FAULT_TRACE_VISIBLE: bool = True
+class InjectionState:
+    """
+    Process-wide injection switch.
+
+    Span factory hot paths read these attributes directly, so checking whether
+    injection is enabled costs a single attribute read.
+    """
+
+    __slots__ = ("engine", "enabled", "trace_visible", "delay_mode")
+
+    def __init__(self) -> None:
+        self.engine: FaultEngine = NoOpFaultEngine()
+        self.enabled: bool = False
+        self.trace_visible: bool = True
+        self.delay_mode: str = "inline"
+
+
+# "inline": DELAY decisions sleep on the calling thread (asyncio.sleep in async_* methods).
+# "scheduled": a2a_send does not wait; A2ASendContext.deliver() runs the delivery after the delay.
+DELAY_MODES = ("inline", "scheduled")
+
+
+STATE = InjectionState()
+
+
+@on_session_end
+def _release_engine_session(session_id: str) -> None:
+    STATE.engine.release_session(session_id)
 
 
 def enable_fault_injection(
@@ -36,6 +66,7 @@ def enable_fault_injection(
     *,
     seed: str = "0",
     trace_visible: bool = True,
+    delay_mode: str = "inline",
 ) -> None:
     """
     Enable fault injection globally.
@@ -43,13 +74,27 @@ def enable_fault_injection(
     Accepts either:
       - a FaultEngine instance
       - a YAML/JSON path string, which will be loaded into a SpecFaultEngine
+      - a directory of YAML/JSON files, loaded and watched for changes
+        (see injection.watch.enable_fault_injection_from_dir)
 
     trace_visible controls whether injected faults are explicitly shown in traces
     via llmmas.fault.* attributes and the fault.applied event.
+
+    delay_mode is "inline" or "scheduled"; see set_delay_mode().
     """
-    global _ACTIVE_ENGINE, _ENABLED, _FAULT_TRACE_VISIBLE
+    set_delay_mode(delay_mode)
+    STATE.trace_visible = trace_visible
 
-    _FAULT_TRACE_VISIBLE = trace_visible
+    if isinstance(engine_or_path, (str, PathLike)) and os.path.isdir(engine_or_path):
+        from .watch import enable_fault_injection_from_dir
+
+        enable_fault_injection_from_dir(
+            engine_or_path,
+            seed=seed,
+            trace_visible=trace_visible,
+            delay_mode=delay_mode,
+        )
+        return
 
     if isinstance(engine_or_path, (str, PathLike)):
         from .config import enable_fault_injection_from_file
@@ -58,6 +103,7 @@ def enable_fault_injection(
             str(engine_or_path),
             seed=seed,
             trace_visible=trace_visible,
+            delay_mode=delay_mode,
         )
         return
 
@@ -67,28 +113,55 @@ def enable_fault_injection(
             "or a YAML/JSON config path"
         )
 
-    _ACTIVE_ENGINE = engine_or_path
-    _ENABLED = True
+    from .watch import stop_fault_spec_watcher
+
+    # A watcher left over from an earlier directory would keep feeding an engine no longer in use.
+    stop_fault_spec_watcher(unless_engine=engine_or_path)
+    STATE.engine = engine_or_path
+    STATE.enabled = True
 
 
 def disable_fault_injection() -> None:
-    global _ACTIVE_ENGINE, _ENABLED
-    _ACTIVE_ENGINE = NoOpFaultEngine()
-    _ENABLED = False
+    from .watch import stop_fault_spec_watcher
+
+    stop_fault_spec_watcher()
+    STATE.engine = NoOpFaultEngine()
+    STATE.enabled = False
 
 
 def is_enabled() -> bool:
-    return _ENABLED
+    return STATE.enabled
 
 
 def get_engine() -> FaultEngine:
-    return _ACTIVE_ENGINE
+    return STATE.engine
 
 
 def set_fault_trace_visibility(visible: bool) -> None:
-    global _FAULT_TRACE_VISIBLE
-    _FAULT_TRACE_VISIBLE = bool(visible)
+    STATE.trace_visible = bool(visible)
 
 
 def is_fault_trace_visible() -> bool:
-    return _FAULT_TRACE_VISIBLE
\ No newline at end of file
+    return STATE.trace_visible
+
+
+def set_delay_mode(mode: str) -> None:
+    """
+    Choose how DELAY decisions are applied.
+
+    "inline" (default) sleeps before the span starts: time.sleep in sync
+    methods, asyncio.sleep in async_* methods. "scheduled" makes a2a_send and
+    async_a2a_send return immediately; the caller hands the delivery to
+    A2ASendContext.deliver(), which runs it after the delay with
+    loop.call_later when an event loop is running, and on a timer wheel
+    otherwise, instead of holding the thread. observe_a2a_send only defers
+    with defer_on_delay=True and otherwise still sleeps. Other hooks have to
+    return a result to their caller and keep the inline behaviour.
+    """
+    if mode not in DELAY_MODES:
+        raise ValueError(f"delay_mode must be one of {DELAY_MODES}, got {mode!r}")
+    STATE.delay_mode = mode
+
+
+def get_delay_mode() -> str:
+    return STATE.delay_mode
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import heapq
+from typing import Any, Iterator, Optional, Sequence
+
+from .predicates import Exact, OneOf
+from .spec import FaultSpec
+from .types import HookContext, HookType
+
+# Selector fields used as index keys, most selective first. A spec is filed
+# under the first of these fields it constrains with an exact value or an
+# `in` set (under each member); glob, regex and range conditions are skipped.
+INDEXED_FIELDS: tuple[str, ...] = ("edge_id", "tool_name", "agent_id", "phase_name")
+
+_Entry = tuple[int, FaultSpec]
+
+
+class _HookBucket:
+    __slots__ = ("wildcard", "keyed")
+
+    def __init__(self) -> None:
+        # Specs that constrain none of INDEXED_FIELDS: candidates for every context.
+        self.wildcard: list[_Entry] = []
+        self.keyed: dict[str, dict[Any, list[_Entry]]] = {}
+
+
+def _index_key(spec: FaultSpec) -> Optional[tuple[str, frozenset[Any]]]:
+    predicates = dict(spec.selector.predicates)
+    for name in INDEXED_FIELDS:
+        predicate = predicates.get(name)
+        if isinstance(predicate, OneOf):
+            return name, predicate.values
+        if isinstance(predicate, Exact):
+            try:
+                hash(predicate.value)
+            except TypeError:
+                # Not usable as a key; selector_matches() still decides.
+                return None
+            return name, frozenset((predicate.value,))
+    return None
+
+
+class SpecIndex:
+    """
+    Candidate lookup for SpecFaultEngine.
+
+    Specs are bucketed by hook type and then by the most selective exact-match
+    (or `in`) field they constrain. candidates(ctx) yields only specs that could match,
+    in original list order, so first-match-wins semantics are preserved.
+    Candidates still have to pass selector_matches().
+    """
+
+    def __init__(self, specs: Sequence[FaultSpec]) -> None:
+        self._buckets: dict[HookType, _HookBucket] = {}
+
+        for pos, spec in enumerate(specs):
+            key = _index_key(spec)
+            for hook in dict.fromkeys(spec.hooks):
+                bucket = self._buckets.setdefault(hook, _HookBucket())
+                if key is None:
+                    bucket.wildcard.append((pos, spec))
+                else:
+                    name, values = key
+                    by_value = bucket.keyed.setdefault(name, {})
+                    for value in values:
+                        by_value.setdefault(value, []).append((pos, spec))
+
+    def candidates(self, ctx: HookContext) -> Iterator[FaultSpec]:
+        bucket = self._buckets.get(ctx.hook_type)
+        if bucket is None:
+            return iter(())
+
+        lists: list[list[_Entry]] = []
+        if bucket.wildcard:
+            lists.append(bucket.wildcard)
+        for name, by_value in bucket.keyed.items():
+            entries = by_value.get(getattr(ctx, name))
+            if entries:
+                lists.append(entries)
+
+        if not lists:
+            return iter(())
+        if len(lists) == 1:
+            return (spec for _, spec in lists[0])
+        return (spec for _, spec in heapq.merge(*lists, key=lambda entry: entry[0]))
@@ -1,42 +1,63 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import pickle
+import tempfile
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 import yaml
 
 from .spec import FaultSpec
 
+# libyaml's loader when PyYAML was built with it; same safe subset, several times faster.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-def _load_yaml(path: Path) -> Any:
-    return yaml.safe_load(path.read_text(encoding="utf-8"))
+# Directory for compiled spec caches; unset disables caching.
+CACHE_DIR_ENV = "LLMMAS_OTEL_SPEC_CACHE_DIR"
+# Bump when FaultSpec or its parts change shape, so stale pickles are not loaded.
+_CACHE_FORMAT = 1
 
 
-def _load_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
+def _load_yaml(data: bytes) -> Any:
+    return yaml.load(data, Loader=_YAML_LOADER)
 
 
-def load_fault_specs(path: str) -> list[FaultSpec]:
-    """
-    Load fault specs from YAML/JSON file.
+def _load_json(data: bytes) -> Any:
+    return json.loads(data)
 
-    Supported shapes:
-      1) dict with key 'faults': { faults: [ ... ] }
-      2) list root: [ ... ]
-    """
+
+def _parse_bytes(data: bytes, suffix: str) -> Any:
+    if suffix == ".json":
+        return _load_json(data)
+    return _load_yaml(data)
+
+
+def _read_bytes(path: str | Path) -> tuple[bytes, str]:
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(f"Fault spec file not found: {path}")
-
     suffix = p.suffix.lower()
-    if suffix in (".yaml", ".yml"):
-        raw = _load_yaml(p)
-    elif suffix == ".json":
-        raw = _load_json(p)
-    else:
+    if suffix not in (".yaml", ".yml", ".json"):
         raise ValueError("Fault spec file must end with .yaml/.yml or .json")
+    return p.read_bytes(), suffix
+
 
+def read_fault_spec_file(path: str | Path) -> Any:
+    """Parsed YAML/JSON content of a fault spec file, not yet validated."""
+    return _parse_bytes(*_read_bytes(path))
+
+
+def parse_fault_specs(raw: Any) -> list[FaultSpec]:
+    """
+    Fault specs from parsed YAML/JSON content.
+
+    Supported shapes:
+      1) dict with key 'faults': { faults: [ ... ] }
+      2) list root: [ ... ]
+    """
     if raw is None:
         return []
 
@@ -59,4 +80,63 @@ def load_fault_specs(path: str) -> list[FaultSpec]:
     if len(ids) != len(set(ids)):
         raise ValueError("Fault IDs must be unique")
 
-    return specs
\ No newline at end of file
+    return specs
+
+
+def _cache_path(cache_dir: Path, data: bytes, suffix: str) -> Path:
+    h = hashlib.sha256(data)
+    h.update(f"|{suffix}|{_CACHE_FORMAT}|{pickle.HIGHEST_PROTOCOL}".encode("ascii"))
+    return cache_dir / f"{h.hexdigest()}.pickle"
+
+
+def _read_cache(path: Path) -> Optional[list[FaultSpec]]:
+    try:
+        with open(path, "rb") as f:
+            specs = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Truncated or written by an incompatible version: rebuild it.
+        return None
+    if not isinstance(specs, list) or not all(isinstance(s, FaultSpec) for s in specs):
+        return None
+    return specs
+
+
+def _write_cache(path: Path, specs: list[FaultSpec]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so concurrent workers never read a partial file.
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".spec-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(specs, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass  # the cache is an optimization; an unwritable directory just means no cache
+
+
+def load_fault_specs(path: str, *, cache_dir: str | os.PathLike[str] | None = None) -> list[FaultSpec]:
+    """
+    Load fault specs from YAML/JSON file (see parse_fault_specs for the shapes).
+
+    With `cache_dir` (or the LLMMAS_OTEL_SPEC_CACHE_DIR environment variable)
+    the validated specs are pickled there, keyed by a hash of the file's
+    content, and later loads of the same content skip parsing and validation.
+    Only point it at a directory you trust: cache files are unpickled.
+    """
+    data, suffix = _read_bytes(path)
+    if cache_dir is None:
+        cache_dir = os.environ.get(CACHE_DIR_ENV) or None
+    if cache_dir is None:
+        return parse_fault_specs(_parse_bytes(data, suffix))
+
+    cached_path = _cache_path(Path(cache_dir), data, suffix)
+    specs = _read_cache(cached_path)
+    if specs is None:
+        specs = parse_fault_specs(_parse_bytes(data, suffix))
+        _write_cache(cached_path, specs)
+    return specs
@@ -0,0 +1,36 @@
+"""
+Payload mutations of MUTATE fault actions.
+
+SpecFaultEngine applies them to the live payload, and ReplayFaultEngine
+re-applies a recorded mutation to the payload of the replayed run, so the
+decision log only needs the mutation's parameters, not the mutated text.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Mapping, NamedTuple
+
+from .types import InjectionDecision
+
+
+class Mutation(NamedTuple):
+    fn: Callable[..., str]
+    # Keyword arguments of fn, recorded in the decision's metadata.
+    params: tuple[str, ...]
+
+
+def truncate(payload: str, *, max_chars: int) -> str:
+    return payload[:max_chars]
+
+
+MUTATIONS: dict[str, Mutation] = {
+    "a2a.truncate": Mutation(truncate, ("max_chars",)),
+}
+
+
+def mutate(*, fault_id: str, fault_type: str, payload: str, params: Mapping[str, Any]) -> InjectionDecision:
+    """The MUTATE decision of applying the `fault_type` mutation with `params` to `payload`."""
+    mutation = MUTATIONS[fault_type]
+    kwargs = {name: params[name] for name in mutation.params}
+    mutated = mutation.fn(payload, **kwargs)
+    meta = {"original_len": len(payload), "new_len": len(mutated), **kwargs}
+    return InjectionDecision.mutate(fault_id=fault_id, fault_type=fault_type, mutated_payload=mutated, metadata=meta)
@@ -0,0 +1,199 @@
+"""
+Selector conditions compiled into predicates.
+
+A selector field in a fault spec is either a plain value (exact match) or one
+of these conditions:
+
+    edge_id: {glob: "*->Editor"}           fnmatch-style, case-sensitive
+    agent_id: {regex: "^(Navigator|Editor)"}  re.search
+    tool_name: {in: [pytest, ruff]}        set membership; a plain list is shorthand
+    step_index: {min: 2, max: 5}           numeric range, bounds inclusive, either optional
+
+FaultSelector compiles its fields once, when it is built (so at
+load_fault_specs time), into a single matcher that tests the cheapest and
+most selective conditions first.
+"""
+from __future__ import annotations
+
+import fnmatch
+import operator
+import re
+from collections.abc import Callable, Iterable, Mapping
+from functools import partial
+from typing import Any, Optional
+
+Matcher = Callable[[Any], bool]
+
+
+class Predicate:
+    """A compiled condition on one context value. `cost` orders evaluation (cheap first)."""
+
+    __slots__ = ("test",)
+    cost = 0
+
+    test: Matcher
+
+    def __call__(self, value: Any) -> bool:
+        return self.test(value)
+
+
+class Exact(Predicate):
+    __slots__ = ("value",)
+    cost = 0
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+        self.test = partial(operator.eq, value)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return Exact, (self.value,)
+
+    def __repr__(self) -> str:
+        return f"Exact({self.value!r})"
+
+
+class OneOf(Predicate):
+    __slots__ = ("values",)
+    cost = 1
+
+    def __init__(self, values: Iterable[Any]) -> None:
+        if isinstance(values, (str, bytes, Mapping)):
+            raise ValueError("'in' condition needs a list of values")
+        try:
+            self.values = frozenset(values)
+        except TypeError:
+            raise ValueError("'in' values must be plain scalars") from None
+        if not self.values:
+            raise ValueError("'in' condition needs at least one value")
+        self.test = self.values.__contains__
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return OneOf, (tuple(self.values),)
+
+    def __repr__(self) -> str:
+        return f"OneOf({sorted(self.values, key=repr)!r})"
+
+
+class Range(Predicate):
+    __slots__ = ("min", "max")
+    cost = 2
+
+    def __init__(self, min: Optional[float] = None, max: Optional[float] = None) -> None:
+        for bound in (min, max):
+            if bound is not None and (isinstance(bound, bool) or not isinstance(bound, (int, float))):
+                raise ValueError("range bounds must be numbers")
+        if min is None and max is None:
+            raise ValueError("range condition needs 'min' and/or 'max'")
+        if min is not None and max is not None and min > max:
+            raise ValueError("range 'min' must be <= 'max'")
+        self.min = min
+        self.max = max
+        lo = float("-inf") if min is None else min
+        hi = float("inf") if max is None else max
+
+        def test(value: Any) -> bool:
+            return isinstance(value, (int, float)) and not isinstance(value, bool) and lo <= value <= hi
+
+        self.test = test
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return Range, (self.min, self.max)
+
+    def __repr__(self) -> str:
+        return f"Range(min={self.min!r}, max={self.max!r})"
+
+
+class _Pattern(Predicate):
+    __slots__ = ("pattern",)
+
+    def __init__(self, pattern: str, compiled: re.Pattern[str], method: str) -> None:
+        self.pattern = pattern
+        match = getattr(compiled, method)
+
+        def test(value: Any) -> bool:
+            return isinstance(value, str) and match(value) is not None
+
+        self.test = test
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return type(self), (self.pattern,)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.pattern!r})"
+
+
+class Glob(_Pattern):
+    __slots__ = ()
+    cost = 3
+
+    def __init__(self, pattern: str) -> None:
+        if not isinstance(pattern, str):
+            raise ValueError("glob pattern must be a string")
+        super().__init__(pattern, re.compile(fnmatch.translate(pattern)), "match")
+
+
+class Regex(_Pattern):
+    __slots__ = ()
+    cost = 4
+
+    def __init__(self, pattern: str) -> None:
+        if not isinstance(pattern, str):
+            raise ValueError("regex pattern must be a string")
+        try:
+            compiled = re.compile(pattern)
+        except re.error as exc:
+            raise ValueError(f"invalid regex {pattern!r}: {exc}") from None
+        super().__init__(pattern, compiled, "search")
+
+
+_CONDITIONS: dict[str, Callable[[Any], Predicate]] = {
+    "glob": Glob,
+    "regex": Regex,
+    "in": OneOf,
+}
+
+
+def compile_condition(raw: Any) -> Predicate:
+    """Predicate for one selector field value (see the module docstring for the forms)."""
+    if isinstance(raw, Predicate):
+        return raw
+    if isinstance(raw, (list, tuple, set, frozenset)):
+        return OneOf(raw)
+    if isinstance(raw, Mapping):
+        keys = set(raw)
+        if keys and keys <= {"min", "max"}:
+            return Range(raw.get("min"), raw.get("max"))
+        if len(raw) == 1:
+            (kind, arg), = raw.items()
+            factory = _CONDITIONS.get(kind)
+            if factory is not None:
+                return factory(arg)
+        raise ValueError(
+            f"unknown selector condition {dict(raw)!r}; expected one of "
+            "{glob: ...}, {regex: ...}, {in: [...]}, {min: ..., max: ...}"
+        )
+    return Exact(raw)
+
+
+def compile_matcher(predicates: Iterable[tuple[str, Predicate]]) -> Callable[[Any], bool]:
+    """
+    One function testing every (attribute, predicate) pair against an object,
+    cheapest predicate kinds first.
+    """
+    checks = [
+        (operator.attrgetter(name), predicate.test)
+        for name, predicate in sorted(predicates, key=lambda item: type(item[1]).cost)
+    ]
+    if not checks:
+        return lambda ctx: True
+    if len(checks) == 1:
+        (get, test), = checks
+        return lambda ctx: test(get(ctx))
+
+    def matches(ctx: Any) -> bool:
+        for get, test in checks:
+            if not test(get(ctx)):
+                return False
+        return True
+
+    return matches
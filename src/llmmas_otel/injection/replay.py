@@ -0,0 +1,251 @@
+"""
+Record the fault decisions of one run and replay them in another.
+
+RecordingFaultEngine wraps any FaultEngine and appends every decision that is
+not PASS to a JSON-lines decision log. ReplayFaultEngine reads the log and
+answers each hook call with a dict lookup, without evaluating selectors,
+limits or coin flips, so a replayed run sees exactly the faults of the
+recorded one.
+
+A hook call is identified by its session, hook, phase, agent, edge and tool,
+plus how many calls with those same fields came before it in the session.
+Message, tool call and request ids are left out because they may be random.
+The replayed run has to make the same hook calls in the same order per
+session; calls that were not recorded pass through.
+
+MUTATE decisions are logged with the mutation's parameters and the sha256 of
+the payload they were applied to, not with the mutated text. Replay applies
+the mutation again to the live payload; if that payload differs from the
+recorded one, the decision's metadata carries replay_payload_changed=True.
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import threading
+from dataclasses import dataclass, field
+from os import PathLike
+from pathlib import Path
+from typing import IO, Any, Optional
+
+from .engine import FaultEngine
+from .mutations import MUTATIONS, mutate
+from .types import DecisionKind, HookContext, HookType, InjectionDecision
+
+LOG_FORMAT = "llmmas-decisions"
+LOG_VERSION = 2
+# Version 1 logs stored the mutated text of MUTATE decisions; they are replayed as recorded.
+_READABLE_VERSIONS = (1, 2)
+
+# (session, hook, phase, agent, edge, tool, occurrence)
+ReplayKey = tuple[str, str, Optional[str], Optional[str], Optional[str], Optional[str], int]
+
+
+class _Occurrences:
+    """Per-session count of hook calls with the same identifying fields."""
+
+    def __init__(self) -> None:
+        self._counts: dict[str, dict[tuple[Any, ...], int]] = {}
+        self._lock = threading.Lock()
+
+    def key(self, ctx: HookContext) -> ReplayKey:
+        session_id = ctx.session_id or "__global__"
+        fields = (ctx.hook_type.value, ctx.phase_name, ctx.agent_id, ctx.edge_id, ctx.tool_name)
+        with self._lock:
+            counts = self._counts.setdefault(session_id, {})
+            n = counts.get(fields, 0)
+            counts[fields] = n + 1
+        return (session_id, *fields, n)
+
+    def release(self, session_id: str) -> None:
+        with self._lock:
+            self._counts.pop(session_id, None)
+
+
+def _exception_to_json(exc: Optional[BaseException]) -> Optional[dict[str, Any]]:
+    if exc is None:
+        return None
+    cls = type(exc)
+    return {"type": f"{cls.__module__}:{cls.__qualname__}", "args": [str(a) for a in exc.args]}
+
+
+def _exception_from_json(raw: Optional[dict[str, Any]]) -> Optional[Exception]:
+    if raw is None:
+        return None
+    module_name, _, qualname = raw["type"].partition(":")
+    args = raw.get("args") or []
+    # Only rebuild exception classes from modules that are safe to import; anything else becomes RuntimeError.
+    if module_name != "builtins" and module_name.split(".")[0] != "llmmas_otel":
+        return RuntimeError(*args)
+    try:
+        obj: Any = importlib.import_module(module_name)
+        for part in qualname.split("."):
+            obj = getattr(obj, part)
+        if isinstance(obj, type) and issubclass(obj, Exception):
+            return obj(*args)
+    except Exception:
+        pass
+    return RuntimeError(*args)
+
+
+def _sha256_hex(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def decision_to_json(decision: InjectionDecision, payload: Optional[str] = None) -> dict[str, Any]:
+    """
+    Compact JSON form of a decision; fields at their defaults are left out.
+
+    A MUTATE decision of a known mutation keeps only its parameters (in
+    metadata) and the sha256 of `payload`, the text it was applied to.
+    """
+    out: dict[str, Any] = {"kind": decision.kind.value}
+    if decision.fault_id is not None:
+        out["fault_id"] = decision.fault_id
+    if decision.fault_type is not None:
+        out["fault_type"] = decision.fault_type
+    if decision.delay_ms is not None:
+        out["delay_ms"] = decision.delay_ms
+    if decision.kind == DecisionKind.MUTATE and decision.fault_type in MUTATIONS:
+        if payload is not None:
+            out["payload_sha256"] = _sha256_hex(payload)
+    elif decision.mutated_payload is not None:
+        out["mutated_payload"] = decision.mutated_payload
+    if decision.raise_exception is not None:
+        out["exception"] = _exception_to_json(decision.raise_exception)
+    if decision.kind == DecisionKind.RETURN:
+        out["return_value"] = decision.return_value
+    if decision.metadata:
+        out["metadata"] = decision.metadata
+    return out
+
+
+def decision_from_json(raw: dict[str, Any]) -> InjectionDecision:
+    return InjectionDecision(
+        kind=DecisionKind(raw["kind"]),
+        fault_id=raw.get("fault_id"),
+        fault_type=raw.get("fault_type"),
+        delay_ms=raw.get("delay_ms"),
+        mutated_payload=raw.get("mutated_payload"),
+        raise_exception=_exception_from_json(raw.get("exception")),
+        return_value=raw.get("return_value"),
+        metadata=raw.get("metadata") or {},
+    )
+
+
+@dataclass
+class RecordingFaultEngine(FaultEngine):
+    """
+    Delegates to `engine` and writes its non-PASS decisions to `path`.
+
+    Lines are written as decisions are made; call close() (or use the engine
+    as a context manager) to flush the log when the run is done.
+    """
+    engine: FaultEngine
+    path: str | PathLike[str]
+    _occurrences: _Occurrences = field(default_factory=_Occurrences, init=False, repr=False)
+    _file: IO[str] = field(init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write(json.dumps({"format": LOG_FORMAT, "version": LOG_VERSION}) + "\n")
+
+    def decide(self, ctx: HookContext, payload: Optional[str] = None) -> InjectionDecision:
+        key = self._occurrences.key(ctx)
+        decision = self.engine.decide(ctx, payload)
+        if decision.kind != DecisionKind.PASS:
+            line = json.dumps(
+                {"key": key, "decision": decision_to_json(decision, payload)}, separators=(",", ":"), default=str
+            )
+            with self._lock:
+                self._file.write(line + "\n")
+        return decision
+
+    def release_session(self, session_id: str) -> None:
+        self._occurrences.release(session_id)
+        self.engine.release_session(session_id)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self) -> "RecordingFaultEngine":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _read_decision_log(
+    path: str | PathLike[str],
+) -> tuple[dict[ReplayKey, InjectionDecision], dict[ReplayKey, str]]:
+    decisions: dict[ReplayKey, InjectionDecision] = {}
+    payload_sha256: dict[ReplayKey, str] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != LOG_FORMAT or header.get("version") not in _READABLE_VERSIONS:
+            raise ValueError(f"{path} is not a version {LOG_VERSION} {LOG_FORMAT} log")
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                key: ReplayKey = tuple(entry["key"])  # type: ignore[assignment]
+                HookType(key[1])  # reject unknown hooks early
+                raw = entry["decision"]
+                decisions[key] = decision_from_json(raw)
+                if "payload_sha256" in raw:
+                    payload_sha256[key] = raw["payload_sha256"]
+    return decisions, payload_sha256
+
+
+def load_decision_log(path: str | PathLike[str]) -> dict[ReplayKey, InjectionDecision]:
+    """Decisions recorded by RecordingFaultEngine, keyed by hook call."""
+    return _read_decision_log(path)[0]
+
+
+@dataclass
+class ReplayFaultEngine(FaultEngine):
+    """
+    Answers every hook call with the decision recorded for it, or PASS.
+
+    Recorded mutations are applied again to the live payload. `payload_sha256`
+    holds the hash of the payload each one was recorded on.
+    """
+    decisions: dict[ReplayKey, InjectionDecision]
+    payload_sha256: dict[ReplayKey, str] = field(default_factory=dict)
+    _occurrences: _Occurrences = field(default_factory=_Occurrences, init=False, repr=False)
+
+    @classmethod
+    def from_file(cls, path: str | PathLike[str]) -> "ReplayFaultEngine":
+        return cls(*_read_decision_log(path))
+
+    def decide(self, ctx: HookContext, payload: Optional[str] = None) -> InjectionDecision:
+        key = self._occurrences.key(ctx)
+        decision = self.decisions.get(key)
+        if decision is None:
+            return InjectionDecision.pass_through()
+        if decision.kind == DecisionKind.MUTATE and decision.mutated_payload is None:
+            return self._mutate(key, decision, payload)
+        return decision
+
+    def _mutate(self, key: ReplayKey, decision: InjectionDecision, payload: Optional[str]) -> InjectionDecision:
+        if decision.fault_type not in MUTATIONS:
+            raise ValueError(f"Fault '{decision.fault_id}': cannot replay unknown mutation '{decision.fault_type}'")
+        if payload is None:
+            raise ValueError(f"Fault '{decision.fault_id}': replaying {decision.fault_type} requires a string payload")
+        replayed = mutate(
+            fault_id=decision.fault_id or "",
+            fault_type=decision.fault_type,
+            payload=payload,
+            params=decision.metadata,
+        )
+        recorded = self.payload_sha256.get(key)
+        if recorded is not None and recorded != _sha256_hex(payload):
+            replayed.metadata["replay_payload_changed"] = True
+        return replayed
+
+    def release_session(self, session_id: str) -> None:
+        self._occurrences.release(session_id)
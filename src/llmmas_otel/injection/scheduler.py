@@ -0,0 +1,175 @@
+"""
+Timer wheel for injected delays.
+
+With delay_mode="scheduled", a delayed A2A message is not slept on by the
+sending thread; A2ASendContext.deliver() puts the delivery callback on a
+TimerWheel instead. One background thread serves all pending timers, so
+thousands of concurrently delayed messages cost one list entry each rather
+than one blocked thread each.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+import traceback
+from collections.abc import Callable
+from typing import Any, Optional
+
+
+class Timer:
+    """Handle returned by TimerWheel.schedule()."""
+
+    __slots__ = ("deadline", "callback", "args", "kwargs", "rounds", "cancelled")
+
+    def __init__(
+        self,
+        deadline: float,
+        callback: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        rounds: int,
+    ) -> None:
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs
+        self.rounds = rounds
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Prevent the callback from running if it has not run yet."""
+        self.cancelled = True
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel with `slots` buckets of `tick_s` seconds each.
+
+    A timer lands in the bucket its deadline falls into and carries the number
+    of full wheel turns left before it is due, so scheduling and expiring are
+    O(1) regardless of how many timers are pending. Callbacks run on the wheel
+    thread, in deadline order within a tick, and at most one tick late.
+    Exceptions raised by callbacks are printed and do not stop the wheel.
+    """
+
+    def __init__(self, *, tick_s: float = 0.001, slots: int = 512, name: str = "llmmas-timer-wheel") -> None:
+        if tick_s <= 0:
+            raise ValueError("tick_s must be > 0")
+        if slots <= 0:
+            raise ValueError("slots must be > 0")
+        self.tick_s = tick_s
+        self._slots: list[list[Timer]] = [[] for _ in range(slots)]
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._closed = False
+        self._start = time.monotonic()
+        self._tick = 0  # next tick to expire
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def schedule(self, delay_s: float, callback: Callable[..., Any], *args: Any, **kwargs: Any) -> Timer:
+        """Run callback(*args, **kwargs) on the wheel thread after `delay_s` seconds."""
+        deadline = time.monotonic() + max(delay_s, 0.0)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("TimerWheel is shut down")
+            if self._pending == 0:
+                # Skip the ticks that passed while idle; their buckets are empty.
+                self._tick = max(self._tick, int((time.monotonic() - self._start) // self.tick_s))
+            # Ceil so a timer never fires before its deadline.
+            due = max(-int(-(deadline - self._start) // self.tick_s), self._tick)
+            slots = len(self._slots)
+            timer = Timer(deadline, callback, args, kwargs, (due - self._tick) // slots)
+            self._slots[due % slots].append(timer)
+            self._pending += 1
+            self._cond.notify()
+        return timer
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def pending(self) -> int:
+        """Timers scheduled and not yet expired (cancelled ones included until their tick)."""
+        with self._cond:
+            return self._pending
+
+    def shutdown(self, *, run_pending: bool = False) -> None:
+        """
+        Stop the wheel thread. Pending timers are dropped, or run immediately
+        on the calling thread with run_pending=True.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        leftover = sorted((t for slot in self._slots for t in slot), key=lambda t: t.deadline)
+        for slot in self._slots:
+            slot.clear()
+        self._pending = 0
+        if run_pending:
+            self._fire(leftover)
+
+    def _run(self) -> None:
+        slots = len(self._slots)
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._pending == 0:
+                        self._cond.wait()
+                        continue
+                    wait = self._start + (self._tick + 1) * self.tick_s - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                if self._closed:
+                    return
+                bucket = self._slots[self._tick % slots]
+                due = [t for t in bucket if t.rounds == 0]
+                kept = []
+                for t in bucket:
+                    if t.rounds:
+                        t.rounds -= 1
+                        kept.append(t)
+                bucket[:] = kept
+                self._pending -= len(due)
+                self._tick += 1
+            if due:
+                due.sort(key=lambda t: t.deadline)
+                self._fire(due)
+
+    @staticmethod
+    def _fire(timers: list[Timer]) -> None:
+        for timer in timers:
+            if timer.cancelled:
+                continue
+            try:
+                timer.callback(*timer.args, **timer.kwargs)
+            except Exception:
+                traceback.print_exc()
+
+
+_WHEEL: Optional[TimerWheel] = None
+_WHEEL_PID: Optional[int] = None
+_WHEEL_LOCK = threading.Lock()
+
+
+def get_timer_wheel() -> TimerWheel:
+    """
+    The process-wide wheel used by delay_mode="scheduled", started on first use.
+
+    A forked child does not inherit the parent's wheel thread, so it gets a
+    wheel of its own.
+    """
+    global _WHEEL, _WHEEL_PID
+    wheel = _WHEEL
+    if wheel is None or wheel.closed or _WHEEL_PID != os.getpid():
+        with _WHEEL_LOCK:
+            if _WHEEL is None or _WHEEL.closed or _WHEEL_PID != os.getpid():
+                _WHEEL = TimerWheel()
+                _WHEEL_PID = os.getpid()
+            wheel = _WHEEL
+    return wheel
@@ -1,45 +1,75 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from typing import Any, Optional
 
+from .predicates import Predicate, compile_condition, compile_matcher
 from .types import HookType
 
 
+SELECTOR_FIELDS: tuple[str, ...] = (
+    "phase_name", "phase_order",
+    "agent_id", "step_index",
+    "source_agent_id", "target_agent_id", "edge_id", "message_id", "channel",
+    "tool_name", "tool_type", "tool_call_id",
+)
+
+
 @dataclass(frozen=True)
 class FaultSelector:
     """
     Matches where a fault applies. All fields are optional; absent fields are 'don't care'.
     Keys not recognized are stored in `extras`.
+
+    A field holds either a plain value (exact match) or a condition:
+    {glob: ...}, {regex: ...}, {in: [...]} (or a plain list), {min: ..., max: ...}.
+    See llmmas_otel.injection.predicates. Conditions are compiled when the
+    selector is created; invalid ones raise ValueError.
     """
-    phase_name: Optional[str] = None
-    phase_order: Optional[int] = None
+    phase_name: Optional[Any] = None
+    phase_order: Optional[Any] = None
 
-    agent_id: Optional[str] = None
-    step_index: Optional[int] = None
+    agent_id: Optional[Any] = None
+    step_index: Optional[Any] = None
 
-    source_agent_id: Optional[str] = None
-    target_agent_id: Optional[str] = None
-    edge_id: Optional[str] = None
-    message_id: Optional[str] = None
-    channel: Optional[str] = None
+    source_agent_id: Optional[Any] = None
+    target_agent_id: Optional[Any] = None
+    edge_id: Optional[Any] = None
+    message_id: Optional[Any] = None
+    channel: Optional[Any] = None
 
-    tool_name: Optional[str] = None
-    tool_type: Optional[str] = None
-    tool_call_id: Optional[str] = None
+    tool_name: Optional[Any] = None
+    tool_type: Optional[Any] = None
+    tool_call_id: Optional[Any] = None
 
     extras: dict[str, Any] = field(default_factory=dict)
 
+    # (field name, predicate) for every constrained field, and the compiled HookContext matcher.
+    predicates: tuple[tuple[str, Predicate], ...] = field(init=False, repr=False, compare=False)
+    matches: Callable[[Any], bool] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        predicates = []
+        for name in SELECTOR_FIELDS:
+            raw = getattr(self, name)
+            if raw is None:
+                continue
+            try:
+                predicates.append((name, compile_condition(raw)))
+            except ValueError as exc:
+                raise ValueError(f"selector.{name}: {exc}") from None
+        object.__setattr__(self, "predicates", tuple(predicates))
+        object.__setattr__(self, "matches", compile_matcher(predicates))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # The compiled matcher is a closure; pickle the raw fields and recompile on load.
+        return FaultSelector, tuple(getattr(self, name) for name in SELECTOR_FIELDS) + (self.extras,)
+
     @staticmethod
     def from_dict(d: dict[str, Any]) -> "FaultSelector":
-        known = {
-            "phase_name", "phase_order",
-            "agent_id", "step_index",
-            "source_agent_id", "target_agent_id", "edge_id", "message_id", "channel",
-            "tool_name", "tool_type", "tool_call_id",
-        }
-        kwargs = {k: d.get(k) for k in known if k in d}
-        extras = {k: v for k, v in d.items() if k not in known}
+        kwargs = {k: d.get(k) for k in SELECTOR_FIELDS if k in d}
+        extras = {k: v for k, v in d.items() if k not in SELECTOR_FIELDS}
         return FaultSelector(**kwargs, extras=extras)
 
 
@@ -128,7 +158,10 @@ class FaultSpec:
         sel_raw = d.get("selector") or {}
         if not isinstance(sel_raw, dict):
             raise ValueError(f"Fault '{fid}': 'selector' must be a dict")
-        selector = FaultSelector.from_dict(sel_raw)
+        try:
+            selector = FaultSelector.from_dict(sel_raw)
+        except ValueError as exc:
+            raise ValueError(f"Fault '{fid}': {exc}") from None
 
         # action
         act_raw = d.get("action")
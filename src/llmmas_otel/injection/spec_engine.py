@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import hashlib
+import threading
 from dataclasses import dataclass, field
-from typing import Optional, Any
+from typing import Iterable, Optional, Any
 
+from ..session_state import SessionStateCache
 from .engine import FaultEngine
+from .index import SpecIndex
 from .matcher import selector_matches
+from .mutations import mutate
 from .spec import FaultSpec
 from .types import HookContext, InjectionDecision, DecisionKind
 from .exceptions import LLMRateLimitError, LLMNetworkError, LLMTimeoutError
@@ -23,6 +27,64 @@ def _stable_coin_flip(probability: float, *, seed: str, session_id: str, fault_i
     return v < probability
 
 
+class _ShardedCounts:
+    """
+    session id -> {fault id: times applied}, split over `shards` locks.
+
+    A session always maps to the same shard, so the check-and-increment for
+    one session is atomic under its shard's lock while other sessions proceed
+    on other shards.
+
+    max_sessions bounds the total over all shards, not each shard, so an
+    uneven spread of sessions over shards never evicts a session while fewer
+    than max_sessions are kept. When a new session takes the total over the
+    cap, the shard it lands in drops its least recently used session; a shard
+    keeps its one newest session, so the total can exceed the cap by at most
+    shards - 1.
+    """
+
+    def __init__(self, shards: int, max_sessions: int, ttl_s: Optional[float]) -> None:
+        if shards <= 0:
+            raise ValueError("counter_shards must be > 0")
+        self.max_sessions = max_sessions
+        self._shards = [
+            (threading.Lock(), SessionStateCache(dict, max_sessions=max_sessions, ttl_s=ttl_s)) for _ in range(shards)
+        ]
+
+    def shard(self, session_id: str) -> tuple[threading.Lock, SessionStateCache[dict[str, int]]]:
+        return self._shards[hash(session_id) % len(self._shards)]
+
+    def applied(self, counts: SessionStateCache[dict[str, int]], session_id: str) -> dict[str, int]:
+        """Counters of `session_id` in its shard `counts`, created if missing. Call with the shard's lock held."""
+        new = session_id not in counts
+        applied = counts.get(session_id)
+        # Summing the shard sizes only happens when a session is added, not per decision.
+        if new and len(counts) > 1 and len(self) > self.max_sessions:
+            counts.popitem()
+        return applied
+
+    def pop(self, session_id: str) -> None:
+        lock, counts = self.shard(session_id)
+        with lock:
+            counts.pop(session_id)
+
+    def forget(self, fault_ids: set[str]) -> None:
+        """Reset the counters of `fault_ids` in every session."""
+        for lock, counts in self._shards:
+            with lock:
+                for session_id in counts:
+                    applied = counts.peek(session_id)
+                    if applied:
+                        for fault_id in fault_ids & applied.keys():
+                            del applied[fault_id]
+
+    def __contains__(self, session_id: object) -> bool:
+        return isinstance(session_id, str) and session_id in self.shard(session_id)[1]
+
+    def __len__(self) -> int:
+        return sum(len(counts) for _, counts in self._shards)
+
+
 @dataclass
 class SpecFaultEngine(FaultEngine):
     """
@@ -31,49 +93,103 @@ class SpecFaultEngine(FaultEngine):
       - A2A_SEND / A2A_RECEIVE
       - TOOL_CALL
       - LLM_CALL (M2.8/M3.0)
+
+    Specs are compiled into a SpecIndex at construction, so decide() only
+    evaluates specs that can match the hook and its edge/tool/agent/phase.
+    indexed=False keeps the plain linear scan over all specs.
+
+    max_times counters are kept per session and dropped when the session
+    ends. Sessions that are never released are bounded by max_sessions (least
+    recently used of the receiving counter shard evicted first, at most
+    counter_shards - 1 over the cap) and, if set, session_ttl_s.
+
+    decide() is thread-safe: the max_times check, the coin flip and the
+    increment happen under the lock of the session's counter shard, so
+    concurrent calls never exceed max_times.
+
+    The coin flip is seeded by session, fault id and the number of times the
+    fault was already applied in the session, and that number only grows when
+    the flip succeeds. After a failed flip, later matching calls in the same
+    session flip the same coin and pass too, until the counters are released.
+
+    replace_specs() swaps in a new spec list while the engine is in use;
+    counters of specs that are unchanged (same id, equal definition) carry over.
     """
     specs: list[FaultSpec]
     seed: str = "0"
-    _counts: dict[tuple[str, str], int] = field(default_factory=dict)
+    indexed: bool = True
+    max_sessions: int = 10_000
+    session_ttl_s: Optional[float] = None
+    counter_shards: int = 64
+    _counts: _ShardedCounts = field(init=False, repr=False)
+    _index: Optional[SpecIndex] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._counts = _ShardedCounts(self.counter_shards, self.max_sessions, self.session_ttl_s)
+        if self.indexed:
+            self._index = SpecIndex(self.specs)
+
+    def _candidates(self, ctx: HookContext) -> Iterable[FaultSpec]:
+        index = self._index
+        if index is not None:
+            return index.candidates(ctx)
+        return (spec for spec in self.specs if ctx.hook_type in spec.hooks)
+
+    def replace_specs(self, specs: list[FaultSpec]) -> None:
+        """
+        Use `specs` from now on. The new index is built before it replaces the
+        old one, so concurrent decide() calls see either the old or the new
+        specs, never a mix. max_times counters are kept for specs whose id and
+        definition are unchanged and reset for specs that changed or were removed.
+        """
+        old = {spec.id: spec for spec in self.specs}
+        new_ids = {spec.id for spec in specs}
+        if len(new_ids) != len(specs):
+            raise ValueError("Fault IDs must be unique")
+        changed = {spec.id for spec in specs if spec.id in old and old[spec.id] != spec}
+        changed |= old.keys() - new_ids
+
+        index = SpecIndex(specs) if self.indexed else None
+        # Linear scans read self.specs, indexed ones self._index; each swap is a single store.
+        self.specs = list(specs)
+        self._index = index
+        if changed:
+            self._counts.forget(changed)
 
     def _session_key(self, ctx: HookContext) -> str:
         return ctx.session_id or "__global__"
 
-    def _get_count(self, session_id: str, fault_id: str) -> int:
-        return self._counts.get((session_id, fault_id), 0)
-
-    def _inc_count(self, session_id: str, fault_id: str) -> int:
-        key = (session_id, fault_id)
-        self._counts[key] = self._counts.get(key, 0) + 1
-        return self._counts[key]
+    def release_session(self, session_id: str) -> None:
+        self._counts.pop(session_id)
 
     def decide(self, ctx: HookContext, payload: Optional[str] = None) -> InjectionDecision:
         session_id = self._session_key(ctx)
+        lock, counts = self._counts.shard(session_id)
 
-        for spec in self.specs:
-            if ctx.hook_type not in spec.hooks:
-                continue
+        for spec in self._candidates(ctx):
             if not selector_matches(spec.selector, ctx):
                 continue
 
-            already = self._get_count(session_id, spec.id)
-            if spec.limits.max_times is not None and already >= spec.limits.max_times:
-                continue
+            with lock:
+                applied = counts.peek(session_id)
+                already = applied.get(spec.id, 0) if applied is not None else 0
+                if spec.limits.max_times is not None and already >= spec.limits.max_times:
+                    continue
 
-            attempt = already + 1
-            if not _stable_coin_flip(
-                spec.limits.probability,
-                seed=self.seed,
-                session_id=session_id,
-                fault_id=spec.id,
-                attempt=attempt,
-            ):
-                continue
+                attempt = already + 1
+                if not _stable_coin_flip(
+                    spec.limits.probability,
+                    seed=self.seed,
+                    session_id=session_id,
+                    fault_id=spec.id,
+                    attempt=attempt,
+                ):
+                    continue
 
-            decision = self._action_to_decision(spec, ctx, payload)
+                decision = self._action_to_decision(spec, ctx, payload)
 
-            if decision.kind != DecisionKind.PASS:
-                self._inc_count(session_id, spec.id)
+                if decision.kind != DecisionKind.PASS:
+                    self._counts.applied(counts, session_id)[spec.id] = attempt
 
             return decision
 
@@ -98,9 +214,7 @@ class SpecFaultEngine(FaultEngine):
             max_chars = spec.action.params.get("max_chars")
             if not isinstance(max_chars, int) or max_chars < 0:
                 raise ValueError(f"Fault '{spec.id}': a2a.truncate requires integer params.max_chars >= 0")
-            mutated = payload[:max_chars]
-            meta = {"original_len": len(payload), "new_len": len(mutated), "max_chars": max_chars}
-            return InjectionDecision.mutate(fault_id=spec.id, fault_type=t, mutated_payload=mutated, metadata=meta)
+            return mutate(fault_id=spec.id, fault_type=t, payload=payload, params={"max_chars": max_chars})
 
         # ---------------- TOOL faults ----------------
         if t == "tool.delay":
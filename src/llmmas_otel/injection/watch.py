@@ -0,0 +1,201 @@
+"""
+Fault specs from a directory of YAML/JSON files, reloaded while running.
+
+SpecDirectory keeps the parsed specs of every file and, on refresh(),
+re-parses only files whose modification time or size changed. SpecWatcher
+polls a SpecDirectory from a background thread and hands the combined spec
+list to SpecFaultEngine.replace_specs(), so a campaign can be edited during a
+long run without disable/enable resetting the max_times counters.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import traceback
+from pathlib import Path
+from typing import Optional
+
+import yaml
+
+from .engine import enable_fault_injection as _enable_engine
+from .loader import parse_fault_specs, read_fault_spec_file
+from .spec import FaultSpec
+from .spec_engine import SpecFaultEngine
+
+SPEC_SUFFIXES = (".yaml", ".yml", ".json")
+
+# (st_mtime_ns, st_size); a file is re-parsed when either changes.
+_Stamp = tuple[int, int]
+
+
+class SpecDirectory:
+    """
+    The fault specs of every *.yaml, *.yml and *.json file directly in `path`.
+
+    Files are combined in file name order and keep their internal order, so
+    prefix names (10_llm.yaml, 20_a2a.yaml) to control first-match priority.
+    Fault ids must be unique across all files.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        if not self.path.is_dir():
+            raise NotADirectoryError(f"Fault spec directory not found: {path}")
+        self._files: dict[Path, tuple[_Stamp, list[FaultSpec]]] = {}
+        self._specs: list[FaultSpec] = []
+        self.refresh()
+
+    @property
+    def specs(self) -> list[FaultSpec]:
+        return list(self._specs)
+
+    def files(self) -> list[Path]:
+        return sorted(self._files)
+
+    def refresh(self) -> bool:
+        """
+        Re-read files that were added, changed or removed since the last call.
+
+        Returns True if the combined spec list changed. If any file fails to
+        parse, or ids collide across files, raises ValueError and keeps the
+        previous specs of every file, so a half-saved edit is picked up on
+        the next successful refresh instead of taking effect partially.
+        """
+        current: dict[Path, _Stamp] = {}
+        for entry in os.scandir(self.path):
+            path = Path(entry.path)
+            if path.suffix.lower() in SPEC_SUFFIXES and entry.is_file():
+                st = entry.stat()
+                current[path] = (st.st_mtime_ns, st.st_size)
+
+        files: dict[Path, tuple[_Stamp, list[FaultSpec]]] = {}
+        changed = current.keys() != self._files.keys()
+        for path, stamp in current.items():
+            cached = self._files.get(path)
+            if cached is not None and cached[0] == stamp:
+                files[path] = cached
+                continue
+            try:
+                specs = parse_fault_specs(read_fault_spec_file(path))
+            except (OSError, ValueError, yaml.YAMLError) as exc:
+                raise ValueError(f"{path.name}: {exc}") from exc
+            files[path] = (stamp, specs)
+            changed = changed or cached is None or cached[1] != specs
+
+        if not changed:
+            self._files = files
+            return False
+
+        combined = [spec for path in sorted(files) for spec in files[path][1]]
+        seen: dict[str, Path] = {}
+        for path in sorted(files):
+            for spec in files[path][1]:
+                if spec.id in seen:
+                    raise ValueError(f"Fault id '{spec.id}' is defined in both {seen[spec.id].name} and {path.name}")
+                seen[spec.id] = path
+
+        self._files = files
+        self._specs = combined
+        return True
+
+
+class SpecWatcher:
+    """
+    Polls `source` every `interval_s` seconds and applies changes to `engine`.
+
+    A refresh that fails (bad YAML, duplicate ids) is printed and stored in
+    `last_error`; the engine keeps its current specs until a later refresh
+    succeeds.
+    """
+
+    def __init__(self, source: SpecDirectory, engine: SpecFaultEngine, *, interval_s: float = 1.0) -> None:
+        if interval_s <= 0:
+            raise ValueError("interval_s must be > 0")
+        self.source = source
+        self.engine = engine
+        self.interval_s = interval_s
+        self.reloads = 0
+        self.last_error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> bool:
+        """Refresh now; returns True if the engine got new specs."""
+        with self._lock:
+            try:
+                changed = self.source.refresh()
+            except ValueError as exc:
+                self.last_error = exc
+                raise
+            self.last_error = None
+            if changed:
+                self.engine.replace_specs(self.source.specs)
+                self.reloads += 1
+            return changed
+
+    def start(self) -> "SpecWatcher":
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="llmmas-spec-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            try:
+                self.check()
+            except Exception:
+                traceback.print_exc()
+
+    def __enter__(self) -> "SpecWatcher":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+_WATCHER: Optional[SpecWatcher] = None
+
+
+def enable_fault_injection_from_dir(
+    path: str | os.PathLike[str],
+    *,
+    seed: str = "0",
+    trace_visible: bool = True,
+    delay_mode: str = "inline",
+    watch: bool = True,
+    interval_s: float = 1.0,
+) -> SpecWatcher:
+    """
+    Load every spec file in `path` into a SpecFaultEngine and enable injection
+    globally. With watch=True the directory is polled and edits are applied
+    without restarting the engine. Calling this again, or
+    stop_fault_spec_watcher(), stops the previous watcher.
+    """
+    global _WATCHER
+    source = SpecDirectory(path)
+    engine = SpecFaultEngine(specs=source.specs, seed=seed)
+    watcher = SpecWatcher(source, engine, interval_s=interval_s)
+    stop_fault_spec_watcher()
+    _enable_engine(engine, trace_visible=trace_visible, delay_mode=delay_mode)
+    if watch:
+        _WATCHER = watcher.start()
+    return watcher
+
+
+def stop_fault_spec_watcher(*, unless_engine: object = None) -> None:
+    """Stop the watcher started by enable_fault_injection_from_dir(), unless it feeds `unless_engine`."""
+    global _WATCHER
+    watcher = _WATCHER
+    if watcher is None or (unless_engine is not None and watcher.engine is unless_engine):
+        return
+    _WATCHER = None
+    watcher.stop()
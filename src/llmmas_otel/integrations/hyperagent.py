@@ -6,7 +6,6 @@ import hashlib
 import inspect
 import os
 import re
-import uuid
 from collections import defaultdict
 from contextlib import contextmanager
 from contextvars import ContextVar
@@ -16,7 +15,9 @@ from opentelemetry.trace.status import Status, StatusCode
 
 from llmmas_otel import semconv
 from llmmas_otel import message_store
+from llmmas_otel.ids import new_id, new_token
 from llmmas_otel.message_store import enable_message_store
+from llmmas_otel.session_state import SessionStateCache, on_session_end
 from llmmas_otel.span_factory import default_span_factory
 
 
@@ -36,16 +37,25 @@ _CURRENT_AGENT_NAME: ContextVar[Optional[str]] = ContextVar(
     default=None,
 )
 
-_STEP_COUNTERS: defaultdict[tuple[str, str], int] = defaultdict(int)
+class _SessionCounters:
+    """Adapter bookkeeping for one HyperAgent task/session."""
 
-# Segment counters are used to create meaningful HyperAgent MAS segments:
-# Setup, Planning turn N, Navigation subtask N, Editing subtask N,
-# Execution subtask N, Output.
-_SEGMENT_COUNTERS: defaultdict[tuple[str, str], int] = defaultdict(int)
-_SEGMENT_ORDER_COUNTERS: defaultdict[str, int] = defaultdict(int)
+    __slots__ = ("steps", "segments", "segment_order", "pending_delegation")
 
-# One pending Planner delegation per active HyperAgent task/session.
-_PENDING_DELEGATIONS: dict[str, dict[str, Any]] = {}
+    def __init__(self) -> None:
+        self.steps: defaultdict[str, int] = defaultdict(int)
+        # Segment counters are used to create meaningful HyperAgent MAS segments:
+        # Setup, Planning turn N, Navigation subtask N, Editing subtask N,
+        # Execution subtask N, Output.
+        self.segments: defaultdict[str, int] = defaultdict(int)
+        self.segment_order = 0
+        # One pending Planner delegation per active HyperAgent task/session.
+        self.pending_delegation: Optional[dict[str, Any]] = None
+
+
+# Released when the session span ends; the cap covers sessions opened outside SpanFactory.session.
+_SESSION_COUNTERS: SessionStateCache[_SessionCounters] = SessionStateCache(_SessionCounters, max_sessions=1024)
+on_session_end(_SESSION_COUNTERS.pop)
 
 OUTER_CHILD_AGENTS = {"Navigator", "Editor", "Executor"}
 
@@ -320,7 +330,7 @@ def _make_generate_reply_wrapper(original: Callable[..., Any]) -> Callable[...,
                 source_agent_id=source_agent,
                 target_agent_id=agent_name,
                 edge_id=f"{source_agent}->{agent_name}",
-                message_id=_make_message_id(source_agent, agent_name, message_body),
+                message_id=new_id("msg"),
                 channel="autogen",
                 message_body=message_body,
                 route_via="AutoGen GroupChatManager",
@@ -380,7 +390,7 @@ def _handle_planner_reply(result: Any) -> None:
             source_agent_id="Planner",
             target_agent_id=delegated_to,
             edge_id=f"Planner->{delegated_to}",
-            message_id=_make_message_id("Planner", delegated_to, content),
+            message_id=new_id("msg"),
             channel="autogen",
             message_body=content,
             route_via="AutoGen GroupChatManager",
@@ -399,7 +409,7 @@ def _handle_planner_reply(result: Any) -> None:
             source_agent_id="Planner",
             target_agent_id="Admin",
             edge_id="Planner->Admin",
-            message_id=_make_message_id("Planner", "Admin", content),
+            message_id=new_id("msg"),
             channel="autogen",
             message_body=content,
             route_via="AutoGen GroupChatManager",
@@ -429,7 +439,7 @@ def _record_non_planner_reply(agent_name: str, result: Any) -> None:
         source_agent_id=agent_name,
         target_agent_id=target,
         edge_id=f"{agent_name}->{target}",
-        message_id=_make_message_id(agent_name, target, content),
+        message_id=new_id("msg"),
         channel="autogen",
         message_body=content,
         route_via="AutoGen GroupChatManager",
@@ -451,9 +461,13 @@ def _session_key() -> str:
     )
 
 
+def _counters() -> _SessionCounters:
+    return _SESSION_COUNTERS.get(_session_key())
+
+
 def _set_pending_delegation(*, from_agent: str, to_agent: str, goal: str) -> None:
-    _PENDING_DELEGATIONS[_session_key()] = {
-        "delegation_id": f"delegation-{uuid.uuid4().hex[:12]}",
+    _counters().pending_delegation = {
+        "delegation_id": new_id("delegation"),
         "from_agent": from_agent,
         "to_agent": to_agent,
         "goal": goal,
@@ -461,7 +475,7 @@ def _set_pending_delegation(*, from_agent: str, to_agent: str, goal: str) -> Non
 
 
 def _peek_pending_delegation(agent_name: str) -> Optional[dict[str, Any]]:
-    pending = _PENDING_DELEGATIONS.get(_session_key())
+    pending = _counters().pending_delegation
     if pending and pending.get("to_agent") == agent_name:
         return pending
     return None
@@ -472,7 +486,7 @@ def _consume_delegation_context(agent_name: str) -> Optional[Any]:
     if pending is None:
         return None
 
-    _PENDING_DELEGATIONS.pop(_session_key(), None)
+    _counters().pending_delegation = None
 
     return default_span_factory.delegation(
         from_agent_id=pending["from_agent"],
@@ -603,7 +617,7 @@ def _make_tool_run_wrapper(original: Callable[..., Any]) -> Callable[..., Any]:
 
         with default_span_factory.tool_call(
             tool_name=str(tool_name),
-            tool_call_id=f"toolcall-{uuid.uuid4().hex[:12]}",
+            tool_call_id=new_id("toolcall"),
             tool_type=type(self).__name__,
             tool_args=input_text,
             record_args=True,
@@ -703,6 +717,8 @@ def _make_llm_create_wrapper(original: Callable[..., Any]) -> Callable[..., Any]
             input_text=input_text,
             record_input=True,
             agent_id=_CURRENT_AGENT_NAME.get(),
+            # The wrapper always calls the provider, so it must not consult the cache.
+            cache=False,
             metadata={
                 "client_class": type(self).__name__,
                 "openai_message_names_sanitized": True,
@@ -847,17 +863,16 @@ def record_patch_artifact(
 # ---------------------------------------------------------------------------
 
 def _next_segment_order() -> int:
-    session_id = _session_key()
-    value = _SEGMENT_ORDER_COUNTERS[session_id]
-    _SEGMENT_ORDER_COUNTERS[session_id] += 1
+    counters = _counters()
+    value = counters.segment_order
+    counters.segment_order += 1
     return value
 
 
 def _next_named_segment_index(name: str) -> int:
-    session_id = _session_key()
-    key = (session_id, name)
-    value = _SEGMENT_COUNTERS[key]
-    _SEGMENT_COUNTERS[key] += 1
+    counters = _counters()
+    value = counters.segments[name]
+    counters.segments[name] += 1
     return value
 
 
@@ -1004,7 +1019,7 @@ def _execute_code_as_tool_operation(
 
     with default_span_factory.tool_call(
         tool_name=tool_name,
-        tool_call_id=f"toolcall-{uuid.uuid4().hex[:12]}",
+        tool_call_id=new_id("toolcall"),
         tool_type=tool_type,
         tool_args=code_text,
         record_args=True,
@@ -1252,7 +1267,7 @@ def _make_session_id(hyperagent: Any, query: str) -> str:
     repo_path = getattr(hyperagent, "repo_path", None) or "repo"
     repo_name = str(repo_path).rstrip("/").split("/")[-1]
     task = _infer_task_id(hyperagent, query) or "task"
-    return f"hyperagent:{repo_name}:{task}:{uuid.uuid4().hex[:8]}"
+    return f"hyperagent:{repo_name}:{task}:{new_token(8)}"
 
 
 def _infer_task_id(hyperagent: Any, query: str) -> Optional[str]:
@@ -1287,10 +1302,9 @@ def _is_manager_name(agent_name: str) -> bool:
 
 
 def _next_step_index(agent_name: str) -> int:
-    session_id = _session_key()
-    key = (session_id, agent_name)
-    idx = _STEP_COUNTERS[key]
-    _STEP_COUNTERS[key] += 1
+    counters = _counters()
+    idx = counters.steps[agent_name]
+    counters.steps[agent_name] += 1
     return idx
 
 
@@ -1437,11 +1451,6 @@ def _infer_agent_role(agent_name: str) -> Optional[str]:
     return mapping.get(agent_name)
 
 
-def _make_message_id(source: Optional[str], target: Optional[str], body: Optional[str]) -> str:
-    base = f"{source or 'unknown'}->{target or 'unknown'}:{body or ''}"
-    return f"msg-{_sha256(base)[:16]}-{uuid.uuid4().hex[:6]}"
-
-
 def _infer_executor_kind(executor: Any) -> str:
     cls_name = type(executor).__name__.lower()
     if "docker" in cls_name or cls_name == "dclce":
@@ -0,0 +1,175 @@
+"""
+On-disk cache of LLM responses, for replaying evaluation runs offline.
+
+When a cache is enabled, SpanFactory.llm_call(..., cache=True) looks the call up by
+provider, model and the sha256 of its input (the same hash recorded in
+`llmmas.llm.input.sha256`). On a hit the context's `cached_output` holds the
+recorded response and the span is marked with `llmmas.llm.cache.hit`; the
+caller returns it instead of calling the provider. On a miss the caller calls
+the provider and hands the response to `ctx.store_output(text)`:
+
+    from llmmas_otel.llm_cache import enable_llm_cache
+
+    enable_llm_cache("out/llm_cache", max_bytes=512 * 1024 * 1024)
+
+    with default_span_factory.llm_call(provider_name="ollama", model=model, input_text=prompt, cache=True) as ctx:
+        if ctx.cached_output is not None:
+            return ctx.cached_output
+        out = ollama_chat_completion(messages, model=model)
+        ctx.store_output(out)
+        return out
+
+Calls whose fault decision raises, returns a value or mutates the input are
+never served from or stored in the cache; delays still apply.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+ENTRY_SUFFIX = ".txt"
+
+
+class LLMResponseCache:
+    """
+    Responses stored as one UTF-8 file per key in `directory`, at most
+    `max_bytes` in total.
+
+    When a write would exceed the bound, the least recently used entries are
+    deleted; a hit counts as a use and touches the file's mtime, so the order
+    survives restarts. Writes are atomic (temporary file, then rename), so
+    several processes can share a directory. Each process only evicts the
+    entries it knows about (those present when it opened the cache, plus the
+    ones it has read or written since), so with concurrent writers the bound
+    is approximate.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], *, max_bytes: int = 256 * 1024 * 1024) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Least recently used first; values are entry sizes in bytes.
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        found = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(ENTRY_SUFFIX) and entry.is_file():
+                st = entry.stat()
+                found.append((st.st_mtime_ns, entry.name[: -len(ENTRY_SUFFIX)], st.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._size += size
+        with self._lock:
+            self._evict()
+
+    @staticmethod
+    def key(provider_name: str, model: str, input_sha256: str) -> str:
+        return hashlib.sha256(f"{provider_name}\0{model}\0{input_sha256}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / (key + ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[str]:
+        """The response stored under `key`, or None."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+                size = self._entries.pop(key, None)
+                if size is not None:  # evicted by another process
+                    self._size -= size
+            return None
+        with self._lock:
+            self.hits += 1
+            size = self._entries.pop(key, None)
+            self._size += len(data) - (size or 0)
+            self._entries[key] = len(data)
+        return data.decode("utf-8")
+
+    def put(self, key: str, output: str) -> None:
+        """Store `output` under `key`. Responses larger than max_bytes are not stored."""
+        data = output.encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            size = self._entries.pop(key, None)
+            self._size += len(data) - (size or 0)
+            self._entries[key] = len(data)
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+            try:
+                os.unlink(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._size
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in self._entries:
+                try:
+                    os.unlink(self._path(key))
+                except FileNotFoundError:
+                    pass
+            self._entries.clear()
+            self._size = 0
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._path(key).is_file()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_CACHE: Optional[LLMResponseCache] = None
+
+
+def enable_llm_cache(directory: str | os.PathLike[str], *, max_bytes: int = 256 * 1024 * 1024) -> LLMResponseCache:
+    """Serve and record LLM responses through a cache in `directory` for every llm_call from now on."""
+    global _CACHE
+    _CACHE = LLMResponseCache(directory, max_bytes=max_bytes)
+    return _CACHE
+
+
+def disable_llm_cache() -> None:
+    global _CACHE
+    _CACHE = None
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    return _CACHE
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-import json
+import atexit
 import os
+import time
 from contextlib import contextmanager
 from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Any, Iterator, Optional
+from typing import Any, Iterator, Optional, Union
+
+from .store import BinaryMessageWriter, BufferedJSONLWriter, DedupBodyWriter, JSONLWriter
+from .store.blobs import blob_path_for
+from .store.shards import TS_FIELD, shard_path_for
 
 
 # ---- Context for correlating offline records with session/workflow ----
@@ -104,37 +109,170 @@ def current_segment() -> Optional[dict[str, Any]]:
 @dataclass(frozen=True)
 class MessageStoreConfig:
     path: str
+    format: str = "jsonl"
+    buffered: bool = False
+    flush_interval_s: float = 1.0
+    max_buffer_records: int = 512
+    dedup_bodies: bool = False
+    dedup_cache_size: int = 4096
+    concurrency: Optional[str] = None
 
 
 _config: Optional[MessageStoreConfig] = None
+_writer: Optional[Union[JSONLWriter, BufferedJSONLWriter, BinaryMessageWriter, DedupBodyWriter]] = None
+
+MESSAGE_STORE_FORMATS = ("jsonl", "binary")
+MESSAGE_STORE_CONCURRENCY = (None, "thread", "process")
 
 
-def enable_message_store(path: str) -> None:
+def enable_message_store(
+    path: str,
+    *,
+    format: str = "jsonl",
+    buffered: bool = False,
+    flush_interval_s: float = 1.0,
+    max_buffer_records: int = 512,
+    dedup_bodies: bool = False,
+    dedup_cache_size: int = 4096,
+    concurrency: Optional[str] = None,
+) -> None:
     """
     Enable JSONL message storage for offline analysis.
 
     The trace keeps previews and hashes. This store keeps full message bodies and
     selected metadata. Safe default: disabled until explicitly enabled.
+
+    buffered=True keeps the file open and writes batches from a background thread
+    every `flush_interval_s` seconds or once `max_buffer_records` are pending.
+    Pending records are flushed by disable_message_store() and at interpreter exit.
+
+    format="binary" writes the compact length-prefixed format from
+    llmmas_otel.store.binary (interned strings, one copy of each body, sidecar
+    index); read it back with BinaryMessageReader. The buffering options only
+    apply to JSONL.
+
+    dedup_bodies=True (JSONL only) stores each message body once in
+    `<path>.blobs.jsonl`, keyed by its sha256; message records carry `body_ref`
+    instead of `body`. The last `dedup_cache_size` hashes are remembered, so a
+    repeated body costs only the reference. Read such files back with
+    llmmas_otel.store.read_messages().
+
+    concurrency="thread" routes all writes through the single background
+    writer thread (implies buffered=True), so records from many agent threads
+    never interleave. concurrency="process" gives each process its own shard
+    file (`<stem>.shard-<pid>.jsonl`, re-opened after fork) and adds a
+    `ts_unix_nano` field to each record; merge the shards into `path` afterwards
+    with llmmas_otel.store.merge_shards(path) or `python -m llmmas_otel.store.shards`.
+    multiprocessing workers exit without running atexit handlers, so with
+    buffered=True call flush_message_store() at the end of each task.
+    With any other concurrency setting, a forked child starts with the store
+    disabled rather than writing to the parent's file.
     """
-    global _config
+    global _config, _writer
+    if format not in MESSAGE_STORE_FORMATS:
+        raise ValueError(f"format must be one of {MESSAGE_STORE_FORMATS}, got {format!r}")
+    if dedup_bodies and format == "binary":
+        raise ValueError("dedup_bodies applies to JSONL; the binary format already stores each body once")
+    if concurrency not in MESSAGE_STORE_CONCURRENCY:
+        raise ValueError(f"concurrency must be one of {MESSAGE_STORE_CONCURRENCY}, got {concurrency!r}")
+    if concurrency == "process" and format != "jsonl":
+        raise ValueError('concurrency="process" requires format="jsonl"')
     os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-    _config = MessageStoreConfig(path=path)
+    disable_message_store()
+
+    config = MessageStoreConfig(
+        path=path,
+        format=format,
+        # A single writer thread is what serializes concurrent writers.
+        buffered=buffered or concurrency == "thread",
+        flush_interval_s=flush_interval_s,
+        max_buffer_records=max_buffer_records,
+        dedup_bodies=dedup_bodies,
+        dedup_cache_size=dedup_cache_size,
+        concurrency=concurrency,
+    )
+    _writer = _open_writer(config)
+    _config = config
+
+
+def _open_writer(config: MessageStoreConfig) -> Union[JSONLWriter, BufferedJSONLWriter, BinaryMessageWriter, DedupBodyWriter]:
+    path = config.path
+    if config.concurrency == "process":
+        path = shard_path_for(path, os.getpid())
+    if config.format == "binary":
+        return BinaryMessageWriter(path)
+    if config.dedup_bodies:
+        return DedupBodyWriter(
+            _jsonl_writer(config, path),
+            _jsonl_writer(config, blob_path_for(path)),
+            cache_size=config.dedup_cache_size,
+        )
+    return _jsonl_writer(config, path)
+
+
+def _jsonl_writer(config: MessageStoreConfig, path: str) -> Union[JSONLWriter, BufferedJSONLWriter]:
+    if config.buffered:
+        return BufferedJSONLWriter(
+            path,
+            flush_interval_s=config.flush_interval_s,
+            max_buffer_records=config.max_buffer_records,
+        )
+    return JSONLWriter(path)
 
 
 def disable_message_store() -> None:
-    global _config
+    global _config, _writer
+    writer = _writer
     _config = None
+    _writer = None
+    if writer is not None:
+        writer.close()
+
+
+def flush_message_store() -> None:
+    """Write out any records still buffered in memory."""
+    writer = _writer
+    if writer is not None:
+        writer.flush()
 
 
 def is_enabled() -> bool:
     return _config is not None
 
 
+atexit.register(disable_message_store)
+
+
+def _reopen_after_fork() -> None:
+    # The parent's writer thread does not exist in the child and its buffer holds
+    # the parent's records. Discard the inherited writer without flushing it. In
+    # process mode, start over with a fresh writer on the child's own shard.
+    # Otherwise the child would open the parent's file a second time (and, for
+    # the binary format, rewrite its index), so the store is disabled instead.
+    global _config, _writer
+    config = _config
+    if config is None:
+        return
+    if _writer is not None:
+        _writer.abandon()
+    if config.concurrency == "process":
+        _writer = _open_writer(config)
+    else:
+        _config = None
+        _writer = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reopen_after_fork)
+
+
 def _append_jsonl(record: dict[str, Any]) -> None:
-    if _config is None:
+    writer = _writer
+    if writer is None:
         return
-    with open(_config.path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+    if _config is not None and _config.concurrency == "process":
+        record[TS_FIELD] = time.time_ns()
+    writer.write(record)
 
 
 def write_message(
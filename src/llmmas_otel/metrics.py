@@ -0,0 +1,145 @@
+"""
+OpenTelemetry metrics recorded by SpanFactory next to its spans.
+
+With metrics enabled, SpanFactory records:
+
+- llmmas.llm.call.duration (histogram, s) per provider, model and operation
+- llmmas.tool.call.duration (histogram, s) per tool name and type
+- llmmas.a2a.messages.sent (counter) per llmmas.edge.id
+- llmmas.faults.injected (counter) per hook and llmmas.fault.type
+
+Durations also carry error.type when the call raised. Metrics are recorded
+whether or not the span is sampled, so traces can be sampled heavily while
+rates, latency percentiles and fault counts stay exact:
+
+    from llmmas_otel.bootstrap import init_otlp_metrics
+
+    init_otlp_metrics(service_name="my-llm-mas")
+
+or, with your own MeterProvider, enable_metrics(meter_provider).
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from typing import Any, Optional
+
+from opentelemetry import metrics as otel_metrics
+
+from . import semconv
+
+# Seconds; the GenAI client operation duration buckets.
+DURATION_BUCKETS_S = (0.01, 0.02, 0.04, 0.08, 0.16, 0.32, 0.64, 1.28, 2.56, 5.12, 10.24, 20.48, 40.96, 81.92)
+
+
+class _Bound:
+    """
+    An instrument's add/record `method` with one attribute dict per tuple of
+    attribute values, built on first use and reused after that.
+
+    At most `max_sets` dicts are kept; values beyond that are still recorded,
+    with a fresh dict each time.
+    """
+
+    def __init__(self, method: Callable[..., None], names: Sequence[str], *, max_sets: int = 2000) -> None:
+        self._method = method
+        self._names = tuple(names)
+        self._max_sets = max_sets
+        self._attributes: dict[tuple[Any, ...], dict[str, Any]] = {}
+
+    def __call__(self, value: float, *values: Any) -> None:
+        attributes = self._attributes.get(values)
+        if attributes is None:
+            attributes = {name: v for name, v in zip(self._names, values) if v is not None}
+            if len(self._attributes) < self._max_sets:
+                self._attributes[values] = attributes
+        self._method(value, attributes)
+
+
+class SpanMetrics:
+    """The metric instruments SpanFactory records to, created from `meter_provider` (default: the global one)."""
+
+    def __init__(self, meter_provider: Optional[otel_metrics.MeterProvider] = None, *, meter_name: str = "llmmas-otel") -> None:
+        meter = otel_metrics.get_meter(meter_name, meter_provider=meter_provider)
+        llm_duration = meter.create_histogram(
+            semconv.METRIC_LLM_CALL_DURATION,
+            unit="s",
+            description="Duration of LLM calls",
+            explicit_bucket_boundaries_advisory=DURATION_BUCKETS_S,
+        )
+        tool_duration = meter.create_histogram(
+            semconv.METRIC_TOOL_CALL_DURATION,
+            unit="s",
+            description="Duration of tool calls",
+            explicit_bucket_boundaries_advisory=DURATION_BUCKETS_S,
+        )
+        messages = meter.create_counter(
+            semconv.METRIC_A2A_MESSAGES_SENT,
+            unit="{message}",
+            description="A2A messages sent",
+        )
+        faults = meter.create_counter(
+            semconv.METRIC_FAULTS_INJECTED,
+            unit="{fault}",
+            description="Fault injection decisions other than pass",
+        )
+        self._llm_call = _Bound(
+            llm_duration.record,
+            (
+                semconv.ATTR_GEN_AI_PROVIDER_NAME,
+                semconv.ATTR_GEN_AI_REQUEST_MODEL,
+                semconv.ATTR_GEN_AI_OPERATION_NAME,
+                semconv.ATTR_LLM_CACHE_HIT,
+                semconv.ATTR_ERROR_TYPE,
+            ),
+        )
+        self._tool_call = _Bound(
+            tool_duration.record,
+            (semconv.ATTR_GEN_AI_TOOL_NAME, semconv.ATTR_GEN_AI_TOOL_TYPE, semconv.ATTR_ERROR_TYPE),
+        )
+        self._a2a_send = _Bound(messages.add, (semconv.ATTR_EDGE_ID,))
+        self._fault = _Bound(faults.add, (semconv.ATTR_FAULT_HOOK, semconv.ATTR_FAULT_TYPE))
+
+    def llm_call(
+        self,
+        duration_s: float,
+        provider_name: str,
+        model: str,
+        operation_name: str,
+        cache_hit: Optional[bool] = None,
+        error_type: Optional[str] = None,
+    ) -> None:
+        self._llm_call(duration_s, provider_name, model, operation_name, cache_hit, error_type)
+
+    def tool_call(
+        self,
+        duration_s: float,
+        tool_name: str,
+        tool_type: Optional[str] = None,
+        error_type: Optional[str] = None,
+    ) -> None:
+        self._tool_call(duration_s, tool_name, tool_type, error_type)
+
+    def a2a_send(self, edge_id: str) -> None:
+        self._a2a_send(1, edge_id)
+
+    def fault_injected(self, hook: str, fault_type: Optional[str]) -> None:
+        self._fault(1, hook, fault_type)
+
+
+_METRICS: Optional[SpanMetrics] = None
+
+
+def enable_metrics(meter_provider: Optional[otel_metrics.MeterProvider] = None) -> SpanMetrics:
+    """Record SpanFactory metrics to `meter_provider` (default: the global one) from now on."""
+    global _METRICS
+    _METRICS = SpanMetrics(meter_provider)
+    return _METRICS
+
+
+def disable_metrics() -> None:
+    global _METRICS
+    _METRICS = None
+
+
+def get_metrics() -> Optional[SpanMetrics]:
+    return _METRICS
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Sequence
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.trace.sampling import Decision, Sampler, SamplingResult
+from opentelemetry.trace import Link, SpanContext, SpanKind, TraceFlags, get_current_span
+from opentelemetry.trace.status import StatusCode
+from opentelemetry.util.types import Attributes
+
+from . import semconv
+from .export import clone_span, discard_deferred
+
+_MAX_UINT64 = (1 << 64) - 1
+
+
+def _session_hash_bound(session_id: str) -> int:
+    return int.from_bytes(hashlib.sha256(session_id.encode("utf-8")).digest()[:8], "big")
+
+
+class SessionSampler(Sampler):
+    """
+    Head sampler that decides once per session.
+
+    The decision is made on root spans: for an llmmas.session span from a hash
+    of its session id (so every process agrees on the same session), for any
+    other root span from its trace id. Every descendant follows its parent, so
+    a session is either exported whole or not at all.
+
+    With record_unsampled=True, unsampled sessions are still recorded (but not
+    exported) so a SessionTailProcessor can keep them if they turn out to be
+    interesting.
+    """
+
+    def __init__(self, ratio: float = 1.0, *, record_unsampled: bool = False) -> None:
+        if not 0.0 <= ratio <= 1.0:
+            raise ValueError("ratio must be between 0.0 and 1.0")
+        self._ratio = ratio
+        self._bound = round(ratio * _MAX_UINT64)
+        self._unsampled = Decision.RECORD_ONLY if record_unsampled else Decision.DROP
+
+    def should_sample(
+        self,
+        parent_context: Optional[Context],
+        trace_id: int,
+        name: str,
+        kind: Optional[SpanKind] = None,
+        attributes: Attributes = None,
+        links: Optional[Sequence[Link]] = None,
+        trace_state=None,
+    ) -> SamplingResult:
+        parent = get_current_span(parent_context)
+        parent_sc = parent.get_span_context()
+
+        if parent_sc.is_valid:
+            if parent_sc.trace_flags.sampled:
+                decision = Decision.RECORD_AND_SAMPLE
+            elif parent.is_recording():
+                decision = Decision.RECORD_ONLY
+            else:
+                decision = Decision.DROP
+            return SamplingResult(decision, attributes, parent_sc.trace_state)
+
+        session_id = (attributes or {}).get(semconv.ATTR_SESSION_ID)
+        if isinstance(session_id, str):
+            key = _session_hash_bound(session_id)
+        else:
+            key = trace_id & _MAX_UINT64
+        decision = Decision.RECORD_AND_SAMPLE if key < self._bound else self._unsampled
+        return SamplingResult(decision, attributes)
+
+    def get_description(self) -> str:
+        return f"SessionSampler{{{self._ratio}}}"
+
+
+class _TraceBuffer:
+    __slots__ = ("spans", "keep")
+
+    def __init__(self) -> None:
+        self.spans: list[ReadableSpan] = []
+        self.keep = False
+
+
+def _is_local_root(span: ReadableSpan) -> bool:
+    return span.parent is None or span.parent.is_remote
+
+
+def _as_sampled(span: ReadableSpan) -> ReadableSpan:
+    sc = span.context
+    context = SpanContext(
+        trace_id=sc.trace_id,
+        span_id=sc.span_id,
+        is_remote=sc.is_remote,
+        trace_flags=TraceFlags(sc.trace_flags | TraceFlags.SAMPLED),
+        trace_state=sc.trace_state,
+    )
+    return clone_span(span, context=context)
+
+
+class SessionTailProcessor(SpanProcessor):
+    """
+    Buffers recorded-but-unsampled traces and forwards a whole trace to
+    `downstream` only if it turned out to be worth keeping.
+
+    Head-sampled spans are forwarded as they end. Spans of an unsampled trace
+    (see SessionSampler(record_unsampled=True)) are buffered until the trace's
+    root span ends; the trace is then kept if any span errored, any span
+    carries an injected fault (llmmas.fault.* attributes or a fault.applied
+    event, so only when faults are trace-visible), or the root took longer
+    than latency_threshold_s. Kept spans are re-flagged as sampled so
+    exporters accept them.
+
+    Memory is bounded by max_buffered_spans: when exceeded, the oldest
+    undecided trace is dropped.
+    """
+
+    def __init__(
+        self,
+        downstream: SpanProcessor,
+        *,
+        latency_threshold_s: Optional[float] = None,
+        keep_errors: bool = True,
+        keep_faults: bool = True,
+        max_buffered_spans: int = 100_000,
+        max_decided_traces: int = 10_000,
+    ) -> None:
+        self._downstream = downstream
+        self._latency_threshold_ns = (
+            int(latency_threshold_s * 1e9) if latency_threshold_s is not None else None
+        )
+        self._keep_errors = keep_errors
+        self._keep_faults = keep_faults
+        self._max_buffered_spans = max_buffered_spans
+        self._max_decided_traces = max_decided_traces
+
+        self._lock = threading.Lock()
+        self._buffers: OrderedDict[int, _TraceBuffer] = OrderedDict()
+        self._buffered_spans = 0
+        # trace_id -> kept?, for spans that end after their root.
+        self._decided: OrderedDict[int, bool] = OrderedDict()
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        if span.context.trace_flags.sampled:
+            self._downstream.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if span.context.trace_flags.sampled:
+            self._downstream.on_end(span)
+            return
+
+        trace_id = span.context.trace_id
+        release: list[ReadableSpan] = []
+        # Spans that will never be exported; their deferred hashes are dropped too.
+        dropped: list[ReadableSpan] = []
+        with self._lock:
+            decided = self._decided.get(trace_id)
+            if decided is not None:
+                (release if decided else dropped).append(span)
+            else:
+                buf = self._buffers.get(trace_id)
+                if buf is None:
+                    buf = self._buffers[trace_id] = _TraceBuffer()
+                buf.spans.append(span)
+                self._buffered_spans += 1
+                if not buf.keep and self._is_interesting(span):
+                    buf.keep = True
+
+                if _is_local_root(span):
+                    del self._buffers[trace_id]
+                    self._buffered_spans -= len(buf.spans)
+                    keep = buf.keep or self._exceeds_latency(span)
+                    self._remember(trace_id, keep)
+                    if keep:
+                        release = buf.spans
+                    else:
+                        dropped = buf.spans
+                else:
+                    self._evict_over_limit(dropped)
+
+        if dropped:
+            discard_deferred(dropped)
+        for s in release:
+            self._downstream.on_end(_as_sampled(s))
+
+    def _is_interesting(self, span: ReadableSpan) -> bool:
+        if self._keep_errors and span.status.status_code == StatusCode.ERROR:
+            return True
+        if self._keep_faults:
+            if (span.attributes or {}).get(semconv.ATTR_FAULT_INJECTED):
+                return True
+            if any(event.name == "fault.applied" for event in span.events):
+                return True
+        return False
+
+    def _exceeds_latency(self, root: ReadableSpan) -> bool:
+        if self._latency_threshold_ns is None or root.end_time is None or root.start_time is None:
+            return False
+        return root.end_time - root.start_time >= self._latency_threshold_ns
+
+    def _remember(self, trace_id: int, keep: bool) -> None:
+        self._decided[trace_id] = keep
+        if len(self._decided) > self._max_decided_traces:
+            self._decided.popitem(last=False)
+
+    def _evict_over_limit(self, dropped: list[ReadableSpan]) -> None:
+        while self._buffered_spans > self._max_buffered_spans and self._buffers:
+            trace_id, buf = self._buffers.popitem(last=False)
+            self._buffered_spans -= len(buf.spans)
+            self._remember(trace_id, False)
+            dropped.extend(buf.spans)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            dropped = [s for buf in self._buffers.values() for s in buf.spans]
+            self._buffers.clear()
+            self._buffered_spans = 0
+        discard_deferred(dropped)
+        self._downstream.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        # Undecided traces stay buffered until their root span ends.
+        return self._downstream.force_flush(timeout_millis)
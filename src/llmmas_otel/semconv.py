@@ -116,4 +116,16 @@ ATTR_TOOL_RESULT_SHA256 = "llmmas.tool.result.sha256"
 ATTR_LLM_INPUT_PREVIEW = "llmmas.llm.input.preview"
 ATTR_LLM_INPUT_SHA256 = "llmmas.llm.input.sha256"
 ATTR_LLM_OUTPUT_PREVIEW = "llmmas.llm.output.preview"
-ATTR_LLM_OUTPUT_SHA256 = "llmmas.llm.output.sha256"
\ No newline at end of file
+ATTR_LLM_OUTPUT_SHA256 = "llmmas.llm.output.sha256"
+# Set only while an LLM response cache is enabled (llmmas_otel.llm_cache)
+ATTR_LLM_CACHE_HIT = "llmmas.llm.cache.hit"
+
+# Metric instruments (llmmas_otel.metrics)
+METRIC_LLM_CALL_DURATION = "llmmas.llm.call.duration"
+METRIC_TOOL_CALL_DURATION = "llmmas.tool.call.duration"
+METRIC_A2A_MESSAGES_SENT = "llmmas.a2a.messages.sent"
+METRIC_FAULTS_INJECTED = "llmmas.faults.injected"
+
+# Metric-only attributes
+ATTR_FAULT_HOOK = "llmmas.fault.hook"
+ATTR_ERROR_TYPE = "error.type"
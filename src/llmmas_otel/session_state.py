@@ -0,0 +1,159 @@
+"""
+Per-session state that is released when the session ends.
+
+SpanFactory.session() calls release_session() when the last span for a session
+id closes. Components that keep per-session bookkeeping (the spec engine's
+fault counters, framework adapters) register a callback with
+on_session_end() and drop their entries there. SessionStateCache bounds the
+state of sessions that never end cleanly, or that touch state again after
+they ended, with an LRU cap and an optional idle TTL.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+_CALLBACKS: list[Callable[[str], None]] = []
+_ACTIVE: dict[str, int] = {}
+_LOCK = threading.Lock()
+
+
+def on_session_end(callback: Callable[[str], None]) -> Callable[[str], None]:
+    """Call `callback(session_id)` whenever a session is released. Usable as a decorator."""
+    with _LOCK:
+        if callback not in _CALLBACKS:
+            _CALLBACKS.append(callback)
+    return callback
+
+
+def remove_session_end_callback(callback: Callable[[str], None]) -> None:
+    with _LOCK:
+        if callback in _CALLBACKS:
+            _CALLBACKS.remove(callback)
+
+
+def session_started(session_id: str) -> None:
+    """Mark a session as open. Sessions with the same id nest; each must be matched by session_ended()."""
+    with _LOCK:
+        _ACTIVE[session_id] = _ACTIVE.get(session_id, 0) + 1
+
+
+def session_ended(session_id: str) -> None:
+    """Close one session_started(); releases the session when none remain open."""
+    with _LOCK:
+        remaining = _ACTIVE.get(session_id, 0) - 1
+        if remaining > 0:
+            _ACTIVE[session_id] = remaining
+            return
+        _ACTIVE.pop(session_id, None)
+    release_session(session_id)
+
+
+def release_session(session_id: str) -> None:
+    """Run every session-end callback for `session_id` now."""
+    with _LOCK:
+        callbacks = list(_CALLBACKS)
+    for callback in callbacks:
+        callback(session_id)
+
+
+def active_sessions() -> int:
+    with _LOCK:
+        return len(_ACTIVE)
+
+
+class SessionStateCache(Generic[T]):
+    """
+    session id -> state object, created on first use by `factory`.
+
+    At most `max_sessions` sessions are kept; the least recently used one is
+    evicted when a new session would exceed the cap. With `ttl_s`, sessions not
+    used for that many seconds are evicted too. Eviction is a fallback for
+    sessions that are never released; released sessions are removed with pop().
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], T],
+        *,
+        max_sessions: int = 10_000,
+        ttl_s: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_sessions <= 0:
+            raise ValueError("max_sessions must be > 0")
+        if ttl_s is not None and ttl_s <= 0:
+            raise ValueError("ttl_s must be > 0")
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.ttl_s = ttl_s
+        self._clock = clock
+        # Least recently used first; values are (last use, state).
+        self._entries: OrderedDict[str, tuple[float, T]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> T:
+        """State of `session_id`, created if missing; marks the session as used."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            state = entry[1] if entry is not None and not self._expired(entry[0], now) else self.factory()
+            self._entries[session_id] = (now, state)
+            self._evict(now)
+            return state
+
+    def peek(self, session_id: str) -> Optional[T]:
+        """State of `session_id` if present, without creating it or marking it as used."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None or self._expired(entry[0], self._clock()):
+                return None
+            return entry[1]
+
+    def pop(self, session_id: str) -> Optional[T]:
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            return None if entry is None else entry[1]
+
+    def popitem(self) -> Optional[tuple[str, T]]:
+        """Remove and return the least recently used session and its state, or None if empty."""
+        with self._lock:
+            if not self._entries:
+                return None
+            session_id, (_, state) = self._entries.popitem(last=False)
+            return session_id, state
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, session_id: object) -> bool:
+        with self._lock:
+            return session_id in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def _expired(self, last_used: float, now: float) -> bool:
+        return self.ttl_s is not None and now - last_used > self.ttl_s
+
+    def _evict(self, now: float) -> None:
+        entries = self._entries
+        while len(entries) > self.max_sessions:
+            entries.popitem(last=False)
+        if self.ttl_s is not None:
+            while entries:
+                session_id, (last_used, _) = next(iter(entries.items()))
+                if not self._expired(last_used, now):
+                    break
+                del entries[session_id]
@@ -1,28 +1,81 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from contextlib import contextmanager
-from contextvars import ContextVar
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar, copy_context
 from dataclasses import dataclass
-from typing import Any, Iterator, Mapping, MutableMapping, Optional
+from typing import Any, AsyncIterator, Iterator, Mapping, MutableMapping, Optional
+import asyncio
 import hashlib
+import inspect
 import os
 import time
-import uuid
 
 from opentelemetry import propagate, trace
 from opentelemetry.trace import Link, Span, SpanKind
 
-from . import message_store, semconv
+from . import export, message_store, semconv, session_state
+from .ids import new_id
+from .llm_cache import get_llm_cache
+from .metrics import get_metrics
+from .injection.engine import STATE as _INJECTION
+from .injection.scheduler import get_timer_wheel
+from .injection.types import DecisionKind, HookContext, HookType
 
 
 def _sha256_hex(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
+def _set_content_attrs(
+    span: Span,
+    text: str,
+    preview_chars: int,
+    *key_pairs: tuple[str, str],
+    sha: Optional[str] = None,
+) -> None:
+    """
+    Set (preview, sha256) attribute pairs for `text`.
+
+    Does nothing on a non-recording span. With deferred hashing enabled the
+    sha256 is computed at export time instead of on the calling thread,
+    unless the caller already has it (`sha`).
+    """
+    if not span.is_recording():
+        return
+    preview = text[:preview_chars]
+    if sha is None and not export.is_deferred_hashing_enabled():
+        sha = _sha256_hex(text)
+    for preview_key, sha_key in key_pairs:
+        span.set_attribute(preview_key, preview)
+        if sha is None:
+            export.defer_sha256(span, sha_key, text)
+        else:
+            span.set_attribute(sha_key, sha)
+
+
+def _a2a_body_sha(body: str, store_enabled: bool, add_event: bool) -> Optional[str]:
+    # The message store and the a2a.message event need the hash now; the span attribute alone can wait.
+    if store_enabled or add_event or not export.is_deferred_hashing_enabled():
+        return _sha256_hex(body)
+    return None
+
+
+def _set_body_sha(span: Span, body: str, sha: Optional[str]) -> None:
+    if sha is None:
+        export.defer_sha256(span, semconv.ATTR_MESSAGE_SHA256, body)
+    else:
+        span.set_attribute(semconv.ATTR_MESSAGE_SHA256, sha)
+
+
+# Attribute value types passed through as-is. Checked by exact type first, so
+# the common case costs one set lookup instead of a chain of isinstance calls.
+_PRIMITIVE_TYPES = frozenset((str, bool, int, float))
+
+
 def _coerce_attr_value(value: Any) -> Any:
-    if value is None:
-        return None
+    if value is None or type(value) in _PRIMITIVE_TYPES:
+        return value
     if isinstance(value, (str, bool, int, float)):
         return value
     if isinstance(value, (list, tuple)) and all(
@@ -32,18 +85,61 @@ def _coerce_attr_value(value: Any) -> Any:
     return str(value)
 
 
-def _set_attr(span: Span, key: str, value: Any) -> None:
-    coerced = _coerce_attr_value(value)
-    if coerced is not None:
-        span.set_attribute(key, coerced)
-
-
-def _set_metadata(span: Span, metadata: Optional[Mapping[str, Any]], prefix: str) -> None:
-    if not metadata:
-        return
-    for key, value in metadata.items():
-        safe_key = str(key).replace(" ", "_")
-        _set_attr(span, f"{prefix}.{safe_key}", value)
+def _attributes(
+    values: Mapping[str, Any],
+    metadata: Optional[Mapping[str, Any]] = None,
+    prefix: str = "",
+) -> dict[str, Any]:
+    """
+    One span attribute mapping: `values` with None dropped and other values
+    coerced, then `metadata` as `<prefix>.<key>` attributes.
+
+    Passing the result to start_as_current_span(attributes=...) sets all of
+    them while the span is created, instead of one locked set_attribute call
+    per key.
+    """
+    attrs: dict[str, Any] = {}
+    for key, value in values.items():
+        if type(value) not in _PRIMITIVE_TYPES:
+            value = _coerce_attr_value(value)
+            if value is None:
+                continue
+        attrs[key] = value
+    if metadata:
+        for key, value in metadata.items():
+            if type(value) not in _PRIMITIVE_TYPES:
+                value = _coerce_attr_value(value)
+                if value is None:
+                    continue
+            attrs[f"{prefix}.{str(key).replace(' ', '_')}"] = value
+    return attrs
+
+
+def _a2a_attributes(
+    source_agent_id: str,
+    target_agent_id: str,
+    edge_id: str,
+    message_id: str,
+    channel: Optional[str],
+    route_via: Optional[str],
+    message_kind: Optional[str],
+    parent_message_id: Optional[str],
+    metadata: Optional[Mapping[str, Any]],
+) -> dict[str, Any]:
+    return _attributes(
+        {
+            semconv.ATTR_SOURCE_AGENT_ID: source_agent_id,
+            semconv.ATTR_TARGET_AGENT_ID: target_agent_id,
+            semconv.ATTR_EDGE_ID: edge_id,
+            semconv.ATTR_MESSAGE_ID: message_id,
+            semconv.ATTR_CHANNEL: channel,
+            semconv.ATTR_MESSAGE_ROUTE_VIA: route_via,
+            semconv.ATTR_MESSAGE_KIND: message_kind,
+            semconv.ATTR_MESSAGE_PARENT_ID: parent_message_id,
+        },
+        metadata,
+        "llmmas.message.meta",
+    )
 
 
 _CURRENT_A2A_RECEIVE_DECISION: ContextVar[Optional[object]] = ContextVar(
@@ -65,6 +161,38 @@ class A2ASendContext:
     span: Span
     decision: Optional[object]
     effective_body: Optional[str]
+    # Injected delay not yet applied (delay_mode="scheduled"); deliver() applies it.
+    pending_delay_s: float = 0.0
+
+    def deliver(self, callback: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """
+        Hand the message to `callback(*args, **kwargs)` according to the decision.
+
+        Dropped messages are not delivered. Without a pending delay `callback`
+        runs right away. A pending delay is served by the running event loop
+        (loop.call_later) when called from a coroutine, and by the timer wheel
+        thread otherwise. Either way `callback` runs in the context current at
+        this call, so spans it starts are children of the send span. On the
+        event loop, `callback` may return an awaitable, which is scheduled as
+        a task.
+        """
+        if _is_decision(self.decision, "drop"):
+            return
+        if not self.pending_delay_s:
+            callback(*args, **kwargs)
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            get_timer_wheel().schedule(self.pending_delay_s, copy_context().run, callback, *args, **kwargs)
+        else:
+            loop.call_later(self.pending_delay_s, _run_on_loop, callback, args, kwargs, context=copy_context())
+
+
+def _run_on_loop(callback: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> None:
+    result = callback(*args, **kwargs)
+    if inspect.isawaitable(result):
+        asyncio.ensure_future(result)
 
 
 @dataclass(frozen=True)
@@ -79,6 +207,18 @@ class LLMCallContext:
     span: Span
     decision: Optional[object]
     request_id: str
+    # Response served by the LLM response cache; when set, do not call the provider.
+    cached_output: Optional[str] = None
+    # Key of this call in the response cache, None when the call is not cacheable.
+    cache_key: Optional[str] = None
+
+    def store_output(self, text: str) -> None:
+        """Record the provider's response in the LLM response cache, if this call is cacheable."""
+        if self.cache_key is None or self.cached_output is not None:
+            return
+        cache = get_llm_cache()
+        if cache is not None:
+            cache.put(self.cache_key, text)
 
 
 @dataclass(frozen=True)
@@ -100,33 +240,20 @@ class ArtifactContext:
     artifact_id: str
 
 
-def _fault_trace_visibility_enabled() -> bool:
-    try:
-        from .injection import is_fault_trace_visible
-
-        return is_fault_trace_visible()
-    except Exception:
-        return True
-
-
 def _annotate_fault_on_span(span: Span, decision: Optional[object]) -> None:
-    if decision is None or not _fault_trace_visibility_enabled():
-        return
-
-    try:
-        from .injection import DecisionKind
-    except Exception:
+    if decision is None or not _INJECTION.trace_visible:
         return
 
     if getattr(decision, "kind", None) == DecisionKind.PASS:
         return
 
-    span.set_attribute(semconv.ATTR_FAULT_INJECTED, True)
-    span.set_attribute(semconv.ATTR_FAULT_TYPE, getattr(decision, "fault_type", None) or "")
-    span.set_attribute(semconv.ATTR_FAULT_SPEC_ID, getattr(decision, "fault_id", None) or "")
-    span.set_attribute(
-        semconv.ATTR_FAULT_DECISION,
-        str(getattr(getattr(decision, "kind", None), "value", "")),
+    span.set_attributes(
+        {
+            semconv.ATTR_FAULT_INJECTED: True,
+            semconv.ATTR_FAULT_TYPE: getattr(decision, "fault_type", None) or "",
+            semconv.ATTR_FAULT_SPEC_ID: getattr(decision, "fault_id", None) or "",
+            semconv.ATTR_FAULT_DECISION: str(getattr(getattr(decision, "kind", None), "value", "")),
+        }
     )
     span.add_event(
         "fault.applied",
@@ -146,9 +273,93 @@ def _annotate_fault_on_span(span: Span, decision: Optional[object]) -> None:
     )
 
 
+def _fault_decision(hook: HookType, payload: Optional[str], **ctx_fields: Any) -> Optional[object]:
+    # Callers check _INJECTION.enabled first so the disabled path skips building the context.
+    ctx = HookContext(hook_type=hook, **ctx_fields)
+    decision = _INJECTION.engine.decide(ctx, payload=payload)
+    metrics = get_metrics()
+    if metrics is not None and decision.kind != DecisionKind.PASS:
+        metrics.fault_injected(hook.value, decision.fault_type)
+    return decision
+
+
+@contextmanager
+def _timed(record: Optional[Callable[..., None]], *args: Any) -> Iterator[None]:
+    """Call `record(duration_s, *args, error_type=...)` when the block exits; a no-op if `record` is None."""
+    if record is None:
+        yield
+        return
+    error_type: Optional[str] = None
+    t0 = time.perf_counter()
+    try:
+        yield
+    except BaseException as exc:
+        error_type = type(exc).__qualname__
+        raise
+    finally:
+        record(time.perf_counter() - t0, *args, error_type=error_type)
+
+
+def _delay_seconds(decision: Optional[object]) -> float:
+    if decision is None:
+        return 0.0
+
+    delay_ms = getattr(decision, "delay_ms", None)
+    if getattr(decision, "kind", None) == DecisionKind.DELAY and delay_ms is not None:
+        return delay_ms / 1000.0
+    return 0.0
+
+
+def _apply_delay(decision: Optional[object]) -> None:
+    seconds = _delay_seconds(decision)
+    if seconds:
+        time.sleep(seconds)
+
+
+def _scheduled_delay_s(decision: Optional[object]) -> float:
+    """Delay a2a_send leaves to A2ASendContext.deliver() instead of sleeping, per the delay mode."""
+    if _INJECTION.delay_mode != "scheduled":
+        return 0.0
+    return _delay_seconds(decision)
+
+
+async def _apply_delay_async(decision: Optional[object]) -> None:
+    seconds = _delay_seconds(decision)
+    if seconds:
+        await asyncio.sleep(seconds)
+
+
+def _is_decision(decision: Optional[object], kind_value: str) -> bool:
+    kind = getattr(decision, "kind", None)
+    return getattr(kind, "value", None) == kind_value
+
+
+def _is_cacheable(decision: Optional[object]) -> bool:
+    # Raised, returned and mutated calls must reach the fault handling; a delay is served before the lookup.
+    return decision is None or getattr(getattr(decision, "kind", None), "value", None) in ("pass", "delay")
+
+
 class SpanFactory:
-    def __init__(self, tracer_name: str = "llmmas-otel") -> None:
-        self._tracer = trace.get_tracer(tracer_name)
+    """
+    Creates llmmas spans.
+
+    Methods that can inject faults (a2a_send, a2a_receive, environment_action,
+    tool_call, llm_call) also have async_* variants for `async with`. They
+    behave the same, except DELAY decisions are applied with asyncio.sleep
+    instead of blocking the thread.
+
+    With delay_mode="scheduled" (see injection.set_delay_mode), a2a_send and
+    async_a2a_send do not sleep either: the delay is left in
+    A2ASendContext.pending_delay_s and applied by A2ASendContext.deliver(), on
+    the running event loop or on a timer wheel.
+    """
+
+    def __init__(
+        self,
+        tracer_name: str = "llmmas-otel",
+        tracer_provider: Optional[trace.TracerProvider] = None,
+    ) -> None:
+        self._tracer = trace.get_tracer(tracer_name, tracer_provider=tracer_provider)
 
     def current_a2a_receive_decision(self) -> Optional[object]:
         return _CURRENT_A2A_RECEIVE_DECISION.get()
@@ -171,17 +382,28 @@ class SpanFactory:
         adapter: Optional[str] = None,
         metadata: Optional[Mapping[str, Any]] = None,
     ) -> Iterator[Span]:
-        with message_store.session_context(session_id):
-            span_name = semconv.SPAN_SESSION if name is None else f"{semconv.SPAN_SESSION} {name}"
-            with self._tracer.start_as_current_span(span_name) as span:
-                span.set_attribute(semconv.ATTR_SESSION_ID, session_id)
-                _set_attr(span, semconv.ATTR_SESSION_NAME, name)
-                _set_attr(span, semconv.ATTR_SESSION_TASK_ID, task_id)
-                _set_attr(span, semconv.ATTR_FRAMEWORK, framework)
-                _set_attr(span, semconv.ATTR_SYSTEM, system)
-                _set_attr(span, semconv.ATTR_ADAPTER, adapter)
-                _set_metadata(span, metadata, "llmmas.session.meta")
-                yield span
+        session_state.session_started(session_id)
+        try:
+            with message_store.session_context(session_id):
+                span_name = semconv.SPAN_SESSION if name is None else f"{semconv.SPAN_SESSION} {name}"
+                # Attributes are set at start, so samplers can decide on the session id.
+                attributes = _attributes(
+                    {
+                        semconv.ATTR_SESSION_ID: session_id,
+                        semconv.ATTR_SESSION_NAME: name,
+                        semconv.ATTR_SESSION_TASK_ID: task_id,
+                        semconv.ATTR_FRAMEWORK: framework,
+                        semconv.ATTR_SYSTEM: system,
+                        semconv.ATTR_ADAPTER: adapter,
+                    },
+                    metadata,
+                    "llmmas.session.meta",
+                )
+                with self._tracer.start_as_current_span(span_name, attributes=attributes) as span:
+                    yield span
+        finally:
+            # Per-session state (fault counters, adapter bookkeeping) is released here.
+            session_state.session_ended(session_id)
 
     @contextmanager
     def workflow(
@@ -198,7 +420,7 @@ class SpanFactory:
         current = message_store.current_workflow()
         if parent_id is None and current is not None:
             parent_id = current.get("id")
-        wid = workflow_id or f"workflow-{uuid.uuid4().hex[:12]}"
+        wid = workflow_id or new_id("workflow")
         depth = len(message_store.current_workflow_stack())
 
         with message_store.workflow_context(
@@ -210,21 +432,24 @@ class SpanFactory:
             parent_id=parent_id,
         ):
             span_name = f"{semconv.SPAN_WORKFLOW} {name}"
-            with self._tracer.start_as_current_span(span_name) as span:
-                span.set_attribute(semconv.ATTR_WORKFLOW_ID, wid)
-                span.set_attribute(semconv.ATTR_WORKFLOW_NAME, name)
-                span.set_attribute(semconv.ATTR_WORKFLOW_KIND, kind)
-                span.set_attribute(semconv.ATTR_WORKFLOW_ORDER, order)
-                span.set_attribute(semconv.ATTR_WORKFLOW_DEPTH, depth)
-                _set_attr(span, semconv.ATTR_WORKFLOW_ORIGIN, origin)
-                _set_attr(span, semconv.ATTR_WORKFLOW_PARENT_ID, parent_id)
-
-                # Backward-compatible segment attributes for existing analysis code.
-                span.set_attribute(semconv.ATTR_SEGMENT_NAME, name)
-                span.set_attribute(semconv.ATTR_SEGMENT_ORDER, order)
-                _set_attr(span, semconv.ATTR_SEGMENT_ORIGIN, origin)
-
-                _set_metadata(span, metadata, "llmmas.workflow.meta")
+            attributes = _attributes(
+                {
+                    semconv.ATTR_WORKFLOW_ID: wid,
+                    semconv.ATTR_WORKFLOW_NAME: name,
+                    semconv.ATTR_WORKFLOW_KIND: kind,
+                    semconv.ATTR_WORKFLOW_ORDER: order,
+                    semconv.ATTR_WORKFLOW_DEPTH: depth,
+                    semconv.ATTR_WORKFLOW_ORIGIN: origin,
+                    semconv.ATTR_WORKFLOW_PARENT_ID: parent_id,
+                    # Backward-compatible segment attributes for existing analysis code.
+                    semconv.ATTR_SEGMENT_NAME: name,
+                    semconv.ATTR_SEGMENT_ORDER: order,
+                    semconv.ATTR_SEGMENT_ORIGIN: origin,
+                },
+                metadata,
+                "llmmas.workflow.meta",
+            )
+            with self._tracer.start_as_current_span(span_name, attributes=attributes) as span:
                 yield span
 
     @contextmanager
@@ -263,14 +488,19 @@ class SpanFactory:
         metadata: Optional[Mapping[str, Any]] = None,
     ) -> Iterator[Span]:
         span_name = f"{semconv.SPAN_AGENT_STEP} {agent_id}"
-        with self._tracer.start_as_current_span(span_name) as span:
-            span.set_attribute(semconv.ATTR_AGENT_ID, agent_id)
-            span.set_attribute(semconv.ATTR_STEP_INDEX, step_index)
-            _set_attr(span, semconv.ATTR_AGENT_ROLE, agent_role)
-            _set_attr(span, semconv.ATTR_AGENT_IMPL, agent_impl)
-            _set_attr(span, semconv.ATTR_PARENT_AGENT_ID, parent_agent_id)
-            _set_attr(span, semconv.ATTR_STEP_KIND, step_kind)
-            _set_metadata(span, metadata, "llmmas.agent.meta")
+        attributes = _attributes(
+            {
+                semconv.ATTR_AGENT_ID: agent_id,
+                semconv.ATTR_STEP_INDEX: step_index,
+                semconv.ATTR_AGENT_ROLE: agent_role,
+                semconv.ATTR_AGENT_IMPL: agent_impl,
+                semconv.ATTR_PARENT_AGENT_ID: parent_agent_id,
+                semconv.ATTR_STEP_KIND: step_kind,
+            },
+            metadata,
+            "llmmas.agent.meta",
+        )
+        with self._tracer.start_as_current_span(span_name, attributes=attributes) as span:
             yield span
 
     @contextmanager
@@ -287,105 +517,117 @@ class SpanFactory:
         preview_chars: int = 200,
         metadata: Optional[Mapping[str, Any]] = None,
     ) -> Iterator[DelegationContext]:
-        did = delegation_id or f"delegation-{uuid.uuid4().hex[:12]}"
+        did = delegation_id or new_id("delegation")
         span_name = f"{semconv.SPAN_DELEGATION} {from_agent_id}->{to_agent_id}"
-        with self._tracer.start_as_current_span(span_name, kind=SpanKind.INTERNAL) as span:
-            span.set_attribute(semconv.ATTR_DELEGATION_ID, did)
-            span.set_attribute(semconv.ATTR_DELEGATION_FROM_AGENT, from_agent_id)
-            span.set_attribute(semconv.ATTR_DELEGATION_TO_AGENT, to_agent_id)
-            span.set_attribute(semconv.ATTR_DELEGATION_KIND, kind)
-            _set_attr(span, semconv.ATTR_DELEGATION_TASK_ID, task_id)
-            _set_attr(span, semconv.ATTR_DELEGATION_VIA, via)
+        attributes = _attributes(
+            {
+                semconv.ATTR_DELEGATION_ID: did,
+                semconv.ATTR_DELEGATION_FROM_AGENT: from_agent_id,
+                semconv.ATTR_DELEGATION_TO_AGENT: to_agent_id,
+                semconv.ATTR_DELEGATION_KIND: kind,
+                semconv.ATTR_DELEGATION_TASK_ID: task_id,
+                semconv.ATTR_DELEGATION_VIA: via,
+            },
+            metadata,
+            "llmmas.delegation.meta",
+        )
+        with self._tracer.start_as_current_span(span_name, kind=SpanKind.INTERNAL, attributes=attributes) as span:
             if goal is not None:
-                span.set_attribute(semconv.ATTR_DELEGATION_GOAL_PREVIEW, goal[:preview_chars])
-                span.set_attribute(semconv.ATTR_DELEGATION_GOAL_SHA256, _sha256_hex(goal))
-            _set_metadata(span, metadata, "llmmas.delegation.meta")
+                _set_content_attrs(
+                    span,
+                    goal,
+                    preview_chars,
+                    (semconv.ATTR_DELEGATION_GOAL_PREVIEW, semconv.ATTR_DELEGATION_GOAL_SHA256),
+                )
             yield DelegationContext(span=span, delegation_id=did)
 
-    @contextmanager
-    def a2a_send(
+    def _a2a_send_decision(
         self,
         *,
         source_agent_id: str,
         target_agent_id: str,
         edge_id: str,
         message_id: str,
-        channel: Optional[str] = None,
-        message_body: Optional[str] = None,
-        carrier: Optional[MutableMapping[str, str]] = None,
-        propagate_context: bool = True,
-        preview_chars: int = 200,
-        add_event: bool = True,
-        apply_mutation: Optional[Callable[[str], None]] = None,
-        route_via: Optional[str] = None,
-        message_kind: Optional[str] = None,
-        parent_message_id: Optional[str] = None,
-        metadata: Optional[Mapping[str, Any]] = None,
-    ) -> Iterator[A2ASendContext]:
+        channel: Optional[str],
+        message_body: Optional[str],
+        apply_mutation: Optional[Callable[[str], None]],
+    ) -> tuple[Optional[object], Optional[str], Optional[str]]:
+        if not _INJECTION.enabled:
+            return None, message_body, None
+
         seg = message_store.current_segment() or {}
         session_id = message_store.current_session_id()
 
-        decision = None
         effective_body = message_body
         original_sha: Optional[str] = None
 
-        try:
-            from .injection import DecisionKind, HookContext, HookType, get_engine, is_enabled
-        except Exception:
-            HookContext = None
-            HookType = None
-            get_engine = None
-            is_enabled = lambda: False
-            DecisionKind = None
-
-        if is_enabled() and HookContext is not None:
-            ctx = HookContext(
-                hook_type=HookType.A2A_SEND,
-                session_id=session_id,
-                phase_name=seg.get("name"),
-                phase_order=seg.get("order"),
-                source_agent_id=source_agent_id,
-                target_agent_id=target_agent_id,
-                edge_id=edge_id,
-                message_id=message_id,
-                channel=channel,
-                agent_id=source_agent_id,
-            )
-            decision = get_engine().decide(ctx, payload=message_body)
-
-            if decision.kind == DecisionKind.DELAY and decision.delay_ms is not None:
-                time.sleep(decision.delay_ms / 1000.0)
-
-            if decision.kind == DecisionKind.MUTATE:
-                if message_body is None:
-                    raise ValueError("Fault injection MUTATE requires message_body (string)")
+        decision = _fault_decision(
+            HookType.A2A_SEND,
+            message_body,
+            session_id=session_id,
+            phase_name=seg.get("name"),
+            phase_order=seg.get("order"),
+            source_agent_id=source_agent_id,
+            target_agent_id=target_agent_id,
+            edge_id=edge_id,
+            message_id=message_id,
+            channel=channel,
+            agent_id=source_agent_id,
+        )
+
+        if _is_decision(decision, "mutate"):
+            if message_body is None:
+                raise ValueError("Fault injection MUTATE requires message_body (string)")
+            # Only the message store records the pre-mutation hash.
+            if message_store.is_enabled():
                 original_sha = _sha256_hex(message_body)
-                effective_body = decision.mutated_payload
-                if apply_mutation is not None and effective_body is not None:
-                    apply_mutation(effective_body)
+            effective_body = getattr(decision, "mutated_payload", None)
+            if apply_mutation is not None and effective_body is not None:
+                apply_mutation(effective_body)
 
-        span_name = f"{semconv.A2A_OP_SEND} {edge_id}"
-        with self._tracer.start_as_current_span(span_name, kind=SpanKind.PRODUCER) as span:
-            span.set_attribute(semconv.ATTR_SOURCE_AGENT_ID, source_agent_id)
-            span.set_attribute(semconv.ATTR_TARGET_AGENT_ID, target_agent_id)
-            span.set_attribute(semconv.ATTR_EDGE_ID, edge_id)
-            span.set_attribute(semconv.ATTR_MESSAGE_ID, message_id)
-            _set_attr(span, semconv.ATTR_CHANNEL, channel)
-            _set_attr(span, semconv.ATTR_MESSAGE_ROUTE_VIA, route_via)
-            _set_attr(span, semconv.ATTR_MESSAGE_KIND, message_kind)
-            _set_attr(span, semconv.ATTR_MESSAGE_PARENT_ID, parent_message_id)
-            _set_metadata(span, metadata, "llmmas.message.meta")
+        return decision, effective_body, original_sha
 
+    @contextmanager
+    def _a2a_send_span(
+        self,
+        *,
+        decision: Optional[object],
+        effective_body: Optional[str],
+        original_sha: Optional[str],
+        source_agent_id: str,
+        target_agent_id: str,
+        edge_id: str,
+        message_id: str,
+        channel: Optional[str],
+        carrier: Optional[MutableMapping[str, str]],
+        propagate_context: bool,
+        preview_chars: int,
+        add_event: bool,
+        route_via: Optional[str],
+        message_kind: Optional[str],
+        parent_message_id: Optional[str],
+        metadata: Optional[Mapping[str, Any]],
+        pending_delay_s: float = 0.0,
+    ) -> Iterator[A2ASendContext]:
+        span_name = f"{semconv.A2A_OP_SEND} {edge_id}"
+        attributes = _a2a_attributes(
+            source_agent_id, target_agent_id, edge_id, message_id, channel, route_via, message_kind,
+            parent_message_id, metadata,
+        )
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.a2a_send(edge_id)
+        with self._tracer.start_as_current_span(span_name, kind=SpanKind.PRODUCER, attributes=attributes) as span:
             _annotate_fault_on_span(span, decision)
 
             if propagate_context and carrier is not None:
                 propagate.inject(carrier)
 
-            if effective_body is not None:
-                preview = effective_body[:preview_chars]
-                sha = _sha256_hex(effective_body)
+            store_enabled = message_store.is_enabled()
+            if effective_body is not None and (store_enabled or span.is_recording()):
+                sha = _a2a_body_sha(effective_body, store_enabled, add_event)
 
-                if message_store.is_enabled():
+                if store_enabled:
                     message_store.write_message(
                         direction="send",
                         message_id=message_id,
@@ -416,8 +658,10 @@ class SpanFactory:
                         ),
                     )
 
+            if effective_body is not None and span.is_recording():
+                preview = effective_body[:preview_chars]
                 span.set_attribute(semconv.ATTR_MESSAGE_PREVIEW, preview)
-                span.set_attribute(semconv.ATTR_MESSAGE_SHA256, sha)
+                _set_body_sha(span, effective_body, sha)
 
                 if add_event:
                     span.add_event(
@@ -432,10 +676,12 @@ class SpanFactory:
                         },
                     )
 
-            yield A2ASendContext(span=span, decision=decision, effective_body=effective_body)
+            yield A2ASendContext(
+                span=span, decision=decision, effective_body=effective_body, pending_delay_s=pending_delay_s
+            )
 
     @contextmanager
-    def a2a_receive(
+    def a2a_send(
         self,
         *,
         source_agent_id: str,
@@ -444,18 +690,163 @@ class SpanFactory:
         message_id: str,
         channel: Optional[str] = None,
         message_body: Optional[str] = None,
-        carrier: Optional[Mapping[str, str]] = None,
-        link_from_carrier: bool = True,
+        carrier: Optional[MutableMapping[str, str]] = None,
+        propagate_context: bool = True,
         preview_chars: int = 200,
         add_event: bool = True,
+        apply_mutation: Optional[Callable[[str], None]] = None,
         route_via: Optional[str] = None,
         message_kind: Optional[str] = None,
         parent_message_id: Optional[str] = None,
         metadata: Optional[Mapping[str, Any]] = None,
-    ) -> Iterator[Span]:
+    ) -> Iterator[A2ASendContext]:
+        decision, effective_body, original_sha = self._a2a_send_decision(
+            source_agent_id=source_agent_id,
+            target_agent_id=target_agent_id,
+            edge_id=edge_id,
+            message_id=message_id,
+            channel=channel,
+            message_body=message_body,
+            apply_mutation=apply_mutation,
+        )
+        pending_delay_s = _scheduled_delay_s(decision)
+        if not pending_delay_s:
+            _apply_delay(decision)
+
+        with self._a2a_send_span(
+            decision=decision,
+            pending_delay_s=pending_delay_s,
+            effective_body=effective_body,
+            original_sha=original_sha,
+            source_agent_id=source_agent_id,
+            target_agent_id=target_agent_id,
+            edge_id=edge_id,
+            message_id=message_id,
+            channel=channel,
+            carrier=carrier,
+            propagate_context=propagate_context,
+            preview_chars=preview_chars,
+            add_event=add_event,
+            route_via=route_via,
+            message_kind=message_kind,
+            parent_message_id=parent_message_id,
+            metadata=metadata,
+        ) as ctx:
+            yield ctx
+
+    @asynccontextmanager
+    async def async_a2a_send(
+        self,
+        *,
+        source_agent_id: str,
+        target_agent_id: str,
+        edge_id: str,
+        message_id: str,
+        channel: Optional[str] = None,
+        message_body: Optional[str] = None,
+        carrier: Optional[MutableMapping[str, str]] = None,
+        propagate_context: bool = True,
+        preview_chars: int = 200,
+        add_event: bool = True,
+        apply_mutation: Optional[Callable[[str], None]] = None,
+        route_via: Optional[str] = None,
+        message_kind: Optional[str] = None,
+        parent_message_id: Optional[str] = None,
+        metadata: Optional[Mapping[str, Any]] = None,
+    ) -> AsyncIterator[A2ASendContext]:
+        decision, effective_body, original_sha = self._a2a_send_decision(
+            source_agent_id=source_agent_id,
+            target_agent_id=target_agent_id,
+            edge_id=edge_id,
+            message_id=message_id,
+            channel=channel,
+            message_body=message_body,
+            apply_mutation=apply_mutation,
+        )
+        pending_delay_s = _scheduled_delay_s(decision)
+        if not pending_delay_s:
+            await _apply_delay_async(decision)
+
+        with self._a2a_send_span(
+            decision=decision,
+            pending_delay_s=pending_delay_s,
+            effective_body=effective_body,
+            original_sha=original_sha,
+            source_agent_id=source_agent_id,
+            target_agent_id=target_agent_id,
+            edge_id=edge_id,
+            message_id=message_id,
+            channel=channel,
+            carrier=carrier,
+            propagate_context=propagate_context,
+            preview_chars=preview_chars,
+            add_event=add_event,
+            route_via=route_via,
+            message_kind=message_kind,
+            parent_message_id=parent_message_id,
+            metadata=metadata,
+        ) as ctx:
+            yield ctx
+
+    def _a2a_receive_decision(
+        self,
+        *,
+        source_agent_id: str,
+        target_agent_id: str,
+        edge_id: str,
+        message_id: str,
+        channel: Optional[str],
+        message_body: Optional[str],
+    ) -> tuple[Optional[object], Optional[str]]:
+        if not _INJECTION.enabled:
+            return None, message_body
+
         seg = message_store.current_segment() or {}
         session_id = message_store.current_session_id()
 
+        effective_body = message_body
+
+        decision = _fault_decision(
+            HookType.A2A_RECEIVE,
+            message_body,
+            session_id=session_id,
+            phase_name=seg.get("name"),
+            phase_order=seg.get("order"),
+            source_agent_id=source_agent_id,
+            target_agent_id=target_agent_id,
+            edge_id=edge_id,
+            message_id=message_id,
+            channel=channel,
+            agent_id=target_agent_id,
+        )
+
+        if _is_decision(decision, "mutate"):
+            if message_body is None:
+                raise ValueError("Fault injection MUTATE requires message_body (string)")
+            effective_body = getattr(decision, "mutated_payload", None)
+
+        return decision, effective_body
+
+    @contextmanager
+    def _a2a_receive_span(
+        self,
+        *,
+        decision: Optional[object],
+        effective_body: Optional[str],
+        source_agent_id: str,
+        target_agent_id: str,
+        edge_id: str,
+        message_id: str,
+        channel: Optional[str],
+        carrier: Optional[Mapping[str, str]],
+        link_from_carrier: bool,
+        preview_chars: int,
+        add_event: bool,
+        route_via: Optional[str],
+        message_kind: Optional[str],
+        parent_message_id: Optional[str],
+        metadata: Optional[Mapping[str, Any]],
+    ) -> Iterator[Span]:
         links = None
         if link_from_carrier and carrier is not None:
             extracted_ctx = propagate.extract(carrier)
@@ -463,41 +854,6 @@ class SpanFactory:
             if extracted_sc is not None and extracted_sc.is_valid:
                 links = [Link(extracted_sc)]
 
-        decision = None
-        effective_body = message_body
-
-        try:
-            from .injection import DecisionKind, HookContext, HookType, get_engine, is_enabled
-        except Exception:
-            HookContext = None
-            HookType = None
-            get_engine = None
-            is_enabled = lambda: False
-            DecisionKind = None
-
-        if is_enabled() and HookContext is not None:
-            ctx = HookContext(
-                hook_type=HookType.A2A_RECEIVE,
-                session_id=session_id,
-                phase_name=seg.get("name"),
-                phase_order=seg.get("order"),
-                source_agent_id=source_agent_id,
-                target_agent_id=target_agent_id,
-                edge_id=edge_id,
-                message_id=message_id,
-                channel=channel,
-                agent_id=target_agent_id,
-            )
-            decision = get_engine().decide(ctx, payload=message_body)
-
-            if decision.kind == DecisionKind.DELAY and decision.delay_ms is not None:
-                time.sleep(decision.delay_ms / 1000.0)
-
-            if decision.kind == DecisionKind.MUTATE:
-                if message_body is None:
-                    raise ValueError("Fault injection MUTATE requires message_body (string)")
-                effective_body = decision.mutated_payload
-
         token = _CURRENT_A2A_RECEIVE_DECISION.set(decision)
 
         span_name = f"{semconv.A2A_OP_PROCESS} {edge_id}"
@@ -506,31 +862,19 @@ class SpanFactory:
                 span_name,
                 kind=SpanKind.CONSUMER,
                 links=links,
+                attributes=_a2a_attributes(
+                    source_agent_id, target_agent_id, edge_id, message_id, channel, route_via, message_kind,
+                    parent_message_id, metadata,
+                ),
             ) as span:
-                span.set_attribute(semconv.ATTR_SOURCE_AGENT_ID, source_agent_id)
-                span.set_attribute(semconv.ATTR_TARGET_AGENT_ID, target_agent_id)
-                span.set_attribute(semconv.ATTR_EDGE_ID, edge_id)
-                span.set_attribute(semconv.ATTR_MESSAGE_ID, message_id)
-                _set_attr(span, semconv.ATTR_CHANNEL, channel)
-                _set_attr(span, semconv.ATTR_MESSAGE_ROUTE_VIA, route_via)
-                _set_attr(span, semconv.ATTR_MESSAGE_KIND, message_kind)
-                _set_attr(span, semconv.ATTR_MESSAGE_PARENT_ID, parent_message_id)
-                _set_metadata(span, metadata, "llmmas.message.meta")
-
                 _annotate_fault_on_span(span, decision)
 
-                if effective_body is not None:
-                    preview = effective_body[:preview_chars]
-                    sha = _sha256_hex(effective_body)
+                store_enabled = message_store.is_enabled()
+                if effective_body is not None and (store_enabled or span.is_recording()):
+                    sha = _a2a_body_sha(effective_body, store_enabled, add_event)
 
-                    if message_store.is_enabled():
-                        dropped = False
-                        try:
-                            from .injection import DecisionKind
-
-                            dropped = decision is not None and decision.kind == DecisionKind.DROP
-                        except Exception:
-                            dropped = False
+                    if store_enabled:
+                        dropped = decision is not None and decision.kind == DecisionKind.DROP
 
                         message_store.write_message(
                             direction="receive",
@@ -556,8 +900,10 @@ class SpanFactory:
                             dropped=dropped,
                         )
 
+                if effective_body is not None and span.is_recording():
+                    preview = effective_body[:preview_chars]
                     span.set_attribute(semconv.ATTR_MESSAGE_PREVIEW, preview)
-                    span.set_attribute(semconv.ATTR_MESSAGE_SHA256, sha)
+                    _set_body_sha(span, effective_body, sha)
 
                     if add_event:
                         span.add_event(
@@ -577,68 +923,278 @@ class SpanFactory:
             _CURRENT_A2A_RECEIVE_DECISION.reset(token)
 
     @contextmanager
-    def environment_action(
+    def a2a_receive(
         self,
         *,
-        name: str,
-        kind: str = "tool",
-        action_id: Optional[str] = None,
-        input_text: Optional[str] = None,
+        source_agent_id: str,
+        target_agent_id: str,
+        edge_id: str,
+        message_id: str,
+        channel: Optional[str] = None,
+        message_body: Optional[str] = None,
+        carrier: Optional[Mapping[str, str]] = None,
+        link_from_carrier: bool = True,
         preview_chars: int = 200,
-        record_input: bool = False,
-        tool_type: Optional[str] = None,
-        changed_files: Optional[list[str]] = None,
+        add_event: bool = True,
+        route_via: Optional[str] = None,
+        message_kind: Optional[str] = None,
+        parent_message_id: Optional[str] = None,
         metadata: Optional[Mapping[str, Any]] = None,
-    ) -> Iterator[EnvironmentActionContext]:
+    ) -> Iterator[Span]:
+        decision, effective_body = self._a2a_receive_decision(
+            source_agent_id=source_agent_id,
+            target_agent_id=target_agent_id,
+            edge_id=edge_id,
+            message_id=message_id,
+            channel=channel,
+            message_body=message_body,
+        )
+        _apply_delay(decision)
+
+        with self._a2a_receive_span(
+            decision=decision,
+            effective_body=effective_body,
+            source_agent_id=source_agent_id,
+            target_agent_id=target_agent_id,
+            edge_id=edge_id,
+            message_id=message_id,
+            channel=channel,
+            carrier=carrier,
+            link_from_carrier=link_from_carrier,
+            preview_chars=preview_chars,
+            add_event=add_event,
+            route_via=route_via,
+            message_kind=message_kind,
+            parent_message_id=parent_message_id,
+            metadata=metadata,
+        ) as span:
+            yield span
+
+    @asynccontextmanager
+    async def async_a2a_receive(
+        self,
+        *,
+        source_agent_id: str,
+        target_agent_id: str,
+        edge_id: str,
+        message_id: str,
+        channel: Optional[str] = None,
+        message_body: Optional[str] = None,
+        carrier: Optional[Mapping[str, str]] = None,
+        link_from_carrier: bool = True,
+        preview_chars: int = 200,
+        add_event: bool = True,
+        route_via: Optional[str] = None,
+        message_kind: Optional[str] = None,
+        parent_message_id: Optional[str] = None,
+        metadata: Optional[Mapping[str, Any]] = None,
+    ) -> AsyncIterator[Span]:
+        decision, effective_body = self._a2a_receive_decision(
+            source_agent_id=source_agent_id,
+            target_agent_id=target_agent_id,
+            edge_id=edge_id,
+            message_id=message_id,
+            channel=channel,
+            message_body=message_body,
+        )
+        await _apply_delay_async(decision)
+
+        with self._a2a_receive_span(
+            decision=decision,
+            effective_body=effective_body,
+            source_agent_id=source_agent_id,
+            target_agent_id=target_agent_id,
+            edge_id=edge_id,
+            message_id=message_id,
+            channel=channel,
+            carrier=carrier,
+            link_from_carrier=link_from_carrier,
+            preview_chars=preview_chars,
+            add_event=add_event,
+            route_via=route_via,
+            message_kind=message_kind,
+            parent_message_id=parent_message_id,
+            metadata=metadata,
+        ) as span:
+            yield span
+
+    def _environment_action_decision(
+        self,
+        *,
+        name: str,
+        kind: str,
+        action_id: str,
+        input_text: Optional[str],
+        tool_type: Optional[str],
+    ) -> Optional[object]:
+        if not _INJECTION.enabled:
+            return None
+
         seg = message_store.current_segment() or {}
         session_id = message_store.current_session_id()
-        aid = action_id or f"envact-{uuid.uuid4().hex[:12]}"
 
-        decision = None
-        try:
-            from .injection import DecisionKind, HookContext, HookType, get_engine, is_enabled
-        except Exception:
-            HookContext = None
-            HookType = None
-            get_engine = None
-            is_enabled = lambda: False
-            DecisionKind = None
-
-        if is_enabled() and HookContext is not None:
-            ctx = HookContext(
-                hook_type=HookType.TOOL_CALL,
-                session_id=session_id,
-                phase_name=seg.get("name"),
-                phase_order=seg.get("order"),
-                tool_name=name,
-                tool_type=tool_type or kind,
-                tool_call_id=aid,
-            )
-            decision = get_engine().decide(ctx, payload=input_text)
-
-            if decision.kind == DecisionKind.DELAY and decision.delay_ms is not None:
-                time.sleep(decision.delay_ms / 1000.0)
+        return _fault_decision(
+            HookType.TOOL_CALL,
+            input_text,
+            session_id=session_id,
+            phase_name=seg.get("name"),
+            phase_order=seg.get("order"),
+            tool_name=name,
+            tool_type=tool_type or kind,
+            tool_call_id=action_id,
+        )
 
+    @contextmanager
+    def _environment_action_span(
+        self,
+        *,
+        decision: Optional[object],
+        name: str,
+        kind: str,
+        action_id: str,
+        input_text: Optional[str],
+        preview_chars: int,
+        record_input: bool,
+        changed_files: Optional[list[str]],
+        metadata: Optional[Mapping[str, Any]],
+    ) -> Iterator[EnvironmentActionContext]:
         token = _CURRENT_TOOL_CALL_DECISION.set(decision)
         span_name = f"{semconv.SPAN_ENVIRONMENT_ACTION} {kind}:{name}"
         try:
-            with self._tracer.start_as_current_span(span_name, kind=SpanKind.INTERNAL) as span:
-                span.set_attribute(semconv.ATTR_ENV_ACTION_ID, aid)
-                span.set_attribute(semconv.ATTR_ENV_ACTION_KIND, kind)
-                span.set_attribute(semconv.ATTR_ENV_ACTION_NAME, name)
-                if changed_files:
-                    span.set_attribute(semconv.ATTR_ENV_ACTION_CHANGED_FILES, changed_files)
-                _set_metadata(span, metadata, "llmmas.env_action.meta")
+            attributes = _attributes(
+                {
+                    semconv.ATTR_ENV_ACTION_ID: action_id,
+                    semconv.ATTR_ENV_ACTION_KIND: kind,
+                    semconv.ATTR_ENV_ACTION_NAME: name,
+                    semconv.ATTR_ENV_ACTION_CHANGED_FILES: changed_files or None,
+                },
+                metadata,
+                "llmmas.env_action.meta",
+            )
+            with self._tracer.start_as_current_span(span_name, kind=SpanKind.INTERNAL, attributes=attributes) as span:
 
                 if record_input and input_text is not None:
-                    span.set_attribute(semconv.ATTR_ENV_ACTION_INPUT_PREVIEW, input_text[:preview_chars])
-                    span.set_attribute(semconv.ATTR_ENV_ACTION_INPUT_SHA256, _sha256_hex(input_text))
+                    _set_content_attrs(
+                        span,
+                        input_text,
+                        preview_chars,
+                        (semconv.ATTR_ENV_ACTION_INPUT_PREVIEW, semconv.ATTR_ENV_ACTION_INPUT_SHA256),
+                    )
 
                 _annotate_fault_on_span(span, decision)
-                yield EnvironmentActionContext(span=span, decision=decision, action_id=aid)
+                yield EnvironmentActionContext(span=span, decision=decision, action_id=action_id)
         finally:
             _CURRENT_TOOL_CALL_DECISION.reset(token)
 
+    @contextmanager
+    def environment_action(
+        self,
+        *,
+        name: str,
+        kind: str = "tool",
+        action_id: Optional[str] = None,
+        input_text: Optional[str] = None,
+        preview_chars: int = 200,
+        record_input: bool = False,
+        tool_type: Optional[str] = None,
+        changed_files: Optional[list[str]] = None,
+        metadata: Optional[Mapping[str, Any]] = None,
+    ) -> Iterator[EnvironmentActionContext]:
+        aid = action_id or new_id("envact")
+        decision = self._environment_action_decision(
+            name=name,
+            kind=kind,
+            action_id=aid,
+            input_text=input_text,
+            tool_type=tool_type,
+        )
+        _apply_delay(decision)
+
+        with self._environment_action_span(
+            decision=decision,
+            name=name,
+            kind=kind,
+            action_id=aid,
+            input_text=input_text,
+            preview_chars=preview_chars,
+            record_input=record_input,
+            changed_files=changed_files,
+            metadata=metadata,
+        ) as ctx:
+            yield ctx
+
+    @asynccontextmanager
+    async def async_environment_action(
+        self,
+        *,
+        name: str,
+        kind: str = "tool",
+        action_id: Optional[str] = None,
+        input_text: Optional[str] = None,
+        preview_chars: int = 200,
+        record_input: bool = False,
+        tool_type: Optional[str] = None,
+        changed_files: Optional[list[str]] = None,
+        metadata: Optional[Mapping[str, Any]] = None,
+    ) -> AsyncIterator[EnvironmentActionContext]:
+        aid = action_id or new_id("envact")
+        decision = self._environment_action_decision(
+            name=name,
+            kind=kind,
+            action_id=aid,
+            input_text=input_text,
+            tool_type=tool_type,
+        )
+        await _apply_delay_async(decision)
+
+        with self._environment_action_span(
+            decision=decision,
+            name=name,
+            kind=kind,
+            action_id=aid,
+            input_text=input_text,
+            preview_chars=preview_chars,
+            record_input=record_input,
+            changed_files=changed_files,
+            metadata=metadata,
+        ) as ctx:
+            yield ctx
+
+    def _tool_call_context(
+        self,
+        env_ctx: EnvironmentActionContext,
+        *,
+        tool_name: str,
+        tool_type: Optional[str],
+        tool_args: Optional[str],
+        preview_chars: int,
+        record_args: bool,
+    ) -> ToolCallContext:
+        span = env_ctx.span
+        call_id = env_ctx.action_id
+        span.set_attributes(
+            _attributes(
+                {
+                    semconv.ATTR_GEN_AI_OPERATION_NAME: semconv.GEN_AI_OPERATION_EXECUTE_TOOL,
+                    semconv.ATTR_GEN_AI_TOOL_NAME: tool_name,
+                    semconv.ATTR_GEN_AI_TOOL_CALL_ID: call_id,
+                    semconv.ATTR_GEN_AI_TOOL_TYPE: tool_type,
+                }
+            )
+        )
+        if record_args and tool_args is not None:
+            _set_content_attrs(
+                span,
+                tool_args,
+                preview_chars,
+                (semconv.ATTR_TOOL_ARGS_PREVIEW, semconv.ATTR_TOOL_ARGS_SHA256),
+            )
+        return ToolCallContext(
+            span=span,
+            decision=env_ctx.decision,
+            call_id=call_id,
+        )
+
     @contextmanager
     def tool_call(
         self,
@@ -650,6 +1206,7 @@ class SpanFactory:
         preview_chars: int = 200,
         record_args: bool = False,
     ) -> Iterator[ToolCallContext]:
+        metrics = get_metrics()
         with self.environment_action(
             name=tool_name,
             kind="tool",
@@ -659,21 +1216,48 @@ class SpanFactory:
             record_input=record_args,
             tool_type=tool_type,
         ) as env_ctx:
-            span = env_ctx.span
-            call_id = env_ctx.action_id
-            span.set_attribute(semconv.ATTR_GEN_AI_OPERATION_NAME, semconv.GEN_AI_OPERATION_EXECUTE_TOOL)
-            span.set_attribute(semconv.ATTR_GEN_AI_TOOL_NAME, tool_name)
-            span.set_attribute(semconv.ATTR_GEN_AI_TOOL_CALL_ID, call_id)
-            if tool_type is not None:
-                span.set_attribute(semconv.ATTR_GEN_AI_TOOL_TYPE, tool_type)
-            if record_args and tool_args is not None:
-                span.set_attribute(semconv.ATTR_TOOL_ARGS_PREVIEW, tool_args[:preview_chars])
-                span.set_attribute(semconv.ATTR_TOOL_ARGS_SHA256, _sha256_hex(tool_args))
-            yield ToolCallContext(
-                span=span,
-                decision=env_ctx.decision,
-                call_id=call_id,
+            ctx = self._tool_call_context(
+                env_ctx,
+                tool_name=tool_name,
+                tool_type=tool_type,
+                tool_args=tool_args,
+                preview_chars=preview_chars,
+                record_args=record_args,
+            )
+            with _timed(metrics.tool_call if metrics is not None else None, tool_name, tool_type):
+                yield ctx
+
+    @asynccontextmanager
+    async def async_tool_call(
+        self,
+        *,
+        tool_name: str,
+        tool_call_id: Optional[str] = None,
+        tool_type: Optional[str] = None,
+        tool_args: Optional[str] = None,
+        preview_chars: int = 200,
+        record_args: bool = False,
+    ) -> AsyncIterator[ToolCallContext]:
+        metrics = get_metrics()
+        async with self.async_environment_action(
+            name=tool_name,
+            kind="tool",
+            action_id=tool_call_id,
+            input_text=tool_args,
+            preview_chars=preview_chars,
+            record_input=record_args,
+            tool_type=tool_type,
+        ) as env_ctx:
+            ctx = self._tool_call_context(
+                env_ctx,
+                tool_name=tool_name,
+                tool_type=tool_type,
+                tool_args=tool_args,
+                preview_chars=preview_chars,
+                record_args=record_args,
             )
+            with _timed(metrics.tool_call if metrics is not None else None, tool_name, tool_type):
+                yield ctx
 
     @contextmanager
     def artifact(
@@ -687,30 +1271,45 @@ class SpanFactory:
         size_bytes: Optional[int] = None,
         metadata: Optional[Mapping[str, Any]] = None,
     ) -> Iterator[ArtifactContext]:
-        aid = artifact_id or f"artifact-{uuid.uuid4().hex[:12]}"
+        aid = artifact_id or new_id("artifact")
         sha: Optional[str] = None
         computed_size = size_bytes
 
-        if content is not None:
-            sha = _sha256_hex(content)
-            computed_size = len(content.encode("utf-8"))
-        elif path is not None and os.path.isfile(path):
-            with open(path, "rb") as f:
-                data = f.read()
-            sha = hashlib.sha256(data).hexdigest()
-            computed_size = len(data)
-
         span_name = f"{semconv.SPAN_ARTIFACT} {kind}"
         with self._tracer.start_as_current_span(span_name, kind=SpanKind.INTERNAL) as span:
-            span.set_attribute(semconv.ATTR_ARTIFACT_ID, aid)
-            span.set_attribute(semconv.ATTR_ARTIFACT_KIND, kind)
-            _set_attr(span, semconv.ATTR_ARTIFACT_NAME, name)
-            _set_attr(span, semconv.ATTR_ARTIFACT_PATH, path)
-            _set_attr(span, semconv.ATTR_ARTIFACT_SHA256, sha)
-            _set_attr(span, semconv.ATTR_ARTIFACT_SIZE_BYTES, computed_size)
-            _set_metadata(span, metadata, "llmmas.artifact.meta")
+            store_enabled = message_store.is_enabled()
+            # Hashing (and reading the file) is skipped when neither the span nor the store keeps it.
+            defer_sha = not store_enabled and export.is_deferred_hashing_enabled()
+            if span.is_recording() or store_enabled:
+                if content is not None:
+                    if not defer_sha:
+                        sha = _sha256_hex(content)
+                    computed_size = len(content.encode("utf-8"))
+                elif path is not None and os.path.isfile(path):
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    sha = hashlib.sha256(data).hexdigest()
+                    computed_size = len(data)
+
+            deferred = defer_sha and content is not None and span.is_recording()
+            span.set_attributes(
+                _attributes(
+                    {
+                        semconv.ATTR_ARTIFACT_ID: aid,
+                        semconv.ATTR_ARTIFACT_KIND: kind,
+                        semconv.ATTR_ARTIFACT_NAME: name,
+                        semconv.ATTR_ARTIFACT_PATH: path,
+                        semconv.ATTR_ARTIFACT_SHA256: None if deferred else sha,
+                        semconv.ATTR_ARTIFACT_SIZE_BYTES: computed_size,
+                    },
+                    metadata,
+                    "llmmas.artifact.meta",
+                )
+            )
+            if deferred:
+                export.defer_sha256(span, semconv.ATTR_ARTIFACT_SHA256, content)
 
-            if message_store.is_enabled():
+            if store_enabled:
                 message_store.write_artifact(
                     artifact_id=aid,
                     kind=kind,
@@ -723,76 +1322,197 @@ class SpanFactory:
 
             yield ArtifactContext(span=span, artifact_id=aid)
 
-    @contextmanager
-    def llm_call(
+    def _llm_call_decision(
         self,
         *,
         provider_name: str,
         model: str,
-        operation_name: str = semconv.GEN_AI_OPERATION_INFERENCE,
-        request_id: Optional[str] = None,
-        input_text: Optional[str] = None,
-        preview_chars: int = 200,
-        record_input: bool = True,
-        agent_id: Optional[str] = None,
-        metadata: Optional[Mapping[str, Any]] = None,
-    ) -> Iterator[LLMCallContext]:
+        operation_name: str,
+        request_id: str,
+        input_text: Optional[str],
+        agent_id: Optional[str],
+    ) -> Optional[object]:
+        if not _INJECTION.enabled:
+            return None
+
         seg = message_store.current_segment() or {}
         session_id = message_store.current_session_id()
 
-        rid = request_id or f"llmreq-{uuid.uuid4().hex[:12]}"
+        return _fault_decision(
+            HookType.LLM_CALL,
+            input_text,
+            session_id=session_id,
+            phase_name=seg.get("name"),
+            phase_order=seg.get("order"),
+            agent_id=agent_id,
+            tool_name=None,
+            extras={
+                "provider": provider_name,
+                "model": model,
+                "operation": operation_name,
+                "request_id": request_id,
+            },
+        )
 
-        decision = None
+    @contextmanager
+    def _llm_call_span(
+        self,
+        *,
+        decision: Optional[object],
+        provider_name: str,
+        model: str,
+        operation_name: str,
+        request_id: str,
+        input_text: Optional[str],
+        preview_chars: int,
+        record_input: bool,
+        agent_id: Optional[str],
+        metadata: Optional[Mapping[str, Any]],
+        cache_enabled: bool,
+    ) -> Iterator[LLMCallContext]:
+        token = _CURRENT_LLM_CALL_DECISION.set(decision)
+
+        span_name = f"{operation_name} {model}"
         try:
-            from .injection import DecisionKind, HookContext, HookType, get_engine, is_enabled
-        except Exception:
-            HookContext = None
-            HookType = None
-            get_engine = None
-            is_enabled = lambda: False
-            DecisionKind = None
-
-        if is_enabled() and HookContext is not None:
-            ctx = HookContext(
-                hook_type=HookType.LLM_CALL,
-                session_id=session_id,
-                phase_name=seg.get("name"),
-                phase_order=seg.get("order"),
-                agent_id=agent_id,
-                tool_name=None,
-                extras={
-                    "provider": provider_name,
-                    "model": model,
-                    "operation": operation_name,
-                    "request_id": rid,
+            attributes = _attributes(
+                {
+                    semconv.ATTR_GEN_AI_OPERATION_NAME: operation_name,
+                    semconv.ATTR_GEN_AI_PROVIDER_NAME: provider_name,
+                    semconv.ATTR_GEN_AI_REQUEST_MODEL: model,
+                    semconv.ATTR_GEN_AI_REQUEST_ID: request_id,
+                    semconv.ATTR_AGENT_ID: agent_id,
                 },
+                metadata,
+                "llmmas.llm.meta",
             )
-            decision = get_engine().decide(ctx, payload=input_text)
 
-            if decision.kind == DecisionKind.DELAY and decision.delay_ms is not None:
-                time.sleep(decision.delay_ms / 1000.0)
+            cache = get_llm_cache() if cache_enabled else None
+            input_sha = cache_key = cached = None
+            if cache is not None and input_text is not None and _is_cacheable(decision):
+                input_sha = _sha256_hex(input_text)
+                cache_key = cache.key(provider_name, model, input_sha)
+                cached = cache.get(cache_key)
+                attributes[semconv.ATTR_LLM_CACHE_HIT] = cached is not None
 
-        token = _CURRENT_LLM_CALL_DECISION.set(decision)
-
-        span_name = f"{operation_name} {model}"
-        try:
-            with self._tracer.start_as_current_span(span_name, kind=SpanKind.CLIENT) as span:
-                span.set_attribute(semconv.ATTR_GEN_AI_OPERATION_NAME, operation_name)
-                span.set_attribute(semconv.ATTR_GEN_AI_PROVIDER_NAME, provider_name)
-                span.set_attribute(semconv.ATTR_GEN_AI_REQUEST_MODEL, model)
-                span.set_attribute(semconv.ATTR_GEN_AI_REQUEST_ID, rid)
-                _set_attr(span, semconv.ATTR_AGENT_ID, agent_id)
-                _set_metadata(span, metadata, "llmmas.llm.meta")
+            with self._tracer.start_as_current_span(span_name, kind=SpanKind.CLIENT, attributes=attributes) as span:
 
                 _annotate_fault_on_span(span, decision)
 
                 if record_input and input_text is not None:
-                    span.set_attribute(semconv.ATTR_LLM_INPUT_PREVIEW, input_text[:preview_chars])
-                    span.set_attribute(semconv.ATTR_LLM_INPUT_SHA256, _sha256_hex(input_text))
+                    _set_content_attrs(
+                        span,
+                        input_text,
+                        preview_chars,
+                        (semconv.ATTR_LLM_INPUT_PREVIEW, semconv.ATTR_LLM_INPUT_SHA256),
+                        sha=input_sha,
+                    )
+                if cached is not None:
+                    _set_content_attrs(
+                        span,
+                        cached,
+                        preview_chars,
+                        (semconv.ATTR_LLM_OUTPUT_PREVIEW, semconv.ATTR_LLM_OUTPUT_SHA256),
+                    )
 
-                yield LLMCallContext(span=span, decision=decision, request_id=rid)
+                metrics = get_metrics()
+                with _timed(
+                    metrics.llm_call if metrics is not None else None,
+                    provider_name,
+                    model,
+                    operation_name,
+                    None if cache_key is None else cached is not None,
+                ):
+                    yield LLMCallContext(
+                        span=span,
+                        decision=decision,
+                        request_id=request_id,
+                        cached_output=cached,
+                        cache_key=cache_key,
+                    )
         finally:
             _CURRENT_LLM_CALL_DECISION.reset(token)
 
+    @contextmanager
+    def llm_call(
+        self,
+        *,
+        provider_name: str,
+        model: str,
+        operation_name: str = semconv.GEN_AI_OPERATION_INFERENCE,
+        request_id: Optional[str] = None,
+        input_text: Optional[str] = None,
+        preview_chars: int = 200,
+        record_input: bool = True,
+        agent_id: Optional[str] = None,
+        metadata: Optional[Mapping[str, Any]] = None,
+        cache: bool = False,
+    ) -> Iterator[LLMCallContext]:
+        rid = request_id or new_id("llmreq")
+        decision = self._llm_call_decision(
+            provider_name=provider_name,
+            model=model,
+            operation_name=operation_name,
+            request_id=rid,
+            input_text=input_text,
+            agent_id=agent_id,
+        )
+        _apply_delay(decision)
+
+        with self._llm_call_span(
+            decision=decision,
+            provider_name=provider_name,
+            model=model,
+            operation_name=operation_name,
+            request_id=rid,
+            input_text=input_text,
+            preview_chars=preview_chars,
+            record_input=record_input,
+            agent_id=agent_id,
+            metadata=metadata,
+            cache_enabled=cache,
+        ) as ctx:
+            yield ctx
+
+    @asynccontextmanager
+    async def async_llm_call(
+        self,
+        *,
+        provider_name: str,
+        model: str,
+        operation_name: str = semconv.GEN_AI_OPERATION_INFERENCE,
+        request_id: Optional[str] = None,
+        input_text: Optional[str] = None,
+        preview_chars: int = 200,
+        record_input: bool = True,
+        agent_id: Optional[str] = None,
+        metadata: Optional[Mapping[str, Any]] = None,
+        cache: bool = False,
+    ) -> AsyncIterator[LLMCallContext]:
+        rid = request_id or new_id("llmreq")
+        decision = self._llm_call_decision(
+            provider_name=provider_name,
+            model=model,
+            operation_name=operation_name,
+            request_id=rid,
+            input_text=input_text,
+            agent_id=agent_id,
+        )
+        await _apply_delay_async(decision)
+
+        with self._llm_call_span(
+            decision=decision,
+            provider_name=provider_name,
+            model=model,
+            operation_name=operation_name,
+            request_id=rid,
+            input_text=input_text,
+            preview_chars=preview_chars,
+            record_input=record_input,
+            agent_id=agent_id,
+            metadata=metadata,
+            cache_enabled=cache,
+        ) as ctx:
+            yield ctx
+
 
-default_span_factory = SpanFactory()
\ No newline at end of file
+default_span_factory = SpanFactory()
@@ -0,0 +1,18 @@
+from .binary import BinaryMessageReader, BinaryMessageWriter, convert_binary_to_jsonl, convert_jsonl_to_binary
+from .blobs import DedupBodyWriter, load_blobs, read_messages
+from .shards import merge_shards, shard_paths
+from .writers import BufferedJSONLWriter, JSONLWriter
+
+__all__ = [
+    "JSONLWriter",
+    "BufferedJSONLWriter",
+    "BinaryMessageWriter",
+    "BinaryMessageReader",
+    "convert_jsonl_to_binary",
+    "convert_binary_to_jsonl",
+    "DedupBodyWriter",
+    "load_blobs",
+    "read_messages",
+    "merge_shards",
+    "shard_paths",
+]
@@ -0,0 +1,396 @@
+"""
+Compact binary message store.
+
+The data file is a header followed by frames, each a 1-byte type, a 4-byte
+little-endian payload length and the payload:
+
+- ``S``: an interned string (UTF-8). Strings are numbered in file order.
+- ``B``: a message body, stored once per sha256: 32-byte digest + UTF-8 text.
+  Bodies are numbered in file order.
+- ``R``: a record, as a compact JSON array ``[schema_id, value, ...]``. The
+  schema is the interned JSON list of the record's keys. Session, workflow,
+  agent and other low-cardinality fields are interned-string ids, ``body`` is
+  a body id.
+
+A JSON sidecar index (``<path>.idx``) maps session_id, message_id and sha256
+to record offsets and holds the string and body tables, so a reader can seek
+straight to one session's records. It is rewritten on flush()/close() and
+rebuilt by scanning the data file when missing or stale.
+
+    python -m llmmas_otel.store.binary out/messages_demo.jsonl out/messages_demo.llmms
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import threading
+from typing import Any, BinaryIO, Iterator, Optional
+
+from .writers import discard_file
+
+MAGIC = b"LLMMSB1\n"
+INDEX_VERSION = 1
+
+_FRAME_HEADER = struct.Struct("<cI")
+_STRING = b"S"
+_BODY = b"B"
+_RECORD = b"R"
+
+# Fields whose values repeat across records; stored as interned JSON.
+INTERNED_FIELDS = frozenset(
+    {
+        "record_type",
+        "session_id",
+        "workflow",
+        "segment",
+        "direction",
+        "source_agent_id",
+        "target_agent_id",
+        "edge_id",
+        "channel",
+        "message_kind",
+        "route_via",
+        "fault_spec_id",
+        "fault_type",
+        "fault_decision",
+        "kind",
+    }
+)
+
+
+def _json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def index_path_for(path: str) -> str:
+    return path + ".idx"
+
+
+class _Index:
+    """In-memory tables shared by the writer and the reader."""
+
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self.string_ids: dict[str, int] = {}
+        self.body_offsets: list[int] = []
+        self.body_ids: dict[str, int] = {}
+        self.sessions: dict[str, list[int]] = {}
+        self.messages: dict[str, list[int]] = {}
+        self.sha256: dict[str, list[int]] = {}
+        self.data_size = len(MAGIC)
+
+    def add_string(self, text: str) -> int:
+        sid = len(self.strings)
+        self.strings.append(text)
+        self.string_ids[text] = sid
+        return sid
+
+    def add_record(self, offset: int, record: dict[str, Any]) -> None:
+        for table, key in ((self.sessions, "session_id"), (self.messages, "message_id"), (self.sha256, "sha256")):
+            value = record.get(key)
+            if isinstance(value, str):
+                table.setdefault(value, []).append(offset)
+
+    def to_json(self) -> dict[str, Any]:
+        digests = [""] * len(self.body_offsets)
+        for sha, bid in self.body_ids.items():
+            digests[bid] = sha
+        return {
+            "version": INDEX_VERSION,
+            "data_size": self.data_size,
+            "strings": self.strings,
+            "bodies": [[offset, sha] for offset, sha in zip(self.body_offsets, digests)],
+            "sessions": self.sessions,
+            "messages": self.messages,
+            "sha256": self.sha256,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "_Index":
+        index = cls()
+        for text in data["strings"]:
+            index.add_string(text)
+        for bid, (offset, sha) in enumerate(data["bodies"]):
+            index.body_offsets.append(offset)
+            index.body_ids[sha] = bid
+        index.sessions = data["sessions"]
+        index.messages = data["messages"]
+        index.sha256 = data["sha256"]
+        index.data_size = data["data_size"]
+        return index
+
+
+def _read_frame(f: BinaryIO) -> Optional[tuple[bytes, bytes]]:
+    header = f.read(_FRAME_HEADER.size)
+    if len(header) < _FRAME_HEADER.size:
+        return None
+    kind, length = _FRAME_HEADER.unpack(header)
+    payload = f.read(length)
+    if len(payload) < length:
+        # Truncated tail (e.g. the writer was killed mid-frame).
+        return None
+    return kind, payload
+
+
+def _scan(f: BinaryIO) -> _Index:
+    """Rebuild the index from the data file."""
+    index = _Index()
+    f.seek(0)
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not a binary message store file")
+    offset = len(MAGIC)
+    while True:
+        frame = _read_frame(f)
+        if frame is None:
+            break
+        kind, payload = frame
+        if kind == _STRING:
+            index.add_string(payload.decode("utf-8"))
+        elif kind == _BODY:
+            index.body_ids[payload[:32].hex()] = len(index.body_offsets)
+            index.body_offsets.append(offset)
+        elif kind == _RECORD:
+            index.add_record(offset, _decode_record(json.loads(payload), index, lambda bid: None))
+        offset += _FRAME_HEADER.size + len(payload)
+    index.data_size = offset
+    return index
+
+
+def _load_index(path: str, f: BinaryIO) -> _Index:
+    size = os.fstat(f.fileno()).st_size
+    try:
+        with open(index_path_for(path), "r", encoding="utf-8") as idx:
+            data = json.load(idx)
+        if data.get("version") == INDEX_VERSION and data.get("data_size") == size:
+            return _Index.from_json(data)
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return _scan(f)
+
+
+def _decode_record(row: list[Any], index: _Index, read_body: Any) -> dict[str, Any]:
+    keys = json.loads(index.strings[row[0]])
+    record: dict[str, Any] = {}
+    for key, value in zip(keys, row[1:]):
+        if value is None:
+            record[key] = None
+        elif key == "body":
+            record[key] = value["v"] if isinstance(value, dict) else read_body(value)
+        elif key == "workflow_stack":
+            if isinstance(value, list):
+                record[key] = [json.loads(index.strings[sid]) for sid in value]
+            else:
+                record[key] = json.loads(index.strings[value])
+        elif key in INTERNED_FIELDS:
+            record[key] = json.loads(index.strings[value])
+        else:
+            record[key] = value
+    return record
+
+
+class BinaryMessageWriter:
+    """
+    Message store writer for the compact binary format.
+
+    Keeps the file open; flush() writes out buffered bytes and the sidecar
+    index. Appending to an existing file reloads its string and body tables.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, "a+b")
+        if exists:
+            self._index = _load_index(path, self._file)
+            # Drop a truncated tail frame so new frames start at a frame boundary.
+            self._file.truncate(self._index.data_size)
+        else:
+            self._file.write(MAGIC)
+            self._index = _Index()
+        self._file.seek(0, os.SEEK_END)
+
+    def _frame(self, kind: bytes, payload: bytes) -> int:
+        offset = self._index.data_size
+        self._file.write(_FRAME_HEADER.pack(kind, len(payload)))
+        self._file.write(payload)
+        self._index.data_size += _FRAME_HEADER.size + len(payload)
+        return offset
+
+    def _intern(self, text: str) -> int:
+        sid = self._index.string_ids.get(text)
+        if sid is None:
+            self._frame(_STRING, text.encode("utf-8"))
+            sid = self._index.add_string(text)
+        return sid
+
+    def _body_id(self, body: str, sha256: Optional[str]) -> int:
+        # Trust the record's sha256 (computed by SpanFactory) when it has one.
+        sha = sha256 if isinstance(sha256, str) and len(sha256) == 64 else hashlib.sha256(body.encode("utf-8")).hexdigest()
+        bid = self._index.body_ids.get(sha)
+        if bid is None:
+            offset = self._frame(_BODY, bytes.fromhex(sha) + body.encode("utf-8"))
+            bid = len(self._index.body_offsets)
+            self._index.body_offsets.append(offset)
+            self._index.body_ids[sha] = bid
+        return bid
+
+    def _encode_value(self, key: str, value: Any, record: dict[str, Any]) -> Any:
+        if value is None:
+            return None
+        if key == "body":
+            if isinstance(value, str):
+                return self._body_id(value, record.get("sha256"))
+            return {"v": value}
+        if key == "workflow_stack" and isinstance(value, list):
+            return [self._intern(_json(item)) for item in value]
+        if key in INTERNED_FIELDS or key == "workflow_stack":
+            return self._intern(_json(value))
+        return value
+
+    def write(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            row: list[Any] = [self._intern(_json(list(record)))]
+            row.extend(self._encode_value(key, value, record) for key, value in record.items())
+            offset = self._frame(_RECORD, _json(row).encode("utf-8"))
+            self._index.add_record(offset, record)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.flush()
+            tmp = index_path_for(self.path) + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._index.to_json(), f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, index_path_for(self.path))
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._file.close()
+
+    def abandon(self) -> None:
+        """Close without writing buffered frames or the index; for a writer inherited by a forked child."""
+        discard_file(self._file)
+
+
+class BinaryMessageReader:
+    """
+    Random-access reader for the binary message store.
+
+        with BinaryMessageReader("out/messages.llmms") as reader:
+            for record in reader.session("programdev-demo::Checkers"):
+                ...
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = open(path, "rb")
+        self._index = _load_index(path, self._file)
+
+    def __enter__(self) -> "BinaryMessageReader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def session_ids(self) -> list[str]:
+        return list(self._index.sessions)
+
+    def session(self, session_id: str) -> Iterator[dict[str, Any]]:
+        """Records of one session, in write order, read by seeking to each."""
+        for offset in self._index.sessions.get(session_id, ()):
+            yield self._record_at(offset)
+
+    def message(self, message_id: str) -> list[dict[str, Any]]:
+        """All records (e.g. send and receive) for a message id."""
+        return [self._record_at(offset) for offset in self._index.messages.get(message_id, ())]
+
+    def by_sha256(self, sha256: str) -> list[dict[str, Any]]:
+        return [self._record_at(offset) for offset in self._index.sha256.get(sha256, ())]
+
+    def body(self, sha256: str) -> Optional[str]:
+        bid = self._index.body_ids.get(sha256)
+        return None if bid is None else self._body(bid)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        """All records in write order (a sequential scan)."""
+        offset = len(MAGIC)
+        while offset < self._index.data_size:
+            # Re-seek every time: body lookups and other calls move the file position.
+            self._file.seek(offset)
+            frame = _read_frame(self._file)
+            if frame is None:
+                return
+            kind, payload = frame
+            offset += _FRAME_HEADER.size + len(payload)
+            if kind == _RECORD:
+                yield _decode_record(json.loads(payload), self._index, self._body)
+
+    def _frame_at(self, offset: int) -> tuple[bytes, bytes]:
+        self._file.seek(offset)
+        frame = _read_frame(self._file)
+        if frame is None:
+            raise ValueError(f"truncated frame at offset {offset}")
+        return frame
+
+    def _body(self, bid: int) -> str:
+        _, payload = self._frame_at(self._index.body_offsets[bid])
+        return payload[32:].decode("utf-8")
+
+    def _record_at(self, offset: int) -> dict[str, Any]:
+        _, payload = self._frame_at(offset)
+        return _decode_record(json.loads(payload), self._index, self._body)
+
+
+def convert_jsonl_to_binary(src: str, dst: str) -> int:
+    """Convert a JSONL message store file; returns the number of records."""
+    writer = BinaryMessageWriter(dst)
+    count = 0
+    try:
+        with open(src, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    writer.write(json.loads(line))
+                    count += 1
+    finally:
+        writer.close()
+    return count
+
+
+def convert_binary_to_jsonl(src: str, dst: str) -> int:
+    from .writers import dumps_record
+
+    count = 0
+    with BinaryMessageReader(src) as reader, open(dst, "w", encoding="utf-8") as out:
+        for record in reader:
+            out.write(dumps_record(record))
+            count += 1
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert message store files between JSONL and the binary format.")
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    parser.add_argument("--to-jsonl", action="store_true", help="convert binary -> JSONL instead")
+    args = parser.parse_args()
+
+    if args.to_jsonl:
+        n = convert_binary_to_jsonl(args.src, args.dst)
+    else:
+        n = convert_jsonl_to_binary(args.src, args.dst)
+    src_size = os.path.getsize(args.src)
+    dst_size = os.path.getsize(args.dst)
+    print(f"{n} records: {src_size:,} -> {dst_size:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Content-addressed body deduplication for the JSONL message store.
+
+Message records keep their ``sha256`` and replace ``body`` with
+``body_ref`` (the same hash). Bodies go to a sidecar blob file
+(``<path>.blobs.jsonl``, one ``{"sha256": ..., "body": ...}`` per line). An LRU
+of recently written hashes means a body seen again (send then receive, a goal
+reused as a delegation goal, repeated tool output) costs only the reference.
+A hash that has fallen out of the LRU is written again, which is harmless:
+readers keep the first copy.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Iterator, Protocol
+
+
+class RecordWriter(Protocol):
+    def write(self, record: dict[str, Any]) -> None: ...
+
+    def flush(self) -> None: ...
+
+    def close(self) -> None: ...
+
+    def abandon(self) -> None: ...
+
+
+def blob_path_for(path: str) -> str:
+    return path + ".blobs.jsonl"
+
+
+class DedupBodyWriter:
+    """Wraps a record writer and moves message bodies into a blob writer."""
+
+    def __init__(self, records: RecordWriter, blobs: RecordWriter, *, cache_size: int = 4096) -> None:
+        if cache_size <= 0:
+            raise ValueError("cache_size must be > 0")
+        self._records = records
+        self._blobs = blobs
+        self._cache_size = cache_size
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _is_new(self, sha: str) -> bool:
+        with self._lock:
+            if sha in self._seen:
+                self._seen.move_to_end(sha)
+                return False
+            self._seen[sha] = None
+            if len(self._seen) > self._cache_size:
+                self._seen.popitem(last=False)
+            return True
+
+    def write(self, record: dict[str, Any]) -> None:
+        body = record.get("body")
+        if not isinstance(body, str):
+            self._records.write(record)
+            return
+
+        sha = record.get("sha256")
+        if not isinstance(sha, str):
+            sha = hashlib.sha256(body.encode("utf-8")).hexdigest()
+        if self._is_new(sha):
+            # Blob first: with unbuffered writers a reader never sees a reference without its body.
+            self._blobs.write({"sha256": sha, "body": body})
+
+        deduped = {("body_ref" if key == "body" else key): (sha if key == "body" else value) for key, value in record.items()}
+        self._records.write(deduped)
+
+    def flush(self) -> None:
+        self._blobs.flush()
+        self._records.flush()
+
+    def close(self) -> None:
+        self._blobs.close()
+        self._records.close()
+
+    def abandon(self) -> None:
+        self._blobs.abandon()
+        self._records.abandon()
+
+
+def load_blobs(path: str) -> dict[str, str]:
+    """sha256 -> body for a message store file written with dedup_bodies=True."""
+    blobs: dict[str, str] = {}
+    try:
+        with open(blob_path_for(path), "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    blob = json.loads(line)
+                    blobs.setdefault(blob["sha256"], blob["body"])
+    except FileNotFoundError:
+        pass
+    return blobs
+
+
+def read_messages(path: str) -> Iterator[dict[str, Any]]:
+    """Records of a JSONL message store with ``body`` restored from ``body_ref``."""
+    blobs = load_blobs(path)
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "body_ref" in record:
+                record = {
+                    ("body" if key == "body_ref" else key): (blobs.get(value) if key == "body_ref" else value)
+                    for key, value in record.items()
+                }
+            yield record
@@ -0,0 +1,115 @@
+"""
+Per-process shard files for the JSONL message store, and their compaction.
+
+With enable_message_store(path, concurrency="process") every process writes
+its own ``<stem>.shard-<pid><suffix>`` file (``out/messages.jsonl`` ->
+``out/messages.shard-4242.jsonl``), so parallel workers never share a file
+handle. Records carry ``ts_unix_nano``; merge_shards() interleaves the shards
+by it with a streaming k-way merge and appends the result to ``path``.
+
+    python -m llmmas_otel.store.shards out/messages.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Iterator
+
+from .blobs import blob_path_for
+from .writers import dumps_record
+
+TS_FIELD = "ts_unix_nano"
+
+
+def shard_path_for(path: str, pid: int) -> str:
+    p = Path(path)
+    return str(p.with_name(f"{p.stem}.shard-{pid}{p.suffix}"))
+
+
+def shard_paths(path: str) -> list[str]:
+    """Existing shard files for `path`, ordered by pid."""
+    p = Path(path)
+    pattern = re.compile(rf"^{re.escape(p.stem)}\.shard-(\d+){re.escape(p.suffix)}$")
+    found = []
+    for candidate in p.parent.glob(f"{p.stem}.shard-*{p.suffix}"):
+        match = pattern.match(candidate.name)
+        if match:
+            found.append((int(match.group(1)), str(candidate)))
+    return [shard for _, shard in sorted(found)]
+
+
+def _read_shard(path: str, shard_index: int) -> Iterator[tuple[int, int, int, str]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            if not line.strip():
+                continue
+            try:
+                ts = int(json.loads(line).get(TS_FIELD, 0))
+            except ValueError:
+                # Torn last line of a shard whose process was killed.
+                continue
+            yield ts, shard_index, line_no, line if line.endswith("\n") else line + "\n"
+
+
+def merge_shards(path: str, *, remove: bool = True) -> int:
+    """
+    Append all shards of `path` to `path` in timestamp order; returns the number
+    of records merged. Blob shards (dedup_bodies=True) are merged into
+    `<path>.blobs.jsonl`, keeping one copy of each body.
+    """
+    shards = shard_paths(path)
+    if not shards:
+        return 0
+
+    count = 0
+    with open(path, "a", encoding="utf-8") as out:
+        for _, _, _, line in heapq.merge(*(_read_shard(s, i) for i, s in enumerate(shards))):
+            out.write(line)
+            count += 1
+
+    blob_shards = [blob_path_for(s) for s in shards if os.path.exists(blob_path_for(s))]
+    if blob_shards:
+        _merge_blobs(blob_path_for(path), blob_shards)
+
+    if remove:
+        for shard in shards + blob_shards:
+            os.remove(shard)
+    return count
+
+
+def _merge_blobs(dst: str, sources: list[str]) -> None:
+    seen: set[str] = set()
+    if os.path.exists(dst):
+        with open(dst, "r", encoding="utf-8") as f:
+            seen.update(json.loads(line)["sha256"] for line in f if line.strip())
+    with open(dst, "a", encoding="utf-8") as out:
+        for src in sources:
+            with open(src, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        blob: dict[str, Any] = json.loads(line)
+                    except ValueError:
+                        continue
+                    if blob["sha256"] not in seen:
+                        seen.add(blob["sha256"])
+                        out.write(dumps_record(blob))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Merge per-process message store shards into one JSONL file.")
+    parser.add_argument("path", help="the path passed to enable_message_store, e.g. out/messages.jsonl")
+    parser.add_argument("--keep-shards", action="store_true")
+    args = parser.parse_args()
+
+    n = merge_shards(args.path, remove=not args.keep_shards)
+    print(f"merged {n} records into {args.path}")
+
+
+if __name__ == "__main__":
+    main()
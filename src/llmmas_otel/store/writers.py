@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import IO, Any, Optional
+
+
+def dumps_record(record: dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False, default=str) + "\n"
+
+
+def discard_file(f: IO[Any]) -> None:
+    """
+    Close `f` without writing its buffered bytes to the file.
+
+    For a file object inherited across fork(): its descriptor is pointed at
+    os.devnull first, so the flush that close() (or garbage collection) does
+    cannot append the parent's pending bytes to the shared file.
+    """
+    if f.closed:
+        return
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    try:
+        os.dup2(devnull, f.fileno())
+    finally:
+        os.close(devnull)
+    f.close()
+
+
+class JSONLWriter:
+    """
+    Default writer: opens, appends and closes the file for every record.
+
+    Slow under load, but nothing is ever lost if the process dies abruptly.
+    Writes from different threads are serialized so records never interleave.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def write(self, record: dict[str, Any]) -> None:
+        line = dumps_record(record)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def abandon(self) -> None:
+        pass
+
+
+class BufferedJSONLWriter:
+    """
+    Buffered writer: keeps the file handle open and batches records in memory.
+
+    Callers only append to an in-memory list. A background thread serializes and
+    writes the batch every `flush_interval_s` seconds, or earlier once
+    `max_buffer_records` records are pending. `close()` always drains the buffer.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        flush_interval_s: float = 1.0,
+        max_buffer_records: int = 512,
+    ) -> None:
+        if flush_interval_s <= 0:
+            raise ValueError("flush_interval_s must be > 0")
+        if max_buffer_records <= 0:
+            raise ValueError("max_buffer_records must be > 0")
+
+        self.path = path
+        self.flush_interval_s = flush_interval_s
+        self.max_buffer_records = max_buffer_records
+
+        self._file = open(path, "a", encoding="utf-8")
+        self._buffer: list[dict[str, Any]] = []
+        self._buffer_lock = threading.Lock()
+        # Held while a batch is taken and written, so batches reach the file in order.
+        self._io_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+
+        self._thread: Optional[threading.Thread] = threading.Thread(
+            target=self._run,
+            name="llmmas-message-store-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def write(self, record: dict[str, Any]) -> None:
+        with self._buffer_lock:
+            if self._closed:
+                # Raced with disable_message_store(); treat like a disabled store.
+                return
+            self._buffer.append(record)
+            full = len(self._buffer) >= self.max_buffer_records
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        with self._io_lock:
+            with self._buffer_lock:
+                batch, self._buffer = self._buffer, []
+            if not batch or self._file.closed:
+                return
+            self._file.write("".join(dumps_record(r) for r in batch))
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._buffer_lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+        self.flush()
+        with self._io_lock:
+            self._file.close()
+
+    def abandon(self) -> None:
+        """Drop pending records and close without writing; for a writer inherited by a forked child."""
+        # No locks: the child may have inherited them held by a thread that no
+        # longer exists. That thread is not running here either, so nothing to join.
+        self._closed = True
+        self._buffer = []
+        self._thread = None
+        discard_file(self._file)
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval_s)
+            self._wakeup.clear()
+            self.flush()
+            if self._closed:
+                return
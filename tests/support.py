@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+_EXPORTER: InMemorySpanExporter | None = None
+
+
+def in_memory_exporter() -> InMemorySpanExporter:
+    """
+    Install (once per process) a global tracer provider exporting to memory.
+
+    The global provider can only be set once, so all span-level tests share it
+    and clear the exporter in setUp.
+    """
+    global _EXPORTER
+    if _EXPORTER is None:
+        _EXPORTER = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(_EXPORTER))
+        trace.set_tracer_provider(provider)
+    return _EXPORTER
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import unittest
+
+from llmmas_otel import observe_llm_call, observe_tool_call
+from llmmas_otel.injection import (
+    FaultSpec,
+    SpecFaultEngine,
+    disable_fault_injection,
+    enable_fault_injection,
+)
+from llmmas_otel.span_factory import default_span_factory
+
+from tests.support import in_memory_exporter
+
+
+def _engine(*raw_specs: dict) -> SpecFaultEngine:
+    return SpecFaultEngine(specs=[FaultSpec.from_dict(r) for r in raw_specs], seed="0")
+
+
+class TestAsyncSpans(unittest.TestCase):
+    def setUp(self) -> None:
+        self.exporter = in_memory_exporter()
+        self.exporter.clear()
+
+    def tearDown(self) -> None:
+        disable_fault_injection()
+
+    def test_async_delays_do_not_block_the_loop(self) -> None:
+        enable_fault_injection(
+            _engine(
+                {
+                    "id": "DELAY",
+                    "hook": "a2a_send",
+                    "selector": {"edge_id": "A->B"},
+                    "action": {"type": "a2a.delay", "params": {"delay_ms": 200}},
+                }
+            )
+        )
+
+        async def send(i: int) -> None:
+            with default_span_factory.session(session_id=f"S{i}"):
+                async with default_span_factory.async_a2a_send(
+                    source_agent_id="A",
+                    target_agent_id="B",
+                    edge_id="A->B",
+                    message_id=f"m{i}",
+                    message_body="hello",
+                ) as ctx:
+                    self.assertEqual(ctx.decision.kind.value, "delay")
+
+        async def main() -> None:
+            await asyncio.gather(*(send(i) for i in range(10)))
+
+        t0 = time.perf_counter()
+        asyncio.run(main())
+        elapsed = time.perf_counter() - t0
+
+        # Ten 200ms delays serialized would take 2s.
+        self.assertLess(elapsed, 1.0)
+        sends = [s for s in self.exporter.get_finished_spans() if s.name == "send A->B"]
+        self.assertEqual(len(sends), 10)
+        for span in sends:
+            self.assertIsNotNone(span.parent)
+
+    def test_async_decorators_apply_decisions(self) -> None:
+        enable_fault_injection(
+            _engine(
+                {"id": "LLM_RET", "hook": "llm_call", "selector": {}, "action": {"type": "llm.malformed_response"}},
+                {"id": "TOOL_TO", "hook": "tool_call", "selector": {"tool_name": "pytest"}, "action": {"type": "tool.timeout"}},
+            )
+        )
+
+        @observe_llm_call(provider_name="test", model="m", input_text_fn=lambda prompt: prompt)
+        async def generate(prompt: str) -> str:
+            return "real"
+
+        @observe_tool_call(tool_name="pytest")
+        async def run_tests() -> str:
+            return "ok"
+
+        self.assertTrue(asyncio.iscoroutinefunction(generate))
+        self.assertEqual(asyncio.run(generate("hi")), "MALFORMED_LLM_RESPONSE")
+        with self.assertRaises(TimeoutError):
+            asyncio.run(run_tests())
+
+        names = [s.name for s in self.exporter.get_finished_spans()]
+        self.assertIn("inference m", names)
+        self.assertIn("llmmas.environment_action tool:pytest", names)
+
+
+if __name__ == "__main__":
+    unittest.main()
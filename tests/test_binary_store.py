@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from llmmas_otel import message_store
+from llmmas_otel.store import BinaryMessageReader, convert_jsonl_to_binary
+from llmmas_otel.store.binary import index_path_for
+
+
+def _write_sessions() -> None:
+    for session in ("S1", "S2"):
+        with message_store.session_context(session):
+            with message_store.workflow_context(workflow_id="w1", name="planning", order=0):
+                for i in range(5):
+                    body = f"shared goal {i % 2}"
+                    sha = hashlib.sha256(body.encode("utf-8")).hexdigest()
+                    for direction in ("send", "receive"):
+                        message_store.write_message(
+                            direction=direction,
+                            message_id=f"{session}-msg-{i}",
+                            sha256=sha,
+                            body=body,
+                            source_agent_id="Planner",
+                            target_agent_id="Coder",
+                            edge_id="Planner->Coder",
+                            dropped=direction == "receive" and i == 3,
+                        )
+            message_store.write_artifact(artifact_id="a1", kind="file", path="main.py", metadata={"lines": 3})
+
+
+class TestBinaryStore(unittest.TestCase):
+    def tearDown(self) -> None:
+        message_store.disable_message_store()
+
+    def _write_both(self, td: str) -> tuple[Path, Path]:
+        jsonl = Path(td) / "messages.jsonl"
+        binary = Path(td) / "messages.llmms"
+        for path, fmt in ((jsonl, "jsonl"), (binary, "binary")):
+            message_store.enable_message_store(str(path), format=fmt)
+            _write_sessions()
+            message_store.disable_message_store()
+        return jsonl, binary
+
+    def test_roundtrip_matches_jsonl(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            jsonl, binary = self._write_both(td)
+            expected = [json.loads(line) for line in jsonl.read_text(encoding="utf-8").splitlines()]
+
+            with BinaryMessageReader(str(binary)) as reader:
+                self.assertEqual(list(reader), expected)
+                self.assertEqual(reader.session_ids(), ["S1", "S2"])
+                self.assertEqual(list(reader.session("S2")), [r for r in expected if r["session_id"] == "S2"])
+                self.assertEqual([r["direction"] for r in reader.message("S1-msg-3")], ["send", "receive"])
+                sha = expected[0]["sha256"]
+                self.assertEqual(reader.body(sha), "shared goal 0")
+                self.assertEqual(len(reader.by_sha256(sha)), 12)
+
+            self.assertLess(binary.stat().st_size, jsonl.stat().st_size / 2)
+
+    def test_index_is_rebuilt_and_file_can_be_appended(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            jsonl, binary = self._write_both(td)
+            os.remove(index_path_for(str(binary)))
+
+            with BinaryMessageReader(str(binary)) as reader:
+                self.assertEqual(len(list(reader.session("S1"))), 11)
+
+            convert_jsonl_to_binary(str(jsonl), str(binary))
+            with BinaryMessageReader(str(binary)) as reader:
+                self.assertEqual(len(list(reader.session("S1"))), 22)
+                self.assertEqual(len(list(reader)), 44)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+
+from llmmas_otel import message_store
+from llmmas_otel.store import load_blobs, read_messages
+from llmmas_otel.store.blobs import blob_path_for
+
+
+def _send_and_receive(body: str, message_id: str) -> None:
+    sha = hashlib.sha256(body.encode("utf-8")).hexdigest()
+    for direction in ("send", "receive"):
+        message_store.write_message(
+            direction=direction,
+            message_id=message_id,
+            sha256=sha,
+            body=body,
+            source_agent_id="Planner",
+            target_agent_id="Navigator",
+            edge_id="Planner->Navigator",
+        )
+
+
+class TestBodyDedup(unittest.TestCase):
+    def tearDown(self) -> None:
+        message_store.disable_message_store()
+
+    def test_repeated_bodies_are_stored_once(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "messages.jsonl"
+            message_store.enable_message_store(str(path), dedup_bodies=True)
+            with message_store.session_context("S1"):
+                _send_and_receive("goal " * 1000, "m1")
+                _send_and_receive("goal " * 1000, "m2")
+                _send_and_receive("observation", "m3")
+                message_store.write_artifact(artifact_id="a1", kind="file")
+            message_store.disable_message_store()
+
+            self.assertEqual(len(load_blobs(str(path))), 2)
+            self.assertLess(Path(blob_path_for(str(path))).stat().st_size, 6000)
+
+            records = list(read_messages(str(path)))
+            self.assertEqual(len(records), 7)
+            self.assertEqual(records[3]["body"], "goal " * 1000)
+            self.assertNotIn("body_ref", records[3])
+            self.assertEqual(records[6]["record_type"], "artifact")
+
+    def test_binary_format_rejects_dedup(self) -> None:
+        with self.assertRaises(ValueError):
+            message_store.enable_message_store("unused.llmms", format="binary", dedup_bodies=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import unittest
+import unittest.mock
+
+from opentelemetry import trace
+
+from llmmas_otel import observe_a2a_send
+from llmmas_otel.injection import (
+    FaultSpec,
+    SpecFaultEngine,
+    TimerWheel,
+    disable_fault_injection,
+    enable_fault_injection,
+    get_delay_mode,
+    set_delay_mode,
+)
+from llmmas_otel.span_factory import default_span_factory
+
+from tests.support import in_memory_exporter
+
+
+def _engine(*raw_specs: dict) -> SpecFaultEngine:
+    return SpecFaultEngine(specs=[FaultSpec.from_dict(r) for r in raw_specs], seed="0")
+
+
+class TestTimerWheel(unittest.TestCase):
+    def setUp(self) -> None:
+        # Few slots, so most timers need several turns of the wheel.
+        self.wheel = TimerWheel(tick_s=0.002, slots=8)
+
+    def tearDown(self) -> None:
+        self.wheel.shutdown()
+
+    def test_fires_in_deadline_order_and_never_early(self) -> None:
+        fired: list[tuple[int, float]] = []
+        done = threading.Event()
+        t0 = time.monotonic()
+        delays = [0.05, 0.01, 0.03, 0.0, 0.02, 0.04]
+
+        def record(i: int) -> None:
+            fired.append((i, time.monotonic() - t0))
+            if len(fired) == len(delays):
+                done.set()
+
+        for i, d in enumerate(delays):
+            self.wheel.schedule(d, record, i)
+        self.assertTrue(done.wait(2.0))
+        self.assertEqual([i for i, _ in fired], sorted(range(len(delays)), key=lambda i: delays[i]))
+        for i, elapsed in fired:
+            self.assertGreaterEqual(elapsed, delays[i])
+        self.assertEqual(self.wheel.pending(), 0)
+
+    def test_cancel_and_callback_errors(self) -> None:
+        fired = []
+        done = threading.Event()
+        cancelled = self.wheel.schedule(0.01, fired.append, "cancelled")
+        self.wheel.schedule(0.005, lambda: 1 / 0)
+        self.wheel.schedule(0.02, lambda: (fired.append("ok"), done.set()))
+        cancelled.cancel()
+        with unittest.mock.patch("traceback.print_exc") as print_exc:
+            self.assertTrue(done.wait(2.0))
+        self.assertEqual(fired, ["ok"])
+        print_exc.assert_called_once()
+
+    def test_shutdown_runs_or_drops_pending(self) -> None:
+        fired = []
+        self.wheel.schedule(10.0, fired.append, "late")
+        self.assertEqual(self.wheel.pending(), 1)
+        self.wheel.shutdown(run_pending=True)
+        self.assertEqual(fired, ["late"])
+        with self.assertRaises(RuntimeError):
+            self.wheel.schedule(0.0, fired.append, "closed")
+
+
+class TestScheduledDelays(unittest.TestCase):
+    def setUp(self) -> None:
+        self.exporter = in_memory_exporter()
+        self.exporter.clear()
+        enable_fault_injection(
+            _engine(
+                {
+                    "id": "DELAY",
+                    "hook": "a2a_send",
+                    "selector": {"edge_id": "A->B"},
+                    "action": {"type": "a2a.delay", "params": {"delay_ms": 100}},
+                },
+                {
+                    "id": "DROP",
+                    "hook": "a2a_send",
+                    "selector": {"edge_id": "A->C"},
+                    "action": {"type": "a2a.drop"},
+                },
+            ),
+            delay_mode="scheduled",
+        )
+
+    def tearDown(self) -> None:
+        disable_fault_injection()
+        set_delay_mode("inline")
+
+    def _send(self, edge_id: str, message_id: str):
+        target = edge_id.split("->")[1]
+        return default_span_factory.a2a_send(
+            source_agent_id="A", target_agent_id=target, edge_id=edge_id, message_id=message_id, message_body="hi"
+        )
+
+    def test_delayed_sends_do_not_block_the_sender(self) -> None:
+        self.assertEqual(get_delay_mode(), "scheduled")
+        delivered: list[tuple[str, object]] = []
+        lock = threading.Lock()
+        all_delivered = threading.Event()
+        n = 500
+
+        def on_message(message_id: str) -> None:
+            with lock:
+                delivered.append((message_id, trace.get_current_span()))
+                if len(delivered) == n:
+                    all_delivered.set()
+
+        t0 = time.perf_counter()
+        send_spans = {}
+        for i in range(n):
+            with self._send("A->B", f"m{i}") as ctx:
+                self.assertEqual(ctx.pending_delay_s, 0.1)
+                ctx.deliver(on_message, f"m{i}")
+                send_spans[f"m{i}"] = ctx.span
+        # 500 inline delays of 100ms would take 50s.
+        self.assertLess(time.perf_counter() - t0, 2.0)
+        self.assertTrue(all_delivered.wait(5.0))
+        self.assertGreaterEqual(time.perf_counter() - t0, 0.1)
+        for message_id, current in delivered:
+            self.assertIs(current, send_spans[message_id])
+
+        sends = [s for s in self.exporter.get_finished_spans() if s.name == "send A->B"]
+        self.assertEqual(len(sends), n)
+        self.assertEqual(sends[0].events[0].attributes["delay_ms"], 100)
+
+    def test_undelayed_and_dropped_messages(self) -> None:
+        delivered = []
+        with self._send("A->D", "m1") as ctx:
+            self.assertEqual(ctx.pending_delay_s, 0.0)
+            ctx.deliver(delivered.append, "m1")
+        with self._send("A->C", "m2") as ctx:
+            ctx.deliver(delivered.append, "m2")
+        self.assertEqual(delivered, ["m1"])
+
+    def test_decorated_send_sleeps_unless_deferral_is_requested(self) -> None:
+        @observe_a2a_send(source_agent_id="A", target_agent_id="B", edge_id="A->B", message_id="m1")
+        def send(body: str) -> str:
+            return body
+
+        t0 = time.perf_counter()
+        self.assertEqual(send("hi"), "hi")
+        self.assertGreaterEqual(time.perf_counter() - t0, 0.1)
+
+        delivered = threading.Event()
+
+        @observe_a2a_send(source_agent_id="A", target_agent_id="B", edge_id="A->B", message_id="m2", defer_on_delay=True)
+        def deferred_send(body: str) -> str:
+            delivered.set()
+            return body
+
+        self.assertIsNone(deferred_send("hi"))
+        self.assertFalse(delivered.is_set())
+        self.assertTrue(delivered.wait(2.0))
+
+    def test_async_send_is_delivered_on_the_event_loop(self) -> None:
+        delivered: list[tuple[str, bool, object]] = []
+
+        async def on_message(message_id: str) -> None:
+            delivered.append((message_id, threading.current_thread() is threading.main_thread(), trace.get_current_span()))
+
+        async def main() -> float:
+            t0 = time.perf_counter()
+            async with default_span_factory.async_a2a_send(
+                source_agent_id="A", target_agent_id="B", edge_id="A->B", message_id="m1", message_body="hi"
+            ) as ctx:
+                self.assertEqual(ctx.pending_delay_s, 0.1)
+                ctx.deliver(on_message, "m1")
+                send_span = ctx.span
+            returned_after = time.perf_counter() - t0
+            await asyncio.sleep(0.3)
+            self.assertEqual(delivered, [("m1", True, send_span)])
+            return returned_after
+
+        self.assertLess(asyncio.run(main()), 0.05)
+
+    def test_async_decorated_send(self) -> None:
+        calls: list[str] = []
+
+        @observe_a2a_send(source_agent_id="A", target_agent_id="B", edge_id="A->B", message_id="m1")
+        async def send(body: str) -> str:
+            calls.append(body)
+            return body
+
+        @observe_a2a_send(source_agent_id="A", target_agent_id="B", edge_id="A->B", message_id="m2", defer_on_delay=True)
+        async def deferred_send(body: str) -> str:
+            calls.append(body)
+            return body
+
+        async def main() -> None:
+            self.assertEqual(await send("inline"), "inline")
+            self.assertIsNone(await deferred_send("later"))
+            self.assertEqual(calls, ["inline"])
+            await asyncio.sleep(0.3)
+            self.assertEqual(calls, ["inline", "later"])
+
+        asyncio.run(main())
+
+    def test_inline_mode_sleeps(self) -> None:
+        set_delay_mode("inline")
+        t0 = time.perf_counter()
+        with self._send("A->B", "m1") as ctx:
+            self.assertEqual(ctx.pending_delay_s, 0.0)
+        self.assertGreaterEqual(time.perf_counter() - t0, 0.1)
+        with self.assertRaises(ValueError):
+            set_delay_mode("later")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import sys
+import threading
+import unittest
+from collections import Counter
+
+from llmmas_otel.injection import DecisionKind, FaultSpec, HookContext, HookType, SpecFaultEngine
+
+THREADS = 16
+CALLS_PER_THREAD = 400
+SESSIONS = [f"S{i}" for i in range(4)]
+
+
+def _engine(**limits) -> SpecFaultEngine:
+    return SpecFaultEngine(
+        specs=[
+            FaultSpec.from_dict(
+                {
+                    "id": "DROP",
+                    "hook": "a2a_send",
+                    "selector": {"edge_id": "A->B"},
+                    "action": {"type": "a2a.drop"},
+                    "limits": limits,
+                }
+            )
+        ],
+        seed="stress",
+    )
+
+
+def _ctx(session_id: str) -> HookContext:
+    return HookContext(hook_type=HookType.A2A_SEND, session_id=session_id, edge_id="A->B")
+
+
+def _hammer(engine: SpecFaultEngine) -> Counter:
+    applied: Counter = Counter()
+    lock = threading.Lock()
+    start = threading.Barrier(THREADS)
+
+    def worker(offset: int) -> None:
+        local: Counter = Counter()
+        start.wait()
+        for i in range(CALLS_PER_THREAD):
+            sid = SESSIONS[(i + offset) % len(SESSIONS)]
+            if engine.decide(_ctx(sid)).kind != DecisionKind.PASS:
+                local[sid] += 1
+        with lock:
+            applied.update(local)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return applied
+
+
+class TestEngineConcurrency(unittest.TestCase):
+    def setUp(self) -> None:
+        # Switch threads as often as possible to provoke interleavings.
+        self._interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self) -> None:
+        sys.setswitchinterval(self._interval)
+
+    def test_max_times_is_exact(self) -> None:
+        # Without the shard lock, about one run in three overshoots max_times.
+        for _ in range(10):
+            applied = _hammer(_engine(max_times=25))
+            self.assertEqual(applied, Counter({sid: 25 for sid in SESSIONS}))
+
+    def test_probabilistic_limit_matches_sequential_run(self) -> None:
+        # Each applied fault consumes exactly one attempt number, so the outcome
+        # is the same as deciding the same number of calls one after another.
+        expected: Counter = Counter()
+        sequential = _engine(max_times=200, probability=0.7)
+        calls = THREADS * CALLS_PER_THREAD // len(SESSIONS)
+        for sid in SESSIONS:
+            for _ in range(calls):
+                if sequential.decide(_ctx(sid)).kind != DecisionKind.PASS:
+                    expected[sid] += 1
+
+        self.assertEqual(_hammer(_engine(max_times=200, probability=0.7)), expected)
+
+    def test_a_failed_flip_repeats_for_the_rest_of_the_session(self) -> None:
+        engine = _engine(probability=0.5)
+        sessions = [f"flip{i}" for i in range(64)]
+        first = {sid: engine.decide(_ctx(sid)).kind for sid in sessions}
+        failed = [sid for sid, kind in first.items() if kind == DecisionKind.PASS]
+        self.assertTrue(0 < len(failed) < len(sessions))
+        for sid in failed:
+            self.assertEqual({engine.decide(_ctx(sid)).kind for _ in range(20)}, {DecisionKind.PASS})
+
+    def test_single_shard_behaves_the_same(self) -> None:
+        engine = _engine(max_times=25)
+        engine = SpecFaultEngine(specs=engine.specs, seed=engine.seed, counter_shards=1)
+        self.assertEqual(_hammer(engine), Counter({sid: 25 for sid in SESSIONS}))
+        with self.assertRaises(ValueError):
+            SpecFaultEngine(specs=[], counter_shards=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import os
+import threading
+import unittest
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from llmmas_otel import ids, semconv
+from llmmas_otel.ids import CounterIdGenerator, RandomIdGenerator, SeededIdGenerator, new_id, set_id_generator
+from llmmas_otel.span_factory import SpanFactory
+
+
+class TestIdGenerators(unittest.TestCase):
+    def setUp(self) -> None:
+        previous = ids.get_id_generator()
+        self.addCleanup(set_id_generator, previous)
+
+    def test_counter_ids_are_unique_across_threads(self) -> None:
+        gen = CounterIdGenerator()
+        out: list[list[str]] = [[] for _ in range(8)]
+
+        def worker(i: int) -> None:
+            out[i].extend(gen.new_id("x") for _ in range(5000))
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        minted = [i for chunk in out for i in chunk]
+        self.assertEqual(len(set(minted)), len(minted))
+        self.assertTrue(all(i.startswith("x-") for i in minted))
+
+    def test_counter_prefix_differs_between_generators(self) -> None:
+        self.assertNotEqual(CounterIdGenerator().token()[:8], CounterIdGenerator().token()[:8])
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork")
+    def test_forked_child_gets_new_prefix(self) -> None:
+        gen = CounterIdGenerator()
+        parent = gen.token()
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(w, gen.token().encode())
+            os._exit(0)
+        os.close(w)
+        child = os.read(r, 64).decode()
+        os.close(r)
+        os.waitpid(pid, 0)
+        self.assertNotEqual(child[:8], parent[:8])
+
+    def test_seeded_ids_repeat_for_the_same_seed(self) -> None:
+        a, b, c = SeededIdGenerator("exp-01"), SeededIdGenerator("exp-01"), SeededIdGenerator("exp-02")
+        first = [a.new_id("w") for _ in range(5)]
+        self.assertEqual(first, [b.new_id("w") for _ in range(5)])
+        self.assertNotEqual(first, [c.new_id("w") for _ in range(5)])
+        self.assertEqual(len(a.token(8)), 8)
+
+    def test_random_generator(self) -> None:
+        self.assertEqual(len(RandomIdGenerator().token(12)), 12)
+
+    def test_set_id_generator_rejects_other_objects(self) -> None:
+        with self.assertRaises(TypeError):
+            set_id_generator(lambda prefix: prefix)  # type: ignore[arg-type]
+
+    def test_span_factory_uses_installed_generator(self) -> None:
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        factory = SpanFactory(tracer_provider=provider)
+
+        def run() -> list[str]:
+            set_id_generator(SeededIdGenerator(7))
+            exporter.clear()
+            with factory.workflow(name="planning"):
+                with factory.llm_call(provider_name="p", model="m"):
+                    pass
+                with factory.artifact(kind="patch"):
+                    pass
+            spans = exporter.get_finished_spans()
+            keys = (semconv.ATTR_WORKFLOW_ID, semconv.ATTR_GEN_AI_REQUEST_ID, semconv.ATTR_ARTIFACT_ID)
+            return [s.attributes[k] for s in spans for k in keys if k in s.attributes]
+
+        first = run()
+        self.assertEqual(len(first), 3)
+        self.assertEqual(first, run())
+        self.assertTrue(any(i.startswith("workflow-") for i in first))
+        self.assertTrue(new_id("msg").startswith("msg-"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import gc
+import hashlib
+import unittest
+
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF
+
+from llmmas_otel import export, semconv
+from llmmas_otel.export import (
+    DeferredHashSpanExporter,
+    DeferredHashSpanProcessor,
+    disable_deferred_hashing,
+    enable_deferred_hashing,
+)
+from llmmas_otel.span_factory import SpanFactory
+
+from tests.support import in_memory_exporter
+
+PROMPT = "x" * 10_000
+
+
+class _CountingStr(str):
+    """A str that counts how often it is sliced or encoded."""
+
+    touches = 0
+
+    def __getitem__(self, key):  # type: ignore[override]
+        type(self).touches += 1
+        return str.__getitem__(self, key)
+
+    def encode(self, *args, **kwargs):  # type: ignore[override]
+        type(self).touches += 1
+        return str.encode(self, *args, **kwargs)
+
+
+class TestLazyHashing(unittest.TestCase):
+    def tearDown(self) -> None:
+        disable_deferred_hashing()
+
+    def test_unsampled_span_skips_preview_and_hash(self) -> None:
+        factory = SpanFactory(tracer_provider=TracerProvider(sampler=ALWAYS_OFF))
+        _CountingStr.touches = 0
+        with factory.llm_call(provider_name="p", model="m", input_text=_CountingStr(PROMPT)) as ctx:
+            self.assertFalse(ctx.span.is_recording())
+        self.assertEqual(_CountingStr.touches, 0)
+
+    def test_sampled_span_hashes_inline(self) -> None:
+        exporter = in_memory_exporter()
+        exporter.clear()
+        with SpanFactory().llm_call(provider_name="p", model="m", input_text=PROMPT):
+            pass
+        (span,) = exporter.get_finished_spans()
+        self.assertEqual(span.attributes[semconv.ATTR_LLM_INPUT_SHA256], hashlib.sha256(PROMPT.encode()).hexdigest())
+        self.assertEqual(span.attributes[semconv.ATTR_LLM_INPUT_PREVIEW], PROMPT[:200])
+
+    def test_deferred_hash_is_set_at_export(self) -> None:
+        inner = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(DeferredHashSpanExporter(inner)))
+        enable_deferred_hashing()
+
+        factory = SpanFactory(tracer_provider=provider)
+        with factory.llm_call(provider_name="p", model="m", input_text=PROMPT) as ctx:
+            self.assertNotIn(semconv.ATTR_LLM_INPUT_SHA256, ctx.span.attributes)
+
+        (span,) = inner.get_finished_spans()
+        self.assertEqual(span.attributes[semconv.ATTR_LLM_INPUT_SHA256], hashlib.sha256(PROMPT.encode()).hexdigest())
+        self.assertEqual(span.attributes[semconv.ATTR_GEN_AI_REQUEST_MODEL], "m")
+
+
+class _HoldingProcessor(SpanProcessor):
+    """Keeps ended spans without exporting them, like a backed-up batch queue."""
+
+    def __init__(self) -> None:
+        self.spans: list = []
+
+    def on_end(self, span) -> None:
+        self.spans.append(span)
+
+
+class TestDeferredHashBounds(unittest.TestCase):
+    def setUp(self) -> None:
+        self.held = _HoldingProcessor()
+        provider = TracerProvider()
+        provider.add_span_processor(self.held)
+        provider.add_span_processor(DeferredHashSpanProcessor())
+        self.factory = SpanFactory(tracer_provider=provider)
+
+    def tearDown(self) -> None:
+        disable_deferred_hashing()
+
+    def _calls(self, n: int) -> None:
+        for i in range(n):
+            with self.factory.llm_call(provider_name="p", model="m", input_text=f"{i}" + PROMPT[1:]):
+                pass
+
+    def test_pending_text_is_bounded_by_bytes(self) -> None:
+        enable_deferred_hashing(max_pending_bytes=25_000)
+        self._calls(5)
+        self.assertEqual(export.pending_bytes(), 20_000)
+
+        oldest, *_, newest = [export.resolve_deferred(span) for span in self.held.spans]
+        self.assertNotIn(semconv.ATTR_LLM_INPUT_SHA256, oldest.attributes)
+        self.assertEqual(
+            newest.attributes[semconv.ATTR_LLM_INPUT_SHA256], hashlib.sha256(("4" + PROMPT[1:]).encode()).hexdigest()
+        )
+
+    def test_text_larger_than_the_bound_is_hashed_inline(self) -> None:
+        enable_deferred_hashing(max_pending_bytes=5_000)
+        self._calls(1)
+        (span,) = self.held.spans
+        self.assertIn(semconv.ATTR_LLM_INPUT_SHA256, span.attributes)
+        self.assertEqual(export.pending_bytes(), 0)
+
+    def test_batched_spans_keep_their_hashes_until_export(self) -> None:
+        enable_deferred_hashing()
+        inner = InMemorySpanExporter()
+        batch = BatchSpanProcessor(DeferredHashSpanExporter(inner), schedule_delay_millis=60_000)
+        provider = TracerProvider()
+        provider.add_span_processor(batch)
+        provider.add_span_processor(DeferredHashSpanProcessor())
+        with SpanFactory(tracer_provider=provider).llm_call(provider_name="p", model="m", input_text=PROMPT):
+            pass
+        gc.collect()
+        batch.force_flush()
+        (span,) = inner.get_finished_spans()
+        self.assertEqual(span.attributes[semconv.ATTR_LLM_INPUT_SHA256], hashlib.sha256(PROMPT.encode()).hexdigest())
+        batch.shutdown()
+
+    def test_spans_that_are_never_exported_release_their_text(self) -> None:
+        enable_deferred_hashing()
+        self._calls(3)
+        self.assertEqual(export.pending_bytes(), 30_000)
+        self.held.spans.clear()
+        gc.collect()
+        self.assertEqual(export.pending_bytes(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
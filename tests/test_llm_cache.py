@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from llmmas_otel import observe_llm_call, semconv
+from llmmas_otel.injection import FaultSpec, SpecFaultEngine, disable_fault_injection, enable_fault_injection
+from llmmas_otel.llm_cache import LLMResponseCache, disable_llm_cache, enable_llm_cache, get_llm_cache
+from llmmas_otel.span_factory import SpanFactory
+
+from tests.support import in_memory_exporter
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_round_trip_and_reopen(self) -> None:
+        cache = LLMResponseCache(self.dir)
+        key = cache.key("ollama", "llama2", _sha("prompt"))
+        self.assertIsNone(cache.get(key))
+        cache.put(key, "réponse")
+        self.assertEqual(cache.get(key), "réponse")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        reopened = LLMResponseCache(self.dir)
+        self.assertEqual(len(reopened), 1)
+        self.assertEqual(reopened.size_bytes, len("réponse".encode("utf-8")))
+        self.assertEqual(reopened.get(key), "réponse")
+
+    def test_key_depends_on_provider_model_and_input(self) -> None:
+        sha = _sha("prompt")
+        keys = {
+            LLMResponseCache.key("ollama", "llama2", sha),
+            LLMResponseCache.key("ollama", "mistral", sha),
+            LLMResponseCache.key("openai", "llama2", sha),
+            LLMResponseCache.key("ollama", "llama2", _sha("other")),
+        }
+        self.assertEqual(len(keys), 4)
+
+    def test_least_recently_used_entries_are_evicted(self) -> None:
+        cache = LLMResponseCache(self.dir, max_bytes=30)
+        for key in ("a", "b", "c"):
+            cache.put(key, "x" * 10)
+        cache.get("a")
+        cache.put("d", "x" * 10)
+
+        self.assertIsNone(cache.get("b"))
+        for key in ("a", "c", "d"):
+            self.assertIn(key, cache)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.size_bytes, 30)
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), ["a.txt", "c.txt", "d.txt"])
+
+    def test_reopen_evicts_oldest_files_first(self) -> None:
+        cache = LLMResponseCache(self.dir)
+        now = time.time()
+        for i, key in enumerate(("old", "mid", "new")):
+            cache.put(key, "x" * 10)
+            os.utime(self.dir / f"{key}.txt", (now + i, now + i))
+
+        smaller = LLMResponseCache(self.dir, max_bytes=20)
+        self.assertNotIn("old", smaller)
+        self.assertIn("mid", smaller)
+        self.assertIn("new", smaller)
+
+    def test_oversized_response_is_not_stored(self) -> None:
+        cache = LLMResponseCache(self.dir, max_bytes=4)
+        cache.put("k", "too long")
+        self.assertNotIn("k", cache)
+        self.assertEqual(cache.size_bytes, 0)
+
+    def test_invalid_bound(self) -> None:
+        with self.assertRaises(ValueError):
+            LLMResponseCache(self.dir, max_bytes=0)
+
+
+class TestLLMCallCaching(unittest.TestCase):
+    def setUp(self) -> None:
+        self.exporter = in_memory_exporter()
+        self.exporter.clear()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = enable_llm_cache(self._tmp.name)
+        self.factory = SpanFactory()
+
+    def tearDown(self) -> None:
+        disable_llm_cache()
+        disable_fault_injection()
+        self._tmp.cleanup()
+
+    def _call(self, prompt: str, provider: list[str], model: str = "m") -> str:
+        with self.factory.llm_call(provider_name="p", model=model, input_text=prompt, cache=True) as ctx:
+            if ctx.cached_output is not None:
+                return ctx.cached_output
+            out = f"answer {len(provider)}"
+            provider.append(prompt)
+            ctx.store_output(out)
+            return out
+
+    def test_second_call_is_served_from_cache(self) -> None:
+        provider: list[str] = []
+        first = self._call("plan the task", provider)
+        second = self._call("plan the task", provider)
+        self._call("plan the task", provider, model="other")
+
+        self.assertEqual(first, second)
+        self.assertEqual(provider, ["plan the task", "plan the task"])
+
+        miss, hit, other = self.exporter.get_finished_spans()
+        self.assertIs(miss.attributes[semconv.ATTR_LLM_CACHE_HIT], False)
+        self.assertIs(hit.attributes[semconv.ATTR_LLM_CACHE_HIT], True)
+        self.assertIs(other.attributes[semconv.ATTR_LLM_CACHE_HIT], False)
+        self.assertEqual(hit.attributes[semconv.ATTR_LLM_INPUT_SHA256], _sha("plan the task"))
+        self.assertEqual(hit.attributes[semconv.ATTR_LLM_OUTPUT_SHA256], _sha(first))
+        self.assertEqual(hit.attributes[semconv.ATTR_LLM_OUTPUT_PREVIEW], first)
+
+    def test_disabled_cache_leaves_span_unmarked(self) -> None:
+        disable_llm_cache()
+        self.assertIsNone(get_llm_cache())
+        provider: list[str] = []
+        self._call("plan", provider)
+        self._call("plan", provider)
+        self.assertEqual(len(provider), 2)
+        for span in self.exporter.get_finished_spans():
+            self.assertNotIn(semconv.ATTR_LLM_CACHE_HIT, span.attributes)
+
+    def test_cache_unaware_caller_is_not_marked_as_a_hit(self) -> None:
+        self._call("plan", [])
+        with self.factory.llm_call(provider_name="p", model="m", input_text="plan") as ctx:
+            self.assertIsNone(ctx.cached_output)
+            self.assertIsNone(ctx.cache_key)
+            ctx.span.set_attribute(semconv.ATTR_LLM_OUTPUT_PREVIEW, "fresh")
+
+        span = self.exporter.get_finished_spans()[-1]
+        self.assertNotIn(semconv.ATTR_LLM_CACHE_HIT, span.attributes)
+        self.assertEqual(span.attributes[semconv.ATTR_LLM_OUTPUT_PREVIEW], "fresh")
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+    def test_injected_results_bypass_the_cache(self) -> None:
+        provider: list[str] = []
+        self._call("plan", provider)
+        enable_fault_injection(
+            SpecFaultEngine(
+                specs=[FaultSpec.from_dict({"id": "RET", "hook": "llm_call", "selector": {}, "action": {"type": "llm.malformed_response"}})],
+                seed="0",
+            )
+        )
+        with self.factory.llm_call(provider_name="p", model="m", input_text="plan", cache=True) as ctx:
+            self.assertIsNone(ctx.cached_output)
+            self.assertIsNone(ctx.cache_key)
+            ctx.store_output("injected")
+        span = self.exporter.get_finished_spans()[-1]
+        self.assertNotIn(semconv.ATTR_LLM_CACHE_HIT, span.attributes)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_decorator_serves_hits_without_calling_the_function(self) -> None:
+        calls: list[str] = []
+
+        @observe_llm_call(provider_name="p", model="m", input_text_fn=lambda prompt: prompt, cache=True)
+        def generate(prompt: str) -> str:
+            calls.append(prompt)
+            return prompt.upper()
+
+        self.assertEqual(generate("hello"), "HELLO")
+        self.assertEqual(generate("hello"), "HELLO")
+        self.assertEqual(calls, ["hello"])
+
+    def test_decorator_without_cache_always_calls_the_function(self) -> None:
+        @observe_llm_call(provider_name="p", model="m", input_text_fn=lambda prompt: prompt, cache=True)
+        def generate(prompt: str) -> str:
+            return prompt.upper()
+
+        @observe_llm_call(provider_name="p", model="m", input_text_fn=lambda prompt: prompt)
+        def parse(prompt: str) -> dict:
+            return {"text": prompt}
+
+        generate("hello")
+        self.assertEqual(parse("hello"), {"text": "hello"})
+        self.assertEqual(len(self.cache), 1)
+        span = self.exporter.get_finished_spans()[-1]
+        self.assertNotIn(semconv.ATTR_LLM_CACHE_HIT, span.attributes)
+
+
+if __name__ == "__main__":
+    unittest.main()
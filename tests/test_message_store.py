@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from llmmas_otel import message_store
+from llmmas_otel.store import merge_shards, shard_paths
+
+
+def _write_messages(n: int) -> None:
+    with message_store.session_context("S1"):
+        for i in range(n):
+            message_store.write_message(
+                direction="send",
+                message_id=f"msg-{i}",
+                sha256=f"sha-{i}",
+                body=f"body {i}",
+                source_agent_id="Planner",
+                target_agent_id="Coder",
+                edge_id="Planner->Coder",
+            )
+
+
+def _read_jsonl(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class TestMessageStore(unittest.TestCase):
+    def tearDown(self) -> None:
+        message_store.disable_message_store()
+
+    def test_buffered_matches_direct(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            direct = Path(td) / "direct.jsonl"
+            buffered = Path(td) / "buffered.jsonl"
+
+            message_store.enable_message_store(str(direct))
+            _write_messages(50)
+            message_store.disable_message_store()
+
+            message_store.enable_message_store(str(buffered), buffered=True, flush_interval_s=60.0)
+            _write_messages(50)
+            message_store.disable_message_store()
+
+            self.assertEqual(_read_jsonl(direct), _read_jsonl(buffered))
+
+    def test_buffered_flushes_on_size_threshold(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "messages.jsonl"
+            message_store.enable_message_store(
+                str(path),
+                buffered=True,
+                flush_interval_s=60.0,
+                max_buffer_records=10,
+            )
+            _write_messages(10)
+
+            # The background thread wakes up on the size threshold, long before the interval.
+            deadline = time.monotonic() + 5.0
+            while time.monotonic() < deadline:
+                if path.exists() and len(_read_jsonl(path)) == 10:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(len(_read_jsonl(path)), 10)
+
+    def test_disable_flushes_pending_records(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "messages.jsonl"
+            message_store.enable_message_store(str(path), buffered=True, flush_interval_s=60.0)
+            _write_messages(3)
+            message_store.disable_message_store()
+
+            records = _read_jsonl(path)
+            self.assertEqual([r["message_id"] for r in records], ["msg-0", "msg-1", "msg-2"])
+            self.assertEqual(records[0]["session_id"], "S1")
+
+    def test_thread_mode_does_not_interleave_records(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "messages.jsonl"
+            message_store.enable_message_store(str(path), concurrency="thread", max_buffer_records=16)
+            big = "x" * 200_000
+
+            def worker(n: int) -> None:
+                with message_store.session_context(f"S{n}"):
+                    for i in range(20):
+                        message_store.write_message(
+                            direction="send",
+                            message_id=f"{n}-{i}",
+                            sha256="sha",
+                            body=big,
+                            source_agent_id="A",
+                            target_agent_id="B",
+                            edge_id="A->B",
+                        )
+
+            threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            message_store.disable_message_store()
+
+            records = _read_jsonl(path)
+            self.assertEqual(len(records), 160)
+            self.assertTrue(all(r["body"] == big for r in records))
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs fork")
+    def test_process_mode_writes_shards_and_merges_them(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "messages.jsonl"
+            message_store.enable_message_store(str(path), concurrency="process")
+            ctx = multiprocessing.get_context("fork")
+            procs = [ctx.Process(target=_write_messages, args=(25,)) for _ in range(3)]
+            for p in procs:
+                p.start()
+            _write_messages(25)
+            for p in procs:
+                p.join()
+            message_store.disable_message_store()
+
+            self.assertEqual(len(shard_paths(str(path))), 4)
+            self.assertFalse(path.exists())
+
+            self.assertEqual(merge_shards(str(path)), 100)
+            self.assertEqual(shard_paths(str(path)), [])
+            records = _read_jsonl(path)
+            self.assertEqual(len(records), 100)
+            timestamps = [r["ts_unix_nano"] for r in records]
+            self.assertEqual(timestamps, sorted(timestamps))
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs fork")
+    def test_forked_child_does_not_write_to_the_parents_binary_store(self) -> None:
+        from llmmas_otel.store import BinaryMessageReader
+
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "messages.bin"
+            message_store.enable_message_store(str(path), format="binary")
+            _write_messages(5)
+            ctx = multiprocessing.get_context("fork")
+            child = ctx.Process(target=_write_messages, args=(7,))
+            child.start()
+            child.join()
+            self.assertEqual(child.exitcode, 0)
+            _write_messages(5)
+            message_store.disable_message_store()
+
+            with BinaryMessageReader(str(path)) as reader:
+                self.assertEqual(len(list(reader)), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF
+
+from llmmas_otel import semconv
+from llmmas_otel.injection import FaultSpec, SpecFaultEngine, disable_fault_injection, enable_fault_injection
+from llmmas_otel.llm_cache import disable_llm_cache, enable_llm_cache
+from llmmas_otel.metrics import disable_metrics, enable_metrics, get_metrics
+from llmmas_otel.span_factory import SpanFactory
+
+
+def _points(reader: InMemoryMetricReader) -> dict[str, list]:
+    data = reader.get_metrics_data()
+    out: dict[str, list] = {}
+    for resource_metrics in data.resource_metrics if data else ():
+        for scope_metrics in resource_metrics.scope_metrics:
+            for metric in scope_metrics.metrics:
+                out[metric.name] = list(metric.data.data_points)
+    return out
+
+
+def _by_attrs(points: list, key: str) -> dict:
+    return {point.attributes.get(key): point for point in points}
+
+
+class TestSpanMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.reader = InMemoryMetricReader()
+        enable_metrics(MeterProvider(metric_readers=[self.reader]))
+        # Metrics must not depend on sampling.
+        self.factory = SpanFactory(tracer_provider=TracerProvider(sampler=ALWAYS_OFF))
+
+    def tearDown(self) -> None:
+        disable_metrics()
+        disable_fault_injection()
+        disable_llm_cache()
+
+    def test_llm_and_tool_call_durations(self) -> None:
+        for _ in range(3):
+            with self.factory.llm_call(provider_name="ollama", model="llama2", input_text="hi"):
+                pass
+        with self.factory.tool_call(tool_name="pytest", tool_type="function"):
+            pass
+        with self.assertRaises(TimeoutError):
+            with self.factory.tool_call(tool_name="pytest", tool_type="function"):
+                raise TimeoutError("slow")
+
+        points = _points(self.reader)
+        (llm,) = points[semconv.METRIC_LLM_CALL_DURATION]
+        self.assertEqual(llm.count, 3)
+        self.assertEqual(
+            dict(llm.attributes),
+            {
+                semconv.ATTR_GEN_AI_PROVIDER_NAME: "ollama",
+                semconv.ATTR_GEN_AI_REQUEST_MODEL: "llama2",
+                semconv.ATTR_GEN_AI_OPERATION_NAME: semconv.GEN_AI_OPERATION_INFERENCE,
+            },
+        )
+
+        tools = _by_attrs(points[semconv.METRIC_TOOL_CALL_DURATION], semconv.ATTR_ERROR_TYPE)
+        self.assertEqual(tools[None].count, 1)
+        self.assertEqual(tools["TimeoutError"].count, 1)
+        self.assertEqual(tools["TimeoutError"].attributes[semconv.ATTR_GEN_AI_TOOL_NAME], "pytest")
+
+    def test_messages_per_edge_and_injected_faults(self) -> None:
+        enable_fault_injection(
+            SpecFaultEngine(
+                specs=[
+                    FaultSpec.from_dict(
+                        {"id": "DROP", "hook": "a2a_send", "selector": {"edge_id": "A->B"}, "action": {"type": "a2a.drop"},
+                         "limits": {"max_times": 2}}
+                    )
+                ],
+                seed="0",
+            )
+        )
+        for i, edge in enumerate(["A->B"] * 3 + ["B->A"]):
+            source, target = edge.split("->")
+            with self.factory.a2a_send(
+                source_agent_id=source, target_agent_id=target, edge_id=edge, message_id=f"m{i}", message_body="x"
+            ):
+                pass
+
+        points = _points(self.reader)
+        sent = _by_attrs(points[semconv.METRIC_A2A_MESSAGES_SENT], semconv.ATTR_EDGE_ID)
+        self.assertEqual({edge: point.value for edge, point in sent.items()}, {"A->B": 3, "B->A": 1})
+        (faults,) = points[semconv.METRIC_FAULTS_INJECTED]
+        self.assertEqual(faults.value, 2)
+        self.assertEqual(
+            dict(faults.attributes), {semconv.ATTR_FAULT_HOOK: "a2a_send", semconv.ATTR_FAULT_TYPE: "a2a.drop"}
+        )
+
+    def test_cache_hits_are_a_separate_series(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            enable_llm_cache(tmp)
+            for _ in range(2):
+                with self.factory.llm_call(provider_name="p", model="m", input_text="same", cache=True) as ctx:
+                    ctx.store_output("out")
+
+        llm = _by_attrs(_points(self.reader)[semconv.METRIC_LLM_CALL_DURATION], semconv.ATTR_LLM_CACHE_HIT)
+        self.assertEqual((llm[False].count, llm[True].count), (1, 1))
+
+    def test_disabled_metrics_record_nothing(self) -> None:
+        disable_metrics()
+        self.assertIsNone(get_metrics())
+        with self.factory.llm_call(provider_name="p", model="m"):
+            pass
+        self.assertEqual(_points(self.reader), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
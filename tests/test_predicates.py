@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from llmmas_otel.injection import (
+    Exact,
+    FaultSelector,
+    FaultSpec,
+    Glob,
+    HookContext,
+    HookType,
+    OneOf,
+    Range,
+    Regex,
+    SpecFaultEngine,
+    compile_condition,
+    load_fault_specs,
+    selector_matches,
+)
+
+
+def _send(edge_id: str, **fields) -> HookContext:
+    source, target = edge_id.split("->")
+    return HookContext(
+        hook_type=HookType.A2A_SEND,
+        session_id="S1",
+        edge_id=edge_id,
+        source_agent_id=source,
+        target_agent_id=target,
+        **fields,
+    )
+
+
+class TestConditions(unittest.TestCase):
+    def test_compile_forms(self) -> None:
+        self.assertIsInstance(compile_condition("Planner"), Exact)
+        self.assertIsInstance(compile_condition({"glob": "*->Editor"}), Glob)
+        self.assertIsInstance(compile_condition({"regex": "^Nav"}), Regex)
+        self.assertIsInstance(compile_condition({"in": ["a", "b"]}), OneOf)
+        self.assertIsInstance(compile_condition(["a", "b"]), OneOf)
+        self.assertIsInstance(compile_condition({"min": 1}), Range)
+
+    def test_predicates(self) -> None:
+        glob = Glob("*->Editor")
+        self.assertTrue(glob("Planner->Editor"))
+        self.assertFalse(glob("Planner->Editor2"))
+        self.assertFalse(glob(None))
+
+        regex = Regex("^(Navigator|Editor)")
+        self.assertTrue(regex("Editor Manager"))
+        self.assertFalse(regex("Planner"))
+
+        one_of = OneOf(["pytest", "ruff"])
+        self.assertTrue(one_of("ruff"))
+        self.assertFalse(one_of("mypy"))
+
+        in_range = Range(2, 5)
+        self.assertEqual([in_range(v) for v in (1, 2, 5, 6, None, True, "3")], [False, True, True, False, False, False, False])
+        self.assertTrue(Range(max=0.5)(-10))
+
+        self.assertTrue(Exact(3)(3))
+        self.assertFalse(Exact("3")(3))
+
+    def test_invalid_conditions(self) -> None:
+        for raw in ({"regex": "("}, {"glob": 3}, {"in": []}, {"in": "abc"}, {"min": 5, "max": 1}, {"min": "a"}, {"like": "x"}):
+            with self.subTest(raw=raw), self.assertRaises(ValueError):
+                compile_condition(raw)
+
+        with self.assertRaisesRegex(ValueError, r"Fault 'BAD': selector.edge_id: invalid regex"):
+            FaultSpec.from_dict({"id": "BAD", "hook": "a2a_send", "selector": {"edge_id": {"regex": "("}}, "action": {"type": "a2a.drop"}})
+
+
+class TestSelectorMatching(unittest.TestCase):
+    def test_all_conditions_must_hold(self) -> None:
+        sel = FaultSelector.from_dict(
+            {
+                "edge_id": {"glob": "*->Editor"},
+                "source_agent_id": {"regex": "Nav|Plan"},
+                "phase_name": ["planning", "editing"],
+                "step_index": {"min": 1, "max": 3},
+            }
+        )
+        self.assertEqual([name for name, _ in sel.predicates], ["phase_name", "step_index", "source_agent_id", "edge_id"])
+        self.assertTrue(selector_matches(sel, _send("Navigator->Editor", phase_name="editing", step_index=2)))
+        self.assertFalse(selector_matches(sel, _send("Navigator->Editor", phase_name="editing", step_index=4)))
+        self.assertFalse(selector_matches(sel, _send("Executor->Editor", phase_name="editing", step_index=2)))
+        self.assertFalse(selector_matches(sel, _send("Navigator->Planner", phase_name="editing", step_index=2)))
+        self.assertFalse(selector_matches(sel, _send("Navigator->Editor", step_index=2)))
+
+    def test_empty_selector_matches_everything(self) -> None:
+        self.assertTrue(selector_matches(FaultSelector(), _send("A->B")))
+
+    def test_engine_with_conditions(self) -> None:
+        yaml_text = """
+faults:
+  - id: INTO_EDITOR
+    hook: a2a_send
+    selector:
+      edge_id: {glob: "*->Editor"}
+    action: {type: a2a.drop}
+  - id: NAV_OR_EXEC
+    hook: a2a_send
+    selector:
+      edge_id: {in: ["Navigator->Planner", "Executor->Planner"]}
+      phase_name: planning
+    action: {type: a2a.delay, params: {delay_ms: 5}}
+"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "faults.yaml")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(yaml_text)
+            specs = load_fault_specs(path)
+
+        for indexed in (True, False):
+            engine = SpecFaultEngine(specs=specs, indexed=indexed)
+            decide = lambda ctx: engine.decide(ctx).fault_id
+            with self.subTest(indexed=indexed):
+                self.assertEqual(decide(_send("Planner->Editor")), "INTO_EDITOR")
+                self.assertEqual(decide(_send("Navigator->Editor")), "INTO_EDITOR")
+                self.assertEqual(decide(_send("Navigator->Planner", phase_name="planning")), "NAV_OR_EXEC")
+                self.assertEqual(decide(_send("Executor->Planner", phase_name="planning")), "NAV_OR_EXEC")
+                self.assertIsNone(decide(_send("Executor->Planner", phase_name="coding")))
+                self.assertIsNone(decide(_send("Editor->Planner", phase_name="planning")))
+
+
+if __name__ == "__main__":
+    unittest.main()
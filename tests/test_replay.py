@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from llmmas_otel.injection import (
+    DecisionKind,
+    FaultSpec,
+    HookContext,
+    HookType,
+    LLMRateLimitError,
+    RecordingFaultEngine,
+    ReplayFaultEngine,
+    SpecFaultEngine,
+    load_decision_log,
+)
+
+SPECS = [
+    FaultSpec.from_dict(raw)
+    for raw in (
+        {"id": "DROP", "hook": "a2a_send", "selector": {"edge_id": "A->B"}, "action": {"type": "a2a.drop"},
+         "limits": {"probability": 0.5}},
+        {"id": "TRUNC", "hook": "a2a_receive", "selector": {"edge_id": "A->B"},
+         "action": {"type": "a2a.truncate", "params": {"max_chars": 3}}, "limits": {"max_times": 2}},
+        {"id": "RATE", "hook": "llm_call", "selector": {"agent_id": "Planner"}, "action": {"type": "llm.rate_limit"},
+         "limits": {"probability": 0.3}},
+        {"id": "BAD", "hook": "tool_call", "selector": {"tool_name": "pytest"},
+         "action": {"type": "tool.malformed_response", "params": {"return_value": {"ok": False}}}},
+    )
+]
+
+
+def _calls(sessions: int = 4, steps: int = 25) -> list[HookContext]:
+    calls = []
+    for s in range(sessions):
+        sid = f"S{s}"
+        for i in range(steps):
+            # message/tool call ids differ between runs and must not matter
+            calls.append(HookContext(hook_type=HookType.A2A_SEND, session_id=sid, edge_id="A->B", message_id=f"m{i}-{id(calls)}"))
+            calls.append(HookContext(hook_type=HookType.A2A_RECEIVE, session_id=sid, edge_id="A->B"))
+            calls.append(HookContext(hook_type=HookType.LLM_CALL, session_id=sid, agent_id="Planner", phase_name="planning"))
+            calls.append(HookContext(hook_type=HookType.TOOL_CALL, session_id=sid, tool_name="pytest", tool_call_id=str(i)))
+    return calls
+
+
+def _summary(decision) -> tuple:
+    exc = decision.raise_exception
+    return (
+        decision.kind,
+        decision.fault_id,
+        decision.mutated_payload,
+        decision.return_value,
+        type(exc).__name__ if exc else None,
+        str(exc) if exc else None,
+    )
+
+
+class TestDecisionReplay(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.log = Path(self._tmp.name) / "decisions.jsonl"
+
+    def _record(self) -> list[tuple]:
+        with RecordingFaultEngine(SpecFaultEngine(specs=SPECS, seed="rec"), self.log) as recorder:
+            return [_summary(recorder.decide(ctx, payload="hello")) for ctx in _calls()]
+
+    def test_replay_reproduces_recorded_decisions(self) -> None:
+        recorded = self._record()
+        kinds = {r[0] for r in recorded}
+        self.assertTrue({DecisionKind.PASS, DecisionKind.DROP, DecisionKind.MUTATE, DecisionKind.RAISE, DecisionKind.RETURN} <= kinds)
+
+        replay = ReplayFaultEngine.from_file(self.log)
+        self.assertEqual([_summary(replay.decide(ctx, payload="hello")) for ctx in _calls()], recorded)
+        self.assertIsInstance(
+            next(d.raise_exception for d in replay.decisions.values() if d.kind == DecisionKind.RAISE),
+            LLMRateLimitError,
+        )
+
+    def test_log_holds_only_injected_faults(self) -> None:
+        recorded = self._record()
+        lines = self.log.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(json.loads(lines[0])["format"], "llmmas-decisions")
+        self.assertEqual(len(lines) - 1, sum(1 for r in recorded if r[0] != DecisionKind.PASS))
+
+    def test_session_release_restarts_occurrences(self) -> None:
+        self._record()
+        replay = ReplayFaultEngine.from_file(self.log)
+        ctx = HookContext(hook_type=HookType.A2A_RECEIVE, session_id="S0", edge_id="A->B")
+        first = [replay.decide(ctx, payload="hello").kind for _ in range(3)]
+        self.assertEqual(first, [DecisionKind.MUTATE, DecisionKind.MUTATE, DecisionKind.PASS])
+        replay.release_session("S0")
+        self.assertEqual(replay.decide(ctx, payload="hello").kind, DecisionKind.MUTATE)
+
+    def test_mutations_are_applied_to_the_live_payload(self) -> None:
+        self._record()
+        entries = [json.loads(line)["decision"] for line in self.log.read_text(encoding="utf-8").splitlines()[1:]]
+        mutations = [e for e in entries if e["kind"] == "mutate"]
+        self.assertTrue(mutations)
+        for entry in mutations:
+            self.assertNotIn("mutated_payload", entry)
+            self.assertEqual(entry["metadata"]["max_chars"], 3)
+            self.assertEqual(entry["payload_sha256"], hashlib.sha256(b"hello").hexdigest())
+
+        replay = ReplayFaultEngine.from_file(self.log)
+        ctx = HookContext(hook_type=HookType.A2A_RECEIVE, session_id="S0", edge_id="A->B")
+        same = replay.decide(ctx, payload="hello")
+        self.assertEqual(same.mutated_payload, "hel")
+        self.assertNotIn("replay_payload_changed", same.metadata)
+
+        changed = replay.decide(ctx, payload="goodbye")
+        self.assertEqual(changed.mutated_payload, "goo")
+        self.assertEqual(changed.metadata["original_len"], 7)
+        self.assertIs(changed.metadata["replay_payload_changed"], True)
+
+    def test_version_1_logs_replay_the_recorded_text(self) -> None:
+        self.log.write_text(
+            '{"format": "llmmas-decisions", "version": 1}\n'
+            '{"key":["S","a2a_receive",null,null,"A->B",null,0],'
+            '"decision":{"kind":"mutate","fault_id":"TRUNC","fault_type":"a2a.truncate","mutated_payload":"old"}}\n',
+            encoding="utf-8",
+        )
+        replay = ReplayFaultEngine.from_file(self.log)
+        ctx = HookContext(hook_type=HookType.A2A_RECEIVE, session_id="S", edge_id="A->B")
+        self.assertEqual(replay.decide(ctx, payload="new text").mutated_payload, "old")
+
+    def test_unrecorded_calls_pass(self) -> None:
+        self._record()
+        replay = ReplayFaultEngine.from_file(self.log)
+        ctx = HookContext(hook_type=HookType.A2A_SEND, session_id="other", edge_id="A->B")
+        self.assertEqual(replay.decide(ctx).kind, DecisionKind.PASS)
+
+    def test_rejects_other_files(self) -> None:
+        self.log.write_text('{"spans": []}\n', encoding="utf-8")
+        with self.assertRaises(ValueError):
+            load_decision_log(self.log)
+
+    def test_unknown_exception_modules_are_not_imported(self) -> None:
+        self.log.write_text(
+            '{"format": "llmmas-decisions", "version": 1}\n'
+            '{"key":["S","llm_call",null,null,null,null,0],'
+            '"decision":{"kind":"raise","exception":{"type":"os:system","args":["boom"]}}}\n',
+            encoding="utf-8",
+        )
+        (decision,) = load_decision_log(self.log).values()
+        self.assertIs(type(decision.raise_exception), RuntimeError)
+
+
+if __name__ == "__main__":
+    unittest.main()
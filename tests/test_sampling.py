@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import hashlib
+import unittest
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace.status import Status, StatusCode
+
+from llmmas_otel import export, semconv
+from llmmas_otel.export import DeferredHashSpanExporter, disable_deferred_hashing, enable_deferred_hashing
+from llmmas_otel.sampling import SessionSampler, SessionTailProcessor
+from llmmas_otel.span_factory import SpanFactory
+
+
+def _pipeline(ratio: float, *, tail: bool = False, latency_threshold_s=None):
+    exporter = InMemorySpanExporter()
+    processor = SimpleSpanProcessor(exporter)
+    if tail:
+        processor = SessionTailProcessor(processor, latency_threshold_s=latency_threshold_s)
+    provider = TracerProvider(sampler=SessionSampler(ratio, record_unsampled=tail))
+    provider.add_span_processor(processor)
+    return SpanFactory(tracer_provider=provider), exporter
+
+
+def _run_session(factory: SpanFactory, session_id: str, *, fail: bool = False) -> None:
+    with factory.session(session_id=session_id):
+        with factory.agent_step(agent_id="Planner", step_index=0):
+            with factory.llm_call(provider_name="p", model="m", input_text="plan") as ctx:
+                if fail:
+                    ctx.span.set_status(Status(StatusCode.ERROR, "boom"))
+            with factory.tool_call(tool_name="pytest"):
+                pass
+
+
+class TestSessionSampler(unittest.TestCase):
+    def test_sessions_are_kept_or_dropped_whole(self) -> None:
+        factory, exporter = _pipeline(0.3)
+        for i in range(200):
+            _run_session(factory, f"S{i}")
+
+        by_trace: dict[int, list] = {}
+        for span in exporter.get_finished_spans():
+            by_trace.setdefault(span.context.trace_id, []).append(span)
+
+        self.assertTrue(20 < len(by_trace) < 100)
+        for spans in by_trace.values():
+            self.assertEqual(len(spans), 4)
+
+    def test_decision_is_stable_per_session_id(self) -> None:
+        first, exporter_a = _pipeline(0.5)
+        second, exporter_b = _pipeline(0.5)
+        for i in range(50):
+            _run_session(first, f"S{i}")
+            _run_session(second, f"S{i}")
+
+        def kept(exporter):
+            return sorted(
+                s.attributes[semconv.ATTR_SESSION_ID]
+                for s in exporter.get_finished_spans()
+                if s.name == semconv.SPAN_SESSION
+            )
+
+        self.assertEqual(kept(exporter_a), kept(exporter_b))
+
+
+class TestSessionTailProcessor(unittest.TestCase):
+    def test_keeps_only_errored_sessions(self) -> None:
+        factory, exporter = _pipeline(0.0, tail=True)
+        _run_session(factory, "ok-1")
+        _run_session(factory, "bad", fail=True)
+        _run_session(factory, "ok-2")
+
+        spans = exporter.get_finished_spans()
+        self.assertEqual(len(spans), 4)
+        self.assertEqual({s.context.trace_id for s in spans}, {spans[0].context.trace_id})
+        self.assertTrue(all(s.context.trace_flags.sampled for s in spans))
+        session = next(s for s in spans if s.name == semconv.SPAN_SESSION)
+        self.assertEqual(session.attributes[semconv.ATTR_SESSION_ID], "bad")
+
+    def test_latency_threshold(self) -> None:
+        factory, exporter = _pipeline(0.0, tail=True, latency_threshold_s=0.0)
+        _run_session(factory, "slow")
+        self.assertEqual(len(exporter.get_finished_spans()), 4)
+
+    def test_dropped_traces_release_their_deferred_hashes(self) -> None:
+        exporter = InMemorySpanExporter()
+        processor = SessionTailProcessor(SimpleSpanProcessor(DeferredHashSpanExporter(exporter)))
+        provider = TracerProvider(sampler=SessionSampler(0.0, record_unsampled=True))
+        provider.add_span_processor(processor)
+        factory = SpanFactory(tracer_provider=provider)
+        enable_deferred_hashing()
+        try:
+            _run_session(factory, "ok")
+            _run_session(factory, "bad", fail=True)
+            self.assertEqual(export._pending, {})
+        finally:
+            disable_deferred_hashing()
+
+        llm = next(s for s in exporter.get_finished_spans() if semconv.ATTR_LLM_INPUT_PREVIEW in s.attributes)
+        self.assertEqual(llm.attributes[semconv.ATTR_LLM_INPUT_SHA256], hashlib.sha256(b"plan").hexdigest())
+
+
+if __name__ == "__main__":
+    unittest.main()
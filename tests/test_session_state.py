@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import gc
+import os
+import tracemalloc
+import unittest
+
+from opentelemetry.sdk.trace import TracerProvider
+
+from llmmas_otel import session_state
+from llmmas_otel.injection import (
+    FaultSpec,
+    HookContext,
+    HookType,
+    SpecFaultEngine,
+    disable_fault_injection,
+    enable_fault_injection,
+)
+from llmmas_otel.integrations import hyperagent
+from llmmas_otel.session_state import SessionStateCache
+from llmmas_otel.span_factory import SpanFactory
+
+_DELAY_ONCE = {
+    "id": "DELAY_ONCE",
+    "hook": "a2a_send",
+    "selector": {"edge_id": "A->B"},
+    "action": {"type": "a2a.delay", "params": {"delay_ms": 0}},
+    "limits": {"max_times": 1},
+}
+
+
+def _engine(**kwargs) -> SpecFaultEngine:
+    return SpecFaultEngine(specs=[FaultSpec.from_dict(_DELAY_ONCE)], seed="0", **kwargs)
+
+
+def _send(session_id: str) -> HookContext:
+    return HookContext(hook_type=HookType.A2A_SEND, session_id=session_id, edge_id="A->B")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSessionStateCache(unittest.TestCase):
+    def test_lru_cap(self) -> None:
+        cache = SessionStateCache(dict, max_sessions=2)
+        cache.get("a")["x"] = 1
+        cache.get("b")
+        cache.get("a")  # a is now the most recently used
+        cache.get("c")
+        self.assertEqual(list(cache), ["a", "c"])
+        self.assertEqual(cache.peek("a"), {"x": 1})
+        self.assertIsNone(cache.peek("b"))
+
+    def test_ttl(self) -> None:
+        clock = FakeClock()
+        cache = SessionStateCache(dict, ttl_s=10.0, clock=clock)
+        cache.get("a")["x"] = 1
+        clock.now = 5.0
+        cache.get("b")
+        clock.now = 12.0
+        self.assertIsNone(cache.peek("a"))
+        self.assertEqual(cache.get("a"), {})  # expired state is replaced
+        self.assertEqual(list(cache), ["b", "a"])
+        clock.now = 30.0
+        cache.get("c")
+        self.assertEqual(list(cache), ["c"])
+
+    def test_invalid_limits(self) -> None:
+        with self.assertRaises(ValueError):
+            SessionStateCache(dict, max_sessions=0)
+        with self.assertRaises(ValueError):
+            SessionStateCache(dict, ttl_s=0)
+
+
+class TestSessionRelease(unittest.TestCase):
+    def setUp(self) -> None:
+        self.factory = SpanFactory(tracer_provider=TracerProvider())
+        self.engine = _engine()
+        enable_fault_injection(self.engine)
+
+    def tearDown(self) -> None:
+        disable_fault_injection()
+
+    def _send_in_session(self) -> object:
+        with self.factory.a2a_send(source_agent_id="A", target_agent_id="B", edge_id="A->B", message_id="m") as ctx:
+            return ctx.decision
+
+    def test_engine_counters_released_at_session_end(self) -> None:
+        with self.factory.session(session_id="S1"):
+            self.assertEqual(self._send_in_session().kind.value, "delay")
+            self.assertEqual(self._send_in_session().kind.value, "pass")  # max_times reached
+            self.assertIn("S1", self.engine._counts)
+        self.assertEqual(len(self.engine._counts), 0)
+
+        # A new session with the same id starts from zero again.
+        with self.factory.session(session_id="S1"):
+            self.assertEqual(self._send_in_session().kind.value, "delay")
+
+    def test_nested_sessions_release_on_outer_exit(self) -> None:
+        with self.factory.session(session_id="S1"):
+            with self.factory.session(session_id="S1"):
+                self._send_in_session()
+            self.assertIn("S1", self.engine._counts)
+            self.assertEqual(self._send_in_session().kind.value, "pass")
+        self.assertNotIn("S1", self.engine._counts)
+        self.assertEqual(session_state.active_sessions(), 0)
+
+    def test_adapter_state_released(self) -> None:
+        with self.factory.session(session_id="S1"):
+            self.assertEqual(hyperagent._next_step_index("Planner"), 0)
+            self.assertEqual(hyperagent._next_step_index("Planner"), 1)
+            self.assertEqual(hyperagent._next_segment_order(), 0)
+            hyperagent._set_pending_delegation(from_agent="Planner", to_agent="Navigator", goal="look")
+            self.assertIsNotNone(hyperagent._peek_pending_delegation("Navigator"))
+        self.assertNotIn("S1", hyperagent._SESSION_COUNTERS)
+
+    def test_callbacks(self) -> None:
+        released = []
+        session_state.on_session_end(released.append)
+        try:
+            with self.factory.session(session_id="S1"):
+                pass
+            session_state.release_session("S2")
+        finally:
+            session_state.remove_session_end_callback(released.append)
+        self.assertEqual(released, ["S1", "S2"])
+
+    def test_unreleased_sessions_are_capped(self) -> None:
+        engine = _engine(max_sessions=100, counter_shards=1)
+        for i in range(1000):
+            engine.decide(_send(f"S{i}"))
+        self.assertEqual(len(engine._counts), 100)
+
+    def test_live_sessions_below_the_cap_are_not_evicted(self) -> None:
+        # Default counter_shards: an uneven spread over shards must not evict before max_sessions.
+        engine = _engine(max_sessions=2000)
+        sessions = [f"S{i}" for i in range(1800)]
+        for session_id in sessions:
+            self.assertEqual(engine.decide(_send(session_id)).fault_id, "DELAY_ONCE")
+        again = [s for s in sessions if engine.decide(_send(s)).fault_id is not None]
+        self.assertEqual(again, [])
+        self.assertEqual(len(engine._counts), 1800)
+
+        for i in range(5000):
+            engine.decide(_send(f"T{i}"))
+        self.assertLessEqual(len(engine._counts), 2000 + engine.counter_shards - 1)
+
+
+class TestSoak(unittest.TestCase):
+    # LLMMAS_SOAK_SESSIONS=100000 for the full soak run.
+    SESSIONS = int(os.environ.get("LLMMAS_SOAK_SESSIONS", "10000"))
+
+    def tearDown(self) -> None:
+        disable_fault_injection()
+
+    def test_memory_flat_across_sessions(self) -> None:
+        engine = _engine()
+        enable_fault_injection(engine)
+
+        def session(i: int) -> None:
+            sid = f"soak-{i}"
+            session_state.session_started(sid)
+            try:
+                engine.decide(_send(sid))
+                token = hyperagent._CURRENT_HYPERAGENT_SESSION_ID.set(sid)
+                try:
+                    hyperagent._next_step_index("Planner")
+                    hyperagent._next_named_segment_index("planning")
+                finally:
+                    hyperagent._CURRENT_HYPERAGENT_SESSION_ID.reset(token)
+            finally:
+                session_state.session_ended(sid)
+
+        for i in range(1000):
+            session(i)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            for i in range(1000, self.SESSIONS):
+                session(i)
+            gc.collect()
+            grown = tracemalloc.get_traced_memory()[0] - baseline
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(len(engine._counts), 0)
+        self.assertEqual(len(hyperagent._SESSION_COUNTERS), 0)
+        self.assertEqual(session_state.active_sessions(), 0)
+        # Before release hooks this grew by well over 10 MB (one entry per session per counter).
+        self.assertLess(grown, 64 * 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import enum
+import unittest
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import ALWAYS_ON, Sampler
+
+from llmmas_otel import semconv
+from llmmas_otel.span_factory import SpanFactory
+
+
+class _Color(str, enum.Enum):
+    RED = "red"
+
+
+class _RecordingSampler(Sampler):
+    """Keeps the attributes each span was started with."""
+
+    def __init__(self) -> None:
+        self.started: dict[str, dict] = {}
+
+    def should_sample(self, parent_context, trace_id, name, kind=None, attributes=None, links=None, trace_state=None):
+        self.started[name] = dict(attributes or {})
+        return ALWAYS_ON.should_sample(parent_context, trace_id, name, kind, attributes, links, trace_state)
+
+    def get_description(self) -> str:
+        return "RecordingSampler"
+
+
+class TestSpanAttributes(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sampler = _RecordingSampler()
+        self.exporter = InMemorySpanExporter()
+        provider = TracerProvider(sampler=self.sampler)
+        provider.add_span_processor(SimpleSpanProcessor(self.exporter))
+        self.factory = SpanFactory(tracer_provider=provider)
+
+    def _span(self, name: str):
+        return next(s for s in self.exporter.get_finished_spans() if s.name == name)
+
+    def test_attributes_are_set_at_span_start(self) -> None:
+        with self.factory.session(session_id="S1", name="run", framework="bench", metadata={"seed": 7}):
+            with self.factory.workflow(name="planning", order=2, origin="explicit", workflow_id="W1"):
+                with self.factory.agent_step(agent_id="Planner", step_index=3, step_kind="act"):
+                    pass
+
+        started = self.sampler.started
+        self.assertEqual(started[f"{semconv.SPAN_SESSION} run"][semconv.ATTR_SESSION_ID], "S1")
+        self.assertEqual(started[f"{semconv.SPAN_SESSION} run"]["llmmas.session.meta.seed"], 7)
+        workflow = started[f"{semconv.SPAN_WORKFLOW} planning"]
+        self.assertEqual(workflow[semconv.ATTR_WORKFLOW_ID], "W1")
+        self.assertEqual(workflow[semconv.ATTR_SEGMENT_ORDER], 2)
+        self.assertEqual(workflow[semconv.ATTR_SEGMENT_ORIGIN], "explicit")
+        self.assertEqual(started[f"{semconv.SPAN_AGENT_STEP} Planner"][semconv.ATTR_STEP_KIND], "act")
+
+        for span in self.exporter.get_finished_spans():
+            self.assertEqual(dict(span.attributes), started[span.name])
+
+    def test_none_skipped_and_values_coerced(self) -> None:
+        with self.factory.a2a_send(
+            source_agent_id="A",
+            target_agent_id="B",
+            edge_id="A->B",
+            message_id="m1",
+            channel=None,
+            message_kind=_Color.RED,
+            metadata={"tags": ("x", "y"), "obj": object, "with space": 1.5, "missing": None},
+        ):
+            pass
+
+        attrs = dict(self._span(f"{semconv.A2A_OP_SEND} A->B").attributes)
+        self.assertNotIn(semconv.ATTR_CHANNEL, attrs)
+        self.assertNotIn("llmmas.message.meta.missing", attrs)
+        self.assertEqual(attrs[semconv.ATTR_MESSAGE_KIND], "red")
+        self.assertEqual(attrs["llmmas.message.meta.tags"], ("x", "y"))
+        self.assertEqual(attrs["llmmas.message.meta.obj"], str(object))
+        self.assertEqual(attrs["llmmas.message.meta.with_space"], 1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
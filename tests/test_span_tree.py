@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import random
+import unittest
+
+from llmmas_otel import semconv
+from llmmas_otel.analysis import SpanTreeIndex
+
+
+def _walk(by_id: dict[str, dict], span: dict, key: str):
+    cur, seen = span, set()
+    while cur is not None:
+        attrs = cur.get("attributes") or {}
+        if key in attrs:
+            return attrs[key]
+        pid = cur.get("parent_span_id")
+        if not pid or pid in seen:
+            return None
+        seen.add(pid)
+        cur = by_id.get(pid)
+    return None
+
+
+class TestSpanTreeIndex(unittest.TestCase):
+    def test_matches_parent_walk_on_random_trees(self) -> None:
+        rng = random.Random(7)
+        spans = [{"span_id": "s0", "parent_span_id": None, "attributes": {semconv.ATTR_SESSION_ID: "S"}}]
+        for i in range(1, 2000):
+            attrs = {}
+            if rng.random() < 0.1:
+                attrs[semconv.ATTR_SEGMENT_NAME] = rng.choice(["planning", "coding", "testing"])
+            if rng.random() < 0.2:
+                attrs[semconv.ATTR_AGENT_ID] = rng.choice(["Planner", "Coder"])
+            # Missing parents end the chain, like spans cut off in an export.
+            parent = f"s{rng.randrange(i)}" if rng.random() < 0.98 else "missing"
+            spans.append({"span_id": f"s{i}", "parent_span_id": parent, "attributes": attrs})
+        rng.shuffle(spans)
+
+        tree = SpanTreeIndex.from_spans(spans)
+        by_id = {s["span_id"]: s for s in spans}
+        for span in spans:
+            for key in tree.keys:
+                self.assertEqual(tree.get(span["span_id"], key), _walk(by_id, span, key))
+
+    def test_own_attribute_wins_and_cycles_terminate(self) -> None:
+        tree = SpanTreeIndex(
+            ["a", "b", "c", "x", "y"],
+            [None, "a", "b", "y", "x"],
+            [{semconv.ATTR_AGENT_ID: "A"}, None, {semconv.ATTR_AGENT_ID: "C"}, {}, {semconv.ATTR_AGENT_ID: "Y"}],
+        )
+        self.assertEqual(tree.get("b", semconv.ATTR_AGENT_ID), "A")
+        self.assertEqual(tree.get("c", semconv.ATTR_AGENT_ID), "C")
+        self.assertEqual(tree.get("x", semconv.ATTR_AGENT_ID), "Y")
+        self.assertIsNone(tree.get("unknown", semconv.ATTR_AGENT_ID))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+from llmmas_otel.injection import FaultSpec, HookContext, HookType, SpecFaultEngine, load_fault_specs
+from llmmas_otel.injection import loader
+
+CAMPAIGN = """
+faults:
+  - id: INTO_EDITOR
+    hook: a2a_send
+    selector:
+      edge_id: {glob: "*->Editor"}
+      step_index: {min: 1, max: 3}
+    action: {type: a2a.drop}
+    limits: {max_times: 1}
+  - id: TOOLS
+    hook: tool_call
+    selector: {tool_name: [pytest, ruff]}
+    action: {type: tool.timeout}
+"""
+
+
+class TestSpecCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = Path(self._tmp.name)
+        self.path = self.root / "faults.yaml"
+        self.path.write_text(CAMPAIGN, encoding="utf-8")
+        self.cache_dir = self.root / "cache"
+
+    def test_uses_libyaml_when_available(self) -> None:
+        if hasattr(yaml, "CSafeLoader"):
+            self.assertIs(loader._YAML_LOADER, yaml.CSafeLoader)
+
+    def test_cache_hit_skips_parsing(self) -> None:
+        first = load_fault_specs(str(self.path), cache_dir=self.cache_dir)
+        self.assertEqual(len(list(self.cache_dir.glob("*.pickle"))), 1)
+
+        with mock.patch.object(loader, "parse_fault_specs", side_effect=AssertionError("parsed")):
+            cached = load_fault_specs(str(self.path), cache_dir=self.cache_dir)
+        self.assertEqual(cached, first)
+
+        engine = SpecFaultEngine(specs=cached)
+        ctx = HookContext(hook_type=HookType.A2A_SEND, session_id="S", edge_id="Planner->Editor", step_index=2)
+        self.assertEqual(engine.decide(ctx).fault_id, "INTO_EDITOR")
+        ctx = HookContext(hook_type=HookType.TOOL_CALL, session_id="S", tool_name="ruff")
+        self.assertEqual(engine.decide(ctx).fault_id, "TOOLS")
+
+    def test_changed_content_misses(self) -> None:
+        load_fault_specs(str(self.path), cache_dir=self.cache_dir)
+        self.path.write_text(CAMPAIGN.replace("max_times: 1", "max_times: 4"), encoding="utf-8")
+        specs = load_fault_specs(str(self.path), cache_dir=self.cache_dir)
+        self.assertEqual(specs[0].limits.max_times, 4)
+        self.assertEqual(len(list(self.cache_dir.glob("*.pickle"))), 2)
+
+    def test_corrupt_cache_is_rebuilt(self) -> None:
+        expected = load_fault_specs(str(self.path))
+        load_fault_specs(str(self.path), cache_dir=self.cache_dir)
+        (entry,) = self.cache_dir.glob("*.pickle")
+        for junk in (b"not a pickle", pickle.dumps({"not": "specs"})):
+            entry.write_bytes(junk)
+            self.assertEqual(load_fault_specs(str(self.path), cache_dir=self.cache_dir), expected)
+            self.assertTrue(all(isinstance(s, FaultSpec) for s in pickle.loads(entry.read_bytes())))
+
+    def test_invalid_specs_are_not_cached(self) -> None:
+        self.path.write_text("- {id: X, hook: a2a_send, action: {type: a2a.drop}, selector: {edge_id: {regex: '('}}}\n", encoding="utf-8")
+        with self.assertRaises(ValueError):
+            load_fault_specs(str(self.path), cache_dir=self.cache_dir)
+        self.assertFalse(list(self.cache_dir.glob("*.pickle")) if self.cache_dir.exists() else [])
+
+    def test_environment_variable(self) -> None:
+        with mock.patch.dict(os.environ, {loader.CACHE_DIR_ENV: str(self.cache_dir)}):
+            load_fault_specs(str(self.path))
+        self.assertEqual(len(list(self.cache_dir.glob("*.pickle"))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
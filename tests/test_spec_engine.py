@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import random
+import unittest
+
+from llmmas_otel.injection import (
+    DecisionKind,
+    FaultSpec,
+    HookContext,
+    HookType,
+    SpecFaultEngine,
+)
+
+AGENTS = ["Planner", "Navigator", "Editor", "Executor"]
+PHASES = ["planning", "coding", "testing"]
+TOOLS = ["pytest", "grep", "editor"]
+
+
+def _random_spec(rng: random.Random, i: int) -> FaultSpec:
+    hook = rng.choice(list(HookType))
+    selector: dict = {}
+    if rng.random() < 0.5:
+        selector["phase_name"] = rng.choice(PHASES)
+    if hook in (HookType.A2A_SEND, HookType.A2A_RECEIVE):
+        src, dst = rng.sample(AGENTS, 2)
+        if rng.random() < 0.6:
+            selector["edge_id"] = f"{src}->{dst}"
+        if rng.random() < 0.3:
+            selector["source_agent_id"] = src
+    elif hook == HookType.TOOL_CALL:
+        if rng.random() < 0.7:
+            selector["tool_name"] = rng.choice(TOOLS)
+    elif rng.random() < 0.5:
+        selector["agent_id"] = rng.choice(AGENTS)
+
+    return FaultSpec.from_dict(
+        {
+            "id": f"F{i}",
+            "hook": hook.value,
+            "selector": selector,
+            "action": {"type": "a2a.drop"},
+            "limits": {"probability": rng.choice([1.0, 0.5]), "max_times": rng.choice([None, 1, 2])},
+        }
+    )
+
+
+def _random_ctx(rng: random.Random) -> HookContext:
+    hook = rng.choice(list(HookType))
+    src, dst = rng.sample(AGENTS, 2)
+    return HookContext(
+        hook_type=hook,
+        session_id=rng.choice(["S1", "S2"]),
+        phase_name=rng.choice(PHASES),
+        agent_id=src,
+        source_agent_id=src,
+        target_agent_id=dst,
+        edge_id=f"{src}->{dst}",
+        tool_name=rng.choice(TOOLS) if hook == HookType.TOOL_CALL else None,
+    )
+
+
+class TestSpecEngineIndex(unittest.TestCase):
+    def test_indexed_matches_linear(self) -> None:
+        rng = random.Random(7)
+        specs = [_random_spec(rng, i) for i in range(200)]
+        linear = SpecFaultEngine(specs=specs, seed="s", indexed=False)
+        indexed = SpecFaultEngine(specs=specs, seed="s")
+
+        for _ in range(2000):
+            ctx = _random_ctx(rng)
+            a = linear.decide(ctx, payload="hello")
+            b = indexed.decide(ctx, payload="hello")
+            self.assertEqual((a.kind, a.fault_id), (b.kind, b.fault_id))
+
+    def test_first_match_wins_across_buckets(self) -> None:
+        specs = [
+            FaultSpec.from_dict(
+                {"id": "WILD", "hook": "a2a_send", "selector": {"phase_name": "coding"}, "action": {"type": "a2a.drop"}}
+            ),
+            FaultSpec.from_dict(
+                {"id": "EDGE", "hook": "a2a_send", "selector": {"edge_id": "A->B"}, "action": {"type": "a2a.drop"}}
+            ),
+        ]
+        engine = SpecFaultEngine(specs=specs)
+        ctx = HookContext(hook_type=HookType.A2A_SEND, session_id="S1", phase_name="coding", edge_id="A->B")
+        d = engine.decide(ctx, payload="x")
+        self.assertEqual(d.kind, DecisionKind.DROP)
+        self.assertEqual(d.fault_id, "WILD")
+
+        engine = SpecFaultEngine(specs=list(reversed(specs)))
+        self.assertEqual(engine.decide(ctx, payload="x").fault_id, "EDGE")
+
+
+if __name__ == "__main__":
+    unittest.main()
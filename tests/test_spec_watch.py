@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from llmmas_otel.injection import (
+    DecisionKind,
+    FaultSpec,
+    HookContext,
+    HookType,
+    SpecDirectory,
+    SpecFaultEngine,
+    SpecWatcher,
+    disable_fault_injection,
+    enable_fault_injection,
+    get_engine,
+)
+from llmmas_otel.injection import watch
+
+
+def _spec(fid: str, edge: str, max_times: int = 2) -> FaultSpec:
+    return FaultSpec.from_dict(
+        {
+            "id": fid,
+            "hook": "a2a_send",
+            "selector": {"edge_id": edge},
+            "action": {"type": "a2a.drop"},
+            "limits": {"max_times": max_times},
+        }
+    )
+
+
+def _ctx(edge: str, session_id: str = "S1") -> HookContext:
+    return HookContext(hook_type=HookType.A2A_SEND, session_id=session_id, edge_id=edge)
+
+
+def _fault(engine: SpecFaultEngine, edge: str, session_id: str = "S1"):
+    return engine.decide(_ctx(edge, session_id)).fault_id
+
+
+def _write(path: Path, text: str) -> None:
+    # Bump mtime explicitly: back-to-back writes can share a timestamp on coarse filesystems.
+    mtime = path.stat().st_mtime_ns + 1_000_000 if path.exists() else None
+    path.write_text(text, encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+A2A = """
+faults:
+  - id: DROP_AB
+    hook: a2a_send
+    selector: {edge_id: "A->B"}
+    action: {type: a2a.drop}
+    limits: {max_times: 2}
+"""
+
+LLM = """
+- id: LLM_DELAY
+  hook: llm_call
+  selector: {}
+  action: {type: llm.delay, params: {delay_ms: 1}}
+"""
+
+
+class TestReplaceSpecs(unittest.TestCase):
+    def test_counters_kept_for_unchanged_specs(self) -> None:
+        for indexed in (True, False):
+            with self.subTest(indexed=indexed):
+                engine = SpecFaultEngine(specs=[_spec("AB", "A->B"), _spec("CD", "C->D")], indexed=indexed)
+                for edge in ("A->B", "C->D"):
+                    self.assertIsNotNone(_fault(engine, edge))
+
+                engine.replace_specs([_spec("AB", "A->B"), _spec("CD", "C->D", max_times=3), _spec("EF", "E->F")])
+
+                # AB unchanged: one application left. CD changed: counter reset.
+                self.assertEqual(_fault(engine, "A->B"), "AB")
+                self.assertIsNone(_fault(engine, "A->B"))
+                self.assertEqual([_fault(engine, "C->D") for _ in range(4)], ["CD", "CD", "CD", None])
+                self.assertEqual(_fault(engine, "E->F"), "EF")
+
+                engine.replace_specs([])
+                self.assertIsNone(_fault(engine, "E->F"))
+                engine.replace_specs([_spec("AB", "A->B")])
+                # AB was removed in between, so its counter starts over.
+                self.assertEqual(_fault(engine, "A->B"), "AB")
+
+    def test_duplicate_ids_rejected(self) -> None:
+        engine = SpecFaultEngine(specs=[_spec("AB", "A->B")])
+        with self.assertRaises(ValueError):
+            engine.replace_specs([_spec("X", "A->B"), _spec("X", "C->D")])
+        self.assertEqual(_fault(engine, "A->B"), "AB")
+
+
+class TestSpecDirectory(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.addCleanup(self._tmp.cleanup)
+
+    def test_combines_files_in_name_order(self) -> None:
+        _write(self.dir / "20_a2a.yaml", A2A)
+        _write(self.dir / "10_llm.yml", LLM)
+        _write(self.dir / "notes.txt", "not a spec")
+        source = SpecDirectory(self.dir)
+        self.assertEqual([s.id for s in source.specs], ["LLM_DELAY", "DROP_AB"])
+        self.assertFalse(source.refresh())
+
+    def test_only_changed_files_are_reparsed(self) -> None:
+        _write(self.dir / "a2a.yaml", A2A)
+        _write(self.dir / "llm.yaml", LLM)
+        source = SpecDirectory(self.dir)
+        before = {spec.id: spec for spec in source.specs}
+
+        _write(self.dir / "a2a.yaml", A2A.replace("max_times: 2", "max_times: 5"))
+        self.assertTrue(source.refresh())
+        after = {spec.id: spec for spec in source.specs}
+        self.assertIs(after["LLM_DELAY"], before["LLM_DELAY"])
+        self.assertEqual(after["DROP_AB"].limits.max_times, 5)
+
+        (self.dir / "llm.yaml").unlink()
+        self.assertTrue(source.refresh())
+        self.assertEqual([s.id for s in source.specs], ["DROP_AB"])
+
+    def test_bad_edit_keeps_previous_specs(self) -> None:
+        _write(self.dir / "a2a.yaml", A2A)
+        source = SpecDirectory(self.dir)
+
+        _write(self.dir / "a2a.yaml", "faults: [ {id: BROKEN")
+        with self.assertRaisesRegex(ValueError, "a2a.yaml"):
+            source.refresh()
+        _write(self.dir / "dup.yaml", A2A)
+        with self.assertRaises(ValueError):
+            source.refresh()
+        self.assertEqual([s.id for s in source.specs], ["DROP_AB"])
+
+        _write(self.dir / "a2a.yaml", LLM)
+        self.assertTrue(source.refresh())
+        self.assertEqual([s.id for s in source.specs], ["LLM_DELAY", "DROP_AB"])
+
+
+class TestWatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.addCleanup(self._tmp.cleanup)
+        self.addCleanup(disable_fault_injection)
+
+    def test_check_swaps_specs_and_keeps_counters(self) -> None:
+        _write(self.dir / "a2a.yaml", A2A)
+        source = SpecDirectory(self.dir)
+        engine = SpecFaultEngine(specs=source.specs)
+        watcher = SpecWatcher(source, engine)
+        self.assertEqual(_fault(engine, "A->B"), "DROP_AB")
+
+        self.assertFalse(watcher.check())
+        _write(self.dir / "llm.yaml", LLM)
+        self.assertTrue(watcher.check())
+        self.assertEqual(watcher.reloads, 1)
+
+        llm = engine.decide(HookContext(hook_type=HookType.LLM_CALL, session_id="S1"))
+        self.assertEqual(llm.kind, DecisionKind.DELAY)
+        self.assertEqual(_fault(engine, "A->B"), "DROP_AB")
+        self.assertIsNone(_fault(engine, "A->B"))
+
+        _write(self.dir / "llm.yaml", "- {id: X")
+        with self.assertRaises(ValueError):
+            watcher.check()
+        self.assertIsNotNone(watcher.last_error)
+
+    def test_enable_directory_watches_in_background(self) -> None:
+        _write(self.dir / "a2a.yaml", A2A)
+        enable_fault_injection(self.dir)
+        watcher = watch._WATCHER
+        self.assertIsNotNone(watcher)
+        watcher.interval_s = 0.01
+        engine = get_engine()
+        self.assertIs(watcher.engine, engine)
+        self.assertEqual(_fault(engine, "A->B"), "DROP_AB")
+
+        _write(self.dir / "a2a.yaml", A2A.replace("A->B", "B->C"))
+        deadline = time.monotonic() + 5
+        while watcher.reloads == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertIs(get_engine(), engine)
+        self.assertEqual(_fault(engine, "B->C"), "DROP_AB")
+
+        disable_fault_injection()
+        self.assertIsNone(watch._WATCHER)
+        self.assertIsNone(watcher._thread)
+
+
+if __name__ == "__main__":
+    unittest.main()
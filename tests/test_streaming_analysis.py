@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from llmmas_otel import semconv
+from llmmas_otel.analysis import JSONTracesFileExporter, SessionAnalyzer, load_span_table, span_to_dict
+from llmmas_otel.span_factory import SpanFactory
+
+HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+def _run_session(factory: SpanFactory, session_id: str, *, fault: bool) -> None:
+    with factory.session(session_id=session_id):
+        with factory.segment(name="planning"):
+            with factory.agent_step(agent_id="Planner", step_index=0):
+                with factory.llm_call(provider_name="p", model="m", input_text="plan") as ctx:
+                    ctx.span.set_attribute(semconv.ATTR_LLM_OUTPUT_SHA256, f"{session_id}-plan")
+                    if fault:
+                        ctx.span.set_attribute(semconv.ATTR_FAULT_INJECTED, True)
+                        ctx.span.set_attribute(semconv.ATTR_FAULT_TYPE, "llm.delay")
+                        ctx.span.set_attribute(semconv.ATTR_FAULT_SPEC_ID, "A1")
+                        ctx.span.add_event("fault.applied", {"delay_ms": 5})
+                with factory.a2a_send(
+                    source_agent_id="Planner",
+                    target_agent_id="Coder",
+                    edge_id="Planner->Coder",
+                    message_id=f"{session_id}-m1",
+                    message_body="the plan",
+                ):
+                    pass
+        with factory.segment(name="coding"):
+            with factory.agent_step(agent_id="Coder", step_index=1):
+                with factory.llm_call(provider_name="p", model="m", input_text="code") as ctx:
+                    ctx.span.set_attribute(semconv.ATTR_LLM_OUTPUT_SHA256, f"{session_id}-code")
+        # A span without any segment or agent ancestor.
+        with factory.llm_call(provider_name="p", model="m", input_text="review") as ctx:
+            ctx.span.set_attribute(semconv.ATTR_LLM_OUTPUT_SHA256, f"{session_id}-review")
+
+
+class TestSessionAnalyzer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.exporter = InMemorySpanExporter()
+        self.analyzer = SessionAnalyzer()
+        self.traces = JSONTracesFileExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(self.exporter))
+        provider.add_span_processor(self.analyzer)
+        provider.add_span_processor(SimpleSpanProcessor(self.traces))
+        self.provider = provider
+        self.factory = SpanFactory(tracer_provider=provider)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _run(self) -> str:
+        path = os.path.join(self.tmp.name, "traces.json")
+        self.traces.open(path)
+        for i in range(3):
+            _run_session(self.factory, f"S{i}", fault=i == 1)
+        self.traces.close()
+        return path
+
+    def test_traces_file_matches_whole_file_dump(self) -> None:
+        path = self._run()
+        spans_json = {"spans": [span_to_dict(s) for s in self.exporter.get_finished_spans()]}
+        with open(path, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), json.dumps(spans_json, indent=2))
+
+        sessions = self.analyzer.sessions()
+        self.assertEqual(sorted(sessions), ["S0", "S1", "S2"])
+        self.assertEqual(self.analyzer.in_flight(), 0)
+        point = sessions["S1"]["injection_points"][0]
+        self.assertEqual((point["phase_name"], point["agent_id"], point["delay_ms"]), ("planning", "Planner", 5.0))
+        self.assertEqual(sessions["S1"]["metrics"]["injected_delay_ms"], 5.0)
+        self.assertEqual(sessions["S0"]["metrics"]["llm_call_count"], 3)
+        self.assertIn("unknown_phase:unknown_agent", sessions["S0"]["fingerprints"]["llm_output_sha_by_phase_agent"])
+
+    @unittest.skipUnless(HAVE_NUMPY, "needs numpy (llmmas-otel[analysis])")
+    def test_matches_batch_analysis(self) -> None:
+        from llmmas_otel.analysis.vectorized import session_summaries
+
+        path = self._run()
+        self.assertEqual(self.analyzer.sessions(), session_summaries(load_span_table(path)))
+
+    def test_empty_traces_file_is_valid_json(self) -> None:
+        path = os.path.join(self.tmp.name, "empty.json")
+        self.traces.open(path)
+        self.traces.close()
+        with open(path, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), json.dumps({"spans": []}, indent=2))
+
+    def test_state_is_released_when_session_ends(self) -> None:
+        with self.factory.session(session_id="S"):
+            with self.factory.agent_step(agent_id="A", step_index=0):
+                self.assertEqual(self.analyzer.in_flight(), 1)
+        self.assertEqual(self.analyzer.in_flight(), 0)
+        self.assertEqual(list(self.analyzer.sessions()), ["S"])
+
+    def test_children_started_after_the_root_ended_are_ignored(self) -> None:
+        with self.factory.session(session_id="S") as root:
+            pass
+        # A delayed delivery that runs after the session span has ended.
+        tracer = self.provider.get_tracer("test")
+        with tracer.start_as_current_span("late", context=trace.set_span_in_context(root)):
+            self.assertEqual(self.analyzer.in_flight(), 0)
+        self.assertEqual(self.analyzer.in_flight(), 0)
+        self.assertEqual(self.analyzer.sessions()["S"]["metrics"]["llm_call_count"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
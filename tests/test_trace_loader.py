@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from google.protobuf.json_format import MessageToJson
+from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import SpanKind
+from opentelemetry.trace.status import Status, StatusCode
+
+from llmmas_otel import semconv
+from llmmas_otel.analysis import load_span_table, span_to_dict
+from llmmas_otel.span_factory import SpanFactory
+
+
+class _TrickleReader(io.StringIO):
+    """Returns at most a few characters per read, to exercise chunk boundaries."""
+
+    def read(self, size: int = -1) -> str:
+        return super().read(7)
+
+
+def _spans():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider(resource=Resource.create({"service.name": "svc"}))
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    factory = SpanFactory(tracer_provider=provider)
+    with factory.session(session_id="S1"):
+        with factory.segment(name="planning"):
+            with factory.agent_step(agent_id="Planner", step_index=0):
+                with factory.llm_call(provider_name="p", model="m", input_text="plan") as ctx:
+                    ctx.span.add_event("fault.applied", {"delay_ms": 250})
+                    ctx.span.set_status(Status(StatusCode.ERROR, "boom"))
+                with factory.a2a_send(
+                    source_agent_id="Planner", target_agent_id="Coder", edge_id="P->C", message_id="m1", message_body="hi"
+                ):
+                    pass
+    return exporter.get_finished_spans()
+
+
+def _jaeger(spans) -> dict:
+    out = []
+    for s in spans:
+        tags = [{"key": k, "type": "string", "value": v} for k, v in s.attributes.items()]
+        tags.append({"key": "span.kind", "type": "string", "value": s.kind.name.lower()})
+        if s.status.status_code == StatusCode.ERROR:
+            tags.append({"key": "otel.status_code", "type": "string", "value": "ERROR"})
+        out.append(
+            {
+                "traceID": f"{s.context.trace_id:032x}",
+                "spanID": f"{s.context.span_id:016x}",
+                "operationName": s.name,
+                "references": (
+                    [{"refType": "CHILD_OF", "traceID": f"{s.context.trace_id:032x}", "spanID": f"{s.parent.span_id:016x}"}]
+                    if s.parent
+                    else []
+                ),
+                "startTime": s.start_time // 1000,
+                "duration": (s.end_time - s.start_time) // 1000,
+                "tags": tags,
+                "logs": [
+                    {
+                        "timestamp": e.timestamp // 1000,
+                        "fields": [{"key": "event", "value": e.name}]
+                        + [{"key": k, "value": v} for k, v in e.attributes.items()],
+                    }
+                    for e in s.events
+                ],
+                "processID": "p1",
+            }
+        )
+    return {"data": [{"traceID": out[0]["traceID"], "spans": out, "processes": {"p1": {"serviceName": "svc"}}}]}
+
+
+class TestLoadSpanTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.spans = _spans()
+        self.by_name = {s.name: s for s in self.spans}
+        self.documents = {
+            "eval": json.dumps({"spans": [span_to_dict(s) for s in self.spans]}, indent=2),
+            "jaeger": json.dumps(_jaeger(self.spans)),
+            "otlp": MessageToJson(encode_spans(self.spans)),
+        }
+
+    def _check(self, table, *, service: bool, microseconds: bool = False) -> None:
+        self.assertEqual(len(table), len(self.spans))
+        self.assertEqual(table.trace_ids, [f"{self.spans[0].context.trace_id:032x}"])
+        rows = {table.name(r): r for r in range(len(table))}
+        for name, span in self.by_name.items():
+            row = rows[name]
+            self.assertEqual(table.span_id[row], span.context.span_id)
+            self.assertEqual(table.parent_span_id[row], span.parent.span_id if span.parent else 0)
+            self.assertEqual(table.kind[row], span.kind.value)
+            self.assertEqual(table.status[row], span.status.status_code.value)
+            start = span.start_time // 1000 * 1000 if microseconds else span.start_time
+            self.assertEqual(table.start_ns[row], start)
+            if service:
+                self.assertEqual(table.service.get(row), "svc")
+
+        send = rows["send P->C"]
+        self.assertEqual(table.kind[send], SpanKind.PRODUCER.value)
+        self.assertEqual(table.attribute(send, semconv.ATTR_MESSAGE_ID), "m1")
+        self.assertEqual(table.attribute(send, semconv.ATTR_AGENT_ID), None)
+
+        tree = table.span_tree()
+        self.assertEqual(tree.get(send, semconv.ATTR_SEGMENT_NAME), "planning")
+        self.assertEqual(tree.get(send, semconv.ATTR_AGENT_ID), "Planner")
+        self.assertEqual(tree.get(send, semconv.ATTR_SESSION_ID), "S1")
+
+        events = {table.event_names[code]: e for e, code in enumerate(table.event_name_code)}
+        self.assertEqual(set(events), {"fault.applied", "a2a.message"})
+        fault = events["fault.applied"]
+        self.assertEqual(table.name(table.event_row[fault]), "inference m")
+        self.assertEqual(table.event_attributes["delay_ms"].get(fault), 250)
+
+    def test_eval_trace_file(self) -> None:
+        self._check(load_span_table(io.StringIO(self.documents["eval"])), service=False)
+
+    def test_jaeger_export(self) -> None:
+        self._check(load_span_table(io.StringIO(self.documents["jaeger"])), service=True, microseconds=True)
+
+    def test_otlp_json_with_base64_ids(self) -> None:
+        self._check(load_span_table(io.StringIO(self.documents["otlp"])), service=True)
+
+    def test_small_reads_and_json_lines(self) -> None:
+        lines = "\n".join(json.dumps(json.loads(self.documents["otlp"])) for _ in range(3))
+        table = load_span_table(_TrickleReader(lines))
+        self.assertEqual(len(table), 3 * len(self.spans))
+        self._check(load_span_table(_TrickleReader(self.documents["eval"])), service=False)
+
+    def test_columns_filter_and_multiple_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for kind in ("eval", "jaeger"):
+                paths.append(os.path.join(tmp, f"{kind}.json"))
+                with open(paths[-1], "w", encoding="utf-8") as f:
+                    f.write(self.documents[kind])
+            table = load_span_table(*paths, columns=[semconv.ATTR_MESSAGE_ID])
+        self.assertEqual(len(table), 2 * len(self.spans))
+        self.assertEqual(list(table.attributes), [semconv.ATTR_MESSAGE_ID])
+
+    def test_jaeger_error_response_and_unknown_layout(self) -> None:
+        error = '{"data":null,"total":0,"limit":0,"offset":0,"errors":[{"code":400,"msg":"bad"}]}'
+        self.assertEqual(len(load_span_table(io.StringIO(error))), 0)
+        with self.assertRaises(ValueError):
+            load_span_table(io.StringIO('{"traces": []}'))
+
+
+if __name__ == "__main__":
+    unittest.main()
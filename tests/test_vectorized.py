@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import importlib.util
+import io
+import json
+import math
+import random
+import unittest
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from llmmas_otel import semconv
+from llmmas_otel.analysis import load_span_table, span_to_dict
+from llmmas_otel.span_factory import SpanFactory
+
+HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+def _percentile(sorted_vals: list[float], p: float) -> float:
+    if not sorted_vals:
+        return float("nan")
+    if len(sorted_vals) == 1:
+        return float(sorted_vals[0])
+    k = (len(sorted_vals) - 1) * p
+    f = int(k)
+    c = min(f + 1, len(sorted_vals) - 1)
+    if f == c:
+        return float(sorted_vals[f])
+    return float(sorted_vals[f] * (c - k) + sorted_vals[c] * (k - f))
+
+
+def _reference_median_iqr(vals: list[float]) -> dict:
+    s = sorted(float(x) for x in vals)
+    q1, med, q3 = (_percentile(s, p) for p in (0.25, 0.5, 0.75))
+    return {"median": med, "q1": q1, "q3": q3, "iqr": q3 - q1, "n": len(s)}
+
+
+def _spans():
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    factory = SpanFactory(tracer_provider=provider)
+    for i in range(3):
+        with factory.session(session_id=f"S{i}"):
+            with factory.segment(name="planning"):
+                with factory.agent_step(agent_id="Planner", step_index=0):
+                    for j in range(i + 1):
+                        with factory.llm_call(provider_name="p", model="m", input_text=f"q{j}") as ctx:
+                            if i == 2:
+                                ctx.span.add_event("fault.applied", {"delay_ms": 10 * (j + 1)})
+                            ctx.span.set_attribute(semconv.ATTR_LLM_OUTPUT_SHA256, f"a{j}")
+    # A trace without a session span is ignored.
+    with factory.llm_call(provider_name="p", model="m", input_text="orphan"):
+        pass
+    return exporter.get_finished_spans()
+
+
+@unittest.skipUnless(HAVE_NUMPY, "needs numpy (llmmas-otel[analysis])")
+class TestSessionMetrics(unittest.TestCase):
+    def test_matches_span_by_span_sums(self) -> None:
+        from llmmas_otel.analysis.vectorized import session_metrics
+
+        spans = _spans()
+        table = load_span_table(io.StringIO(json.dumps({"spans": [span_to_dict(s) for s in spans]})))
+        metrics = session_metrics(table)
+        self.assertEqual(sorted(metrics), ["S0", "S1", "S2"])
+
+        for sid, m in metrics.items():
+            trace = [s for s in spans if f"{s.context.trace_id:032x}" == m["trace_id"]]
+            session = next(s for s in trace if s.name == semconv.SPAN_SESSION)
+            llm = [s for s in trace if s.attributes.get(semconv.ATTR_GEN_AI_OPERATION_NAME) == "inference"]
+            self.assertEqual(session.attributes[semconv.ATTR_SESSION_ID], sid)
+            self.assertEqual(m["session_ms"], (session.end_time - session.start_time) / 1e6)
+            self.assertEqual(m["llm_call_count"], len(llm))
+            self.assertAlmostEqual(m["llm_total_ms"], sum((s.end_time - s.start_time) / 1e6 for s in llm))
+        self.assertEqual([metrics[s]["llm_call_count"] for s in ("S0", "S1", "S2")], [1, 2, 3])
+        self.assertEqual(metrics["S2"]["injected_delay_ms"], 60.0)
+        self.assertEqual(metrics["S0"]["injected_delay_ms"], 0.0)
+
+    def test_empty_table(self) -> None:
+        from llmmas_otel.analysis import SpanTable
+        from llmmas_otel.analysis.vectorized import session_metrics, session_summaries
+
+        self.assertEqual(session_metrics(SpanTable()), {})
+        self.assertEqual(session_summaries(SpanTable()), {})
+
+
+@unittest.skipUnless(HAVE_NUMPY, "needs numpy (llmmas-otel[analysis])")
+class TestMedianIQR(unittest.TestCase):
+    def test_matches_scalar_percentile(self) -> None:
+        from llmmas_otel.analysis.vectorized import median_iqr
+
+        rng = random.Random(7)
+        for n in (1, 2, 3, 4, 5, 10, 37):
+            vals = [rng.uniform(0, 1000) for _ in range(n)]
+            self.assertEqual(median_iqr(vals), _reference_median_iqr(vals))
+
+        empty = median_iqr([])
+        self.assertEqual(empty["n"], 0)
+        self.assertTrue(math.isnan(empty["median"]))
+
+    def test_grouped_matches_per_group(self) -> None:
+        from llmmas_otel.analysis.vectorized import grouped_median_iqr
+
+        rng = random.Random(11)
+        groups = [rng.choice("abcde") for _ in range(200)]
+        values = [float(rng.randint(0, 50)) for _ in groups]
+        out = grouped_median_iqr(groups, values)
+        self.assertEqual(list(out), list(dict.fromkeys(groups)))
+        for key, stats in out.items():
+            self.assertEqual(stats, _reference_median_iqr([v for g, v in zip(groups, values) if g == key]))
+
+        self.assertEqual(grouped_median_iqr([], []), {})
+        with self.assertRaises(ValueError):
+            grouped_median_iqr(["a"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()